@@ -0,0 +1,17 @@
+"""Model ve render performans ölçümleri
+
+Modüller src/ altındaki paketleri uygulamanın kendisi gibi ('core.*',
+'utils.*', 'gui.*') içe aktarır; bunun için yol ve Qt platformu burada
+ayarlanır.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+for path in (ROOT, SRC):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Ölçümler pencere açmadan çalışır
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
@@ -0,0 +1,94 @@
+import random
+
+from core.project import Project
+from core.board import Board
+from core.element import Element
+from core.connection import Connection
+
+WORDS = ('kapı', 'karanlık', 'orman', 'kral', 'mektup', 'gemi', 'sır', 'yol', 'ışık',
+         'köprü', 'nehir', 'kule', 'anahtar', 'gölge', 'şehir', 'rüya', 'savaş', 'dost')
+
+
+class ProjectShape:
+    """Üretilecek sentetik projenin şekli"""
+
+    def __init__(self, elements=1000, boards=1, connections_per_element=1.5,
+                 content_length=200, depth=1, seed=1234):
+        self.elements = elements  # Toplam element sayısı
+        self.boards = boards
+        self.connections_per_element = connections_per_element  # Ortalama çıkan bağlantı
+        self.content_length = content_length  # Element içeriğinin karakter sayısı
+        self.depth = depth  # Board.children hiyerarşisinin en fazla derinliği
+        self.seed = seed
+
+    @classmethod
+    def for_size(cls, elements, seed=1234):
+        """Boyuta göre makul board sayısı ve derinlikle varsayılan şekil"""
+        boards = max(2, min(64, elements // 2000))
+        return cls(elements=elements, boards=boards, depth=3, seed=seed)
+
+    def to_dict(self):
+        return dict(self.__dict__)
+
+
+def _text(rng, length):
+    words = []
+    size = 0
+    while size < length:
+        word = rng.choice(WORDS)
+        words.append(word)
+        size += len(word) + 1
+    return ' '.join(words)[:length]
+
+
+def generate_project(shape: ProjectShape) -> Project:
+    """Aynı şekil ve seed için her zaman aynı projeyi üret"""
+    rng = random.Random(shape.seed)
+    project = Project(f"Benchmark {shape.elements}")
+
+    # Board hiyerarşisi: her board derinliği depth'i aşmayan rastgele bir
+    # board'un altına eklenir
+    boards = []
+    levels = []
+    for index in range(max(1, shape.boards)):
+        board = Board(f"Board {index}", is_root=(index == 0))
+        if index:
+            candidates = [i for i, level in enumerate(levels) if level < shape.depth]
+            parent = rng.choice(candidates) if candidates else 0
+            boards[parent].children.append(board.id)
+            levels.append(levels[parent] + 1)
+        else:
+            levels.append(0)
+        boards.append(board)
+        project.add_board(board)
+
+    # Elementler board'lara eşit dağıtılır ve ızgaraya dizilir
+    per_board = [shape.elements // len(boards)] * len(boards)
+    for index in range(shape.elements % len(boards)):
+        per_board[index] += 1
+
+    content_pool = [_text(rng, shape.content_length) for _ in range(64)]
+    for board, count in zip(boards, per_board):
+        columns = max(1, int(count ** 0.5))
+        element_ids = []
+        for index in range(count):
+            element = Element(f"{rng.choice(WORDS)} {index}", rng.choice(content_pool))
+            element.set_position((index % columns) * 260, (index // columns) * 200)
+            board.add_element(element)
+            element_ids.append(element.id)
+
+        # Bağlantılar çoğunlukla ileri doğru (anlatı akışı gibi), bazıları geri
+        connection_count = int(count * shape.connections_per_element)
+        for _ in range(connection_count if count > 1 else 0):
+            source = rng.randrange(count)
+            if rng.random() < 0.8:
+                target = min(count - 1, source + 1 + int(rng.expovariate(0.3)))
+            else:
+                target = rng.randrange(count)
+            if target != source:
+                board.add_connection(Connection(element_ids[source], element_ids[target]))
+
+    for board in boards:
+        board.clear_dirty('save')
+        board.clear_dirty('autosave')
+    return project
@@ -0,0 +1,68 @@
+"""Model nesnelerinin bellek ve oluşturma maliyeti
+
+Kullanım:
+    python -m benchmarks.memory --count 100000
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+import benchmarks  # noqa: F401  (yol ayarı)
+from benchmarks.generator import ProjectShape, generate_project
+
+from core.element import Element
+from core.connection import Connection
+
+
+def _allocated(build):
+    """build() sonucunun canlı tuttuğu bellek (bayt) ve süresi (saniye)"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, elapsed
+
+
+def report(count):
+    rows = []
+
+    _, size, elapsed = _allocated(
+        lambda: [Element("Başlık", "İçerik") for _ in range(count)])
+    rows.append(('Element()', size, elapsed))
+
+    _, size, elapsed = _allocated(
+        lambda: [Connection("a", "b") for _ in range(count)])
+    rows.append(('Connection()', size, elapsed))
+
+    data = [Element(f"Başlık {i}", "İçerik").to_dict() for i in range(count)]
+    _, size, elapsed = _allocated(lambda: [Element.from_dict(d) for d in data])
+    rows.append(('Element.from_dict', size, elapsed))
+    del data
+
+    # Bağlantılar, indeksler ve board dahil gerçekçi bir proje
+    shape = ProjectShape(elements=count, boards=1, content_length=0)
+    _, size, elapsed = _allocated(lambda: generate_project(shape))
+    rows.append(('generate_project (1.5 bağlantı/element)', size, elapsed))
+
+    print(f"{'':<42} {'bayt/element':>14} {'µs/element':>12}")
+    for name, size, elapsed in rows:
+        print(f"{name:<42} {size / count:>14.1f} {elapsed / count * 1e6:>12.2f}")
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Model bellek raporu')
+    parser.add_argument('--count', type=int, default=100_000, help='Oluşturulacak nesne sayısı')
+    args = parser.parse_args(argv)
+    report(args.count)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,265 @@
+"""Model katmanı ölçümleri
+
+Kullanım:
+    python -m benchmarks.model                       # 100, 1k, 10k element
+    python -m benchmarks.model --sizes 100 1000000   # istenen boyutlar
+    python -m benchmarks.model --output sonuc.json --compare taban.json
+"""
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+
+import benchmarks  # noqa: F401  (yol ve Qt platformu ayarı)
+from benchmarks.generator import ProjectShape, generate_project
+from benchmarks.results import ResultSet, compare, load_results, measure
+
+from PyQt6.QtCore import QPointF
+from PyQt6.QtWidgets import QApplication
+
+from core.analysis import GraphAnalysis
+from core.commands import CommandStack, MoveElementCommand
+from core.connection import Connection
+from core.paths import PathStatistics
+from core.expressions import ExpressionCompiler, parse_condition, parse_effects
+from core.runtime import RuntimeGraph, Simulator
+from core.search import SearchIndex
+from utils.file_ops import ProjectFileHandler
+from utils.json_exporter import RuntimeExporter
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+ALL_SIZES = (100, 1_000, 10_000, 100_000, 1_000_000)
+COMMAND_OPS = 2_000  # Undo/redo ölçümündeki komut sayısı
+SIMULATION_RUNS = 1_000  # Simülasyon ölçümündeki oynanış sayısı
+SEARCH_QUERIES = ('kapı', 'apı', 'orman gemi', 'kral 7', 'ışık', 'k', 'bulunmayan')
+
+
+def repeat_for(size):
+    """Büyük projelerde daha az tekrar"""
+    if size <= 10_000:
+        return 5
+    if size <= 100_000:
+        return 3
+    return 1
+
+
+def silent(fn):
+    """Uygulamanın konsol çıktılarını ölçüm sırasında bastıran sarmalayıcı"""
+    def wrapper(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+    return wrapper
+
+
+def bench_size(results, shape, workdir):
+    size = shape.elements
+    repeat = repeat_for(size)
+    rng = random.Random(shape.seed)
+
+    holder = []
+    results.add('generate_project', size, measure(lambda: holder.append(generate_project(shape)), 1),
+                shape=shape.to_dict())
+    project = holder.pop()
+    boards = list(project.boards.values())
+    root = boards[0]
+
+    results.add('project_to_dict', size, measure(project.to_dict, repeat))
+
+    # Kayıt: tam yazma, tek düzenlemenin günlüğe eklenmesi ve SQLite
+    path = os.path.join(workdir, f'bench_{size}.ntp')
+    sqlite_path = os.path.join(workdir, f'bench_{size}.sqlite.ntp')
+
+    @silent
+    def full_save():
+        project.save_state = None
+        ProjectFileHandler.save_project(project, path)
+
+    results.add('save_project_full', size, measure(full_save, repeat))
+
+    elements = list(root.elements.values())
+
+    def edit_one():
+        element = rng.choice(elements)
+        element.set_position(element.position['x'] + 1, element.position['y'])
+
+    results.add('save_project_incremental', size, measure(
+        silent(lambda _: ProjectFileHandler.save_project(project, path)), repeat, setup=edit_one))
+
+    @silent
+    def sqlite_save():
+        project.save_state = None
+        ProjectFileHandler.save_project(project, sqlite_path, backend='sqlite')
+
+    results.add('save_project_sqlite_full', size, measure(sqlite_save, repeat))
+    results.add('save_project_sqlite_incremental', size, measure(
+        silent(lambda _: ProjectFileHandler.save_project(project, sqlite_path)),
+        repeat, setup=edit_one))
+    project.save_state.close()
+    full_save()
+
+    results.add('load_project_lazy', size, measure(
+        silent(lambda: ProjectFileHandler.load_project(path)), repeat))
+    results.add('load_project_full', size, measure(
+        silent(lambda: ProjectFileHandler.load_project(path, lazy=False)), repeat))
+    results.add('load_project_sqlite_lazy', size, measure(
+        silent(lambda: ProjectFileHandler.load_project(sqlite_path)), repeat))
+
+    # Arama: tüm board'ları indeksle (tembel board'lar yüklenmeden), sonra sorgula
+    lazy_project = silent(lambda: ProjectFileHandler.load_project(path))()
+    index_holder = []
+    results.add('search_build', size, measure(
+        lambda: index_holder.append(SearchIndex(project)) or index_holder[-1].refresh(), 1))
+    results.add('search_build_lazy', size, measure(
+        lambda: SearchIndex(lazy_project).refresh(), 1))
+    index = index_holder.pop()
+    results.add('search_query', size, measure(
+        lambda: [index.search(query) for query in SEARCH_QUERIES], repeat),
+        ops=len(SEARCH_QUERIES))
+
+    # Graf analizi: toplu kurulum, sonra tek bağlantı ekleme/silme sonrası güncelleme
+    analysis_holder = []
+    results.add('analysis_build', size, measure(
+        lambda: analysis_holder.append(GraphAnalysis(project)) or analysis_holder[-1].refresh(), 1))
+    analysis = analysis_holder.pop()
+    element_ids = list(root.elements)
+
+    def connect_random():
+        connection = Connection(rng.choice(element_ids), rng.choice(element_ids))
+        root.add_connection(connection)
+        return connection
+
+    def update_and_disconnect(connection):
+        analysis.update()
+        root.remove_connection(connection.id)
+        analysis.update()
+
+    results.add('analysis_update', size, measure(
+        update_and_disconnect, repeat * 20, setup=connect_random), ops=2)
+
+    # Yol istatistikleri: ilk elementten tüm sonlara (her ölçümde önbelleksiz)
+    project.set_starting_element(element_ids[0])
+    statistics = PathStatistics(analysis)
+
+    def path_summary():
+        statistics.invalidate()
+        statistics.summary()
+
+    results.add('path_statistics', size, measure(path_summary, repeat))
+
+    # Çalışma zamanı paketi: yüklü ve tembel projeden
+    bundle_path = os.path.join(workdir, f'bench_{size}.ntb')
+    results.add('runtime_export', size, measure(
+        lambda: RuntimeExporter(project).export(bundle_path), repeat))
+    results.add('runtime_export_lazy', size, measure(
+        lambda: RuntimeExporter(lazy_project).export(bundle_path), 1))
+
+    # Oynanış: çalışma zamanı grafiği kurulumu ve süreç havuzsuz rastgele oynanışlar
+    results.add('runtime_graph', size, measure(lambda: RuntimeGraph.from_project(project), repeat))
+    simulator = Simulator.from_project(project, max_steps=1_000)
+    results.add('simulate', size, measure(
+        lambda: simulator.run(SIMULATION_RUNS, seed=0, workers=1), repeat), ops=SIMULATION_RUNS)
+
+    # Koşul/etki derleme: bağlantı başına farklı metin, ayrıştırma önbelleği boşken
+    conditions = [f'gold >= {i} and (hp < {i % 97} or not met)' for i in range(len(element_ids))]
+    effects = [f'gold -= {i % 13}; met = true' for i in range(len(element_ids))]
+    slots = {'gold': 0, 'hp': 1, 'met': 2}
+
+    def compile_expressions():
+        parse_condition.cache_clear()
+        parse_effects.cache_clear()
+        compiler = ExpressionCompiler(slots)
+        for condition, effect in zip(conditions, effects):
+            compiler.condition(condition)
+            compiler.effects(effect)
+
+    results.add('expression_compile', size, measure(compile_expressions, repeat),
+                ops=len(conditions) * 2)
+
+    # Element silme (bağlantılarıyla); ölçümden sonra geri eklenir
+    count = max(1, min(1_000, len(root.elements) // 10))
+    victims = rng.sample(list(root.elements), count)
+    removed = []
+
+    def remove_all():
+        for element_id in victims:
+            element = root.elements[element_id]
+            removed.append((element, root.remove_element(element_id)))
+
+    timings = []
+    for _ in range(repeat):
+        timings.extend(measure(remove_all, 1))
+        for element, connections in reversed(removed):
+            root.add_element(element)
+            for connection in connections:
+                root.add_connection(connection)
+        removed.clear()
+    results.add('board_remove_element', size, timings, ops=count)
+
+    # Board değiştirme: ilk geçiş sahneyi kurar, sonrakiler önbellekten gelir
+    from gui.board_view import BoardView
+
+    view = BoardView(None)
+    view.resize(1280, 800)
+    first, second = boards[0], boards[1]
+    results.add('board_switch_cold', size, measure(lambda: view.show_board(second), 1))
+    pair = iter([first, second] * repeat * 10)
+    results.add('board_switch_warm', size,
+                measure(lambda: [view.show_board(next(pair)) for _ in range(10)], repeat), ops=10)
+
+    # Komut yığını: taşıma komutlarını uygula, hepsini geri al, yeniden uygula
+    view.show_board(root)
+    scene = view.scene
+    element_pool = list(root.elements.values())
+    commands = []
+    for index in range(COMMAND_OPS):
+        element = element_pool[index % len(element_pool)]
+        old = QPointF(element.position['x'], element.position['y'])
+        commands.append(MoveElementCommand(scene, element, old, old + QPointF(5, 5)))
+
+    stack = CommandStack()
+    results.add('command_execute', size, measure(
+        silent(lambda: [stack.execute(c) for c in commands]), 1), ops=COMMAND_OPS)
+    results.add('command_undo', size, measure(
+        silent(lambda: [stack.undo() for _ in commands]), 1), ops=COMMAND_OPS)
+    results.add('command_redo', size, measure(
+        silent(lambda: [stack.redo() for _ in commands]), 1), ops=COMMAND_OPS)
+
+    view.scene_cache.discard(first.id)
+    view.scene_cache.discard(second.id)
+    view.deleteLater()
+    QApplication.processEvents()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Model katmanı ölçümleri')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help=f'Element sayıları (önerilen: {" ".join(map(str, ALL_SIZES))})')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='bench_model.json', help='Sonuç JSON dosyası')
+    parser.add_argument('--compare', help='Karşılaştırılacak taban çizgisi JSON dosyası')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Gerileme eşiği (0.2 = %%20 daha yavaş)')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = ResultSet('model')
+    with tempfile.TemporaryDirectory() as workdir:
+        for size in args.sizes:
+            bench_size(results, ProjectShape.for_size(size, args.seed), workdir)
+
+    results.save(args.output)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.compare:
+        regressions = compare(results.to_dict(), load_results(args.compare), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} gerileme bulundu")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,220 @@
+"""Çizim ölçümleri: BoardView karelerini QImage'a çizer
+
+Her senaryo (zoom, kaydırma, sürükleme) adım adım uygulanır; her adımda
+etkileşimin kendisi ve bir karenin çizimi birlikte ölçülür.
+
+Kullanım:
+    python -m benchmarks.rendering
+    python -m benchmarks.rendering --sizes 1000 --output render.json --compare taban.json
+"""
+import argparse
+import contextlib
+import io
+import sys
+import time
+
+import benchmarks  # noqa: F401  (yol ve Qt platformu ayarı)
+from benchmarks.generator import ProjectShape, generate_project
+from benchmarks.results import ResultSet, compare, load_results, percentile
+
+from PyQt6.QtCore import QPointF
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QApplication
+
+from gui.board_view import BoardView, ElementGraphicsItem, ConnectionGraphicsItem
+
+DEFAULT_SIZES = (1_000, 10_000)
+VIEW_SIZE = (1280, 800)
+ZOOM_LEVELS = (1.0, 0.75, 0.5, 0.35, 0.25, 0.35, 0.5, 1.0, 1.5, 2.0, 3.0, 4.0, 2.0, 1.0)
+PAN_STEPS = 60  # Kaydırma senaryosundaki kare sayısı
+PAN_STEP_PX = 40  # Kare başına kaydırma (piksel)
+DRAG_STEPS = 60  # Sürükleme senaryosundaki kare sayısı
+DRAG_STEP = QPointF(6, 4)  # Kare başına sürükleme (scene birimi)
+
+
+class PaintCounter:
+    """Item paint çağrılarını sayan geçici sarmalayıcı"""
+
+    CLASSES = (ElementGraphicsItem, ConnectionGraphicsItem)
+
+    def __init__(self):
+        self.count = 0
+        self._originals = {}
+
+    def __enter__(self):
+        for cls in self.CLASSES:
+            original = cls.paint
+            self._originals[cls] = original
+
+            def paint(item, painter, option, widget=None, _original=original):
+                self.count += 1
+                _original(item, painter, option, widget)
+            cls.paint = paint
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self._originals.items():
+            cls.paint = original
+        self._originals.clear()
+
+
+class FrameRecorder:
+    """Senaryo karelerini QImage'a çizer ve kare başına ölçümleri toplar"""
+
+    def __init__(self, view):
+        self.view = view
+        viewport = view.viewport().size()
+        self.image = QImage(viewport, QImage.Format.Format_ARGB32_Premultiplied)
+        self.times = []
+        self.painted = []
+        self.geometry = []
+        self.layouts = []
+
+    def frame(self, step):
+        """step() ile sahneyi değiştir, ardından bir kare çiz"""
+        geometry = ConnectionGraphicsItem.geometry_updates
+        layouts = ElementGraphicsItem.layout_updates
+        with PaintCounter() as counter:
+            start = time.perf_counter()
+            step()
+            self.image.fill(0)
+            painter = QPainter(self.image)
+            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+            self.view.render(painter)
+            painter.end()
+            self.times.append(time.perf_counter() - start)
+        self.painted.append(counter.count)
+        self.geometry.append(ConnectionGraphicsItem.geometry_updates - geometry)
+        self.layouts.append(ElementGraphicsItem.layout_updates - layouts)
+
+    def summary(self):
+        frames = len(self.times)
+        return {
+            'frames': frames,
+            'p50': percentile(self.times, 50),
+            'p90': percentile(self.times, 90),
+            'p99': percentile(self.times, 99),
+            'max': max(self.times),
+            'items_painted': sum(self.painted) / frames,
+            'geometry_updates': sum(self.geometry),
+            'layout_updates': sum(self.layouts),
+        }
+
+
+def silent(fn):
+    """Uygulamanın konsol çıktılarını bastıran sarmalayıcı"""
+    def wrapper(*args):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return fn(*args)
+    return wrapper
+
+
+def _densest_board(project):
+    return max(project.boards.values(), key=lambda board: len(board.elements))
+
+
+def make_view(board):
+    view = BoardView(None)
+    view.resize(*VIEW_SIZE)
+    view.show()
+    view.show_board(board)
+    silent(view.set_zoom)(1.0)
+    view.fit_to_view()
+    return view
+
+
+def scenario_zoom(view):
+    recorder = FrameRecorder(view)
+    set_zoom = silent(view.set_zoom)
+    for factor in ZOOM_LEVELS:
+        recorder.frame(lambda: set_zoom(factor))
+    return recorder
+
+
+def scenario_pan(view):
+    recorder = FrameRecorder(view)
+    silent(view.set_zoom)(1.0)
+    bar = view.horizontalScrollBar()
+    vbar = view.verticalScrollBar()
+    for index in range(PAN_STEPS):
+        # Önce sağa, sonra aşağı kaydır
+        if index < PAN_STEPS // 2:
+            recorder.frame(lambda: bar.setValue(bar.value() + PAN_STEP_PX))
+        else:
+            recorder.frame(lambda: vbar.setValue(vbar.value() + PAN_STEP_PX))
+    return recorder
+
+
+def scenario_drag(view):
+    """En çok bağlantısı olan görünür elementi adım adım sürükle"""
+    recorder = FrameRecorder(view)
+    silent(view.set_zoom)(1.0)
+    scene = view.scene
+    board = scene.board
+    item = max(scene.element_items.values(),
+               key=lambda it: len(board.get_element_connections(it.element.id)))
+    view.centerOn(item)
+    view.refresh_visible_items()
+    for _ in range(DRAG_STEPS):
+        recorder.frame(lambda: item.setPos(item.pos() + DRAG_STEP))
+    return recorder
+
+
+SCENARIOS = (
+    ('render_zoom', scenario_zoom),
+    ('render_pan', scenario_pan),
+    ('render_drag', scenario_drag),
+)
+
+
+def bench_size(results, shape):
+    size = shape.elements
+    project = generate_project(shape)
+    board = _densest_board(project)
+    for name, scenario in SCENARIOS:
+        view = make_view(board)
+        # İlk kare sahneyi ve metin önbelleklerini ısıtır, ölçüme dahil değil
+        FrameRecorder(view).frame(lambda: None)
+        summary = scenario(view).summary()
+        results.add(name, size, [summary['p50']], board_elements=len(board.elements), **summary)
+        print(f"{'':<32} {'':>9}  p90 {summary['p90'] * 1000:.3f} ms"
+              f"  p99 {summary['p99'] * 1000:.3f} ms"
+              f"  painted/frame {summary['items_painted']:.1f}"
+              f"  geometry {summary['geometry_updates']}"
+              f"  layouts {summary['layout_updates']}")
+        view.deleteLater()
+        QApplication.processEvents()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Board çizim ölçümleri')
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES),
+                        help='Projedeki toplam element sayıları')
+    parser.add_argument('--seed', type=int, default=1234)
+    parser.add_argument('--output', default='bench_rendering.json', help='Sonuç JSON dosyası')
+    parser.add_argument('--compare', help='Karşılaştırılacak taban çizgisi JSON dosyası')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='Gerileme eşiği (0.2 = %%20 daha yavaş)')
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    results = ResultSet('rendering')
+    for size in args.sizes:
+        shape = ProjectShape.for_size(size, args.seed)
+        # Tek yoğun board: sahnede gerçekçi sayıda item olsun
+        shape.boards = 1
+        bench_size(results, shape)
+
+    results.save(args.output)
+    print(f"Sonuçlar yazıldı: {args.output}")
+
+    if args.compare:
+        regressions = compare(results.to_dict(), load_results(args.compare), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} gerileme bulundu")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
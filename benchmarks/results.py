@@ -0,0 +1,102 @@
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+
+NOISE_FLOOR = 0.001  # Bundan küçük mutlak farklar gerileme sayılmaz (saniye)
+
+
+def measure(fn, repeat=3, setup=None):
+    """fn'i repeat kez çalıştır, süreleri (saniye) döndür
+
+    setup verilirse her çalıştırmadan önce çağrılır ve süreye dahil edilmez;
+    dönüş değeri fn'e argüman olarak geçilir.
+    """
+    timings = []
+    for _ in range(repeat):
+        arg = setup() if setup is not None else None
+        start = time.perf_counter()
+        fn(arg) if setup is not None else fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def percentile(values, q):
+    """Sıralı olmayan değerlerin q yüzdelik dilimi (doğrusal ara değer)"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    pos = (len(ordered) - 1) * q / 100
+    low = int(pos)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (pos - low)
+
+
+class ResultSet:
+    """Ölçüm sonuçları; JSON'a yazılır ve taban çizgisiyle karşılaştırılır"""
+
+    def __init__(self, suite):
+        self.suite = suite
+        self.results = []
+
+    def add(self, name, size, timings, ops=1, **extra):
+        """Bir ölçümü ekle; ops birden fazla işlemin toplu süresini böler"""
+        per_op = [t / ops for t in timings]
+        result = {
+            'name': name,
+            'size': size,
+            'repeat': len(timings),
+            'ops': ops,
+            'min': min(per_op),
+            'median': statistics.median(per_op),
+        }
+        result.update(extra)
+        self.results.append(result)
+        print(f"{name:<32} {size:>9}  median {result['median'] * 1000:10.3f} ms"
+              f"  min {result['min'] * 1000:10.3f} ms")
+        return result
+
+    def to_dict(self):
+        from PyQt6.QtCore import QT_VERSION_STR
+
+        return {
+            'suite': self.suite,
+            'created_at': datetime.now().isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'qt': QT_VERSION_STR,
+            'results': self.results,
+        }
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def compare(current, baseline, threshold=0.2):
+    """Sonuçları taban çizgisiyle karşılaştır; gerilemelerin listesini döndür
+
+    Medyan süre tabandakinin (1 + threshold) katını ve gürültü sınırını
+    aşarsa gerileme sayılır.
+    """
+    base = {(r['name'], r['size']): r for r in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        old = base.get((result['name'], result['size']))
+        if old is None:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else float('inf')
+        regressed = (ratio > 1 + threshold
+                     and result['median'] - old['median'] > NOISE_FLOOR)
+        flag = 'GERİLEME' if regressed else ('iyileşme' if ratio < 1 - threshold else '')
+        print(f"{result['name']:<32} {result['size']:>9}  {old['median'] * 1000:10.3f} ms"
+              f" -> {result['median'] * 1000:10.3f} ms  x{ratio:5.2f}  {flag}")
+        if regressed:
+            regressions.append((result, old, ratio))
+    return regressions
+
+
+def load_results(path):
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
@@ -0,0 +1,622 @@
+"""Anlatı grafiği analizi: erişilebilirlik, çıkmazlar, döngüler ve yetimler"""
+from bisect import bisect_left
+from typing import Callable, Dict, Hashable, Iterable, List, Optional, Set
+
+
+def strongly_connected_components(nodes: Iterable[Hashable],
+                                  successors: Callable[[Hashable], Iterable[Hashable]]
+                                  ) -> List[List[Hashable]]:
+    """Tarjan algoritması (özyinelemesiz); bileşenler ters topolojik sırada döner
+
+    Uzun zincirlerde Python'un özyineleme sınırına takılmamak için yığın
+    elle tutulur. İlk bileşen hiçbir başka bileşene çıkmayan (batan) bileşendir.
+    """
+    index: Dict[Hashable, int] = {}
+    low: Dict[Hashable, int] = {}
+    on_stack: Set[Hashable] = set()
+    stack: List[Hashable] = []
+    result: List[List[Hashable]] = []
+    counter = 0
+    for root in nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(successors(root)))]
+        while work:
+            node, pending = work[-1]
+            for child in pending:
+                if child not in index:
+                    index[child] = low[child] = counter
+                    counter += 1
+                    stack.append(child)
+                    on_stack.add(child)
+                    work.append((child, iter(successors(child))))
+                    break
+                if child in on_stack and index[child] < low[node]:
+                    low[node] = index[child]
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    if low[node] < low[parent]:
+                        low[parent] = low[node]
+                if low[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    result.append(component)
+    return result
+
+
+class GraphAnalysis:
+    """Projedeki bağlantı grafiğinin artımlı analizi
+
+    Düğümler tüm board'lardaki elementler, kenarlar bağlantılardır. Sonuçlar
+    her değişiklikte baştan hesaplanmaz:
+
+    - Erişilebilirlik başlangıç elementinden bir kapsayan ağaçla tutulur.
+      Kenar eklenince sadece yeni erişilen düğümler dolaşılır; ağaçtaki bir
+      kenar silinince sadece o alt ağaç koparılıp yeniden bağlanmaya çalışılır.
+    - Güçlü bağlı bileşenler (döngüler) yoğunlaştırılmış grafiğin topolojik
+      sırasıyla tutulur (Pearce-Kelly). Sırayı bozan bir kenar eklenince
+      sadece iki uç arasındaki bölge yeniden sıralanır, döngü oluştuysa o
+      bölgedeki bileşenler birleştirilir. Bileşen içinden kenar silinince
+      sadece o bileşen yeniden ayrıştırılır.
+    - Çıkmazlar (çıkan kenarı olmayan) ve yetimler (hiç kenarı olmayan)
+      derece değişimlerinde güncellenir.
+
+    Değişiklikler Board'un 'analysis' kanalından okunur; tembel board'lar
+    yüklenmeden kaynaklarından okunur. Hiçbir board'da olmayan bir elemente
+    giden bağlantı (ör. silinmiş board'a) o elementi örtük düğüm olarak
+    tutar; örtük düğüm son bağlantısı silinince kalkar. Böylece artımlı
+    sonuç her zaman baştan okumayla aynıdır.
+    """
+
+    CHANNEL = 'analysis'
+
+    def __init__(self, project):
+        self.project = project
+        self._boards: Set[str] = set()  # Okunmuş board ID'leri
+        self._node_board: Dict[str, str] = {}  # element_id -> board_id
+        self._edges: Dict[str, tuple] = {}  # connection_id -> (kaynak, hedef)
+        self._edge_board: Dict[str, Optional[str]] = {}  # connection_id -> bağlantının board'u
+        self._implicit: Set[str] = set()  # Sadece bağlantılarda geçen (element olmayan) düğümler
+        # Aynı iki element arasında birden çok bağlantı olabilir: sayılarıyla
+        self._succ: Dict[str, Dict[str, int]] = {}
+        self._pred: Dict[str, Dict[str, int]] = {}
+        self._dead_ends: Set[str] = set()
+        self._orphans: Set[str] = set()
+        # Erişilebilirlik: erişilen düğüm -> kapsayan ağaçtaki ebeveyni
+        self._start: Optional[str] = None
+        self._parent: Dict[str, Optional[str]] = {}
+        self._children: Dict[str, Set[str]] = {}
+        # Bileşenler ve yoğunlaştırılmış grafiğin topolojik sırası
+        self._comp: Dict[str, int] = {}
+        self._members: Dict[int, Set[str]] = {}
+        self._ord: Dict[int, int] = {}
+        self._csucc: Dict[int, Dict[int, int]] = {}
+        self._cpred: Dict[int, Dict[int, int]] = {}
+        self._next_comp = 0
+        self._next_ord = 0
+        self.version = 0  # Graf her değiştiğinde artar (önbellekler için)
+
+    # --- Sonuçlar ---
+
+    def __len__(self) -> int:
+        return len(self._succ)
+
+    def __contains__(self, element_id: str) -> bool:
+        return element_id in self._succ
+
+    @property
+    def start(self) -> Optional[str]:
+        return self._start
+
+    def board_of(self, element_id: str) -> Optional[str]:
+        """Elementin bulunduğu board'un ID'si"""
+        return self._node_board.get(element_id)
+
+    def successors(self, element_id: str) -> Iterable[str]:
+        return self._succ.get(element_id, {}).keys()
+
+    def predecessors(self, element_id: str) -> Iterable[str]:
+        return self._pred.get(element_id, {}).keys()
+
+    def is_reachable(self, element_id: str) -> bool:
+        return element_id in self._parent
+
+    def reachable(self) -> Set[str]:
+        """Başlangıçtan erişilen elementler"""
+        return set(self._parent)
+
+    def unreachable(self) -> List[str]:
+        """Başlangıçtan erişilemeyen elementler (başlangıç yoksa boş)"""
+        if self._start is None:
+            return []
+        return [node for node in self._succ if node not in self._parent]
+
+    def dead_ends(self, reachable_only: bool = False) -> List[str]:
+        """Çıkan bağlantısı olmayan elementler (sonlar ya da yarım kalmış dallar)"""
+        if reachable_only:
+            return [node for node in self._dead_ends if node in self._parent]
+        return list(self._dead_ends)
+
+    def orphans(self) -> List[str]:
+        """Hiç bağlantısı olmayan elementler"""
+        return list(self._orphans)
+
+    def loops(self) -> List[Set[str]]:
+        """Döngüler: birden çok elementli bileşenler ve kendine bağlı elementler"""
+        loops = []
+        for members in self._members.values():
+            if len(members) > 1:
+                loops.append(set(members))
+            else:
+                node = next(iter(members))
+                if node in self._succ[node]:
+                    loops.append({node})
+        return loops
+
+    def component_of(self, element_id: str) -> Optional[int]:
+        """Elementin güçlü bağlı bileşeninin numarası"""
+        return self._comp.get(element_id)
+
+    def components(self) -> List[Set[str]]:
+        """Bileşenler topolojik sırada (kenarlar hep sonraki bileşenlere gider)"""
+        return [self._members[comp] for comp in sorted(self._ord, key=self._ord.get)]
+
+    def component_members(self, comp: int) -> Set[str]:
+        return self._members.get(comp, set())
+
+    def component_successors(self, comp: int) -> Iterable[int]:
+        return self._csucc.get(comp, {}).keys()
+
+    def component_predecessors(self, comp: int) -> Iterable[int]:
+        return self._cpred.get(comp, {}).keys()
+
+    def summary(self) -> Dict[str, int]:
+        """Arayüz için sayılar"""
+        return {
+            'elements': len(self._succ),
+            'connections': len(self._edges),
+            'reachable': len(self._parent),
+            'unreachable': len(self._succ) - len(self._parent) if self._start is not None else 0,
+            'dead_ends': len(self._dead_ends),
+            'orphans': len(self._orphans),
+            'loops': len(self.loops()),
+        }
+
+    # --- Projeyle eşitleme ---
+
+    def refresh(self) -> None:
+        """Yeni board'ları oku, silinenleri çıkar, değişiklikleri ve başlangıcı uygula"""
+        boards = self.project.boards
+        for board_id in [bid for bid in self._boards if bid not in boards]:
+            self._remove_board(board_id)
+        new_boards = [board for board in boards.values() if board.id not in self._boards]
+        if new_boards:
+            for board in new_boards:
+                self._read_board(board)
+            # İlk okuma toplu yapılır: bileşenler ve erişilebilirlik bir kez kurulur
+            self._rebuild()
+        self.update()
+
+    def update(self) -> None:
+        """Okunmuş board'lardaki değişiklikleri uygula (komutlardan sonra)"""
+        boards = self.project.boards
+        for board_id in self._boards:
+            board = boards.get(board_id)
+            if board is not None:
+                self._apply_changes(board)
+        start = self.project.starting_element
+        if start != self._start:
+            self.set_start(start)
+
+    def _read_board(self, board) -> None:
+        board.change_set(self.CHANNEL).clear()
+        source = board.lazy_source
+        if source is not None and hasattr(source, 'iter_graph'):
+            records = source.iter_graph()
+        else:
+            records = [('element', element_id, None, None) for element_id in board.elements]
+            records.extend(('connection', connection.id, connection.source_id,
+                            connection.target_id)
+                           for connection in board.connections.values())
+        for kind, record_id, source_id, target_id in records:
+            if kind == 'element':
+                self._add_raw_node(record_id, board.id)
+            else:
+                self._add_raw_edge(record_id, source_id, target_id, board.id)
+        self._boards.add(board.id)
+
+    def _remove_board(self, board_id: str) -> None:
+        for connection_id in [cid for cid, owner in self._edge_board.items() if owner == board_id]:
+            self.remove_edge(connection_id)
+        for node in [n for n, bid in self._node_board.items() if bid == board_id]:
+            self._remove_element(node)
+        self._boards.discard(board_id)
+
+    def _apply_changes(self, board) -> None:
+        if board.lazy_source is not None:
+            return
+        changes = board.change_set(self.CHANNEL)
+        if not changes:
+            return
+        # Sıra önemli: önce kenarlar kopar, sonra düğümler gider/gelir, en son kenarlar eklenir
+        for connection_id in changes.removed_connections:
+            self.remove_edge(connection_id)
+        for element_id in changes.removed_elements:
+            self._remove_element(element_id)
+        for element_id in changes.elements:
+            if element_id not in self._succ or element_id in self._implicit:
+                self.add_node(element_id, board.id)
+        connections = board.connections
+        for connection_id in changes.connections:
+            connection = connections.get(connection_id)
+            if connection is None:
+                continue
+            endpoints = (connection.source_id, connection.target_id)
+            if self._edges.get(connection_id) == endpoints:
+                continue
+            self.remove_edge(connection_id)
+            self.add_edge(connection_id, *endpoints, board_id=board.id)
+        changes.clear()
+
+    # --- Düğümler ---
+
+    def _add_raw_node(self, node: str, board_id: Optional[str]) -> bool:
+        if node in self._succ:
+            if board_id is not None:
+                self._node_board[node] = board_id
+                self._implicit.discard(node)
+            return False
+        self._succ[node] = {}
+        self._pred[node] = {}
+        self._node_board[node] = board_id
+        self._dead_ends.add(node)
+        self._orphans.add(node)
+        return True
+
+    def add_node(self, node: str, board_id: Optional[str] = None) -> None:
+        """Elementi (bağlantısız olarak) ekle"""
+        self._implicit.discard(node)
+        if not self._add_raw_node(node, board_id):
+            return
+        self.version += 1
+        comp = self._new_comp({node})
+        self._ord[comp] = self._next_ord
+        self._next_ord += 1
+        if node == self._start:
+            self._parent[node] = None
+            self._children[node] = set()
+
+    def _remove_element(self, node: str) -> None:
+        """Element silindi; başka board'ların bağlantıları hâlâ gösteriyorsa örtük düğüm kalır"""
+        if node not in self._succ:
+            return
+        if not self._succ[node] and not self._pred[node]:
+            self.remove_node(node)
+            return
+        self.version += 1
+        self._implicit.add(node)
+        self._node_board[node] = next(self._edge_board[cid] for cid, (u, v) in self._edges.items()
+                                      if node in (u, v))
+
+    def remove_node(self, node: str) -> None:
+        """Düğümü çıkar; kalan kenarları (ör. board'lar arası) da silinir"""
+        if node not in self._succ:
+            return
+        if self._succ[node] or self._pred[node]:
+            for connection_id in [cid for cid, (u, v) in self._edges.items() if node in (u, v)]:
+                self.remove_edge(connection_id)
+            if node not in self._succ:
+                return  # Örtük düğümdü; son kenarıyla birlikte kalktı
+        self.version += 1
+        self._implicit.discard(node)
+        del self._succ[node]
+        del self._pred[node]
+        self._node_board.pop(node, None)
+        self._dead_ends.discard(node)
+        self._orphans.discard(node)
+        if node in self._parent:
+            parent = self._parent.pop(node)
+            if parent is not None:
+                self._children[parent].discard(node)
+            self._children.pop(node, None)
+        comp = self._comp.pop(node)
+        self._members.pop(comp)
+        del self._ord[comp]
+        self._csucc.pop(comp, None)
+        self._cpred.pop(comp, None)
+
+    # --- Kenarlar ---
+
+    def _add_raw_edge(self, connection_id: str, u: str, v: str,
+                      board_id: Optional[str]) -> bool:
+        """Komşuluğa ekle; iki element arasında ilk kenarsa True"""
+        for node in (u, v):
+            if self._add_raw_node(node, None):
+                self._implicit.add(node)
+        if self._node_board.get(u) is None:
+            self._node_board[u] = board_id
+        if self._node_board.get(v) is None:
+            self._node_board[v] = board_id
+        self._edges[connection_id] = (u, v)
+        self._edge_board[connection_id] = board_id
+        count = self._succ[u].get(v, 0)
+        self._succ[u][v] = count + 1
+        self._pred[v][u] = count + 1
+        self._dead_ends.discard(u)
+        self._orphans.discard(u)
+        self._orphans.discard(v)
+        return count == 0
+
+    def add_edge(self, connection_id: str, u: str, v: str,
+                 board_id: Optional[str] = None) -> None:
+        """Bağlantıyı ekle ve sonuçları güncelle"""
+        if connection_id in self._edges:
+            self.remove_edge(connection_id)
+        for node in (u, v):
+            if node not in self._succ:
+                # Henüz okunmamış ya da hiç olmayan element: kenar durdukça örtük düğüm
+                self.add_node(node)
+                self._implicit.add(node)
+        self.version += 1
+        if not self._add_raw_edge(connection_id, u, v, board_id):
+            return  # Aynı iki element zaten bağlıydı
+        # Erişilebilirlik: sadece yeni erişilen bölge dolaşılır
+        if u in self._parent and v not in self._parent:
+            self._attach(v, u)
+            self._grow([v])
+        # Bileşenler
+        cu, cv = self._comp[u], self._comp[v]
+        if cu != cv:
+            count = self._csucc[cu].get(cv, 0)
+            self._csucc[cu][cv] = count + 1
+            self._cpred[cv][cu] = count + 1
+            if count == 0 and self._ord[cu] > self._ord[cv]:
+                self._restore_order(cu, cv)
+
+    def remove_edge(self, connection_id: str) -> None:
+        """Bağlantıyı çıkar ve sonuçları güncelle"""
+        endpoints = self._edges.pop(connection_id, None)
+        if endpoints is None:
+            return
+        del self._edge_board[connection_id]
+        self.version += 1
+        u, v = endpoints
+        count = self._succ[u][v] - 1
+        if count:
+            self._succ[u][v] = count
+            self._pred[v][u] = count
+            return
+        del self._succ[u][v]
+        del self._pred[v][u]
+        if not self._succ[u]:
+            self._dead_ends.add(u)
+        for node in (u, v):
+            if not self._succ[node] and not self._pred[node]:
+                self._orphans.add(node)
+        # Erişilebilirlik: kenar ağaçtaysa alt ağaç koparılıp yeniden bağlanır
+        if u != v and v in self._parent and self._parent[v] == u:
+            self._reattach_subtree(v)
+        # Bileşenler
+        cu, cv = self._comp[u], self._comp[v]
+        if cu != cv:
+            count = self._csucc[cu][cv] - 1
+            if count:
+                self._csucc[cu][cv] = count
+                self._cpred[cv][cu] = count
+            else:
+                del self._csucc[cu][cv]
+                del self._cpred[cv][cu]
+        elif u != v:
+            self._split(cu)
+        for node in (u, v):
+            if node in self._implicit and not self._succ[node] and not self._pred[node]:
+                self.remove_node(node)
+
+    # --- Erişilebilirlik ---
+
+    def set_start(self, start: Optional[str]) -> None:
+        """Başlangıç elementini değiştir; erişilebilirlik yeniden kurulur"""
+        self._start = start
+        self.version += 1
+        self._reset_reachability()
+
+    def _reset_reachability(self) -> None:
+        self._parent = {}
+        self._children = {}
+        start = self._start
+        if start is not None and start in self._succ:
+            self._parent[start] = None
+            self._children[start] = set()
+            self._grow([start])
+
+    def _attach(self, node: str, parent: str) -> None:
+        self._parent[node] = parent
+        self._children.setdefault(parent, set()).add(node)
+        self._children.setdefault(node, set())
+
+    def _grow(self, frontier: List[str]) -> None:
+        """frontier'dan erişilemeyen düğümlere doğru genişle"""
+        parent = self._parent
+        succ = self._succ
+        while frontier:
+            node = frontier.pop()
+            for child in succ[node]:
+                if child not in parent:
+                    self._attach(child, node)
+                    frontier.append(child)
+
+    def _reattach_subtree(self, root: str) -> None:
+        # Alt ağacı kopar; dışarıdan hâlâ erişilen bir öncülü olanları yeniden bağla
+        subtree = [root]
+        children = self._children
+        for node in subtree:
+            subtree.extend(children.get(node, ()))
+        parent = self._parent
+        old_parent = parent[root]
+        if old_parent is not None:
+            children[old_parent].discard(root)
+        for node in subtree:
+            del parent[node]
+            children.pop(node, None)
+        frontier = []
+        for node in subtree:
+            if node in parent:
+                continue
+            for pred in self._pred[node]:
+                if pred in parent:
+                    self._attach(node, pred)
+                    frontier.append(node)
+                    break
+        self._grow(frontier)
+
+    # --- Bileşenler ---
+
+    def _new_comp(self, members: Set[str]) -> int:
+        comp = self._next_comp
+        self._next_comp += 1
+        self._members[comp] = members
+        self._csucc[comp] = {}
+        self._cpred[comp] = {}
+        for node in members:
+            self._comp[node] = comp
+        return comp
+
+    def _rebuild(self) -> None:
+        """Bileşenleri, sırayı ve erişilebilirliği baştan kur (toplu ilk okuma için)"""
+        self._comp = {}
+        self._members = {}
+        self._ord = {}
+        self._csucc = {}
+        self._cpred = {}
+        succ = self._succ
+        sccs = strongly_connected_components(succ, succ.__getitem__)
+        for position, members in enumerate(reversed(sccs)):
+            comp = self._new_comp(set(members))
+            self._ord[comp] = position
+        self._next_ord = len(sccs)
+        comp_of = self._comp
+        for node, targets in succ.items():
+            cu = comp_of[node]
+            for target in targets:
+                cv = comp_of[target]
+                if cu != cv:
+                    self._csucc[cu][cv] = self._csucc[cu].get(cv, 0) + 1
+                    self._cpred[cv][cu] = self._cpred[cv].get(cu, 0) + 1
+        self.version += 1
+        self._reset_reachability()
+
+    def _restore_order(self, cu: int, cv: int) -> None:
+        """cu -> cv kenarı topolojik sırayı bozdu: aradaki bölgeyi yeniden sırala
+
+        cv'den ileri (sırası cu'yu geçmeyen) ve cu'dan geri (sırası cv'nin
+        altına inmeyen) aranır. İleri arama cu'ya ulaştıysa iki kümenin
+        kesişimi yeni bir döngüdür ve tek bileşende birleşir.
+        """
+        order = self._ord
+        lower, upper = order[cv], order[cu]
+        forward = {cv}
+        stack = [cv]
+        while stack:
+            comp = stack.pop()
+            for nxt in self._csucc[comp]:
+                if nxt not in forward and order[nxt] <= upper:
+                    forward.add(nxt)
+                    stack.append(nxt)
+        backward = {cu}
+        stack = [cu]
+        while stack:
+            comp = stack.pop()
+            for prev in self._cpred[comp]:
+                if prev not in backward and order[prev] >= lower:
+                    backward.add(prev)
+                    stack.append(prev)
+        positions = sorted(order[comp] for comp in forward | backward)
+        cycle = forward & backward if cu in forward else set()
+        before = sorted(backward - cycle, key=order.get)
+        after = sorted(forward - cycle, key=order.get)
+        # Geridekiler en küçük, ilerdekiler en büyük sıraları alır; birleşen
+        # bileşenin dış komşuları bölgenin dışında olduğundan arada kalan
+        # herhangi bir sıra ona uyar
+        for comp, position in zip(before, positions):
+            order[comp] = position
+        if after:
+            for comp, position in zip(after, positions[-len(after):]):
+                order[comp] = position
+        if cycle:
+            merged = self._merge(cycle)
+            order[merged] = positions[len(before)]
+
+    def _merge(self, comps: Set[int]) -> int:
+        """Bileşenleri en büyüğünde birleştir; aralarındaki kenarlar iç kenar olur"""
+        target = max(comps, key=lambda comp: len(self._members[comp]))
+        members = self._members[target]
+        csucc, cpred = self._csucc, self._cpred
+        for comp in comps:
+            if comp == target:
+                continue
+            for node in self._members.pop(comp):
+                self._comp[node] = target
+                members.add(node)
+            del self._ord[comp]
+            for nxt, count in csucc.pop(comp).items():
+                del cpred[nxt][comp]
+                if nxt not in comps:
+                    csucc[target][nxt] = csucc[target].get(nxt, 0) + count
+                    cpred[nxt][target] = cpred[nxt].get(target, 0) + count
+            for prev, count in cpred.pop(comp).items():
+                del csucc[prev][comp]
+                if prev not in comps:
+                    csucc[prev][target] = csucc[prev].get(target, 0) + count
+                    cpred[target][prev] = cpred[target].get(prev, 0) + count
+        for comp in comps:
+            csucc[target].pop(comp, None)
+            cpred[target].pop(comp, None)
+        return target
+
+    def _split(self, comp: int) -> None:
+        """Bileşen içinden kenar silindi: sadece bu bileşeni yeniden ayrıştır"""
+        members = self._members[comp]
+        succ = self._succ
+        sccs = strongly_connected_components(
+            members, lambda node: [child for child in succ[node] if child in members])
+        if len(sccs) == 1:
+            return
+        csucc, cpred = self._csucc, self._cpred
+        for nxt in csucc.pop(comp):
+            del cpred[nxt][comp]
+        for prev in cpred.pop(comp):
+            del csucc[prev][comp]
+        del self._members[comp]
+        position = self._ord.pop(comp)
+        # Tarjan ters topolojik sırada verir
+        parts = [self._new_comp(set(scc)) for scc in reversed(sccs)]
+        comp_of = self._comp
+        for node in members:
+            cx = comp_of[node]
+            for child in succ[node]:
+                cy = comp_of[child]
+                if cx != cy:
+                    csucc[cx][cy] = csucc[cx].get(cy, 0) + 1
+                    cpred[cy][cx] = cpred[cy].get(cx, 0) + 1
+            for prev in self._pred[node]:
+                cy = comp_of[prev]
+                if prev not in members:
+                    csucc[cy][cx] = csucc[cy].get(cx, 0) + 1
+                    cpred[cx][cy] = cpred[cx].get(cy, 0) + 1
+        # Parçalar eski bileşenin yerine sırayla girer; sıra numaraları yeniden verilir
+        ordered = sorted(self._ord, key=self._ord.get)
+        at = bisect_left([self._ord[c] for c in ordered], position)
+        ordered[at:at] = parts
+        self._ord = {c: index for index, c in enumerate(ordered)}
+        self._next_ord = len(ordered)
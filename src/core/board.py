@@ -1,69 +1,370 @@
-from sqlite3 import Connection
 from uuid import uuid4
-from typing import List, Dict, Optional
-from datetime import datetime
+from typing import List, Dict, Optional, Set
 
 from src.core.element import Element
+from src.core.connection import Connection
+from src.core.spatial_index import SpatialIndex
+from src.core import geometry_store
+from src.core.fields import Timestamp, now, iso_timestamps
+
+class ChangeSet:
+    """Bir tüketicinin (kayıt, otomatik kayıt) son okumasından beri değişen kayıtlar"""
+
+    __slots__ = ('elements', 'removed_elements', 'connections', 'removed_connections')
+
+    def __init__(self):
+        self.elements: Set[str] = set()
+        self.removed_elements: Set[str] = set()
+        self.connections: Set[str] = set()
+        self.removed_connections: Set[str] = set()
+
+    def __bool__(self) -> bool:
+        return bool(self.elements or self.removed_elements
+                    or self.connections or self.removed_connections)
+
+    def element_changed(self, element_id: str) -> None:
+        self.removed_elements.discard(element_id)
+        self.elements.add(element_id)
+
+    def element_removed(self, element_id: str) -> None:
+        self.elements.discard(element_id)
+        self.removed_elements.add(element_id)
+
+    def connection_changed(self, connection_id: str) -> None:
+        self.removed_connections.discard(connection_id)
+        self.connections.add(connection_id)
+
+    def connection_removed(self, connection_id: str) -> None:
+        self.connections.discard(connection_id)
+        self.removed_connections.add(connection_id)
+
+    def clear(self) -> None:
+        self.elements.clear()
+        self.removed_elements.clear()
+        self.connections.clear()
+        self.removed_connections.clear()
+
 
 class Board:
     """Board sınıfı - projedeki her bir çalışma alanını temsil eder"""
     
+    # Değişiklikleri birbirinden bağımsız izleyen tüketiciler
+    CHANGE_CHANNELS = ('save', 'autosave', 'search', 'analysis')
+    # Toplu kaydırmada bundan fazla element varsa uzamsal indeks yeniden kurulur
+    SPATIAL_REBUILD_ABOVE = 1000
+
+    __slots__ = ('id', 'name', 'root', '_elements', 'branches', '_connections', '_source',
+                 'children', '_outgoing', '_incoming', '_spatial_index', '_geometry',
+                 '_changes', '_created', '_modified')
+
+    created_at = Timestamp('_created')
+    modified_at = Timestamp('_modified')
+
     def __init__(self, name: str, is_root: bool = False):
         self.id: str = str(uuid4())
         self.name: str = name
         self.root: bool = is_root
-        self.elements: Dict[str, 'Element'] = {}  # element_id -> Element
+        self._elements: Dict[str, 'Element'] = {}  # element_id -> Element
         self.branches: Dict[str, 'Branch'] = {}  # branch_id -> Branch
-        self.connections: Dict[str, 'Connection'] = {}  # connection_id -> Connection
+        self._connections: Dict[str, 'Connection'] = {}  # connection_id -> Connection
+        self._source = None  # Tembel yükleme kaynağı (dosyadaki board verisi)
         self.children: List[str] = []  # Alt board ID'leri
-        self.created_at: datetime = datetime.now()
-        self.modified_at: datetime = datetime.now()
+        # Komşuluk indeksi: element_id -> bağlantı ID'leri
+        self._outgoing: Dict[str, Set[str]] = {}
+        self._incoming: Dict[str, Set[str]] = {}
+        self._spatial_index: Optional[SpatialIndex] = None  # İlk ihtiyaçta kurulur
+        self._geometry = None  # Sütunlu geometri deposu (NumPy varsa, ilk ihtiyaçta)
+        # Tüketici başına son okumadan beri değişen/silinen kayıtlar
+        self._changes: Dict[str, ChangeSet] = {channel: ChangeSet()
+                                               for channel in self.CHANGE_CHANNELS}
+        self._created = self._modified = now()
+        
+    @property
+    def elements(self) -> Dict[str, 'Element']:
+        """element_id -> Element (board tembel yüklendiyse ilk erişimde okunur)"""
+        if self._source is not None:
+            self.ensure_loaded()
+        return self._elements
+
+    @property
+    def connections(self) -> Dict[str, 'Connection']:
+        """connection_id -> Connection (board tembel yüklendiyse ilk erişimde okunur)"""
+        if self._source is not None:
+            self.ensure_loaded()
+        return self._connections
+
+    @property
+    def is_loaded(self) -> bool:
+        """Elementler ve bağlantılar bellekte mi?"""
+        return self._source is None
+
+    @property
+    def lazy_source(self):
+        """Henüz okunmamış board verisinin kaynağı (yüklüyse None)"""
+        return self._source
+
+    def set_lazy_source(self, source) -> None:
+        """Board içeriğini ilk erişimde yüklenecek şekilde bir kaynağa bağla
+
+        source.load(board) çağrısı load_records ile board'u doldurmalıdır.
+        """
+        self._elements = {}
+        self._connections = {}
+        self._outgoing = {}
+        self._incoming = {}
+        self._spatial_index = None
+        self._geometry = None
+        for changes in self._changes.values():
+            changes.clear()
+        self._source = source
+
+    def ensure_loaded(self, progress=None, cancel=None) -> None:
+        """Tembel yüklenen board içeriğini şimdi oku
+
+        progress(done, total) ve cancel (threading.Event) kaynağa iletilir;
+        yükleme yarıda kalırsa board tekrar tembel duruma döner.
+        """
+        source, self._source = self._source, None
+        if source is None:
+            return
+        try:
+            if progress is None and cancel is None:
+                source.load(self)
+            else:
+                source.load(self, progress=progress, cancel=cancel)
+        except BaseException:
+            self.set_lazy_source(source)
+            raise
+
+    def load_records(self, elements, connections) -> None:
+        """Yükleme sırasında elementleri ve bağlantıları ekle (modified_at değişmez)"""
+        for element in elements:
+            element._owner = self
+            self._elements[element.id] = element
+        for connection in connections:
+            connection._owner = self
+            self._connections[connection.id] = connection
+            self._outgoing.setdefault(connection.source_id, set()).add(connection.id)
+            self._incoming.setdefault(connection.target_id, set()).add(connection.id)
         
     def add_element(self, element: 'Element') -> None:
         """Board'a yeni bir element ekle"""
         self.elements[element.id] = element
-        self.modified_at = datetime.now()
+        element._owner = self
+        if self._spatial_index is not None:
+            self._spatial_index.insert(element.id, self._element_rect(element))
+        if self._geometry is not None:
+            self._geometry.set(element.id, *element.geometry())
+        for changes in self._changes.values():
+            changes.element_changed(element.id)
+        self._modified = now()
         
-    def remove_element(self, element_id: str) -> None:
-        """Board'dan bir elementi kaldır"""
+    def remove_element(self, element_id: str) -> List['Connection']:
+        """Board'dan bir elementi ve ona bağlı bağlantıları kaldır
+
+        Geri alma için kaldırılan bağlantıları döndürür.
+        """
+        removed = []
         if element_id in self.elements:
-            # İlgili bağlantıları da kaldır
-            connections_to_remove = []
-            for conn_id, conn in self.connections.items():
-                if conn.source_id == element_id or conn.target_id == element_id:
-                    connections_to_remove.append(conn_id)
-                    
-            for conn_id in connections_to_remove:
-                del self.connections[conn_id]
-                
-            del self.elements[element_id]
-            self.modified_at = datetime.now()
+            # İlgili bağlantıları indeks üzerinden bul (O(derece))
+            for conn_id in list(self._incident_ids(element_id)):
+                connection = self.remove_connection(conn_id)
+                if connection is not None:
+                    removed.append(connection)
+
+            self._outgoing.pop(element_id, None)
+            self._incoming.pop(element_id, None)
+            if self._spatial_index is not None:
+                self._spatial_index.remove(element_id)
+            if self._geometry is not None:
+                self._geometry.remove(element_id)
+            self.elements.pop(element_id)._owner = None
+            for changes in self._changes.values():
+                changes.element_removed(element_id)
+            self._modified = now()
+        return removed
             
     def add_branch(self, branch: 'Branch') -> None:
         """Board'a yeni bir branch ekle"""
         self.branches[branch.id] = branch
-        self.modified_at = datetime.now()
+        self._modified = now()
         
     def add_connection(self, connection: 'Connection') -> None:
         """Board'a yeni bir bağlantı ekle"""
         self.connections[connection.id] = connection
-        self.modified_at = datetime.now()
+        connection._owner = self
+        self._outgoing.setdefault(connection.source_id, set()).add(connection.id)
+        self._incoming.setdefault(connection.target_id, set()).add(connection.id)
+        for changes in self._changes.values():
+            changes.connection_changed(connection.id)
+        self._modified = now()
+
+    def remove_connection(self, connection_id: str) -> Optional['Connection']:
+        """Board'dan bir bağlantıyı kaldır"""
+        connection = self.connections.pop(connection_id, None)
+        if connection is None:
+            return None
+        self._outgoing.get(connection.source_id, set()).discard(connection_id)
+        self._incoming.get(connection.target_id, set()).discard(connection_id)
+        connection._owner = None
+        for changes in self._changes.values():
+            changes.connection_removed(connection_id)
+        self._modified = now()
+        return connection
+
+    def mark_element_dirty(self, element_id: str) -> None:
+        """Elementi bir sonraki kayıtta yazılacak olarak işaretle"""
+        if element_id in self._elements:
+            for changes in self._changes.values():
+                changes.elements.add(element_id)
+            self._modified = now()
+
+    def mark_connection_dirty(self, connection_id: str) -> None:
+        """Bağlantıyı bir sonraki kayıtta yazılacak olarak işaretle"""
+        if connection_id in self._connections:
+            for changes in self._changes.values():
+                changes.connections.add(connection_id)
+            self._modified = now()
+
+    @property
+    def is_dirty(self) -> bool:
+        """Son kayıttan beri kaydedilmemiş değişiklik var mı?"""
+        return bool(self._changes['save'])
+
+    def change_set(self, channel: str) -> ChangeSet:
+        """Tüketicinin değişiklik kümesi (tüketici okudukça kendisi boşaltır)"""
+        return self._changes[channel]
+
+    def dirty_changes(self, channel: str = 'save'):
+        """Kaydedilmemiş değişiklikler: (değişen elementler, silinen element ID'leri,
+        değişen bağlantılar, silinen bağlantı ID'leri)"""
+        changes = self._changes[channel]
+        return ([self._elements[eid] for eid in changes.elements],
+                list(changes.removed_elements),
+                [self._connections[cid] for cid in changes.connections],
+                list(changes.removed_connections))
+
+    def clear_dirty(self, channel: str = 'save') -> None:
+        """Kayıttan sonra değişiklik işaretlerini temizle"""
+        self._changes[channel].clear()
         
     def get_element(self, element_id: str) -> Optional['Element']:
         """ID'ye göre element getir"""
         return self.elements.get(element_id)
+
+    def get_outgoing_connections(self, element_id: str) -> List['Connection']:
+        """Elementten çıkan bağlantılar"""
+        connections = self.connections
+        return [connections[cid] for cid in self._outgoing.get(element_id, ())]
+
+    def get_incoming_connections(self, element_id: str) -> List['Connection']:
+        """Elemente gelen bağlantılar"""
+        connections = self.connections
+        return [connections[cid] for cid in self._incoming.get(element_id, ())]
+
+    def get_element_connections(self, element_id: str) -> List['Connection']:
+        """Elemente bağlı tüm bağlantılar (gelen ve çıkan)"""
+        connections = self.connections
+        return [connections[cid] for cid in self._incident_ids(element_id)]
+
+    def _incident_ids(self, element_id: str) -> Set[str]:
+        return self._outgoing.get(element_id, set()) | self._incoming.get(element_id, set())
+
+    def get_neighbor_ids(self, element_id: str) -> Set[str]:
+        """Elemente doğrudan bağlı element ID'leri"""
+        neighbors = set()
+        connections = self.connections
+        for conn_id in self._incident_ids(element_id):
+            connection = connections[conn_id]
+            neighbors.add(connection.source_id)
+            neighbors.add(connection.target_id)
+        neighbors.discard(element_id)
+        return neighbors
+
+    @property
+    def spatial_index(self) -> SpatialIndex:
+        """Element konum/boyutları için uzamsal indeks"""
+        if self._spatial_index is None:
+            self._spatial_index = SpatialIndex()
+            for element in self.elements.values():
+                self._spatial_index.insert(element.id, self._element_rect(element))
+        return self._spatial_index
+
+    def update_element_geometry(self, element_id: str) -> None:
+        """Elementin konumu/boyutu değişince uzamsal indeksi güncelle"""
+        element = self.elements.get(element_id)
+        if element is None:
+            return
+        for changes in self._changes.values():
+            changes.elements.add(element_id)
+        if self._spatial_index is not None:
+            self._spatial_index.update(element_id, self._element_rect(element))
+        if self._geometry is not None:
+            self._geometry.set(element_id, *element.geometry())
+
+    @property
+    def geometry_store(self):
+        """Element geometrisinin sütunlu (NumPy) kopyası; NumPy yoksa None
+
+        İlk erişimde kurulur, sonra ekleme/silme/konum değişikliğiyle güncel tutulur.
+        """
+        if self._geometry is None and geometry_store.AVAILABLE:
+            self._geometry = geometry_store.GeometryStore.from_elements(self.elements.values())
+        return self._geometry
+
+    def element_bounds(self):
+        """Tüm elementleri kapsayan (left, top, right, bottom) ya da None"""
+        store = self.geometry_store
+        if store is not None:
+            return store.bounds()
+        return self.spatial_index.bounds()
+
+    def elements_at(self, x: float, y: float) -> List[str]:
+        """Noktayı içeren element ID'leri"""
+        store = self.geometry_store
+        if store is not None:
+            return store.query_point(x, y)
+        return list(self.spatial_index.query((x, y, x, y)))
+
+    def translate_elements(self, element_ids, dx: float, dy: float) -> None:
+        """Elementleri toplu kaydır (yerleşim, hizalama gibi toplu işlemler için)"""
+        elements = self.elements
+        ids = [eid for eid in element_ids if eid in elements]
+        stamp = now()
+        for element_id in ids:
+            element = elements[element_id]
+            element._x += dx
+            element._y += dy
+            element._modified = stamp
+        if self._geometry is not None:
+            self._geometry.translate(ids, dx, dy)
+        if self._spatial_index is not None:
+            if len(ids) > self.SPATIAL_REBUILD_ABOVE:
+                self._spatial_index = None  # Tek tek güncellemek yerine yeniden kurulur
+            else:
+                for element_id in ids:
+                    self._spatial_index.update(element_id, self._element_rect(elements[element_id]))
+        for changes in self._changes.values():
+            changes.elements.update(ids)
+        self._modified = stamp
+
+    @staticmethod
+    def _element_rect(element: 'Element'):
+        x, y, width, height = element.geometry()
+        return (x, y, x + width, y + height)
         
     def to_dict(self):
         """Board'u JSON serileştirme için dict'e çevir"""
+        created_at, modified_at = iso_timestamps(self)
         return {
             'id': self.id,
             'name': self.name,
             'root': self.root,
             'elements': {eid: elem.to_dict() for eid, elem in self.elements.items()},
-            'connections': self.connections,  # Bağlantıları kaydet
+            'connections': {cid: conn.to_dict() for cid, conn in self.connections.items()},
             'children': self.children,
-            'created_at': self.created_at.isoformat(),
-            'modified_at': self.modified_at.isoformat()
+            'created_at': created_at,
+            'modified_at': modified_at
         }
     
     @classmethod
@@ -72,7 +373,11 @@ class Board:
         board = cls(data['name'], data.get('root', False))
         board.id = data['id']
         board.children = data['children']
-        board.connections = data.get('connections', {})  # Bağlantıları yükle
-        board.created_at = datetime.fromisoformat(data['created_at'])
-        board.modified_at = datetime.fromisoformat(data['modified_at'])
+        for element_data in data.get('elements', {}).values():
+            board.add_element(Element.from_dict(element_data))
+        # Bağlantıları yükle (komşuluk indeksi add_connection ile kurulur)
+        for conn_data in data.get('connections', {}).values():
+            board.add_connection(Connection.from_dict(conn_data))
+        board._created = data['created_at']
+        board._modified = data['modified_at']
         return board
\ No newline at end of file
@@ -1,16 +1,18 @@
 ﻿from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
 from src.core.element import Element
 from PyQt6.QtCore import QPointF
 
 
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List
+import sys
+import time
+import zlib
+from contextlib import ExitStack, contextmanager
 from src.core.element import Element
 from PyQt6.QtCore import QPointF
 
-from src.gui.board_view import ConnectionGraphicsItem, ElementGraphicsItem
-
 class Command(ABC):
     """Temel komut sınıfı"""
     
@@ -24,77 +26,128 @@ class Command(ABC):
         """Komutu geri al"""
         pass
 
+    def merge_with(self, other: 'Command') -> bool:
+        """Az önce uygulanmış other komutunu bu komuta kat
+
+        True dönerse other ayrı bir geri alma adımı olmaz; bu komutun
+        undo'su ikisini birden geri almalıdır.
+        """
+        return False
+
+    def footprint(self) -> int:
+        """Komutun geçmişte tuttuğu yaklaşık bellek (bayt)"""
+        # __dict__'in kendi boyutu ilk erişime ve paylaşılan anahtarlara göre
+        # değişir; aynı komut her seferinde aynı boyutu versin diye kopyası ölçülür
+        return sys.getsizeof(self) + sys.getsizeof(dict(self.__dict__))
+
+def _element_footprint(element) -> int:
+    """Sadece geçmişin tuttuğu (silinmiş) bir elementin yaklaşık boyutu"""
+    return (sys.getsizeof(element) + sys.getsizeof(element.title)
+            + sys.getsizeof(element.content) + sys.getsizeof(element.components))
+
+# Silinen bir bağlantının yaklaşık boyutu (nesne ve ID metinleri)
+CONNECTION_FOOTPRINT = 400
+
+class TextChange:
+    """İki metin arasındaki fark: sadece değişen orta kısım saklanır
+
+    Ortak baş ve son kısım tutulmadığı için tek harflik bir düzenleme uzun
+    bir metinde de birkaç bayt yer kaplar. COMPRESS_ABOVE karakterden uzun
+    parçalar zlib ile sıkıştırılmış olarak tutulur.
+    """
+    __slots__ = ('start', 'end', '_old', '_new')
+
+    COMPRESS_ABOVE = 1024
+
+    def __init__(self, old: str, new: str):
+        limit = min(len(old), len(new))
+        start = 0
+        while start < limit and old[start] == new[start]:
+            start += 1
+        end = 0
+        while end < limit - start and old[-1 - end] == new[-1 - end]:
+            end += 1
+        self.start = start  # Ortak başın uzunluğu
+        self.end = end  # Ortak sonun uzunluğu
+        self._old = self._pack(old[start:len(old) - end])
+        self._new = self._pack(new[start:len(new) - end])
+
+    @classmethod
+    def _pack(cls, text: str):
+        if len(text) <= cls.COMPRESS_ABOVE:
+            return text
+        return zlib.compress(text.encode('utf-8'))
+
+    @staticmethod
+    def _unpack(value) -> str:
+        if isinstance(value, bytes):
+            return zlib.decompress(value).decode('utf-8')
+        return value
+
+    @property
+    def old(self) -> str:
+        """Değişen kısmın eski hali"""
+        return self._unpack(self._old)
+
+    @property
+    def new(self) -> str:
+        """Değişen kısmın yeni hali"""
+        return self._unpack(self._new)
+
+    def footprint(self) -> int:
+        return sys.getsizeof(self) + sys.getsizeof(self._old) + sys.getsizeof(self._new)
+
+    def apply(self, text: str) -> str:
+        """Eski metinden yeni metni üret"""
+        return text[:self.start] + self.new + text[len(text) - self.end:]
+
+    def revert(self, text: str) -> str:
+        """Yeni metinden eski metni üret"""
+        return text[:self.start] + self.old + text[len(text) - self.end:]
+
 class AddElementCommand(Command):
     """Element ekleme komutu"""
     def __init__(self, board_scene, element, pos):
         self.scene = board_scene
         self.element = element
         self.pos = pos
-        self.element_item = None
+        self.removed_connections = []
         
     def execute(self):
-        from src.gui.board_view import ElementGraphicsItem
-        self.element_item = ElementGraphicsItem(self.element)
-        self.element_item.setPos(self.pos)
-        self.scene.addItem(self.element_item)
-        
-        # Board'a elementi ekle
-        view = self.scene.views()[0]
-        if view.main_window and view.main_window.current_board:
-            view.main_window.current_board.elements[self.element.id] = self.element
-            view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
+        # Modele ekle; item'ı sahne görünürlüğe göre oluşturur
+        board = self.scene.board
+        self.element.set_position(self.pos.x(), self.pos.y())
+        board.add_element(self.element)
+        for connection in self.removed_connections:
+            board.add_connection(connection)
+        self.scene.ensure_element_item(self.element.id)
+        self.scene.notify_model_changed((self.element.id,))
         
     def undo(self):
-        if self.element_item:
-            # Board'dan elementi kaldır
-            view = self.scene.views()[0]
-            if view.main_window and view.main_window.current_board:
-                if self.element.id in view.main_window.current_board.elements:
-                    del view.main_window.current_board.elements[self.element.id]
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
-            # Sahneden elementi kaldır
-            self.scene.removeItem(self.element_item)
+        # Sonradan çizilmiş bağlantılarla birlikte kaldır
+        self.removed_connections = self.scene.board.remove_element(self.element.id)
+        self.scene.remove_element_item(self.element.id)
+        self.scene.notify_model_changed((self.element.id,))
+
+    def footprint(self) -> int:
+        return (super().footprint() + _element_footprint(self.element)
+                + len(self.removed_connections) * CONNECTION_FOOTPRINT)
 
 class DeleteElementCommand(Command):
     """Element silme komutu"""
-    def __init__(self, board_scene, element_item):
+    def __init__(self, board_scene, element):
         self.scene = board_scene
-        self.element_item = element_item
-        self.element = element_item.element
-        self.pos = element_item.pos()
-        self.connections = []
-        self.was_executed = False
-        print(f"Created delete command for element {self.element.title}")
+        self.element = element
+        self.removed_connections = []  # Board'dan silinen model bağlantıları
 
     def execute(self):
         """Elementi ve bağlantılarını sil"""
         try:
-            print(f"Executing delete for element {self.element.title}")
-            # Bağlantıları kaydet ve sil
-            if self.scene and not self.was_executed:  # Sadece ilk kez yürütülüyorsa bağlantıları kaydet
-                for item in self.scene.items():
-                    if isinstance(item, ConnectionGraphicsItem):
-                        if item.source_item == self.element_item or item.target_item == self.element_item:
-                            self.connections.append({
-                                'source_id': item.source_item.element.id,
-                                'target_id': item.target_item.element.id,
-                                'item': item
-                            })
-                            self.scene.removeItem(item)
-
-            # Board'dan elementi sil
-            view = self.scene.views()[0]
-            if view.main_window and view.main_window.current_board:
-                if self.element.id in view.main_window.current_board.elements:
-                    del view.main_window.current_board.elements[self.element.id]
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
-
-            # Sahneden elementi sil
-            if self.scene:
-                self.scene.removeItem(self.element_item)
-            
-            self.was_executed = True
-            print(f"Successfully deleted element {self.element.title}")
+            # Board'dan elementi ve bağlantılarını sil (O(derece))
+            self.removed_connections = self.scene.board.remove_element(self.element.id)
+            # Item'ı varsa bağlantı çizgileriyle birlikte sahneden kaldır
+            self.scene.remove_element_item(self.element.id)
+            self.scene.notify_model_changed((self.element.id,))
         except Exception as e:
             print(f"Error in DeleteElementCommand execute: {str(e)}")
             import traceback
@@ -103,196 +156,342 @@ class DeleteElementCommand(Command):
     def undo(self):
         """Elementi ve bağlantılarını geri yükle"""
         try:
-            print(f"Undoing delete for element {self.element.title}")
-            # Elementi geri ekle
-            if self.scene:
-                self.scene.addItem(self.element_item)
-                self.element_item.setPos(self.pos)
-
-            # Board'a elementi geri ekle
-            view = self.scene.views()[0]
-            if view.main_window and view.main_window.current_board:
-                view.main_window.current_board.elements[self.element.id] = self.element
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
-
-            # Bağlantıları geri oluştur
-            for conn_data in self.connections:
-                source_item = None
-                target_item = None
-                for item in self.scene.items():
-                    if isinstance(item, ElementGraphicsItem):
-                        if item.element.id == conn_data['source_id']:
-                            source_item = item
-                        elif item.element.id == conn_data['target_id']:
-                            target_item = item
-                
-                if source_item and target_item:
-                    conn = ConnectionGraphicsItem(source_item, target_item)
-                    self.scene.addItem(conn)
-            
-            self.was_executed = False
-            print(f"Successfully restored element {self.element.title}")
+            board = self.scene.board
+            board.add_element(self.element)
+            for connection in self.removed_connections:
+                board.add_connection(connection)
+            # Görünen alandaysa item ve bağlantı çizgileri yeniden oluşur
+            self.scene.refresh_element(self.element.id)
+            self.scene.notify_model_changed((self.element.id,))
         except Exception as e:
             print(f"Error in DeleteElementCommand undo: {str(e)}")
             import traceback
             traceback.print_exc()
-        """Elementi ve bağlantılarını geri yükle"""
-        try:
-            print(f"Undoing delete for element: {self.element.title}")  # Debug için
-            
-            # Elementi geri ekle
-            if self.scene:
-                self.scene.addItem(self.element_item)
-                self.element_item.setPos(self.pos)
-                print("Restored element to scene")  # Debug için
-
-            # Bağlantıları geri ekle
-            for conn in self.connections:
-                if self.scene:
-                    self.scene.addItem(conn['connection'])
-                    print("Restored connection")  # Debug için
-
-            # Board'a elementi geri ekle
-            view = self.scene.views()[0]
-            if view.main_window and view.main_window.current_board:
-                view.main_window.current_board.elements[self.element.id] = self.element
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
-                print("Restored to board data")  # Debug için
 
-        except Exception as e:
-            print(f"Error in DeleteElementCommand undo: {str(e)}")
-            import traceback
-            traceback.print_exc()
+    def footprint(self) -> int:
+        return (super().footprint() + _element_footprint(self.element)
+                + len(self.removed_connections) * CONNECTION_FOOTPRINT)
 
 class MoveElementCommand(Command):
     """Element taşıma komutu"""
-    def __init__(self, element_item, old_pos, new_pos):
-        self.element_item = element_item
+    def __init__(self, board_scene, element, old_pos, new_pos):
+        self.scene = board_scene
+        self.element = element
         self.old_pos = old_pos
         self.new_pos = new_pos
-        print(f"Created move command from {old_pos} to {new_pos}")
         
     def execute(self):
-        try:
-            self.element_item.setPos(self.new_pos)
-            print(f"Moved element to {self.new_pos}")
-        except Exception as e:
-            print(f"Error in MoveElementCommand execute: {str(e)}")
+        self._move_to(self.new_pos)
         
     def undo(self):
+        self._move_to(self.old_pos)
+
+    def _move_to(self, pos):
         try:
-            self.element_item.setPos(self.old_pos)
-            print(f"Moved element back to {self.old_pos}")
+            self.element.set_position(pos.x(), pos.y())
+            self.scene.refresh_element(self.element.id)
         except Exception as e:
-            print(f"Error in MoveElementCommand undo: {str(e)}")
+            print(f"Error in MoveElementCommand: {str(e)}")
 
 class UpdateElementCommand(Command):
-    """Element özelliklerini güncelleme komutu"""
-    def __init__(self, element_item, property_name: str, old_value: Any, new_value: Any):
-        self.element_item = element_item
+    """Element özelliklerini güncelleme komutu
+
+    Metin özellikleri (başlık, içerik) tam kopya yerine TextChange olarak
+    saklanır ve art arda yapılan düzenlemeler tek komutta birleşir.
+    """
+    TEXT_PROPERTIES = ("title", "content")
+
+    def __init__(self, board_scene, element, property_name: str, old_value: Any, new_value: Any):
+        self.scene = board_scene
+        self.element = element
         self.property_name = property_name
-        self.old_value = old_value
-        self.new_value = new_value
+        if property_name in self.TEXT_PROPERTIES:
+            self.change = TextChange(old_value, new_value)
+            self.old_value = self.new_value = None
+        else:
+            self.change = None
+            self.old_value = old_value
+            self.new_value = new_value
         
     def execute(self):
-        self._set_property(self.new_value)
+        if self.change is not None:
+            self._set_property(self.change.apply(getattr(self.element, self.property_name)))
+        else:
+            self._set_property(self.new_value)
         
     def undo(self):
-        self._set_property(self.old_value)
+        if self.change is not None:
+            self._set_property(self.change.revert(getattr(self.element, self.property_name)))
+        else:
+            self._set_property(self.old_value)
+
+    def merge_with(self, other: Command) -> bool:
+        """Aynı elementin aynı metin özelliğindeki ardışık düzenlemeyi birleştir"""
+        if (self.change is None or not isinstance(other, UpdateElementCommand)
+                or other.element is not self.element
+                or other.property_name != self.property_name):
+            return False
+        # other uygulanmış durumda: şimdiki metinden iki adım geri giderek ilk metni bul
+        current = getattr(self.element, self.property_name)
+        original = self.change.revert(other.change.revert(current))
+        self.change = TextChange(original, current)
+        return True
+
+    def footprint(self) -> int:
+        size = super().footprint()
+        if self.change is not None:
+            return size + self.change.footprint()
+        return size + sys.getsizeof(self.old_value) + sys.getsizeof(self.new_value)
         
     def _set_property(self, value):
         if self.property_name == "title":
-            self.element_item.element.title = value
-            self.element_item.update()
+            self.element.title = value
             # Sol paneli güncelle
-            view = self.element_item.scene().views()[0]
-            if view.main_window and view.main_window.current_board:
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
+            self.scene.notify_model_changed((self.element.id,))
         elif self.property_name == "content":
-            self.element_item.element.content = value
-            self.element_item.update()
+            self.element.content = value
         elif self.property_name == "size":
-            self.element_item.setRect(0, 0, value['width'], value['height'])
-            self.element_item.element.size = value
+            self.element.set_size(value['width'], value['height'])
         elif self.property_name == "color":
-            self.element_item.setBrush(value)
-    """Element taşıma komutu"""
-    def __init__(self, element_item, old_pos, new_pos):
-        self.element_item = element_item
-        self.old_pos = old_pos
-        self.new_pos = new_pos
-        print(f"Created move command from {old_pos} to {new_pos}")
-        
-    def execute(self):
-        try:
-            self.element_item.setPos(self.new_pos)
-            print(f"Moved element to {self.new_pos}")
-        except Exception as e:
-            print(f"Error in MoveElementCommand execute: {str(e)}")
-        
-    def undo(self):
-        try:
-            self.element_item.setPos(self.old_pos)
-            print(f"Moved element back to {self.old_pos}")
-        except Exception as e:
-            print(f"Error in MoveElementCommand undo: {str(e)}")
-    """Element özelliklerini güncelleme komutu"""
+            self.element.color = value
+        self.element.touch()
+        # Item varsa modelden yeniden eşle (metin önbelleği de temizlenir)
+        self.scene.refresh_element(self.element.id)
 
-    def __init__(self, element_item, property_name: str, old_value: Any, new_value: Any):
-        self.element_item = element_item
-        self.property_name = property_name
-        self.old_value = old_value
-        self.new_value = new_value
+class CompositeCommand(Command):
+    """Birden çok komutu tek geri alma adımı olarak çalıştıran komut
+
+    Alt komutlar sırayla uygulanır, ters sırada geri alınır. Bu sırada alt
+    komutların sahneleri toplu güncelleme modunda tutulur; gezgin, özellikler
+    paneli ve görünür item'lar her komutta değil en sonda bir kez yenilenir.
+    """
+    def __init__(self, commands=(), name: str = ""):
+        self.commands: List[Command] = list(commands)
+        self.name = name
+        self._scope = None  # Açık toplu güncelleme (batch içindeyken)
+        self._scenes = []
+
+    def __len__(self):
+        return len(self.commands)
 
     def execute(self):
-        self._set_property(self.new_value)
+        with self.batch():
+            for command in self.commands:
+                command.execute()
 
     def undo(self):
-        self._set_property(self.old_value)
+        with self.batch():
+            for command in reversed(self.commands):
+                command.undo()
 
-    def _set_property(self, value):
-        if self.property_name == "title":
-            self.element_item.element.title = value
-            self.element_item.update()
-            # Sol paneli güncelle
-            view = self.element_item.scene().views()[0]
-            if view.main_window and view.main_window.current_board:
-                view.main_window.project_explorer.refresh_elements(view.main_window.current_board)
-        elif self.property_name == "content":
-            self.element_item.element.content = value
-            self.element_item.update()
-        elif self.property_name == "size":
-            self.element_item.setRect(0, 0, value['width'], value['height'])
-            self.element_item.element.size = value
-        elif self.property_name == "color":
-            self.element_item.setBrush(value)
+    @contextmanager
+    def batch(self):
+        """Alt komutların sahnelerini blok boyunca toplu güncellemede tut"""
+        with ExitStack() as scope:
+            self._scope = scope
+            try:
+                for command in self.commands:
+                    self._hold(command)
+                yield self
+            finally:
+                self._scope = None
+                self._scenes = []
+
+    def run(self, command: Command):
+        """Komutu açık batch içinde uygula ve alt komutlara ekle"""
+        self._hold(command)
+        command.execute()
+        self.commands.append(command)
+
+    def _hold(self, command: Command):
+        scene = getattr(command, 'scene', None)
+        if (self._scope is None or scene is None or not hasattr(scene, 'batch_updates')
+                or any(scene is held for held in self._scenes)):
+            return
+        self._scenes.append(scene)
+        self._scope.enter_context(scene.batch_updates())
+
+    def footprint(self) -> int:
+        return (super().footprint() + sys.getsizeof(self.commands)
+                + sum(command.footprint() for command in self.commands))
 
 class CommandStack:
-    """Komut yığını - Geri alma/ileri alma işlemlerini yönetir"""
+    """Komut yığını - Geri alma/ileri alma işlemlerini yönetir
+
+    Geçmiş hem adım sayısıyla hem de yaklaşık bellekle sınırlıdır; sınır
+    aşılınca en eski adımlar atılır. En son adım tek başına sınırı aşsa da
+    geri alınabilsin diye tutulur.
+    """
+
+    # Bu süre içinde gelen birleştirilebilir komutlar tek geri alma adımı olur (saniye)
+    MERGE_WINDOW = 1.0
+    DEFAULT_MAX_ENTRIES = 1000
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
 
-    def __init__(self):
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
         self.undo_stack: List[Command] = []
         self.redo_stack: List[Command] = []
+        self.listeners: List[Callable[[], None]] = []  # Her değişiklikten sonra çağrılır
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.evicted = 0  # Sınır yüzünden atılan adım sayısı
+        self._last_execute = None  # Son komutun zamanı; None ise birleştirme kapalı
+        # Komutların yaklaşık boyutları (yığınlarla paralel) ve toplamları
+        self._undo_sizes: List[int] = []
+        self._redo_sizes: List[int] = []
+        self._undo_bytes = 0
+        self._redo_bytes = 0
+        self._transaction = None  # Açık transaction'ın CompositeCommand'ı
+
+    def add_listener(self, callback: Callable[[], None]):
+        """Komut uygulandığında/geri alındığında çağrılacak fonksiyonu ekle"""
+        self.listeners.append(callback)
+
+    def _notify(self):
+        for callback in self.listeners:
+            callback()
 
     def execute(self, command: Command):
-        """Komutu uygula ve undo stack'e ekle"""
+        """Komutu uygula ve undo stack'e ekle (mümkünse öncekiyle birleştir)
+
+        Bir transaction açıksa komut uygulanır ama ayrı bir adım olmaz;
+        transaction bitince diğerleriyle birlikte tek adım olarak eklenir.
+        """
+        if self._transaction is not None:
+            self._transaction.run(command)
+            return
         command.execute()
-        self.undo_stack.append(command)
-        self.redo_stack.clear()  # Yeni komut eklenince redo stack'i temizle
+        self._record(command)
+
+    @contextmanager
+    def transaction(self, name: str = ""):
+        """İçinde execute edilen komutları tek geri alma adımında topla
+
+            with command_stack.transaction("Sil"):
+                for element in elements:
+                    command_stack.execute(DeleteElementCommand(scene, element))
+
+        İç içe açılan transaction dıştakine katılır. Blok hata ile biterse o
+        ana kadar uygulanan komutlar geri alınır ve geçmişe bir şey eklenmez.
+        """
+        if self._transaction is not None:
+            yield self._transaction
+            return
+        composite = CompositeCommand(name=name)
+        self._transaction = composite
+        try:
+            with composite.batch():
+                try:
+                    yield composite
+                except BaseException:
+                    for command in reversed(composite.commands):
+                        command.undo()
+                    raise
+        finally:
+            self._transaction = None
+        if len(composite) == 1:
+            self._record(composite.commands[0])
+        elif composite.commands:
+            self._record(composite)
+
+    def _record(self, command: Command):
+        """Uygulanmış komutu geçmişe ekle"""
+        now = time.monotonic()
+        merged = (self._last_execute is not None and self.undo_stack
+                  and now - self._last_execute <= self.MERGE_WINDOW
+                  and self.undo_stack[-1].merge_with(command))
+        if merged:
+            size = self.undo_stack[-1].footprint()
+            self._undo_bytes += size - self._undo_sizes[-1]
+            self._undo_sizes[-1] = size
+        else:
+            self._push_undo(command, command.footprint())
+        self._last_execute = now
+        # Yeni komut eklenince redo stack'i temizle
+        self.redo_stack.clear()
+        self._redo_sizes.clear()
+        self._redo_bytes = 0
+        self._enforce_budget()
+        self._notify()
+
+    def close_merge(self):
+        """Sonraki komutun son komutla birleşmesini engelle (ör. düzenleme bitince)"""
+        self._last_execute = None
 
     def undo(self):
         """Son komutu geri al"""
         if self.undo_stack:
+            self.close_merge()
             command = self.undo_stack.pop()
+            size = self._undo_sizes.pop()
+            self._undo_bytes -= size
             command.undo()
             self.redo_stack.append(command)
+            self._redo_sizes.append(size)
+            self._redo_bytes += size
+            self._notify()
 
     def redo(self):
         """Son geri alınan komutu tekrar uygula"""
         if self.redo_stack:
+            self.close_merge()
             command = self.redo_stack.pop()
+            size = self._redo_sizes.pop()
+            self._redo_bytes -= size
             command.execute()
-            self.undo_stack.append(command)
+            self._push_undo(command, size)
+            self._notify()
+
+    def _push_undo(self, command: Command, size: int):
+        self.undo_stack.append(command)
+        self._undo_sizes.append(size)
+        self._undo_bytes += size
+
+    def set_budget(self, max_entries: int = None, max_bytes: int = None):
+        """Geçmiş sınırlarını değiştir; gerekirse eski adımlar hemen atılır"""
+        if max_entries is not None:
+            self.max_entries = max_entries
+        if max_bytes is not None:
+            self.max_bytes = max_bytes
+        self._enforce_budget()
+
+    def _over_budget(self, entries: int) -> bool:
+        return entries > self.max_entries or self._undo_bytes + self._redo_bytes > self.max_bytes
+
+    def _enforce_budget(self):
+        """Sınırlar aşıldıysa önce en eski geri alma, sonra en uzak ileri alma adımlarını at"""
+        entries = len(self.undo_stack) + len(self.redo_stack)
+        count = 0
+        while count < len(self.undo_stack) - 1 and self._over_budget(entries - count):
+            self._undo_bytes -= self._undo_sizes[count]
+            count += 1
+        if count:
+            del self.undo_stack[:count]
+            del self._undo_sizes[:count]
+            entries -= count
+        # redo_stack'in başı, geri alınmış adımların en eskisidir (en uzak ileri alma)
+        redo_count = 0
+        while redo_count < len(self.redo_stack) and self._over_budget(entries - redo_count):
+            self._redo_bytes -= self._redo_sizes[redo_count]
+            redo_count += 1
+        if redo_count:
+            del self.redo_stack[:redo_count]
+            del self._redo_sizes[:redo_count]
+        self.evicted += count + redo_count
+
+    def footprint(self) -> Dict[str, int]:
+        """Geçmişin adım sayıları ve yaklaşık bellek kullanımı (bayt)"""
+        return {
+            'undo_entries': len(self.undo_stack),
+            'redo_entries': len(self.redo_stack),
+            'undo_bytes': self._undo_bytes,
+            'redo_bytes': self._redo_bytes,
+            'total_bytes': self._undo_bytes + self._redo_bytes,
+            'max_entries': self.max_entries,
+            'max_bytes': self.max_bytes,
+            'evicted': self.evicted,
+        }
 
     def can_undo(self) -> bool:
         """Geri alınabilecek komut var mı?"""
@@ -1,42 +1,75 @@
 from uuid import uuid4
 from typing import Optional, Dict
-from datetime import datetime
+
+from src.core.expressions import validate
+from src.core.fields import Interned, Timestamp, now, iso_timestamps
 
 class Connection:
     """Connection sınıfı - elementler arası bağlantıları temsil eder"""
+
+    __slots__ = ('id', 'source_id', 'target_id', 'label', 'condition', 'effects',
+                 '_type', '_theme', '_created', '_modified', '_owner')
+
+    type = Interned('_type')  # bezier, straight, flowchart
+    theme = Interned('_theme')
+    created_at = Timestamp('_created')
+    modified_at = Timestamp('_modified')
     
     def __init__(self, source_id: str, target_id: str):
         self.id: str = str(uuid4())
         self.source_id: str = source_id
         self.target_id: str = target_id
         self.label: str = ""
-        self.type: str = "bezier"  # bezier, straight, flowchart
-        self.theme: str = "default"
-        self.created_at: datetime = datetime.now()
-        self.modified_at: datetime = datetime.now()
+        self.condition: str = ""  # Seçimin görünmesi için doğru olması gereken ifade
+        self.effects: str = ""  # Seçim yapılınca uygulanan atamalar (bkz. core.expressions)
+        self._type: str = "bezier"
+        self._theme: str = "default"
+        self._created = self._modified = now()
+        self._owner = None  # Bağlantıyı içeren board (değişiklik takibi için)
+
+    def touch(self) -> None:
+        """Değişikliği işaretle; board'u kaydedilecek olarak bildir"""
+        self._modified = now()
+        if self._owner is not None:
+            self._owner.mark_connection_dirty(self.id)
         
     def set_label(self, label: str) -> None:
         """Bağlantı etiketini ayarla"""
         self.label = label
-        self.modified_at = datetime.now()
+        self.touch()
         
+    def set_condition(self, condition: str) -> None:
+        """Koşulu ayarla; ifade hatalıysa ExpressionError"""
+        validate(condition=condition)
+        self.condition = condition
+        self.touch()
+
+    def set_effects(self, effects: str) -> None:
+        """Etkileri ayarla; ifade hatalıysa ExpressionError"""
+        validate(effects=effects)
+        self.effects = effects
+        self.touch()
+
     def set_type(self, connection_type: str) -> None:
         """Bağlantı tipini ayarla"""
         if connection_type in ["bezier", "straight", "flowchart"]:
             self.type = connection_type
-            self.modified_at = datetime.now()
+            self.touch()
             
     def to_dict(self) -> dict:
         """Connection'ı JSON serileştirme için dict'e çevir"""
+        created_at, modified_at = iso_timestamps(self)
         return {
             'id': self.id,
             'source_id': self.source_id,
             'target_id': self.target_id,
             'label': self.label,
-            'type': self.type,
-            'theme': self.theme,
-            'created_at': self.created_at.isoformat(),
-            'modified_at': self.modified_at.isoformat()
+            'condition': self.condition,
+            'effects': self.effects,
+            'type': self._type,
+            'theme': self._theme,
+            'created_at': created_at,
+            'modified_at': modified_at
         }
     
     @classmethod
@@ -45,8 +78,10 @@ class Connection:
         connection = cls(data['source_id'], data['target_id'])
         connection.id = data['id']
         connection.label = data['label']
+        connection.condition = data.get('condition', "")
+        connection.effects = data.get('effects', "")
         connection.type = data['type']
         connection.theme = data['theme']
-        connection.created_at = datetime.fromisoformat(data['created_at'])
-        connection.modified_at = datetime.fromisoformat(data['modified_at'])
+        connection._created = data['created_at']
+        connection._modified = data['modified_at']
         return connection
\ No newline at end of file
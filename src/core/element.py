@@ -1,57 +1,107 @@
 from uuid import uuid4
-from datetime import datetime
+
+from src.core.fields import FieldView, Interned, Timestamp, now, iso_timestamps
+
+POSITION_SLOTS = {'x': '_x', 'y': '_y'}
+SIZE_SLOTS = {'width': '_width', 'height': '_height'}
 
 
 class Element:
     """Element sınıfı - hikayedeki her bir düğümü temsil eder"""
 
+    # Yüz binlerce element için örnek başına dict tutulmaz
+    __slots__ = ('id', 'title', 'content', '_theme', '_color', 'components',
+                 '_x', '_y', '_width', '_height', '_created', '_modified', '_owner')
+
+    theme = Interned('_theme')  # Görsel tema
+    color = Interned('_color')  # Kutu rengi
+    created_at = Timestamp('_created')
+    modified_at = Timestamp('_modified')
+
     def __init__(self, title: str = "", content: str = ""):
         self.id: str = str(uuid4())
         self.title: str = title
         self.content: str = content
-        self.theme: str = "default"  # Görsel tema
+        self._theme: str = "default"
+        self._color: str = "#f0f0f0"
         self.components: list = []  # Bağlı component ID'leri
-        self.position: dict = {'x': 0, 'y': 0}  # Board üzerindeki konumu
-        self.size: dict = {'width': 200, 'height': 150}  # Element boyutu
-        self.created_at: datetime = datetime.now()
-        self.modified_at: datetime = datetime.now()
+        self._x = self._y = 0  # Board üzerindeki konumu
+        self._width, self._height = 200, 150  # Element boyutu
+        self._created = self._modified = now()
+        self._owner = None  # Elementi içeren board (değişiklik takibi için)
+
+    @property
+    def position(self) -> FieldView:
+        """Konum: {'x', 'y'} anahtarlarıyla dict gibi okunur ve yazılır"""
+        return FieldView(self, POSITION_SLOTS)
+
+    @position.setter
+    def position(self, value) -> None:
+        self._x = value['x']
+        self._y = value['y']
+
+    @property
+    def size(self) -> FieldView:
+        """Boyut: {'width', 'height'} anahtarlarıyla dict gibi okunur ve yazılır"""
+        return FieldView(self, SIZE_SLOTS)
+
+    @size.setter
+    def size(self, value) -> None:
+        self._width = value['width']
+        self._height = value['height']
+
+    def geometry(self) -> tuple:
+        """(x, y, width, height) - sık çağrılan yollar için view'siz erişim"""
+        return self._x, self._y, self._width, self._height
+
+    def touch(self) -> None:
+        """Değişikliği işaretle; board'u kaydedilecek olarak bildir"""
+        self._modified = now()
+        if self._owner is not None:
+            self._owner.mark_element_dirty(self.id)
 
     def set_position(self, x: float, y: float) -> None:
         """Element'in konumunu ayarla"""
-        self.position['x'] = x
-        self.position['y'] = y
-        self.modified_at = datetime.now()
+        self._x = x
+        self._y = y
+        self.touch()
+        if self._owner is not None:
+            self._owner.update_element_geometry(self.id)
 
     def set_size(self, width: float, height: float) -> None:
         """Element'in boyutunu ayarla"""
-        self.size['width'] = width
-        self.size['height'] = height
-        self.modified_at = datetime.now()
+        self._width = width
+        self._height = height
+        self.touch()
+        if self._owner is not None:
+            self._owner.update_element_geometry(self.id)
 
     def add_component(self, component_id: str) -> None:
         """Element'e component bağla"""
         if component_id not in self.components:
             self.components.append(component_id)
-            self.modified_at = datetime.now()
+            self.touch()
 
     def remove_component(self, component_id: str) -> None:
         """Element'ten component bağlantısını kaldır"""
         if component_id in self.components:
             self.components.remove(component_id)
-            self.modified_at = datetime.now()
+            self.touch()
 
     def to_dict(self) -> dict:
         """Element'i JSON serileştirme için dict'e çevir"""
+        created_at, modified_at = iso_timestamps(self)
         return {
             'id': self.id,
             'title': self.title,
             'content': self.content,
-            'theme': self.theme,
+            'theme': self._theme,
+            'color': self._color,
             'components': self.components,
-            'position': self.position,
-            'size': self.size,
-            'created_at': self.created_at.isoformat(),
-            'modified_at': self.modified_at.isoformat()
+            'position': {'x': self._x, 'y': self._y},
+            'size': {'width': self._width, 'height': self._height},
+            'created_at': created_at,
+            'modified_at': modified_at
         }
 
     @classmethod
@@ -60,11 +110,13 @@ class Element:
         element = cls(data['title'], data['content'])
         element.id = data['id']
         element.theme = data['theme']
+        element.color = data.get('color', element.color)
         element.components = data['components']
         element.position = data['position']
         element.size = data['size']
-        element.created_at = datetime.fromisoformat(data['created_at'])
-        element.modified_at = datetime.fromisoformat(data['modified_at'])
+        # Zaman metinleri okunana ya da yeniden yazılana kadar çözülmez
+        element._created = data['created_at']
+        element._modified = data['modified_at']
         return element
 
     def move_to(self, x: float, y: float) -> None:
@@ -83,16 +135,17 @@ class Element:
             self.title = title
         if content is not None:
             self.content = content
-        self.modified_at = datetime.now()
+        self.touch()
         print(f"Element {self.id} content updated")
 
     def duplicate(self) -> 'Element':
         """Element'in bir kopyasını oluştur"""
         new_element = Element(f"{self.title} (Copy)", self.content)
         new_element.theme = self.theme
+        new_element.color = self.color
         new_element.components = self.components.copy()
-        new_element.position = {'x': self.position['x'] + 20, 'y': self.position['y'] + 20}
-        new_element.size = self.size.copy()
+        new_element._x, new_element._y = self._x + 20, self._y + 20
+        new_element._width, new_element._height = self._width, self._height
         return new_element
 
     def __str__(self) -> str:
@@ -102,4 +155,4 @@ class Element:
     def __repr__(self) -> str:
         """Element'in detaylı string gösterimi"""
         return (f"Element(id={self.id}, title='{self.title}', "
-                f"pos=({self.position['x']}, {self.position['y']}))")
\ No newline at end of file
+                f"pos=({self._x}, {self._y}))")
\ No newline at end of file
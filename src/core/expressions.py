@@ -0,0 +1,337 @@
+"""Bağlantı koşulları ve etkileri için küçük, güvenli ifade dili
+
+Koşul tek bir ifadedir, ör. ``gold >= 10 and not met``. Etki ``;`` ile
+ayrılmış atamalardır, ör. ``gold -= 10; met = true``.
+
+Dil: tam ve ondalık sayılar, "metin" ya da 'metin', true/false, değişken
+adları, parantez, + - * / %, karşılaştırmalar (== != < <= > >=) ve
+not/and/or (ya da ! && ||). Çağrı, öznitelik ve indeks yoktur; metin
+hiçbir zaman eval edilmez.
+
+Metin bir kez ayrıştırılır (önbellek anahtarı metnin kendisidir), ağaç
+değişken yerleri çözülerek iç içe closure'lara derlenir. Derlenen
+fonksiyonlar VariableState.values gibi düz bir değer listesi alır;
+değerlendirme sırasında ne metin ne de değişken adı işlenir.
+"""
+import ast
+import operator
+import re
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Optional
+
+# Ayrıştırılmış metinlerin önbelleği (koşul ve etki ayrı)
+PARSE_CACHE_SIZE = 1 << 17
+
+# Her eşleşme (işleç, ad, sayı, metin, hatalı karakter) gruplarından birini doldurur;
+# boşluk dışındaki her karakter bir gruba düştüğü için hiçbir şey sessizce atlanmaz
+_TOKEN = re.compile(r"""\s*(?:
+    (==|!=|<=|>=|\+=|-=|\*=|/=|&&|\|\||[-+*/%<>=!();])
+  | ([^\W\d]\w*)
+  | (\d+\.\d*|\.\d+|\d+)
+  | ("(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+  | (\S)
+)""", re.VERBOSE)
+
+# Ad biçimindeki özel sözcükler; geri kalan adlar değişkendir
+WORDS = {'true': ('const', True), 'false': ('const', False),
+         'and': 'and', 'or': 'or', 'not': 'not'}
+ALIASES = {'&&': 'and', '||': 'or', '!': 'not'}
+
+BINARY = {
+    '+': operator.add, '-': operator.sub, '*': operator.mul,
+    '/': operator.truediv, '%': operator.mod,
+}
+COMPARISON = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt,
+    '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+}
+ASSIGNMENT = {'=': None, '+=': operator.add, '-=': operator.sub,
+              '*=': operator.mul, '/=': operator.truediv}
+
+# İkili işleçlerin önceliği; not (3) karşılaştırmadan gevşek, and'den sıkı bağlar
+NOT_PRECEDENCE = 3
+COMPARISON_PRECEDENCE = 4
+PRECEDENCE = {'or': 1, 'and': 2, '+': 5, '-': 5, '*': 6, '/': 6, '%': 6}
+PRECEDENCE.update(dict.fromkeys(COMPARISON, COMPARISON_PRECEDENCE))
+
+Evaluator = Callable[[list], object]
+
+
+class ExpressionError(ValueError):
+    """İfade ayrıştırılamadı ya da derlenemedi"""
+
+
+def _tokenize(text: str) -> list:
+    """İşleçler str, değerler ('const', değer) ya da ('var', ad); sonda None"""
+    tokens = []
+    append = tokens.append
+    for op, name, number, string, error in _TOKEN.findall(text):
+        if op:
+            append(ALIASES.get(op, op))
+        elif name:
+            append(WORDS.get(name) or ('var', name))
+        elif number:
+            append(('const', float(number) if '.' in number else int(number)))
+        elif string:
+            # Kaçış dizisi yoksa tırnaklar atılır; varsa Python literali gibi çözülür
+            append(('const', string[1:-1] if '\\' not in string else _decode_string(string)))
+        else:
+            raise ExpressionError(f"Beklenmeyen karakter: {error!r}")
+    append(None)
+    return tokens
+
+
+def _decode_string(literal: str) -> str:
+    try:
+        return ast.literal_eval(literal)
+    except (SyntaxError, ValueError) as error:
+        raise ExpressionError(f"Geçersiz kaçış dizisi: {literal}") from error
+
+
+class _Parser:
+    """Öncelik tırmanmalı ayrıştırıcı
+
+    Ağaç düğümleri demetlerdir: ('const', değer), ('var', ad), ('not', x),
+    ('neg', x), ('and'|'or', a, b), ('bin'|'cmp', işleç, a, b).
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.names = set()
+
+    def next(self):
+        return self.tokens[self.position]
+
+    def take(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, value) -> None:
+        if self.take() != value:
+            raise ExpressionError(f"'{value}' bekleniyordu")
+
+    def unexpected(self, token) -> ExpressionError:
+        if token is None:
+            return ExpressionError("İfade eksik")
+        return ExpressionError(f"Beklenmeyen '{token[1] if token.__class__ is tuple else token}'")
+
+    def expression(self, min_precedence: int = 1):
+        if self.tokens[self.position] == 'not':
+            if min_precedence > NOT_PRECEDENCE:
+                raise self.unexpected('not')
+            self.position += 1
+            left = ('not', self.expression(NOT_PRECEDENCE))
+        else:
+            left = self.operand()
+        tokens = self.tokens
+        while True:
+            token = tokens[self.position]
+            precedence = PRECEDENCE.get(token, 0) if token.__class__ is str else 0
+            if precedence < min_precedence:
+                return left
+            self.position += 1
+            right = self.expression(precedence + 1)
+            if precedence == COMPARISON_PRECEDENCE:
+                left = ('cmp', token, left, right)
+                if tokens[self.position] in COMPARISON:
+                    raise ExpressionError("Karşılaştırmalar zincirlenemez")
+            elif precedence < NOT_PRECEDENCE:
+                left = (token, left, right)
+            else:
+                left = ('bin', token, left, right)
+
+    def operand(self):
+        token = self.take()
+        if token.__class__ is tuple:
+            if token[0] == 'var':
+                self.names.add(token[1])
+            return token
+        if token == '-':
+            return ('neg', self.operand())
+        if token == '+':
+            return self.operand()
+        if token == '(':
+            node = self.expression()
+            self.expect(')')
+            return node
+        raise self.unexpected(token)
+
+
+class Condition:
+    """Ayrıştırılmış koşul; variables okuduğu değişkenlerin adlarıdır"""
+
+    __slots__ = ('source', 'tree', 'variables')
+
+    def __init__(self, source: str, tree, variables: FrozenSet[str]):
+        self.source = source
+        self.tree = tree
+        self.variables = variables
+
+    def __repr__(self) -> str:
+        return f"Condition({self.source!r})"
+
+
+class Effects:
+    """Ayrıştırılmış etkiler: sırayla uygulanan (ad, işleç, ağaç) atamaları"""
+
+    __slots__ = ('source', 'assignments', 'reads', 'writes')
+
+    def __init__(self, source: str, assignments: tuple, reads: FrozenSet[str]):
+        self.source = source
+        self.assignments = assignments
+        self.reads = reads  # Sağ tarafta ve += gibi atamalarda okunanlar
+        self.writes = frozenset(name for name, _, _ in assignments)
+
+    @property
+    def variables(self) -> FrozenSet[str]:
+        return self.reads | self.writes
+
+    def __repr__(self) -> str:
+        return f"Effects({self.source!r})"
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_condition(text: str) -> Condition:
+    """Koşul metnini ayrıştır; aynı metin ikinci kez ayrıştırılmaz"""
+    parser = _Parser(text)
+    if parser.next() is None:
+        raise ExpressionError("Koşul boş")
+    tree = _guarded(parser.expression)
+    if parser.next() is not None:
+        raise parser.unexpected(parser.next())
+    return Condition(text, tree, frozenset(parser.names))
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_effects(text: str) -> Effects:
+    """Etki metnini ayrıştır (ad = ifade; ad += ifade; ...)"""
+    parser = _Parser(text)
+    assignments = []
+    while parser.next() is not None:
+        token = parser.take()
+        if token == ';':
+            continue
+        if token.__class__ is not tuple or token[0] != 'var':
+            raise ExpressionError("Atama değişken adıyla başlamalı")
+        name = token[1]
+        token = parser.take()
+        if token not in ASSIGNMENT:
+            raise ExpressionError(f"'{name}' için atama işleci bekleniyordu")
+        if token != '=':
+            parser.names.add(name)
+        assignments.append((name, token, _guarded(parser.expression)))
+        if parser.next() is not None:
+            parser.expect(';')
+    return Effects(text, tuple(assignments), frozenset(parser.names))
+
+
+def _guarded(function):
+    try:
+        return function()
+    except RecursionError:
+        raise ExpressionError("İfade çok derin iç içe") from None
+
+
+def validate(condition: str = "", effects: str = "") -> None:
+    """Boş olmayan metinleri ayrıştır; hatalıysa ExpressionError"""
+    if condition.strip():
+        parse_condition(condition)
+    if effects.strip():
+        parse_effects(effects)
+
+
+class ExpressionCompiler:
+    """Ayrıştırılmış ifadeleri değişken yerlerine bağlı closure'lara derler
+
+    slots değişken adından değer listesindeki yere eşlemedir (bkz.
+    RuntimeGraph.variable_slots). Derlenenler metinle önbelleğe alınır;
+    aynı koşulu taşıyan binlerce bağlantı tek fonksiyonu paylaşır. Boş
+    metin None döndürür (koşulsuz / etkisiz).
+    """
+
+    def __init__(self, slots: Dict[str, int]):
+        self.slots = slots
+        self._conditions: Dict[str, Optional[Evaluator]] = {}
+        self._effects: Dict[str, Optional[Callable[[list], None]]] = {}
+
+    def condition(self, text: str) -> Optional[Evaluator]:
+        compiled = self._conditions.get(text, self)
+        if compiled is self:
+            if text.strip():
+                compiled = _guarded(lambda: self._compile(parse_condition(text).tree))
+            else:
+                compiled = None
+            self._conditions[text] = compiled
+        return compiled
+
+    def effects(self, text: str) -> Optional[Callable[[list], None]]:
+        compiled = self._effects.get(text, self)
+        if compiled is self:
+            if text.strip():
+                compiled = _guarded(lambda: self._compile_effects(parse_effects(text)))
+            else:
+                compiled = None
+            self._effects[text] = compiled
+        return compiled
+
+    def _slot(self, name: str) -> int:
+        slot = self.slots.get(name)
+        if slot is None:
+            raise ExpressionError(f"Tanımsız değişken: {name}")
+        return slot
+
+    def _compile(self, node) -> Evaluator:
+        kind = node[0]
+        if kind == 'const':
+            value = node[1]
+            return lambda values: value
+        if kind == 'var':
+            slot = self._slot(node[1])
+            return lambda values: values[slot]
+        if kind == 'not':
+            operand = self._compile(node[1])
+            return lambda values: not operand(values)
+        if kind == 'neg':
+            operand = self._compile(node[1])
+            return lambda values: -operand(values)
+        if kind == 'and':
+            left, right = self._compile(node[1]), self._compile(node[2])
+            return lambda values: left(values) and right(values)
+        if kind == 'or':
+            left, right = self._compile(node[1]), self._compile(node[2])
+            return lambda values: left(values) or right(values)
+
+        function = (COMPARISON if kind == 'cmp' else BINARY)[node[1]]
+        left, right = node[2], node[3]
+        # En sık durum değişken ile sabit (gold >= 10): ara çağrı yapılmaz
+        if left[0] == 'var' and right[0] == 'const':
+            slot, value = self._slot(left[1]), right[1]
+            return lambda values: function(values[slot], value)
+        if left[0] == 'var' and right[0] == 'var':
+            first, second = self._slot(left[1]), self._slot(right[1])
+            return lambda values: function(values[first], values[second])
+        left, right = self._compile(left), self._compile(right)
+        return lambda values: function(left(values), right(values))
+
+    def _compile_effects(self, effects: Effects) -> Callable[[list], None]:
+        steps = []
+        for name, token, tree in effects.assignments:
+            slot = self._slot(name)
+            value = self._compile(tree)
+            combine = ASSIGNMENT[token]
+            if combine is None:
+                steps.append(lambda values, slot=slot, value=value:
+                             values.__setitem__(slot, value(values)))
+            else:
+                steps.append(lambda values, slot=slot, value=value, combine=combine:
+                             values.__setitem__(slot, combine(values[slot], value(values))))
+        if len(steps) == 1:
+            return steps[0]
+        steps = tuple(steps)
+
+        def apply(values):
+            for step in steps:
+                step(values)
+        return apply
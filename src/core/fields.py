@@ -0,0 +1,129 @@
+"""Slot tabanlı model sınıfları için alan yardımcıları"""
+import math
+import sys
+import time
+from collections.abc import MutableMapping
+from datetime import datetime
+from functools import lru_cache
+
+
+def now() -> float:
+    """Şimdiki zaman damgası (datetime nesnesi oluşturmadan)"""
+    return time.time()
+
+
+def to_datetime(value) -> datetime:
+    """Saklanan zaman değerini (float damga veya ISO metni) datetime'a çevir"""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value)
+
+
+@lru_cache(maxsize=4096)
+def _second_iso(second: int) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(second))
+
+
+def to_iso(value) -> str:
+    """Saklanan zaman değerini ISO metnine çevir; dosyadan okunan metin aynen döner
+
+    Sonuç datetime.fromtimestamp(value).isoformat() ile aynıdır; saniye
+    kısmı önbellekten geldiği için aynı saniyede oluşan kayıtlar ucuzdur.
+    """
+    if isinstance(value, str):
+        return value
+    second = math.floor(value)
+    micro = round((value - second) * 1e6)
+    if micro >= 1_000_000:
+        second += 1
+        micro -= 1_000_000
+    if micro:
+        return f'{_second_iso(second)}.{micro:06d}'
+    return _second_iso(second)
+
+
+def iso_timestamps(obj) -> tuple:
+    """Modelin (created_at, modified_at) değerleri ISO metni olarak
+
+    created_at/modified_at alanlarını Timestamp ile tutan sınıflar içindir.
+    Biçimlendirilen metin alana geri yazılır; değişmeyen kayıtlar sonraki
+    kayıtlarda yeniden biçimlendirilmez.
+    """
+    created, modified = obj._created, obj._modified
+    if created.__class__ is not str:
+        obj._created = created = to_iso(created)
+    if modified.__class__ is not str:
+        obj._modified = modified = to_iso(modified)
+    return created, modified
+
+
+class Timestamp:
+    """Zamanı ucuz biçimde saklayan alan
+
+    Değer float damga ya da dosyadan okunan ISO metni olarak tutulur;
+    datetime sadece okunurken, ISO metni sadece serileştirirken üretilir.
+    Atama datetime, float damga veya ISO metni kabul eder.
+    """
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return to_datetime(getattr(obj, self.slot))
+
+    def __set__(self, obj, value):
+        if isinstance(value, datetime):
+            value = value.timestamp()
+        setattr(obj, self.slot, value)
+
+
+class Interned:
+    """Az sayıda farklı değer alan metin alanı (tema, tip); değerler paylaşılır"""
+
+    def __init__(self, slot: str):
+        self.slot = slot
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.slot)
+
+    def __set__(self, obj, value):
+        setattr(obj, self.slot, sys.intern(value) if type(value) is str else value)
+
+
+class FieldView(MutableMapping):
+    """Nesnenin sayısal slot'larına dict gibi erişim (position, size)
+
+    view['x'] = 5 doğrudan nesnenin alanını değiştirir; dict(view) ya da
+    view.copy() bağımsız bir dict döndürür.
+    """
+
+    __slots__ = ('_obj', '_slots')
+
+    def __init__(self, obj, slots: dict):
+        self._obj = obj
+        self._slots = slots  # anahtar -> slot adı
+
+    def __getitem__(self, key):
+        return getattr(self._obj, self._slots[key])
+
+    def __setitem__(self, key, value):
+        setattr(self._obj, self._slots[key], value)
+
+    def __delitem__(self, key):
+        raise TypeError(f"'{key}' alanı silinemez")
+
+    def __iter__(self):
+        return iter(self._slots)
+
+    def __len__(self):
+        return len(self._slots)
+
+    def copy(self) -> dict:
+        return dict(self.items())
+
+    def __repr__(self):
+        return repr(self.copy())
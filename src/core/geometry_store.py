@@ -0,0 +1,164 @@
+from typing import Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy isteğe bağlı; yoksa Board uzamsal indekse döner
+    np = None
+
+Rect = Tuple[float, float, float, float]  # (left, top, right, bottom)
+
+AVAILABLE = np is not None
+
+
+class GeometryStore:
+    """Board elementlerinin konum ve boyutları için sütunlu (NumPy) depo
+
+    ID'ler ve x, y, genişlik, yükseklik paralel dizilerde tutulur; silme
+    son satırın boşalan yere taşınmasıyla O(1)'dir. Sınırlar, dikdörtgen/nokta
+    sorguları, en yakın komşu ve toplu kaydırma vektörel çalışır, böylece
+    yerleşim, ayıklama ve dışa aktarma gibi işlemler QGraphicsItem'a dokunmaz.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    def __init__(self, capacity: int = INITIAL_CAPACITY):
+        if np is None:
+            raise RuntimeError("GeometryStore için NumPy kurulu olmalı")
+        capacity = max(1, capacity)
+        self.ids: List[str] = []  # satır -> element_id
+        self._rows: Dict[str, int] = {}  # element_id -> satır
+        self._data = np.empty((4, capacity), dtype=np.float64)  # x, y, width, height
+
+    @classmethod
+    def from_elements(cls, elements: Iterable) -> 'GeometryStore':
+        """Elementlerden toplu olarak oluştur"""
+        elements = list(elements)
+        store = cls(max(cls.INITIAL_CAPACITY, len(elements)))
+        store.ids = [element.id for element in elements]
+        store._rows = {element_id: row for row, element_id in enumerate(store.ids)}
+        if elements:
+            store._data[:, :len(elements)] = np.array(
+                [element.geometry() for element in elements], dtype=np.float64).T
+        return store
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, element_id: str) -> bool:
+        return element_id in self._rows
+
+    # --- Sütunlar (canlı görünümler; depo değişince geçersizleşir) ---
+
+    @property
+    def x(self):
+        return self._data[0, :len(self.ids)]
+
+    @property
+    def y(self):
+        return self._data[1, :len(self.ids)]
+
+    @property
+    def width(self):
+        return self._data[2, :len(self.ids)]
+
+    @property
+    def height(self):
+        return self._data[3, :len(self.ids)]
+
+    def rows(self, element_ids: Iterable[str]):
+        """ID'lerin satır numaraları (depoda olmayanlar atlanır)"""
+        rows = self._rows
+        return np.fromiter((rows[eid] for eid in element_ids if eid in rows), dtype=np.intp)
+
+    # --- Güncelleme ---
+
+    def set(self, element_id: str, x: float, y: float, width: float, height: float) -> None:
+        """Elementin geometrisini ekle ya da güncelle"""
+        row = self._rows.get(element_id)
+        if row is None:
+            row = len(self.ids)
+            if row == self._data.shape[1]:
+                grown = np.empty((4, row * 2), dtype=np.float64)
+                grown[:, :row] = self._data
+                self._data = grown
+            self.ids.append(element_id)
+            self._rows[element_id] = row
+        self._data[:, row] = (x, y, width, height)
+
+    def remove(self, element_id: str) -> None:
+        """Elementi çıkar; son satır boşalan yere taşınır"""
+        row = self._rows.pop(element_id, None)
+        if row is None:
+            return
+        last = len(self.ids) - 1
+        if row != last:
+            moved = self.ids[last]
+            self.ids[row] = moved
+            self._rows[moved] = row
+            self._data[:, row] = self._data[:, last]
+        self.ids.pop()
+
+    def translate(self, element_ids: Optional[Iterable[str]], dx: float, dy: float) -> None:
+        """Elementleri (None ise hepsini) toplu kaydır"""
+        rows = slice(0, len(self.ids)) if element_ids is None else self.rows(element_ids)
+        self._data[0, rows] += dx
+        self._data[1, rows] += dy
+
+    # --- Sorgular ---
+
+    def rect(self, element_id: str) -> Optional[Rect]:
+        """Elementin dikdörtgeni"""
+        row = self._rows.get(element_id)
+        if row is None:
+            return None
+        x, y, width, height = self._data[:, row].tolist()
+        return (x, y, x + width, y + height)
+
+    def bounds(self, element_ids: Optional[Iterable[str]] = None) -> Optional[Rect]:
+        """Elementleri (None ise hepsini) kapsayan dikdörtgen (boşsa None)"""
+        x, y, width, height = self.x, self.y, self.width, self.height
+        if element_ids is not None:
+            rows = self.rows(element_ids)
+            x, y, width, height = x[rows], y[rows], width[rows], height[rows]
+        if not len(x):
+            return None
+        return (float(x.min()), float(y.min()),
+                float((x + width).max()), float((y + height).max()))
+
+    def query_rect(self, rect: Rect) -> List[str]:
+        """Dikdörtgenle kesişen element ID'leri"""
+        left, top, right, bottom = rect
+        x, y = self.x, self.y
+        mask = ((x <= right) & (x + self.width >= left)
+                & (y <= bottom) & (y + self.height >= top))
+        return self._ids_for(np.flatnonzero(mask))
+
+    def query_point(self, px: float, py: float) -> List[str]:
+        """Noktayı içeren element ID'leri"""
+        return self.query_rect((px, py, px, py))
+
+    def nearest(self, px: float, py: float, k: int = 1,
+                max_distance: Optional[float] = None) -> List[Tuple[str, float]]:
+        """Noktaya en yakın k element: (element_id, uzaklık) listesi
+
+        Uzaklık noktanın element dikdörtgenine olan uzaklığıdır (içindeyse 0).
+        """
+        count = len(self.ids)
+        if not count or k <= 0:
+            return []
+        x, y = self.x, self.y
+        dx = np.maximum(np.maximum(x - px, px - (x + self.width)), 0.0)
+        dy = np.maximum(np.maximum(y - py, py - (y + self.height)), 0.0)
+        distances = np.hypot(dx, dy)
+        if k < count:
+            rows = np.argpartition(distances, k - 1)[:k]
+        else:
+            rows = np.arange(count)
+        rows = rows[np.argsort(distances[rows], kind='stable')]
+        if max_distance is not None:
+            rows = rows[distances[rows] <= max_distance]
+        return [(self.ids[row], float(distances[row])) for row in rows.tolist()]
+
+    def _ids_for(self, rows) -> List[str]:
+        ids = self.ids
+        return [ids[row] for row in rows.tolist()]
@@ -0,0 +1,272 @@
+"""Başlangıç elementinden yol istatistikleri: yol sayıları, derinlikler, baskın elementler"""
+from typing import Dict, Iterator, List, Optional, Set
+
+
+class PathStatistics:
+    """GraphAnalysis üzerinde başlangıçtan sonlara giden yolların istatistikleri
+
+    Döngüler analizin güçlü bağlı bileşenleriyle yoğunlaştırılır: bir döngü
+    tek adım sayılır, yoksa yol sayısı sonsuz olurdu. Başlangıçtan erişilen
+    bileşenler topolojik sırayla bir kez dolaşılır ve her bileşen için
+    öncüllerinden yol sayısı, en kısa/en uzun derinlik ve baskın (her yolun
+    geçtiği) bileşen hesaplanır. Yollar hiçbir zaman tek tek sayılmaz;
+    Python tam sayıları sınırsız olduğundan 10^20 yollu bir grafik de
+    doğrusal sürede sayılır.
+
+    Sonuçlar analizin sürümüyle önbellekte tutulur; graf ya da başlangıç
+    değişince ilk sorguda yeniden hesaplanır. Son (ending), çıkan bağlantısı
+    olmayan ve başlangıçtan erişilen elementtir.
+    """
+
+    def __init__(self, analysis):
+        self.analysis = analysis
+        self._version = None  # Hesaplanan sonuçların analiz sürümü
+        self._start_comp: Optional[int] = None
+        self._order: List[int] = []  # Erişilen bileşenler, topolojik sırada
+        self._count: Dict[int, int] = {}  # bileşen -> başlangıçtan yol sayısı
+        self._shortest: Dict[int, int] = {}
+        self._longest: Dict[int, int] = {}
+        self._idom: Dict[int, Optional[int]] = {}  # bileşen -> en yakın baskın bileşen
+        self._dom_depth: Dict[int, int] = {}
+        self._endings: List[int] = []
+        self._to_end: Set[int] = set()  # Bir sona ulaşabilen bileşenler
+
+    # --- Hesaplama ---
+
+    @property
+    def is_current(self) -> bool:
+        """Önbellekteki sonuçlar grafın son haline mi ait?"""
+        return self._version is not None and self._version == self.analysis.version
+
+    def invalidate(self) -> None:
+        """Önbelleği boşalt (sonraki sorguda yeniden hesaplanır)"""
+        self._version = None
+
+    def _ensure(self) -> None:
+        analysis = self.analysis
+        analysis.refresh()
+        if self._version != analysis.version:
+            self._compute()
+            self._version = analysis.version
+
+    def _compute(self) -> None:
+        analysis = self.analysis
+        self._start_comp = None
+        self._order = []
+        self._count, self._shortest, self._longest = {}, {}, {}
+        self._idom, self._dom_depth = {}, {}
+        self._endings = []
+        self._to_end = set()
+        start = analysis.start
+        if start is None or start not in analysis:
+            return
+        source = analysis.component_of(start)
+        self._start_comp = source
+
+        # Erişilen bileşenler ve erişilen öncüllerinin sayısı
+        indegree = {source: 0}
+        stack = [source]
+        while stack:
+            comp = stack.pop()
+            for nxt in analysis.component_successors(comp):
+                if nxt in indegree:
+                    indegree[nxt] += 1
+                else:
+                    indegree[nxt] = 1
+                    stack.append(nxt)
+        # Kahn: liste dolaşılırken sonuna eklenir
+        order = [source]
+        for comp in order:
+            for nxt in analysis.component_successors(comp):
+                indegree[nxt] -= 1
+                if not indegree[nxt]:
+                    order.append(nxt)
+        self._order = order
+
+        count, shortest, longest = self._count, self._shortest, self._longest
+        idom, depth = self._idom, self._dom_depth
+        count[source], shortest[source], longest[source] = 1, 0, 0
+        idom[source], depth[source] = None, 0
+        for comp in order[1:]:
+            total, low, high, dominator = 0, None, 0, None
+            for prev in analysis.component_predecessors(comp):
+                if prev not in count:
+                    continue  # Başlangıçtan erişilmeyen öncül
+                total += count[prev]
+                if low is None or shortest[prev] < low:
+                    low = shortest[prev]
+                if longest[prev] > high:
+                    high = longest[prev]
+                dominator = prev if dominator is None else self._intersect(dominator, prev)
+            count[comp] = total
+            shortest[comp] = low + 1
+            longest[comp] = high + 1
+            idom[comp] = dominator
+            depth[comp] = depth[dominator] + 1
+
+        for comp in order:
+            if not analysis.component_successors(comp):
+                node = self._element_of(comp)
+                if node is not None and not analysis.successors(node):
+                    self._endings.append(comp)
+        to_end = self._to_end
+        to_end.update(self._endings)
+        for comp in reversed(order):
+            if comp not in to_end and any(nxt in to_end
+                                          for nxt in analysis.component_successors(comp)):
+                to_end.add(comp)
+
+    def _intersect(self, a: int, b: int) -> int:
+        """Baskınlar ağacında iki bileşenin en yakın ortak atası"""
+        idom, depth = self._idom, self._dom_depth
+        while a != b:
+            if depth[a] > depth[b]:
+                a = idom[a]
+            else:
+                b = idom[b]
+        return a
+
+    def _element_of(self, comp: int) -> Optional[str]:
+        """Bileşeni temsil eden element: tek elementliyse o, başlangıç bileşeniyse başlangıç"""
+        if comp == self._start_comp:
+            return self.analysis.start
+        members = self.analysis.component_members(comp)
+        if len(members) == 1:
+            return next(iter(members))
+        return None
+
+    def _comp(self, element_id: str) -> Optional[int]:
+        self._ensure()
+        comp = self.analysis.component_of(element_id)
+        return comp if comp in self._count else None
+
+    # --- Sonuçlar ---
+
+    def path_count(self, element_id: Optional[str] = None) -> int:
+        """Başlangıçtan elemente giden yol sayısı; element verilmezse tüm sonlara"""
+        if element_id is None:
+            self._ensure()
+            return sum(self._count[comp] for comp in self._endings)
+        comp = self._comp(element_id)
+        return self._count[comp] if comp is not None else 0
+
+    def shortest_depth(self, element_id: str) -> Optional[int]:
+        """Başlangıçtan en az kaç adımda ulaşılır (erişilemiyorsa None)"""
+        comp = self._comp(element_id)
+        return self._shortest[comp] if comp is not None else None
+
+    def longest_depth(self, element_id: str) -> Optional[int]:
+        """Başlangıçtan en fazla kaç adımda ulaşılır (döngüler tek adım)"""
+        comp = self._comp(element_id)
+        return self._longest[comp] if comp is not None else None
+
+    def endings(self) -> List[str]:
+        """Başlangıçtan erişilen sonlar, topolojik sırada"""
+        self._ensure()
+        return [self._element_of(comp) for comp in self._endings]
+
+    def dominators(self, element_id: str) -> List[str]:
+        """Başlangıçtan elemente giden her yolun geçtiği elementler (başlangıç önce)
+
+        Döngü bileşenleri atlanır: her yol döngüye girer ama hep aynı
+        elementinden girmeyebilir.
+        """
+        comp = self._comp(element_id)
+        if comp is None:
+            return []
+        return self._chain(self._idom[comp])
+
+    def common_dominators(self) -> List[str]:
+        """Her oynanışın (başlangıçtan herhangi bir sona) geçtiği elementler"""
+        self._ensure()
+        if not self._endings:
+            return []
+        common = self._endings[0]
+        for comp in self._endings[1:]:
+            common = self._intersect(common, comp)
+        return self._chain(common)
+
+    def _chain(self, comp: Optional[int]) -> List[str]:
+        chain = []
+        while comp is not None:
+            node = self._element_of(comp)
+            if node is not None:
+                chain.append(node)
+            comp = self._idom[comp]
+        chain.reverse()
+        return chain
+
+    def summary(self) -> Dict[str, Optional[int]]:
+        """Arayüz için: oynanış ve son sayısı, sonlara en kısa ve en uzun derinlik"""
+        self._ensure()
+        endings = self._endings
+        return {
+            'playthroughs': sum(self._count[comp] for comp in endings),
+            'endings': len(endings),
+            'shortest': min((self._shortest[comp] for comp in endings), default=None),
+            'longest': max((self._longest[comp] for comp in endings), default=None),
+        }
+
+    # --- Somut yollar ---
+
+    def iter_paths(self, target: Optional[str] = None, limit: Optional[int] = None,
+                   max_length: Optional[int] = None) -> Iterator[List[str]]:
+        """Başlangıçtan hedefe (verilmezse herhangi bir sona) giden somut yollar
+
+        Yollar element tekrarı olmadan derinlik öncelikli ve tembel üretilir;
+        en fazla limit yol ve max_length adım. Hedefe ya da bir sona
+        ulaşamayan bileşenlere hiç girilmez. Üretim sürerken graf değişirse
+        üreteç baştan başlatılmalıdır.
+        """
+        self._ensure()
+        analysis = self.analysis
+        start = analysis.start
+        if start is None or start not in analysis or (limit is not None and limit <= 0):
+            return
+        if target is None:
+            allowed = self._to_end
+        else:
+            goal = self._comp(target)
+            if goal is None:
+                return
+            # Hedefin erişilen atası olan bileşenler
+            allowed = {goal}
+            stack = [goal]
+            while stack:
+                comp = stack.pop()
+                for prev in analysis.component_predecessors(comp):
+                    if prev not in allowed and prev in self._count:
+                        allowed.add(prev)
+                        stack.append(prev)
+        if self._start_comp not in allowed:
+            return
+
+        def is_goal(node):
+            return node == target if target is not None else not analysis.successors(node)
+
+        if is_goal(start):
+            yield [start]
+            return
+        component_of = analysis.component_of
+        produced = 0
+        path = [start]
+        on_path = {start}
+        pending = [iter(list(analysis.successors(start)))]
+        while pending:
+            child = next(pending[-1], None)
+            if child is None:
+                pending.pop()
+                on_path.discard(path.pop())
+                continue
+            if (child in on_path or component_of(child) not in allowed
+                    or (max_length is not None and len(path) > max_length)):
+                continue
+            if is_goal(child):
+                yield path + [child]
+                produced += 1
+                if limit is not None and produced >= limit:
+                    return
+                continue
+            path.append(child)
+            on_path.add(child)
+            pending.append(iter(list(analysis.successors(child))))
@@ -3,6 +3,7 @@ from typing import List, Optional, Dict
 from datetime import datetime
 
 from src.core.board import Board
+from src.core.variable import Variable
 
 class Project:
     """Narrative tool projesi için ana sınıf"""
@@ -17,26 +18,53 @@ class Project:
         self.variables: Dict[str, 'Variable'] = {}  # variable_name -> Variable
         self.starting_element: Optional[str] = None  # element_id
         self.save_path: Optional[str] = None
+        self.save_state = None  # Diskteki kaydın durumu (utils.file_ops yönetir)
+        self._dirty = False  # Board içerikleri dışında kaydedilmemiş değişiklik
         
     def add_board(self, board: 'Board') -> None:
         """Projeye yeni bir board ekle"""
         self.boards[board.id] = board
-        self.modified_at = datetime.now()
+        self.mark_dirty()
         
     def remove_board(self, board_id: str) -> None:
         """Projeden bir board'u kaldır"""
         if board_id in self.boards:
             del self.boards[board_id]
-            self.modified_at = datetime.now()
-            
+            self.mark_dirty()
+
+    def mark_dirty(self) -> None:
+        """Proje bilgisi, değişkenler ya da board listesi/bilgisi değişti"""
+        self._dirty = True
+        self.modified_at = datetime.now()
+
+    def clear_dirty(self) -> None:
+        """Kayıttan sonra çağrılır (board'lar kendi değişikliklerini ayrıca temizler)"""
+        self._dirty = False
+
+    @property
+    def is_dirty(self) -> bool:
+        """Son kayıttan beri kaydedilmemiş değişiklik var mı?"""
+        return self._dirty or any(board.is_dirty for board in self.boards.values())
+
     def get_board(self, board_id: str) -> Optional['Board']:
         """ID'ye göre board getir"""
         return self.boards.get(board_id)
     
+    def add_variable(self, variable: 'Variable') -> None:
+        """Projeye değişken ekle (aynı isimdeki değişkenin yerine geçer)"""
+        self.variables[variable.name] = variable
+        self.mark_dirty()
+
+    def remove_variable(self, name: str) -> None:
+        """Projeden bir değişkeni kaldır"""
+        if name in self.variables:
+            del self.variables[name]
+            self.mark_dirty()
+
     def set_starting_element(self, element_id: str) -> None:
         """Başlangıç elementini ayarla"""
         self.starting_element = element_id
-        self.modified_at = datetime.now()
+        self.mark_dirty()
     
     def to_dict(self):
         """Projeyi JSON serileştirme için dict'e çevir"""
@@ -59,6 +87,8 @@ class Project:
         project.created_at = datetime.fromisoformat(data['created_at'])
         project.modified_at = datetime.fromisoformat(data['modified_at'])
         project.starting_element = data['starting_element']
+        project.variables = {name: Variable.from_dict(var)
+                             for name, var in data.get('variables', {}).items()}
         
-        # Board'ları, component'leri ve variable'ları daha sonra yükleyeceğiz
+        # Board'ları ve component'leri daha sonra yükleyeceğiz
         return project
\ No newline at end of file
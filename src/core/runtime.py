@@ -0,0 +1,585 @@
+"""Anlatı çalışma zamanı: başlangıç elementinden oynanış ve toplu (arayüzsüz) simülasyon"""
+import gc
+import os
+import random
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+from src.core.expressions import ExpressionCompiler, ExpressionError
+
+# Sonsuz döngüde kalan oynanışlar bu kadar seçimden sonra kesilir
+DEFAULT_MAX_STEPS = 10_000
+# Bundan az oynanış için süreç havuzu açılmaz (açılış maliyeti kazançtan büyük)
+PARALLEL_MIN_RUNS = 500
+# Her işçiye düşen oynanışlar bu kadar parçaya bölünür (yük dengesi için)
+BATCHES_PER_WORKER = 4
+
+
+class RuntimeGraph:
+    """Oynanış için projenin sıkıştırılmış, salt okunur kopyası
+
+    Elementler sıra numarasıyla tutulur; bağlantılar kaynak elemente göre
+    sıralanıp CSR dizilerine (offsets/targets) yazılır, böylece bir seçim
+    noktası tek dilim okumasıdır. Koşul ve etki metinleri kurulurken bir kez
+    derlenir; hiçbir bağlantıda yoksa conditions/effects None kalır ve
+    seçimler doğrudan dilimden okunur. İşçilere metinler gönderilir,
+    derleme her işçide bir kez yapılır. Proje sonradan değişirse grafik
+    yeniden kurulmalıdır.
+    """
+
+    __slots__ = ('element_ids', 'titles', 'offsets', 'targets', 'labels', 'start',
+                 'variable_slots', 'defaults', 'condition_texts', 'effect_texts',
+                 'conditions', 'effects', '_index')
+
+    def __init__(self, element_ids: List[str], titles: List[str], offsets: array,
+                 targets: array, labels: List[str], start: Optional[int],
+                 variable_slots: Dict[str, int], defaults: list,
+                 condition_texts: Optional[List[str]] = None,
+                 effect_texts: Optional[List[str]] = None):
+        self.element_ids = element_ids
+        self.titles = titles
+        self.offsets = offsets  # element -> ilk seçiminin konumu (uzunluk: element + 1)
+        self.targets = targets  # seçim -> hedef element
+        self.labels = labels  # seçim -> bağlantı etiketi
+        self.start = start  # Başlangıç elementinin sırası (yoksa None)
+        self.variable_slots = variable_slots  # değişken adı -> değer listesindeki yeri
+        self.defaults = defaults
+        self.condition_texts = condition_texts or [""] * len(targets)
+        self.effect_texts = effect_texts or [""] * len(targets)
+        self.conditions: Optional[list] = None  # seçim -> derlenmiş koşul (koşulsuzsa None)
+        self.effects: Optional[list] = None  # seçim -> derlenmiş etki
+        self._index: Optional[Dict[str, int]] = None
+        self._compile()
+
+    def __getstate__(self):
+        return tuple(getattr(self, name) for name in self.__slots__[:-3])
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, value)
+        self.conditions = self.effects = self._index = None
+        self._compile()
+
+    def _compile(self) -> None:
+        """Koşul ve etki metinlerini derle; aynı metin bir kez derlenir"""
+        has_conditions = any(self.condition_texts)
+        has_effects = any(self.effect_texts)
+        if not has_conditions and not has_effects:
+            return
+        compiler = ExpressionCompiler(self.variable_slots)
+        choice = 0
+        try:
+            with _collector_paused():
+                if has_conditions:
+                    compile_condition = compiler.condition
+                    conditions = []
+                    for choice, text in enumerate(self.condition_texts):
+                        conditions.append(compile_condition(text))
+                    self.conditions = conditions
+                if has_effects:
+                    compile_effects = compiler.effects
+                    effects = []
+                    for choice, text in enumerate(self.effect_texts):
+                        effects.append(compile_effects(text))
+                    self.effects = effects
+        except ExpressionError as error:
+            raise ExpressionError(f"{self.describe_choice(choice)}: {error}") from None
+
+    @classmethod
+    def from_project(cls, project) -> 'RuntimeGraph':
+        """Projeden kur; tembel board'lar yüklenmeden kaynaklarından okunur"""
+        with _collector_paused():
+            return cls._from_project(project)
+
+    @classmethod
+    def _from_project(cls, project) -> 'RuntimeGraph':
+        element_ids, titles = [], []
+        edges = []
+        for board in project.boards.values():
+            source = board.lazy_source
+            if source is not None and hasattr(source, 'iter_records'):
+                records = source.iter_records()
+            else:
+                records = [('element', element) for element in board.elements.values()]
+                records.extend(('connection', connection)
+                               for connection in board.connections.values())
+            for kind, record in records:
+                if kind == 'element':
+                    element_ids.append(record.id)
+                    titles.append(record.title)
+                else:
+                    edges.append((record.source_id, record.target_id, record.label,
+                                  record.condition, record.effects))
+
+        index = {element_id: i for i, element_id in enumerate(element_ids)}
+        # Kaynağa göre sayma sıralaması; aynı elementin seçimleri ekleme sırasını korur
+        counts = array('I', bytes(4 * (len(element_ids) + 1)))
+        resolved = []
+        for source_id, target_id, label, condition, effects in edges:
+            source, target = index.get(source_id), index.get(target_id)
+            if source is None or target is None:
+                continue  # Silinmiş elemente sarkan bağlantı
+            counts[source + 1] += 1
+            resolved.append((source, target, label, condition, effects))
+        for i in range(len(element_ids)):
+            counts[i + 1] += counts[i]
+        offsets = array('I', counts)
+        targets = array('I', bytes(4 * len(resolved)))
+        labels = [""] * len(resolved)
+        conditions = [""] * len(resolved)
+        effects = [""] * len(resolved)
+        for source, target, label, condition, effect in resolved:
+            position = counts[source]
+            counts[source] = position + 1
+            targets[position] = target
+            labels[position] = label
+            conditions[position] = condition
+            effects[position] = effect
+
+        variables = list(project.variables.values())
+        return cls(element_ids, titles, offsets, targets, labels,
+                   index.get(project.starting_element),
+                   {variable.name: slot for slot, variable in enumerate(variables)},
+                   [variable.default for variable in variables], conditions, effects)
+
+    def __len__(self) -> int:
+        return len(self.element_ids)
+
+    def index_of(self, element_id: str) -> Optional[int]:
+        """Element ID'sinin sırası (ilk çağrıda eşleme kurulur)"""
+        if self._index is None:
+            self._index = {element_id: i for i, element_id in enumerate(self.element_ids)}
+        return self._index.get(element_id)
+
+    def choices(self, element: int) -> range:
+        """Elementin seçimlerinin konumları (targets/labels dizilerinde)"""
+        return range(self.offsets[element], self.offsets[element + 1])
+
+    def source_of(self, choice: int) -> int:
+        """Seçimin çıktığı element"""
+        return bisect_right(self.offsets, choice) - 1
+
+    def describe_choice(self, choice: int) -> str:
+        """Hata mesajları için 'kaynak -> hedef (etiket)'"""
+        titles = self.titles
+        text = f"{titles[self.source_of(choice)]} -> {titles[self.targets[choice]]}"
+        return f"{text} ({self.labels[choice]})" if self.labels[choice] else text
+
+    def is_ending(self, element: int) -> bool:
+        return self.offsets[element] == self.offsets[element + 1]
+
+    def endings(self) -> List[int]:
+        """Çıkan bağlantısı olmayan elementler"""
+        offsets = self.offsets
+        return [i for i in range(len(self.element_ids)) if offsets[i] == offsets[i + 1]]
+
+    def new_state(self) -> 'VariableState':
+        """Değişkenleri varsayılan değerlerinde yeni oynanış durumu"""
+        return VariableState(self.variable_slots, self.defaults)
+
+
+@contextmanager
+def _collector_paused():
+    """Kurulum yüz binlerce demet ve closure oluşturur; toplayıcının büyük
+    projelerde tekrar tekrar tam tarama yapmasını önlemek için kapatılır"""
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if collecting:
+            gc.enable()
+
+
+class VariableState:
+    """Bir oynanışın değişken değerleri
+
+    İsimden yere eşleme grafikte bir kez tutulur ve tüm oynanışlarca
+    paylaşılır; oynanış başına sadece düz bir değer listesi kopyalanır.
+    """
+
+    __slots__ = ('slots', 'values')
+
+    def __init__(self, slots: Dict[str, int], values: Iterable):
+        self.slots = slots
+        self.values = list(values)
+
+    def __getitem__(self, name: str):
+        return self.values[self.slots[name]]
+
+    def __setitem__(self, name: str, value) -> None:
+        self.values[self.slots[name]] = value
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.slots
+
+    def get(self, name: str, default=None):
+        slot = self.slots.get(name)
+        return default if slot is None else self.values[slot]
+
+    def copy(self) -> 'VariableState':
+        return VariableState(self.slots, self.values)
+
+    def as_dict(self) -> dict:
+        values = self.values
+        return {name: values[slot] for name, slot in self.slots.items()}
+
+
+class Playthrough:
+    """Başlangıç elementinden tek bir oynanış
+
+    path ziyaret edilen elementlerin sıralarını tutar (başlangıç dahil).
+    Koşulu yanlış olan bağlantılar seçilemez, seçilen bağlantının etkileri
+    state'e uygulanır. Seçilebilecek bağlantı kalmayınca oynanış biter;
+    element bir son değilse oynanış koşullar yüzünden takılmıştır.
+    """
+
+    __slots__ = ('graph', 'state', 'current', 'path')
+
+    def __init__(self, graph: RuntimeGraph, state: Optional[VariableState] = None):
+        if graph.start is None:
+            raise ValueError("Başlangıç elementi seçilmedi")
+        self.graph = graph
+        self.state = state if state is not None else graph.new_state()
+        self.current: int = graph.start
+        self.path = array('I', (graph.start,))
+
+    @property
+    def element_id(self) -> str:
+        return self.graph.element_ids[self.current]
+
+    @property
+    def finished(self) -> bool:
+        return not self.choices()
+
+    @property
+    def blocked(self) -> bool:
+        """Çıkan bağlantı var ama hiçbirinin koşulu sağlanmıyor"""
+        return not self.graph.is_ending(self.current) and not self.choices()
+
+    @property
+    def steps(self) -> int:
+        """Şimdiye kadar yapılan seçim sayısı"""
+        return len(self.path) - 1
+
+    def choices(self) -> Sequence[int]:
+        """Şu anki elementte seçilebilecek bağlantıların konumları"""
+        graph = self.graph
+        choices = graph.choices(self.current)
+        conditions = graph.conditions
+        if conditions is None:
+            return choices
+        values = self.state.values
+        try:
+            return [choice for choice in choices
+                    if conditions[choice] is None or conditions[choice](values)]
+        except Exception as error:
+            raise self._evaluation_error(choices, conditions, error) from error
+
+    def choice_labels(self) -> List[str]:
+        labels = self.graph.labels
+        return [labels[choice] for choice in self.choices()]
+
+    def choose(self, choice: int) -> int:
+        """Bağlantıyı izle ve yeni elementin sırasını döndür"""
+        if choice not in self.choices():
+            raise ValueError(f"Geçersiz seçim: {choice}")
+        return self._follow(choice)
+
+    def _follow(self, choice: int) -> int:
+        """Seçilebilirliği denetlemeden izle (choices()'tan gelen seçimler için)"""
+        graph = self.graph
+        effects = graph.effects
+        if effects is not None and effects[choice] is not None:
+            try:
+                effects[choice](self.state.values)
+            except Exception as error:
+                raise ExpressionError(f"{graph.describe_choice(choice)}: {error}") from error
+        self.current = graph.targets[choice]
+        self.path.append(self.current)
+        return self.current
+
+    def choose_label(self, label: str) -> int:
+        """Etiketi verilen ilk seçimi izle"""
+        labels = self.graph.labels
+        for choice in self.choices():
+            if labels[choice] == label:
+                return self._follow(choice)
+        raise ValueError(f"Seçim bulunamadı: {label!r}")
+
+    def _evaluation_error(self, choices, conditions, error) -> ExpressionError:
+        """Değerlendirilemeyen koşulu bulup bağlantısıyla bildir"""
+        values = self.state.values
+        for choice in choices:
+            try:
+                if conditions[choice] is not None:
+                    conditions[choice](values)
+            except Exception:
+                return ExpressionError(f"{self.graph.describe_choice(choice)}: {error}")
+        return ExpressionError(str(error))
+
+
+# Strateji: (oynanış, seçimler, rastgele üreteç) -> seçilen konum.
+# Süreç havuzunda kullanılacaksa modül düzeyinde tanımlı (pickle edilebilir) olmalı.
+Strategy = Callable[[Playthrough, Sequence[int], random.Random], int]
+Script = Sequence[Union[int, str]]
+
+
+def random_choice(playthrough: Playthrough, choices: Sequence[int], rng: random.Random) -> int:
+    """Seçimlerden eşit olasılıkla birini seç"""
+    return choices[rng.randrange(len(choices))]
+
+
+class SimulationReport:
+    """Toplu simülasyon sonuçları
+
+    Ziyaret sayısı döngülerdeki her geçişi sayar. Uzunluk oynanıştaki
+    seçim sayısıdır; kesilen, takılan ve senaryosu erken biten oynanışlar
+    da ortalamaya girer.
+    """
+
+    def __init__(self, graph: RuntimeGraph, seed: Optional[int] = None):
+        self.graph = graph
+        self.seed = seed  # Rastgele oynanışları aynen tekrarlamak için
+        self.runs = 0
+        self.completed = 0  # Bir sona ulaşan oynanışlar
+        self.truncated = 0  # max_steps'te kesilenler
+        self.stopped = 0  # Senaryosu sona varmadan bitenler
+        self.blocked = 0  # Son olmayan elementte hiçbir koşul sağlanmadığı için kalanlar
+        self.total_steps = 0
+        self.longest = 0
+        self.visits = array('Q', bytes(8 * len(graph)))
+        self.ending_counts: Dict[int, int] = {}
+        self.blocked_counts: Dict[int, int] = {}
+
+    def _merge(self, batch: tuple) -> None:
+        """İşçiden gelen kısmi sonucu ekle"""
+        (runs, completed, truncated, stopped, total_steps, longest, visits, endings,
+         blocked) = batch
+        self.runs += runs
+        self.completed += completed
+        self.truncated += truncated
+        self.stopped += stopped
+        self.blocked += sum(blocked.values())
+        self.total_steps += total_steps
+        self.longest = max(self.longest, longest)
+        merged = self.visits
+        for element, count in visits.items():
+            merged[element] += count
+        for element, count in endings.items():
+            self.ending_counts[element] = self.ending_counts.get(element, 0) + count
+        for element, count in blocked.items():
+            self.blocked_counts[element] = self.blocked_counts.get(element, 0) + count
+
+    @property
+    def average_length(self) -> float:
+        return self.total_steps / self.runs if self.runs else 0.0
+
+    def visit_counts(self) -> Dict[str, int]:
+        """Element ID -> ziyaret sayısı (ziyaret edilmeyenler hariç)"""
+        element_ids = self.graph.element_ids
+        return {element_ids[i]: count for i, count in enumerate(self.visits) if count}
+
+    def unvisited(self) -> List[str]:
+        """Hiçbir oynanışta ziyaret edilmeyen elementler"""
+        element_ids = self.graph.element_ids
+        return [element_ids[i] for i, count in enumerate(self.visits) if not count]
+
+    def endings_reached(self) -> Dict[str, int]:
+        """Son element ID -> o sonda biten oynanış sayısı"""
+        element_ids = self.graph.element_ids
+        return {element_ids[i]: count for i, count in sorted(self.ending_counts.items())}
+
+    def blocked_at(self) -> Dict[str, int]:
+        """Element ID -> koşullar yüzünden orada takılan oynanış sayısı"""
+        element_ids = self.graph.element_ids
+        return {element_ids[i]: count for i, count in sorted(self.blocked_counts.items())}
+
+    def unreached_endings(self) -> List[str]:
+        """Hiçbir oynanışın ulaşmadığı sonlar (grafikten erişilemeyenler dahil)"""
+        element_ids = self.graph.element_ids
+        return [element_ids[i] for i in self.graph.endings() if i not in self.ending_counts]
+
+    def summary(self) -> dict:
+        return {
+            'runs': self.runs,
+            'completed': self.completed,
+            'truncated': self.truncated,
+            'stopped': self.stopped,
+            'blocked': self.blocked,
+            'average_length': self.average_length,
+            'longest': self.longest,
+            'endings_reached': len(self.ending_counts),
+            'unreached_endings': len(self.unreached_endings()),
+        }
+
+
+class Simulator:
+    """Çok sayıda oynanışı arayüzsüz oynatır
+
+    Rastgele oynanışlarda her oynanışın üreteci (seed, sıra) ikilisinden
+    türetilir; sonuçlar işçi sayısından bağımsız olarak aynı seed ile
+    aynen tekrarlanır. workers > 1 iken oynanışlar parçalara bölünüp
+    süreç havuzunda oynatılır; grafik her işçiye bir kez gönderilir.
+    """
+
+    def __init__(self, graph: RuntimeGraph, max_steps: int = DEFAULT_MAX_STEPS):
+        if graph.start is None:
+            raise ValueError("Başlangıç elementi seçilmedi")
+        self.graph = graph
+        self.max_steps = max_steps
+
+    @classmethod
+    def from_project(cls, project, max_steps: int = DEFAULT_MAX_STEPS) -> 'Simulator':
+        return cls(RuntimeGraph.from_project(project), max_steps)
+
+    def run(self, runs: int, seed: Optional[int] = None, strategy: Strategy = random_choice,
+            workers: Optional[int] = None) -> SimulationReport:
+        """Stratejiyle runs kez oyna (workers verilmezse işlemci sayısı kadar süreç)"""
+        if seed is None:
+            seed = random.getrandbits(32)
+        report = SimulationReport(self.graph, seed)
+        workers = self._workers(workers, runs)
+        tasks = [(_play_random, (first, count, seed, strategy))
+                 for first, count in _split(runs, workers)]
+        self._execute(report, tasks, workers)
+        return report
+
+    def run_scripts(self, scripts: Sequence[Script],
+                    workers: Optional[int] = None) -> SimulationReport:
+        """Her senaryoyu bir kez oyna
+
+        Senaryo adımı seçim listesindeki sıra (int) ya da bağlantı etiketidir
+        (str). Senaryo bitince oynanış durur; geçersiz adım ValueError verir.
+        """
+        report = SimulationReport(self.graph)
+        scripts = list(scripts)
+        workers = self._workers(workers, len(scripts))
+        tasks = [(_play_scripts, (scripts[first:first + count],))
+                 for first, count in _split(len(scripts), workers)]
+        self._execute(report, tasks, workers)
+        return report
+
+    @staticmethod
+    def _workers(workers: Optional[int], runs: int) -> int:
+        if workers is None:
+            workers = (os.cpu_count() or 1) if runs >= PARALLEL_MIN_RUNS else 1
+        return max(1, min(workers, runs))
+
+    def _execute(self, report: SimulationReport, tasks: list, workers: int) -> None:
+        if workers <= 1:
+            for function, args in tasks:
+                report._merge(function(self.graph, self.max_steps, *args))
+            return
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(self.graph, self.max_steps)) as pool:
+            futures = [pool.submit(_run_in_worker, function, args) for function, args in tasks]
+            for future in futures:
+                report._merge(future.result())
+
+
+def _split(total: int, workers: int):
+    """total oynanışı (ilk sıra, adet) parçalarına böl"""
+    if total <= 0:
+        return []
+    parts = 1 if workers <= 1 else workers * BATCHES_PER_WORKER
+    size = -(-total // parts)
+    return [(first, min(size, total - first)) for first in range(0, total, size)]
+
+
+# --- İşçi tarafı ---
+
+_worker_graph: Optional[RuntimeGraph] = None
+_worker_max_steps = DEFAULT_MAX_STEPS
+
+
+def _init_worker(graph: RuntimeGraph, max_steps: int) -> None:
+    global _worker_graph, _worker_max_steps
+    _worker_graph, _worker_max_steps = graph, max_steps
+
+
+def _run_in_worker(function, args):
+    return function(_worker_graph, _worker_max_steps, *args)
+
+
+class _Batch:
+    """Bir parçanın sayaçları; sonuç düz veri olarak ana sürece döner"""
+
+    __slots__ = ('runs', 'completed', 'truncated', 'stopped', 'total_steps', 'longest',
+                 'visits', 'endings', 'blocked')
+
+    def __init__(self):
+        self.runs = self.completed = self.truncated = self.stopped = 0
+        self.total_steps = self.longest = 0
+        self.visits: Dict[int, int] = {}
+        self.endings: Dict[int, int] = {}
+        self.blocked: Dict[int, int] = {}
+
+    def add(self, playthrough: Playthrough, finished: bool, truncated: bool) -> None:
+        """finished: seçilebilecek bağlantı kalmadı; truncated: max_steps'e ulaşıldı"""
+        self.runs += 1
+        steps = playthrough.steps
+        self.total_steps += steps
+        if steps > self.longest:
+            self.longest = steps
+        visits = self.visits
+        for element in playthrough.path:
+            visits[element] = visits.get(element, 0) + 1
+        current = playthrough.current
+        if finished and playthrough.graph.is_ending(current):
+            self.completed += 1
+            self.endings[current] = self.endings.get(current, 0) + 1
+        elif finished:
+            self.blocked[current] = self.blocked.get(current, 0) + 1
+        elif truncated:
+            self.truncated += 1
+        else:
+            self.stopped += 1
+
+    def result(self) -> tuple:
+        return (self.runs, self.completed, self.truncated, self.stopped, self.total_steps,
+                self.longest, self.visits, self.endings, self.blocked)
+
+
+def _play_random(graph: RuntimeGraph, max_steps: int, first: int, count: int, seed: int,
+                 strategy: Strategy) -> tuple:
+    batch = _Batch()
+    rng = random.Random()
+    for run in range(first, first + count):
+        rng.seed((seed << 32) ^ run)
+        playthrough = Playthrough(graph)
+        choices = playthrough.choices()
+        while choices and playthrough.steps < max_steps:
+            choice = strategy(playthrough, choices, rng)
+            if choice not in choices:
+                raise ValueError(f"Strateji geçersiz seçim döndürdü: {choice}")
+            playthrough._follow(choice)
+            choices = playthrough.choices()
+        batch.add(playthrough, not choices, bool(choices))
+    return batch.result()
+
+
+def _play_scripts(graph: RuntimeGraph, max_steps: int, scripts: Sequence[Script]) -> tuple:
+    batch = _Batch()
+    labels = graph.labels
+    for script in scripts:
+        playthrough = Playthrough(graph)
+        choices = playthrough.choices()
+        for step in script:
+            if not choices or playthrough.steps >= max_steps:
+                break
+            if isinstance(step, str):
+                choice = next((choice for choice in choices if labels[choice] == step), None)
+                if choice is None:
+                    raise ValueError(f"Seçim bulunamadı: {step!r}")
+            elif 0 <= step < len(choices):
+                choice = choices[step]
+            else:
+                raise ValueError(f"Geçersiz seçim sırası: {step}")
+            playthrough._follow(choice)
+            choices = playthrough.choices()
+        batch.add(playthrough, not choices, bool(choices) and playthrough.steps >= max_steps)
+    return batch.result()
@@ -0,0 +1,333 @@
+"""Tüm board'lardaki elementler için tam metin arama"""
+import re
+from array import array
+from bisect import bisect_left
+from heapq import merge
+from itertools import compress
+from typing import Dict, List, Optional, Set
+
+_TOKEN = re.compile(r'\w+')
+TRIGRAM = 3
+MERGE_MAX_LISTS = 64  # Bundan fazla listesi olan terimin belgeleri önce birleştirilir
+SHORT_CACHE_SIZE = 16  # Eşleşmeleri saklanan kısa terim sayısı
+
+
+def fold(text: str) -> str:
+    """Büyük/küçük harf ve i/ı/İ/I farkını yok sayan karşılaştırma biçimi"""
+    # str.translate'ten çok daha hızlı; 'I' zaten casefold ile 'i' olur
+    return text.replace('İ', 'i').replace('ı', 'i').casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """Metnin katlanmış kelimeleri"""
+    return _TOKEN.findall(fold(text))
+
+
+def trigrams(token: str) -> Set[str]:
+    return {token[i:i + TRIGRAM] for i in range(len(token) - TRIGRAM + 1)}
+
+
+def _contains(postings: array, doc: int) -> bool:
+    index = bisect_left(postings, doc)
+    return index < len(postings) and postings[index] == doc
+
+
+class SearchHit:
+    """Arama sonucu: görünümün board'a geçip elemente odaklanması için"""
+
+    __slots__ = ('board_id', 'element_id', 'title')
+
+    def __init__(self, board_id: str, element_id: str, title: str):
+        self.board_id = board_id
+        self.element_id = element_id
+        self.title = title
+
+    def __repr__(self):
+        return f"SearchHit({self.board_id!r}, {self.element_id!r}, {self.title!r})"
+
+
+class SearchIndex:
+    """Projedeki tüm element başlık ve içerikleri için artımlı ters indeks
+
+    Her element bir belge numarası alır; her kelimenin belgeleri artan
+    sırada bir array'de tutulur. Alt dizi araması için kelime sözlüğü
+    üzerinde trigram indeksi vardır: 'apı' önce 'kapı', 'kapıcı' gibi
+    kelimeleri, sonra onların belgelerini bulur.
+
+    Çok sayıda kelimeye uyan terimin ('1', '12') belgeleri, belge numarasıyla
+    indekslenen bir bytearray'de toplanır. Trigramı olmayan kısa terimlerin
+    eşleşmeleri sözlük taranarak bulunur ve yeni belge eklenene kadar saklanır.
+
+    Değişen element yeni bir belge numarası alır, eskisi ölü sayılır; ölüler
+    biriktikçe listeler sıkıştırılır. Yüklü board'ların değişiklikleri
+    Board'un 'search' kanalından okunur; tembel board'lar yüklenmeden
+    kaynaklarından indekslenir. Hiçbir sahne oluşturulmaz.
+    """
+
+    CHANNEL = 'search'
+    CHUNK = 500  # iter_refresh'in adım başına indekslediği element sayısı
+    COMPACT_MIN_DEAD = 10_000  # Sıkıştırma için en az ölü belge sayısı
+    COMPACT_RATIO = 0.5  # Ölü belgeler canlıların bu oranını aşınca sıkıştır
+
+    def __init__(self, project):
+        self.project = project
+        self._postings: Dict[str, array] = {}  # kelime -> artan belge numaraları
+        self._trigrams: Dict[str, Set[str]] = {}  # trigram -> kelimeler
+        self._short_matches: Dict[str, tuple] = {}  # kısa terim -> (belge sayısı, belgeler)
+        self._short_matches_docs = 0  # Saklanan eşleşmeler kurulurken belge sayısı
+        # Belge numarasına göre paralel listeler (ölü belgede element None)
+        self._doc_element: List[Optional[str]] = []
+        self._doc_board: List[Optional[str]] = []
+        self._doc_title: List[Optional[str]] = []
+        self._doc_signature: List[int] = []
+        self._docs: Dict[str, int] = {}  # element_id -> canlı belge numarası
+        self._boards: Set[str] = set()  # İndekslenmiş board ID'leri
+        self._dead = 0
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    # --- Güncelleme ---
+
+    def refresh(self) -> None:
+        """Projeyle eşitle: yeni board'ları indeksle, silinenleri çıkar, değişiklikleri uygula"""
+        for _ in self.iter_refresh():
+            pass
+
+    def iter_refresh(self):
+        """refresh() adım adım: her board'dan ya da CHUNK elementten sonra yield eder
+
+        Arayüz indeksi proje açılınca dilim dilim kurabilsin diye; adımlar
+        arasında model değişebilir, bu değişiklikler sonradan uygulanır.
+        """
+        boards = self.project.boards
+        for board_id in [bid for bid in self._boards if bid not in boards]:
+            self.remove_board(board_id)
+        for board in list(boards.values()):
+            if board.id in self._boards:
+                self._apply_changes(board)
+            elif board.id in boards:
+                yield from self._iter_index_board(board)
+
+    @property
+    def is_complete(self) -> bool:
+        """Projedeki bütün board'lar indekslendi mi?"""
+        return self._boards.issuperset(self.project.boards)
+
+    def update(self) -> None:
+        """Sadece indekslenmiş board'ları eşitle: silinenleri çıkar, değişiklikleri uygula
+
+        Yeni board indekslenmez (bkz. iter_refresh); komutlardan sonra ve
+        her sorgudan önce çağrılacak kadar ucuzdur.
+        """
+        boards = self.project.boards
+        for board_id in [bid for bid in self._boards if bid not in boards]:
+            self.remove_board(board_id)
+        for board_id in self._boards:
+            board = boards.get(board_id)
+            if board is not None:
+                self._apply_changes(board)
+
+    def index_board(self, board) -> None:
+        """Board'un tüm elementlerini indeksle; tembel board yüklenmez"""
+        for _ in self._iter_index_board(board):
+            pass
+
+    def _iter_index_board(self, board):
+        # Bu andan sonraki değişiklikler kanalda birikir ve board bitince uygulanır
+        board.change_set(self.CHANNEL).clear()
+        source = board.lazy_source
+        if source is not None and hasattr(source, 'iter_element_texts'):
+            records = source.iter_element_texts()
+        else:
+            records = [(element.id, element.title, element.content)
+                       for element in board.elements.values()]
+        for count, (element_id, title, content) in enumerate(records, 1):
+            self.index_element(board.id, element_id, title, content)
+            if count % self.CHUNK == 0:
+                yield
+        self._boards.add(board.id)
+        self._apply_changes(board)
+        yield
+
+    def remove_board(self, board_id: str) -> None:
+        """Board'un bütün elementlerini indeksten çıkar"""
+        for doc, doc_board in enumerate(self._doc_board):
+            if doc_board == board_id:
+                del self._docs[self._doc_element[doc]]
+                self._kill(doc)
+        self._boards.discard(board_id)
+        self._maybe_compact()
+
+    def _apply_changes(self, board) -> None:
+        if board.lazy_source is not None:
+            return
+        changes = board.change_set(self.CHANNEL)
+        if not changes:
+            return
+        for element_id in changes.removed_elements:
+            self.remove_element(element_id)
+        elements = board.elements
+        for element_id in changes.elements:
+            element = elements.get(element_id)
+            if element is not None:
+                self.index_element(board.id, element_id, element.title, element.content)
+        changes.clear()
+
+    def index_element(self, board_id: str, element_id: str, title: str, content: str) -> None:
+        """Elementi ekle ya da metni değiştiyse yeniden indeksle"""
+        signature = hash((title, content))
+        doc = self._docs.get(element_id)
+        if doc is not None:
+            if self._doc_signature[doc] == signature and self._doc_board[doc] == board_id:
+                self._doc_title[doc] = title
+                return
+            self._kill(doc)
+        doc = len(self._doc_element)
+        self._doc_element.append(element_id)
+        self._doc_board.append(board_id)
+        self._doc_title.append(title)
+        self._doc_signature.append(signature)
+        self._docs[element_id] = doc
+        postings = self._postings
+        for token in set(_TOKEN.findall(fold(f'{title}\n{content}'))):
+            entries = postings.get(token)
+            if entries is None:
+                entries = postings[token] = array('I')
+                for gram in trigrams(token):
+                    self._trigrams.setdefault(gram, set()).add(token)
+            entries.append(doc)
+        self._maybe_compact()
+
+    def remove_element(self, element_id: str) -> None:
+        doc = self._docs.pop(element_id, None)
+        if doc is not None:
+            self._kill(doc)
+            self._maybe_compact()
+
+    def _kill(self, doc: int) -> None:
+        self._doc_element[doc] = None
+        self._doc_board[doc] = None
+        self._doc_title[doc] = None
+        self._dead += 1
+
+    def _maybe_compact(self) -> None:
+        if (self._dead >= self.COMPACT_MIN_DEAD
+                and self._dead > len(self._docs) * self.COMPACT_RATIO):
+            self.compact()
+
+    def compact(self) -> None:
+        """Ölü belgeleri listelerden at; boşalan kelimeleri sözlükten çıkar"""
+        alive = self._doc_element
+        for token in list(self._postings):
+            entries = array('I', (doc for doc in self._postings[token]
+                                  if alive[doc] is not None))
+            if entries:
+                self._postings[token] = entries
+                continue
+            del self._postings[token]
+            for gram in trigrams(token):
+                tokens = self._trigrams.get(gram)
+                if tokens is not None:
+                    tokens.discard(token)
+                    if not tokens:
+                        del self._trigrams[gram]
+        self._short_matches.clear()
+        self._dead = 0
+
+    # --- Sorgu ---
+
+    def search(self, query: str, limit: int = 100,
+               board_id: Optional[str] = None) -> List[SearchHit]:
+        """Bütün kelimeleri (kelime içinde alt dizi olarak) içeren elementler
+
+        Sonuçlar indekslenme sırasındadır (board board); en fazla limit
+        sonuç döner. board_id verilirse sadece o board'da aranır. Sadece
+        indekslenmiş olan aranır; henüz indekslenmemiş board'lar burada
+        okunmaz (is_complete False iken sonuçlar eksik olabilir).
+        """
+        self.update()
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        # Başka bir terimin içinde geçen terim ek koşul getirmez ('ka kapı')
+        terms = [term for term in terms
+                 if not any(term != other and term in other for other in terms)]
+        # Trigramlı terimler önce: biri eşleşmezse kısa terimler hiç genişletilmez
+        terms.sort(key=lambda term: len(term) < TRIGRAM)
+        matches = []
+        for term in terms:
+            if len(term) < TRIGRAM:
+                match = self._short_term_docs(term)
+            else:
+                match = self._term_docs([self._postings[token]
+                                         for token in self._matching_tokens(term)])
+            if not match[0]:
+                return []
+            matches.append(match)
+
+        # En az belgesi olan terim dolaşılır. Diğerleri belge haritasından ya
+        # da (birkaç listeyse) ikili aramayla denetlenir
+        matches.sort(key=lambda match: match[0])
+        driver = matches[0][1]
+        checks = []
+        for _, docs in matches[1:]:
+            if docs.__class__ is bytearray:
+                checks.append(docs.__getitem__)
+            else:
+                checks.append(lambda doc, lists=docs:
+                              any(_contains(entries, doc) for entries in lists))
+        if driver.__class__ is bytearray:
+            stream = compress(range(len(driver)), driver)
+        else:
+            stream = driver[0] if len(driver) == 1 else merge(*driver)
+
+        hits = []
+        elements, boards, titles = self._doc_element, self._doc_board, self._doc_title
+        previous = -1
+        for doc in stream:
+            if doc == previous:
+                continue
+            previous = doc
+            element_id = elements[doc]
+            if element_id is None or (board_id is not None and boards[doc] != board_id):
+                continue
+            if all(check(doc) for check in checks):
+                hits.append(SearchHit(boards[doc], element_id, titles[doc]))
+                if len(hits) >= limit:
+                    break
+        return hits
+
+    def _term_docs(self, lists: List[array]) -> tuple:
+        """(belge sayısı, belgeler): birkaç liste olduğu gibi, çoksa belge haritası"""
+        if len(lists) <= MERGE_MAX_LISTS:
+            return sum(map(len, lists)), lists
+        docs = bytearray(len(self._doc_element))
+        for entries in lists:
+            for doc in entries:
+                docs[doc] = 1
+        return docs.count(1), docs
+
+    def _short_term_docs(self, term: str) -> tuple:
+        """Kısa terimin _term_docs sonucu; yeni belge eklenene kadar saklanır"""
+        cache = self._short_matches
+        if self._short_matches_docs != len(self._doc_element):
+            cache.clear()  # Eklenen belgeler (ve kelimeler) saklananlarda yok
+            self._short_matches_docs = len(self._doc_element)
+        match = cache.get(term)
+        if match is None:
+            # Trigram yok; sözlük taranır
+            match = self._term_docs([entries for token, entries in self._postings.items()
+                                     if term in token])
+            if len(cache) >= SHORT_CACHE_SIZE:
+                cache.clear()
+            cache[term] = match
+        return match
+
+    def _matching_tokens(self, term: str) -> List[str]:
+        """Trigramlı terimi içeren sözlük kelimeleri"""
+        sets = sorted((self._trigrams.get(gram, ()) for gram in trigrams(term)), key=len)
+        if not sets[0]:
+            return []
+        candidates = sets[0].intersection(*sets[1:])
+        return [token for token in candidates if term in token]
@@ -0,0 +1,108 @@
+from math import floor
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+Rect = Tuple[float, float, float, float]  # (left, top, right, bottom)
+
+
+class SpatialIndex:
+    """Element konum ve boyutları için hafif, Qt'den bağımsız ızgara indeksi
+
+    Düzlem cell_size büyüklüğünde hücrelere bölünür; her hücre kendisiyle
+    kesişen element ID'lerini tutar. Dikdörtgen sorgusu sadece ilgili
+    hücrelere bakar, böylece maliyet görünen alandaki eleman sayısıyla orantılıdır.
+    """
+
+    def __init__(self, cell_size: float = 512):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[str]] = {}
+        self._rects: Dict[str, Rect] = {}
+        self._bounds: Optional[Rect] = None
+        self._bounds_dirty = False
+
+    def __len__(self) -> int:
+        return len(self._rects)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rects
+
+    def _cell_range(self, rect: Rect):
+        size = self.cell_size
+        left, top, right, bottom = rect
+        for cx in range(floor(left / size), floor(right / size) + 1):
+            for cy in range(floor(top / size), floor(bottom / size) + 1):
+                yield cx, cy
+
+    def insert(self, item_id: str, rect: Rect) -> None:
+        """Öğeyi indekse ekle (varsa günceller)"""
+        if item_id in self._rects:
+            self.remove(item_id)
+        self._rects[item_id] = rect
+        for cell in self._cell_range(rect):
+            self._cells.setdefault(cell, set()).add(item_id)
+
+        # Sınırları büyütmek ucuz, küçültmek yeniden hesap ister
+        if self._bounds is not None and not self._bounds_dirty:
+            left, top, right, bottom = self._bounds
+            self._bounds = (min(left, rect[0]), min(top, rect[1]),
+                            max(right, rect[2]), max(bottom, rect[3]))
+        elif self._bounds is None and len(self._rects) == 1:
+            self._bounds = rect
+
+    def remove(self, item_id: str) -> None:
+        """Öğeyi indeksten çıkar"""
+        rect = self._rects.pop(item_id, None)
+        if rect is None:
+            return
+        for cell in self._cell_range(rect):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(item_id)
+                if not bucket:
+                    del self._cells[cell]
+        self._bounds_dirty = True
+
+    def update(self, item_id: str, rect: Rect) -> None:
+        """Öğenin konum/boyutunu güncelle"""
+        self.insert(item_id, rect)
+
+    def rect(self, item_id: str) -> Optional[Rect]:
+        """Öğenin kayıtlı dikdörtgeni"""
+        return self._rects.get(item_id)
+
+    def query(self, rect: Rect) -> Set[str]:
+        """Dikdörtgenle kesişen öğe ID'leri"""
+        left, top, right, bottom = rect
+        rects = self._rects
+        found: Set[str] = set()
+        for cell in self._cell_range(rect):
+            for item_id in self._cells.get(cell, ()):
+                if item_id in found:
+                    continue
+                r = rects[item_id]
+                if r[0] <= right and r[2] >= left and r[1] <= bottom and r[3] >= top:
+                    found.add(item_id)
+        return found
+
+    def bounds(self) -> Optional[Rect]:
+        """Tüm öğeleri kapsayan dikdörtgen (boşsa None)"""
+        if self._bounds_dirty:
+            self._bounds = self._compute_bounds(self._rects.values())
+            self._bounds_dirty = False
+        return self._bounds
+
+    @staticmethod
+    def _compute_bounds(rects: Iterable[Rect]) -> Optional[Rect]:
+        bounds = None
+        for left, top, right, bottom in rects:
+            if bounds is None:
+                bounds = [left, top, right, bottom]
+            else:
+                if left < bounds[0]:
+                    bounds[0] = left
+                if top < bounds[1]:
+                    bounds[1] = top
+                if right > bounds[2]:
+                    bounds[2] = right
+                if bottom > bounds[3]:
+                    bounds[3] = bottom
+        return tuple(bounds) if bounds else None
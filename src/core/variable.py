@@ -0,0 +1,27 @@
+from typing import Union
+
+Value = Union[bool, int, float, str]
+
+
+class Variable:
+    """Variable sınıfı - oynanış boyunca değişen hikaye değişkenini temsil eder"""
+
+    __slots__ = ('name', 'default', 'description')
+
+    def __init__(self, name: str, default: Value = 0, description: str = ""):
+        self.name: str = name
+        self.default: Value = default  # Her oynanışın başındaki değer
+        self.description: str = description
+
+    def to_dict(self) -> dict:
+        """Variable'ı JSON serileştirme için dict'e çevir"""
+        return {
+            'name': self.name,
+            'default': self.default,
+            'description': self.description
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Variable':
+        """Dict'ten variable oluştur"""
+        return cls(data['name'], data.get('default', 0), data.get('description', ""))
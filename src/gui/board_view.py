@@ -1,145 +1,568 @@
+import math
+from collections import OrderedDict
+from contextlib import contextmanager
+
 from PyQt6.QtWidgets import (QGraphicsView, QGraphicsScene, QGraphicsItem,
-                           QGraphicsRectItem, QGraphicsLineItem, QMenu, 
+                           QGraphicsRectItem, QMenu, QStyleOptionGraphicsItem,
                            QGraphicsTextItem, QGraphicsProxyWidget, 
                            QTextEdit, QVBoxLayout, QWidget)
-from PyQt6.QtCore import Qt, QRectF, QPointF
+from PyQt6.QtCore import Qt, QRectF, QPointF, QLineF
 from PyQt6.QtGui import (QPen, QBrush, QColor, QPainter, QPainterPath,
-                        QTransform)  # QTransform burada olmalı
+                        QPainterPathStroker, QTransform, QFont, QFontMetricsF, QStaticText,
+                        QTextLayout, QTextOption)  # QTransform burada olmalı
 
 
 class BoardGraphicsScene(QGraphicsScene):
     """Board için özel scene sınıfı"""
+
+    # Grid detay seviyesi (LOD) eşikleri - değerler view ölçeğine göre
+    GRID_HIDE_BELOW = 0.15  # Bu zoom'un altında grid hiç çizilmez
+    GRID_DOTS_BELOW = 0.5  # Bu zoom'un altında çizgiler yerine noktalar çizilir
+    GRID_MIN_SCREEN_SPACING = 8  # Ekranda iki grid çizgisi arası minimum piksel
+    GRID_COARSEN_FACTOR = 5  # Sıkışan grid bu katsayıyla seyreltilir
     
-    def __init__(self):
-        super().__init__()
+    # Sanallaştırma ayarları
+    MATERIALIZE_MARGIN = 400  # Görünen alanın etrafında item oluşturulan pay
+    ITEM_POOL_SIZE = 256  # Yeniden kullanılmak üzere saklanan element item sayısı
+    CONNECTION_POOL_SIZE = 1024  # Yeniden kullanılmak üzere saklanan bağlantı item sayısı
+    # Yakınlaşınca oluşturulmuş bölge, gereken alanın bu katına kadar olduğu gibi kullanılır
+    MATERIALIZE_REUSE_AREA = 4.0
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
         self.setSceneRect(-5000, -5000, 10000, 10000)
-        self.grid_lines = []  # Grid çizgilerini takip etmek için
+        self.grid_size = 20  # Grid aralığı (scene birimi)
         self.grid_visible = True  # Grid görünürlüğünü takip etmek için
-        self._draw_grid()
+        self.grid_pen = QPen(QColor(50, 50, 50, 100))
+        self.grid_pen.setStyle(Qt.PenStyle.DotLine)
+        self.grid_pen.setCosmetic(True)  # Zoom'dan bağımsız 1 piksel
+        self.grid_dot_pen = QPen(QColor(50, 50, 50, 140))
+        self.grid_dot_pen.setCosmetic(True)
+
+        # Sanallaştırma: sadece görünen alana yakın elementler için item var
+        self.board = None
+        self.element_items = {}  # element_id -> ElementGraphicsItem
+        self.connection_items = {}  # connection_id -> ConnectionGraphicsItem
+        self.selected_ids = set()  # Seçili element ID'leri (item'ı olmasa da)
+        self._item_pool = []  # Sahneden çıkarılmış, yeniden kullanılabilir item'lar
+        self._connection_pool = []
+        # Ucu item'sız (uzaktaki) elemente giden bağlantı item'ları: element_id -> item'lar
+        self._ghost_ends = {}
+        self._viewport_rect = None  # Son görünen alan (scene koordinatı)
+        self._materialized_rect = None  # Item'ları oluşturulmuş bölge
+        self._releasing = False
+        self.view_center = None  # Board'dan ayrılırken görünen alanın merkezi
+        self.synced_at = None  # Sahnenin en son eşitlendiği board.modified_at
+
+        # Toplu komutlar sırasında ertelenen yenilemeler
+        self._batch_depth = 0
+        self._pending_refresh = set()  # Item'ı yeniden eşlenecek element ID'leri
+        self._changed_ids = set()  # Panellere bildirilecek element ID'leri
+        self._model_changed = False  # Paneller yenilenmeli mi
+
+    def set_board(self, board):
+        """Sahneyi bir board'a bağla; item'lar görünen alana göre oluşturulur"""
+        for element_id in list(self.element_items):
+            self._release_item(element_id)
+        self.clear()
+        self.element_items.clear()
+        self.connection_items.clear()
+        self._ghost_ends.clear()
+        self.selected_ids.clear()
+        self.board = board
+        self.synced_at = board.modified_at if board is not None else None
+        self._materialized_rect = None
+        if self._viewport_rect is not None:
+            self.update_viewport(self._viewport_rect)
+
+    def flush_to_model(self):
+        """Sahnede kalan, modele yazılmamış düzenlemeleri modele aktar"""
+        # Konum, renk ve seçim zaten modelde; sadece açık editörler kaydedilir
+        for item in list(self.element_items.values()):
+            if item.editor is not None:
+                item.close_editor()
+
+    def unload(self):
+        """Düzenlemeleri modele yazıp tüm item'ları bırak (board bağlı kalır)"""
+        self.flush_to_model()
+        for element_id in list(self.element_items):
+            self._release_item(element_id)
+        self.clear()
+        self.element_items.clear()
+        self.connection_items.clear()
+        self._ghost_ends.clear()
+        self._item_pool.clear()
+        self._connection_pool.clear()
+        self._viewport_rect = None
+        self._materialized_rect = None
+
+    def get_element_item(self, element_id):
+        """Element ID'sine göre sahnedeki item'ı getir (yoksa None)"""
+        return self.element_items.get(element_id)
+
+    def ensure_element_item(self, element_id):
+        """Element için item yoksa oluştur ve döndür"""
+        item = self.element_items.get(element_id)
+        if item is None and self.board and element_id in self.board.elements:
+            item = self._materialize(self.board.elements[element_id])
+            self._add_connection_items(item)
+        return item
+
+    def get_connection_items(self, element_item):
+        """Elemente bağlı bağlantı item'ları (O(derece))"""
+        return list(element_item.connections)
+
+    def add_connection_item(self, connection):
+        """Model bağlantısı için çizgi oluştur
+
+        En az bir ucun item'ı olmalı; item'ı olmayan uç modeldeki
+        geometriden çizilir, uzaktaki komşu için element item'ı oluşturulmaz.
+        """
+        if connection.id in self.connection_items:
+            return self.connection_items[connection.id]
+        source_item = self.element_items.get(connection.source_id)
+        target_item = self.element_items.get(connection.target_id)
+        if source_item is None and target_item is None:
+            return None
+        if self._connection_pool:
+            item = self._connection_pool.pop()
+            item.bind(source_item, target_item, connection, self.board)
+        else:
+            item = ConnectionGraphicsItem(source_item, target_item, connection, self.board)
+        self.addItem(item)
+        for element_id in item.ghost_ends():
+            self._ghost_ends.setdefault(element_id, set()).add(item)
+        return item
+
+    def remove_element_item(self, element_id):
+        """Elementin item'ını (ve bağlantı çizgilerini) sahneden kaldır"""
+        self.selected_ids.discard(element_id)
+        if element_id in self.element_items:
+            self._release_item(element_id)
+        # Element modelden silindiyse ona giden çizgiler de gider
+        for connection_item in list(self._ghost_ends.get(element_id, ())):
+            self._release_connection_item(connection_item)
+
+    def refresh_element(self, element_id):
+        """Model değişikliğinden sonra elementin item'ını görünürlüğe göre güncelle"""
+        if self._batch_depth:
+            self._pending_refresh.add(element_id)
+            return
+        if self.board is None or element_id not in self.board.elements:
+            self.remove_element_item(element_id)
+            return
+        item = self.element_items.get(element_id)
+        if item is not None:
+            item.bind(self.board.elements[element_id])
+            self._add_connection_items(item)
+        elif self._is_near_viewport(element_id):
+            self.ensure_element_item(element_id)
+        else:
+            # Item'sız uç taşınmış olabilir
+            for connection_item in self._ghost_ends.get(element_id, ()):
+                connection_item.update_geometry()
+
+    def notify_model_changed(self, element_ids=()):
+        """Elementler ya da bağlantılar değişti: panelleri güncelle
+
+        Gezgin sadece verilen ID'lerin satırlarına dokunur.
+        """
+        if self._batch_depth:
+            self._changed_ids.update(element_ids)
+            self._model_changed = True
+            return
+        view = self.views()[0] if self.views() else None
+        if view is None or not view.main_window or self.board is None:
+            return
+        view.main_window.project_explorer.elements_changed(self.board, element_ids)
+        view.main_window.properties_panel.sync_with_board(self.board)
+        view.main_window.analysis_panel.schedule_refresh()
+
+    @contextmanager
+    def batch_updates(self):
+        """Blok boyunca item ve panel yenilemelerini biriktir
+
+        Çok sayıda komut art arda uygulanırken her biri ayrı ayrı yenileme
+        yapmaz; en dıştaki blok bitince görünen alan ve paneller bir kez
+        güncellenir.
+        """
+        self._batch_depth += 1
+        try:
+            yield
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self._flush_batch()
+
+    def _flush_batch(self):
+        pending, self._pending_refresh = self._pending_refresh, set()
+        changed, self._model_changed = self._model_changed, False
+        changed_ids, self._changed_ids = self._changed_ids, set()
+        if pending:
+            elements = self.board.elements if self.board is not None else {}
+            for element_id in pending:
+                # Mevcut item'lar yeniden eşlenir, silinenler kaldırılır
+                if element_id in self.element_items or element_id not in elements:
+                    self.refresh_element(element_id)
+            # Görünen alana giren yeni elementler tek sorguyla oluşturulur
+            if self._viewport_rect is not None:
+                self._materialized_rect = None
+                self.update_viewport(self._viewport_rect)
+        if changed:
+            self.notify_model_changed(changed_ids)
+
+    def select_element(self, element_id, clear=True):
+        """Elementi seç (item'ı olmasa bile)"""
+        if clear:
+            self.clearSelection()
+            self.selected_ids.clear()
+        self.selected_ids.add(element_id)
+        item = self.element_items.get(element_id)
+        if item is not None:
+            item.setSelected(True)
+
+    def selected_element_ids(self):
+        """Seçili element ID'leri"""
+        return [eid for eid in self.selected_ids
+                if self.board is not None and eid in self.board.elements]
+
+    def update_viewport(self, rect):
+        """Görünen alana yakın elementleri oluştur, uzaktakileri geri dönüştür"""
+        self._viewport_rect = QRectF(rect)
+        if self.board is None:
+            return
+        margin = self.MATERIALIZE_MARGIN
+        # Küçük kaydırmalarda ve yakınlaşmada görünen alan hâlâ oluşturulmuş
+        # bölgenin içindeyse yeniden hesaplamaya gerek yok; bölge gerekenden
+        # çok büyüdüyse (uzaktan yakına gelindi) fazlası bırakılsın diye kurulur
+        inner = rect.adjusted(-margin / 2, -margin / 2, margin / 2, margin / 2)
+        wanted_rect = rect.adjusted(-margin, -margin, margin, margin)
+        materialized = self._materialized_rect
+        if materialized is not None and materialized.contains(inner) \
+                and materialized.width() * materialized.height() \
+                <= self.MATERIALIZE_REUSE_AREA * wanted_rect.width() * wanted_rect.height():
+            return
+        self._materialized_rect = wanted_rect
+
+        # Arada kalanlar hemen atılmasın diye çıkarma için daha geniş bir pay
+        index = self.board.spatial_index
+        keep = index.query(self._rect_tuple(rect, margin * 2))
+        left, top, right, bottom = self._rect_tuple(rect, margin)
+        near = set()
+        for element_id in keep:
+            r = index.rect(element_id)
+            if r[0] <= right and r[2] >= left and r[1] <= bottom and r[3] >= top:
+                near.add(element_id)
+
+        # Komşular oluşturulmaz: uzaktaki uca giden çizgi modelin geometrisinden çizilir
+        keep |= self._pinned_ids()
+
+        for element_id in [eid for eid in self.element_items if eid not in keep]:
+            self._release_item(element_id)
+
+        created = []
+        for element_id in near:
+            if element_id not in self.element_items:
+                element = self.board.elements.get(element_id)
+                if element is not None:
+                    created.append(self._materialize(element))
+        for item in created:
+            self._add_connection_items(item)
+
+    def _is_near_viewport(self, element_id):
+        if self._viewport_rect is None or self.board is None:
+            return False
+        rect = self.board.spatial_index.rect(element_id)
+        if rect is None:
+            return False
+        left, top, right, bottom = self._rect_tuple(self._viewport_rect, self.MATERIALIZE_MARGIN)
+        return rect[0] <= right and rect[2] >= left and rect[1] <= bottom and rect[3] >= top
+
+    @staticmethod
+    def _rect_tuple(rect, margin=0):
+        return (rect.left() - margin, rect.top() - margin,
+                rect.right() + margin, rect.bottom() + margin)
+
+    def _pinned_ids(self):
+        """Kullanıcı etkileşimi sürerken sahneden çıkarılmaması gereken elementler"""
+        pinned = set()
+        for item in (self.mouseGrabberItem(), self.focusItem()):
+            if isinstance(item, ElementGraphicsItem):
+                pinned.add(item.element.id)
+        for element_id, item in self.element_items.items():
+            if item.editor is not None:
+                pinned.add(element_id)
+        return pinned
+
+    def _materialize(self, element):
+        item = self._item_pool.pop() if self._item_pool else ElementGraphicsItem(element)
+        item.bind(element)
+        self.addItem(item)
+        if element.id in self.selected_ids:
+            item.setSelected(True)
+        # Bu elemente item'sız uçla çizilmiş bağlantılar artık item'a bağlanır
+        for connection_item in self._ghost_ends.pop(element.id, ()):
+            connection_item.set_end_item(element.id, item)
+        return item
+
+    def _add_connection_items(self, item):
+        for connection in self.board.get_element_connections(item.element.id):
+            self.add_connection_item(connection)
+
+    def _release_item(self, element_id):
+        item = self.element_items.get(element_id)
+        if item is None:
+            return
+        self._releasing = True
+        try:
+            for connection_item in list(item.connections):
+                if connection_item.other_end_item(item) is not None:
+                    # Diğer ucu sahnede kalıyor: bu uç modelden çizilmeye devam eder
+                    connection_item.set_end_item(element_id, None)
+                    self._ghost_ends.setdefault(element_id, set()).add(connection_item)
+                else:
+                    self._release_connection_item(connection_item)
+            item.setSelected(False)
+            self.removeItem(item)
+        finally:
+            self._releasing = False
+        if len(self._item_pool) < self.ITEM_POOL_SIZE:
+            self._item_pool.append(item)
+
+    def _release_connection_item(self, connection_item):
+        for element_id in connection_item.ghost_ends():
+            items = self._ghost_ends.get(element_id)
+            if items is not None:
+                items.discard(connection_item)
+                if not items:
+                    del self._ghost_ends[element_id]
+        self.removeItem(connection_item)
+        connection_item.bind(None, None, None, None)
+        if len(self._connection_pool) < self.CONNECTION_POOL_SIZE:
+            self._connection_pool.append(connection_item)
+
+    def _on_item_selection_changed(self, item, selected):
+        if self._releasing:
+            return
+        if selected:
+            self.selected_ids.add(item.element.id)
+        else:
+            self.selected_ids.discard(item.element.id)
+
+    def mousePressEvent(self, event):
+        # Boş alana tıklanınca item'ı olmayan seçili elementleri de bırak
+        if (event.button() == Qt.MouseButton.LeftButton
+                and not event.modifiers() & Qt.KeyboardModifier.ControlModifier
+                and self.itemAt(event.scenePos(), QTransform()) is None):
+            self.selected_ids.clear()
+        super().mousePressEvent(event)
 
     def set_grid_visible(self, visible):
         """Grid görünürlüğünü ayarla"""
-        print(f"Setting grid visibility to: {visible}")  # Debug için
-        self.grid_visible = visible
-        
-        # Tüm grid çizgilerini kaldır
-        for line in self.grid_lines:
-            self.removeItem(line)
-        self.grid_lines.clear()
-        
-        # Eğer grid görünür olacaksa yeniden çiz
-        if visible:
-            self._draw_grid()
-        self.update()
-        """Grid görünürlüğünü ayarla"""
+        if self.grid_visible == visible:
+            return
         self.grid_visible = visible
-        if visible:
-            self._draw_grid()
-        else:
-            # Grid çizgilerini temizle
-            for line in self.grid_lines:
-                self.removeItem(line)
-            self.grid_lines.clear()
-        self.update()
-
-    def _draw_grid(self, size: int = 20):
-        """Arka plan ızgarasını çiz"""
-        # Önceki grid çizgilerini temizle
-        for line in self.grid_lines:
-            self.removeItem(line)
-        self.grid_lines.clear()
-        
-        if not self.grid_visible:
+        # Grid item değil, sadece arka plan katmanını yeniden boya
+        self.invalidate(self.sceneRect(), QGraphicsScene.SceneLayer.BackgroundLayer)
+
+    def drawBackground(self, painter, rect):
+        """Arka planı ve sadece görünen bölgedeki grid'i çiz"""
+        super().drawBackground(painter, rect)
+        if self.grid_visible:
+            self._draw_grid(painter, rect)
+
+    def _grid_spacing(self, scale: float) -> int:
+        """Zoom seviyesine göre ekranda okunabilir grid aralığını hesapla"""
+        spacing = self.grid_size
+        while spacing * scale < self.GRID_MIN_SCREEN_SPACING:
+            spacing *= self.GRID_COARSEN_FACTOR
+        return spacing
+
+    def _draw_grid(self, painter, rect):
+        """Arka plan ızgarasını exposed rect ile sınırlı olarak çiz"""
+        scale = QStyleOptionGraphicsItem.levelOfDetailFromTransform(painter.worldTransform())
+        if scale < self.GRID_HIDE_BELOW:
+            return
+
+        # Sadece scene sınırları içindeki görünen alan
+        area = rect.intersected(self.sceneRect())
+        if area.isEmpty():
             return
-            
-        pen = QPen(QColor(50, 50, 50, 100))
-        pen.setStyle(Qt.PenStyle.DotLine)
-        
-        # Dikey çizgiler
-        for x in range(-5000, 5000, size):
-            line = QGraphicsLineItem(x, -5000, x, 5000)
-            line.setPen(pen)
-            self.addItem(line)
-            self.grid_lines.append(line)
-            
-        # Yatay çizgiler
-        for y in range(-5000, 5000, size):
-            line = QGraphicsLineItem(-5000, y, 5000, y)
-            line.setPen(pen)
-            self.addItem(line)
-            self.grid_lines.append(line)
+
+        spacing = self._grid_spacing(scale)
+        left = int(math.floor(area.left() / spacing)) * spacing
+        top = int(math.floor(area.top() / spacing)) * spacing
+        xs = range(left, int(math.ceil(area.right())) + 1, spacing)
+        ys = range(top, int(math.ceil(area.bottom())) + 1, spacing)
+
+        painter.save()
+        if scale < self.GRID_DOTS_BELOW:
+            # Uzaktan bakıldığında sadece kesişim noktaları
+            painter.setPen(self.grid_dot_pen)
+            painter.drawPoints([QPointF(x, y) for x in xs for y in ys])
+        else:
+            painter.setPen(self.grid_pen)
+            lines = [QLineF(x, area.top(), x, area.bottom()) for x in xs]
+            lines.extend(QLineF(area.left(), y, area.right(), y) for y in ys)
+            painter.drawLines(lines)
+        painter.restore()
 
 class ConnectionGraphicsItem(QGraphicsItem):
     """Elementler arası bağlantı çizgisi"""
-    def __init__(self, source_item, target_item):
+
+    HIT_TOLERANCE = 6  # Tıklama algılama toleransı (scene birimi)
+    geometry_updates = 0  # Geometrinin yeniden hesaplanma sayısı (ölçüm için)
+
+    def __init__(self, source_item, target_item, connection=None, board=None):
         super().__init__()
-        self.source_item = source_item
-        self.target_item = target_item
         self.arrow_size = 10
         self._pen = QPen(QColor(0, 0, 0), 2)
+        self._bounding_rect = QRectF()
+        self.bind(source_item, target_item, connection, board)
+
+    def bind(self, source_item, target_item, connection, board=None):
+        """Item'ı (yeniden kullanım için) verilen uçlara ve bağlantıya eşle
+
+        Uçlardan biri None olabilir: o uç board'daki elementin
+        geometrisinden çizilir (element item'ı sahnede yok).
+        """
+        self.source_item = source_item
+        self.target_item = target_item
+        self.connection = connection  # Model tarafındaki Connection
+        self.board = board
+
+        # Önbelleğe alınmış geometri - sadece uçlar değişince yeniden hesaplanır
+        self._line = QLineF()
+        self._shape = None
+        self.update_geometry()
+
+    def ghost_ends(self):
+        """Item'ı olmayan uçların element ID'leri"""
+        if self.connection is None:
+            return []
+        ends = []
+        if self.source_item is None:
+            ends.append(self.connection.source_id)
+        if self.target_item is None and self.connection.target_id not in ends:
+            ends.append(self.connection.target_id)
+        return ends
+
+    def other_end_item(self, item):
+        """Verilen uç item'ın karşısındaki item (yoksa ya da kendine bağlantıysa None)"""
+        other = self.target_item if item is self.source_item else self.source_item
+        return other if other is not item else None
+
+    def set_end_item(self, element_id, item):
+        """element_id ucunu item'a bağla (None: ucu modelden çiz)"""
+        self._detach()
+        if self.connection.source_id == element_id:
+            self.source_item = item
+        if self.connection.target_id == element_id:
+            self.target_item = item
+        if self.scene() is not None:
+            self._attach()
+        self.update_geometry()
+
+    def itemChange(self, change, value):
+        # Sahneye eklenince uç elementlere kaydol, çıkarılınca kaydı sil
+        if change == QGraphicsItem.GraphicsItemChange.ItemSceneChange:
+            old_scene = self.scene()
+            if isinstance(old_scene, BoardGraphicsScene) and self.connection is not None:
+                if old_scene.connection_items.get(self.connection.id) is self:
+                    del old_scene.connection_items[self.connection.id]
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged:
+            if value is not None:
+                self._attach()
+                self.update_geometry()
+                if isinstance(value, BoardGraphicsScene) and self.connection is not None:
+                    value.connection_items[self.connection.id] = self
+            else:
+                self._detach()
+        return super().itemChange(change, value)
+
+    def _attach(self):
+        for item in (self.source_item, self.target_item):
+            if item is not None and self not in item.connections:
+                item.connections.append(self)
+
+    def _detach(self):
+        for item in (self.source_item, self.target_item):
+            if item is not None and self in item.connections:
+                item.connections.remove(self)
+
+    def _end_point(self, item, element_id):
+        if item is not None:
+            return item.sceneBoundingRect().center()
+        element = self.board.elements.get(element_id) if self.board is not None else None
+        if element is None:
+            return None
+        x, y, width, height = element.geometry()
+        return QPointF(x + width / 2, y + height / 2)
+
+    def update_geometry(self):
+        """Uç elementlerin konumuna göre çizgiyi ve sınırları yeniden hesapla"""
+        if self.connection is None:
+            if not (self.source_item and self.target_item):
+                return
+            p1 = self.source_item.sceneBoundingRect().center()
+            p2 = self.target_item.sceneBoundingRect().center()
+        else:
+            p1 = self._end_point(self.source_item, self.connection.source_id)
+            p2 = self._end_point(self.target_item, self.connection.target_id)
+            if p1 is None or p2 is None:
+                return
+        line = QLineF(p1, p2)
+        if line == self._line:
+            return
+
+        ConnectionGraphicsItem.geometry_updates += 1
+        self.prepareGeometryChange()
+        self._line = line
+        self._shape = None
+        extra = max(self._pen.widthF() / 2, self.HIT_TOLERANCE) + 1
+        self._bounding_rect = QRectF(line.p1(), line.p2()).normalized().adjusted(
+            -extra, -extra, extra, extra)
         
     def boundingRect(self):
-        return self.shape().boundingRect()
+        return self._bounding_rect
         
     def shape(self):
-        path = QPainterPath()
-        
-        if self.source_item and self.target_item:
-            source_pos = self.source_item.sceneBoundingRect().center()
-            target_pos = self.target_item.sceneBoundingRect().center()
-            
-            # Ana çizgi
-            path.moveTo(source_pos)
-            path.lineTo(target_pos)
-            
-        return path
+        # Tıklama için tolerans genişliğinde kontur
+        if self._shape is None:
+            path = QPainterPath()
+            path.moveTo(self._line.p1())
+            path.lineTo(self._line.p2())
+            stroker = QPainterPathStroker()
+            stroker.setWidth(self.HIT_TOLERANCE * 2)
+            stroker.setCapStyle(Qt.PenCapStyle.RoundCap)
+            self._shape = stroker.createStroke(path)
+        return self._shape
         
     def paint(self, painter, option, widget=None):
-        if self.source_item and self.target_item:
-            source_pos = self.source_item.sceneBoundingRect().center()
-            target_pos = self.target_item.sceneBoundingRect().center()
-            
+        if not self._line.isNull():
             # Çizgiyi çiz
             painter.setPen(self._pen)
-            painter.drawLine(source_pos, target_pos)
+            painter.drawLine(self._line)
             
     def setPen(self, pen):
+        self.prepareGeometryChange()
         self._pen = pen
-        self.update()
+        self._line = QLineF()
+        self.update_geometry()
         
     def pen(self):
         return self._pen
 
 class ElementGraphicsItem(QGraphicsRectItem):
+    # Semantik zoom eşikleri (painter LOD değerine göre)
+    LOD_TITLE_ONLY_BELOW = 0.6  # Bunun altında içerik metni çizilmez
+    LOD_BOX_ONLY_BELOW = 0.3  # Bunun altında sadece renkli kutu çizilir
+    layout_updates = 0  # Metin yerleşiminin yeniden hesaplanma sayısı (ölçüm için)
+
     def __init__(self, element, x=0, y=0, width=200, height=150):
         super().__init__(0, 0, width, height)
         self.element = element
-        self.setPos(x, y)
-        self.default_width = width
-        self.default_height = height
-        self.old_pos = None
-        
-        # Görsel özellikler
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsMovable)
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemIsSelectable)
-        self.setFlag(QGraphicsItem.GraphicsItemFlag.ItemSendsGeometryChanges)
-        
-        # Görünüm ayarları
-        self.default_pen = QPen(QColor(100, 100, 100))
-        self.default_brush = QBrush(QColor(240, 240, 240))
-        self.selected_pen = QPen(QColor(0, 120, 210), 2)
-        self.setPen(self.default_pen)
-        self.setBrush(self.default_brush)
-        
-        # Editor
-        self.editor = None
-        self.editor_proxy = None
-        
-        # Bağlantı oluşturma için değişkenler
-        self.is_drawing_connection = False
-        self.temp_connection = None
-        super().__init__(0, 0, width, height)
-        self.element = element
+        self.connections = []  # Bu elemente bağlı ConnectionGraphicsItem'lar
         self.setPos(x, y)
         self.default_width = width
         self.default_height = height
@@ -165,6 +588,56 @@ class ElementGraphicsItem(QGraphicsRectItem):
         self.is_drawing_connection = False
         self.temp_connection = None
 
+        # Metin yerleşimi önbelleği
+        self.invalidate_text_cache()
+        self._binding = False
+
+    def bind(self, element):
+        """Item'ı (yeniden kullanım için) verilen elementin verileriyle eşle"""
+        self._binding = True
+        try:
+            self.element = element
+            x, y, width, height = element.geometry()
+            self.setRect(0, 0, width, height)
+            self.setPos(x, y)
+            self.setBrush(QBrush(QColor(element.color)))
+            self.invalidate_text_cache()
+            self.update()
+        finally:
+            self._binding = False
+
+    def itemChange(self, change, value):
+        # Konum değişince sadece bu elemente bağlı bağlantıları güncelle
+        if change == QGraphicsItem.GraphicsItemChange.ItemPositionHasChanged:
+            self._update_connections()
+            if not self._binding:
+                # Konumun asıl kaynağı model; sürükleme anında yaz
+                self.element.position = {'x': value.x(), 'y': value.y()}
+                scene = self.scene()
+                if isinstance(scene, BoardGraphicsScene) and scene.board is not None:
+                    scene.board.update_element_geometry(self.element.id)
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSelectedHasChanged:
+            if isinstance(self.scene(), BoardGraphicsScene):
+                self.scene()._on_item_selection_changed(self, bool(value))
+        # Sahnenin element_id -> item indeksini güncel tut
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSceneChange:
+            old_scene = self.scene()
+            if isinstance(old_scene, BoardGraphicsScene):
+                if old_scene.element_items.get(self.element.id) is self:
+                    del old_scene.element_items[self.element.id]
+        elif change == QGraphicsItem.GraphicsItemChange.ItemSceneHasChanged:
+            if isinstance(value, BoardGraphicsScene):
+                value.element_items[self.element.id] = self
+        return super().itemChange(change, value)
+
+    def setRect(self, *args):
+        super().setRect(*args)
+        self._update_connections()
+
+    def _update_connections(self):
+        for connection in self.connections:
+            connection.update_geometry()
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.old_pos = self.pos()
@@ -185,6 +658,11 @@ class ElementGraphicsItem(QGraphicsRectItem):
                 pos.x(), pos.y(), pos.x(), pos.y(), 
                 QPen(QColor(0, 0, 0), 2, Qt.PenStyle.DashLine))
         super().mousePressEvent(event)
+        if event.button() == Qt.MouseButton.LeftButton and self.scene():
+            # Seçili diğer item'lar da birlikte sürüklenir
+            for item in self.scene().selectedItems():
+                if isinstance(item, ElementGraphicsItem):
+                    item.old_pos = item.pos()
 
     def mouseMoveEvent(self, event):
         if self.is_drawing_connection and self.temp_connection:
@@ -198,29 +676,39 @@ class ElementGraphicsItem(QGraphicsRectItem):
 
     def mouseReleaseEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton and self.old_pos is not None:
-            new_pos = self.pos()
-            if self.old_pos != new_pos:
-                from src.core.commands import MoveElementCommand
-                view = self.scene().views()[0]
-                if view.main_window:
-                    command = MoveElementCommand(self, self.old_pos, new_pos)
-                    view.main_window.command_stack.execute(command)
-            self.old_pos = None
+            # Birlikte sürüklenen tüm item'lar tek geri alma adımı olur
+            scene = self.scene()
+            moved = [item for item in scene.selectedItems()
+                     if isinstance(item, ElementGraphicsItem) and item.old_pos is not None]
+            if self not in moved:
+                moved.append(self)
+            view = scene.views()[0]
+            if view.main_window:
+                from core.commands import MoveElementCommand
+                stack = view.main_window.command_stack
+                with stack.transaction("Taşı"):
+                    for item in moved:
+                        if item.old_pos != item.pos():
+                            stack.execute(MoveElementCommand(
+                                scene, item.element, item.old_pos, item.pos()))
+            for item in moved:
+                item.old_pos = None
         elif event.button() == Qt.MouseButton.RightButton and self.is_drawing_connection:
-            # Hedef elementi bul
+            # Hedef elementi modelin geometrisinden bul (sahne item'larını taramadan)
             end_pos = self.mapToScene(event.pos())
-            items = self.scene().items(end_pos)
-            
-            target_item = None
-            for item in items:
-                if isinstance(item, ElementGraphicsItem) and item != self:
-                    target_item = item
-                    break
+            board = self.scene().board
+            target_id = None
+            if board is not None:
+                target_id = next((eid for eid in board.elements_at(end_pos.x(), end_pos.y())
+                                  if eid != self.element.id), None)
             
             # Bağlantıyı oluştur
-            if target_item:
-                connection = ConnectionGraphicsItem(self, target_item)
-                self.scene().addItem(connection)
+            if target_id is not None:
+                from core.connection import Connection
+                connection = Connection(self.element.id, target_id)
+                board.add_connection(connection)
+                self.scene().add_connection_item(connection)
+                self.scene().notify_model_changed()
             
             # Geçici çizgiyi kaldır
             if self.temp_connection:
@@ -239,36 +727,111 @@ class ElementGraphicsItem(QGraphicsRectItem):
             self.setRect(0, 0, 300, 200)
         super().mouseDoubleClickEvent(event)
 
+    def invalidate_text_cache(self):
+        """Önbelleğe alınmış başlık/içerik yerleşimini geçersiz kıl"""
+        self._title_cache_key = None
+        self._title_text = None
+        self._content_cache_key = None
+        self._content_lines = []
+        self._content_layout = None
+
+    def _ensure_title_layout(self, font):
+        """Başlık yerleşimini gerekiyorsa yeniden hesapla"""
+        rect = self.rect()
+        key = (self.element.title, rect.width(), font.key())
+        if key == self._title_cache_key:
+            return
+        ElementGraphicsItem.layout_updates += 1
+
+        # Başlık: kalın, tek satır, sığmazsa kısaltılmış
+        title_font = QFont(font)
+        title_font.setBold(True)
+        title_width = max(0.0, rect.width() - 20)
+        title = QFontMetricsF(title_font).elidedText(
+            self.element.title, Qt.TextElideMode.ElideRight, title_width)
+        self._title_text = QStaticText(title)
+        self._title_text.setTextFormat(Qt.TextFormat.PlainText)
+        self._title_text.prepare(QTransform(), title_font)
+        self._title_font = title_font
+        self._title_cache_key = key
+
+    def _ensure_content_layout(self, font):
+        """İçerik yerleşimini gerekiyorsa yeniden hesapla (sadece içerik çizilirken)"""
+        rect = self.rect()
+        key = (self.element.content, rect.width(), rect.height(), font.key())
+        if key == self._content_cache_key:
+            return
+        ElementGraphicsItem.layout_updates += 1
+
+        # İçerik: sadece kutuya sığan satırlar yerleştirilir
+        content_rect = rect.adjusted(10, 30, -10, -10)
+        layout = QTextLayout(self.element.content.replace('\n', '\u2028'), font)
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WrapMode.WordWrap)
+        layout.setTextOption(text_option)
+        layout.setCacheEnabled(True)
+        lines = []
+        y = 0.0
+        layout.beginLayout()
+        while content_rect.height() > 0:
+            line = layout.createLine()
+            if not line.isValid():
+                break
+            line.setLineWidth(max(0.0, content_rect.width()))
+            if y + line.height() > content_rect.height():
+                break
+            line.setPosition(QPointF(0, y))
+            y += line.height()
+            lines.append(line)
+        layout.endLayout()
+        self._content_layout = layout
+        self._content_lines = lines
+        self._content_cache_key = key
+
     def paint(self, painter, option, widget=None):
+        lod = option.levelOfDetailFromTransform(painter.worldTransform())
+        rect = self.rect()
+
+        if lod < self.LOD_BOX_ONLY_BELOW:
+            # Çok uzak: metin yok, sadece dolu renkli kutu
+            painter.fillRect(rect, self.brush())
+            if self.isSelected():
+                painter.setPen(self.selected_pen)
+                painter.setBrush(Qt.BrushStyle.NoBrush)
+                painter.drawRect(rect)
+            return
+
         painter.setBrush(self.brush())
         painter.setPen(self.selected_pen if self.isSelected() else self.default_pen)
-        painter.drawRect(self.rect())
-        
-        painter.setPen(Qt.PenStyle.SolidLine)
+        painter.drawRect(rect)
+
         font = painter.font()
-        font.setBold(True)
-        painter.setFont(font)
-        painter.drawText(self.rect().adjusted(10, 5, -10, -10), 
-                        Qt.AlignmentFlag.AlignTop, self.element.title)
-        
-        font.setBold(False)
-        painter.setFont(font)
-        content_rect = self.rect().adjusted(10, 30, -10, -10)
-        painter.drawText(content_rect, Qt.TextFlag.TextWordWrap, self.element.content)
+        self._ensure_title_layout(font)
+        painter.setPen(Qt.PenStyle.SolidLine)
+        painter.setFont(self._title_font)
+        painter.drawStaticText(rect.topLeft() + QPointF(10, 5), self._title_text)
+
+        if lod < self.LOD_TITLE_ONLY_BELOW:
+            # Orta mesafe: sadece başlık; içerik yerleşimi hiç kurulmaz
+            return
+
+        self._ensure_content_layout(font)
+        origin = rect.topLeft() + QPointF(10, 30)
+        for line in self._content_lines:
+            line.draw(painter, origin)
 
     def keyPressEvent(self, event):
         """Delete tuşu ile silme"""
         if event.key() == Qt.Key.Key_Delete:
             # DeleteElementCommand kullan
             if self.scene():
-                from src.core.commands import DeleteElementCommand
+                from core.commands import DeleteElementCommand
                 view = self.scene().views()[0]
                 if view.main_window:
                     if self.editor:  # Eğer düzenleme penceresi açıksa kapat
                         self.close_editor()
-                    command = DeleteElementCommand(self.scene(), self)
+                    command = DeleteElementCommand(self.scene(), self.element)
                     view.main_window.command_stack.execute(command)
-                    print("Element deleted")  # Debug için
         else:
             super().keyPressEvent(event)
     
@@ -281,16 +844,75 @@ class ElementGraphicsItem(QGraphicsRectItem):
                 self.scene().removeItem(self.editor_proxy)
             self.editor = None
             self.editor_proxy = None
-            self.setRect(0, 0, self.default_width, self.default_height)
+            self.setRect(0, 0, self.element.size['width'], self.element.size['height'])
+
+class BoardSceneCache:
+    """Board başına BoardGraphicsScene önbelleği (LRU)
+
+    Her board'un kendi sahnesi vardır; tekrar geçişte sahne yeniden kurulmaz,
+    sadece view'a bağlanır. Item'ları dolu sahne sayısı ve toplam item sayısı
+    (bellek için yaklaşık ölçü) bütçeyle sınırlıdır. Bütçe aşılınca en eski
+    sahne modele yazılır ve item'ları boşaltılır; sahne nesnesi (komutlar ona
+    referans tuttuğu için) boş olarak kalır.
+    """
+
+    def __init__(self, parent=None, max_scenes=16, max_items=50000):
+        self.parent = parent
+        self.max_scenes = max_scenes
+        self.max_items = max_items
+        self._scenes = {}  # board_id -> BoardGraphicsScene
+        self._loaded = OrderedDict()  # Item'ları dolu sahneler, LRU sırasıyla
+
+    def __len__(self):
+        return len(self._loaded)
+
+    def __contains__(self, board_id):
+        return board_id in self._loaded
+
+    def get(self, board):
+        """Board'un sahnesini getir, yoksa oluştur; en son kullanılan yapar"""
+        scene = self._scenes.get(board.id)
+        if scene is None:
+            scene = BoardGraphicsScene(self.parent)
+            scene.set_board(board)
+            self._scenes[board.id] = scene
+        elif scene.synced_at != board.modified_at:
+            # Sahne pasifken model dışarıdan değiştiyse yeniden kur
+            scene.set_board(board)
+        self._loaded[board.id] = scene
+        self._loaded.move_to_end(board.id)
+        self._evict(keep=board.id)
+        return scene
+
+    def item_count(self):
+        """Dolu sahnelerdeki yaklaşık toplam item sayısı"""
+        return sum(len(scene.element_items) + len(scene.connection_items)
+                   for scene in self._loaded.values())
+
+    def discard(self, board_id):
+        """Board'un sahnesini önbellekten çıkar (modele yazarak)"""
+        self._loaded.pop(board_id, None)
+        scene = self._scenes.pop(board_id, None)
+        if scene is not None:
+            scene.unload()
+
+    def _evict(self, keep):
+        # En eski sahnelerden başlayarak bütçeye inene kadar boşalt
+        for board_id in list(self._loaded):
+            if len(self._loaded) <= self.max_scenes and self.item_count() <= self.max_items:
+                break
+            if board_id != keep:
+                self._loaded.pop(board_id).unload()
 
 class BoardView(QGraphicsView):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.main_window = parent
         
-        # Scene oluştur
-        self.scene = BoardGraphicsScene()
+        # Scene oluştur (board bağlanana kadar boş sahne)
+        self.scene = BoardGraphicsScene(self)
         self.setScene(self.scene)
+        self.scene_cache = BoardSceneCache(self)
         
         # Görünüm ayarları
         self.setRenderHint(QPainter.RenderHint.Antialiasing)
@@ -310,6 +932,50 @@ class BoardView(QGraphicsView):
         # Pan ayarları
         self.last_mouse_pos = QPointF()
         self.panning = False
+
+    def show_board(self, board):
+        """Board'u göster; sahnesi önbellekteyse yeniden kurulmaz"""
+        scene = self.scene_cache.get(board)
+        if scene is not self.scene:
+            self._leave_scene()
+            self.scene = scene
+            self.setScene(scene)
+        scene.set_grid_visible(self.show_grid)
+        if scene.view_center is not None:
+            self.centerOn(scene.view_center)
+        self.refresh_visible_items()
+
+    def _leave_scene(self):
+        """Aktif sahneden çıkarken görünüm konumunu ve senkron damgasını sakla"""
+        scene = self.scene
+        scene.view_center = self.mapToScene(self.viewport().rect().center())
+        if scene.board is not None:
+            scene.synced_at = scene.board.modified_at
+
+    def refresh_visible_items(self):
+        """Görünen alan değişince sahnedeki item'ları güncelle"""
+        if isinstance(self.scene, BoardGraphicsScene):
+            visible = self.mapToScene(self.viewport().rect()).boundingRect()
+            self.scene.update_viewport(visible)
+
+    def scrollContentsBy(self, dx, dy):
+        super().scrollContentsBy(dx, dy)
+        self.refresh_visible_items()
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.refresh_visible_items()
+
+    def center_on_element(self, element_id, select=True):
+        """Elementi (item'ı henüz yoksa da) ortala ve seç"""
+        board = self.scene.board
+        if board is None or element_id not in board.elements:
+            return
+        left, top, right, bottom = board.spatial_index.rect(element_id)
+        self.centerOn(QPointF((left + right) / 2, (top + bottom) / 2))
+        self.refresh_visible_items()
+        if select:
+            self.scene.select_element(element_id)
     
     def wheelEvent(self, event):
         if event.modifiers() & Qt.KeyboardModifier.ControlModifier:
@@ -369,46 +1035,16 @@ class BoardView(QGraphicsView):
     def keyPressEvent(self, event):
         """Tuş olaylarını yakala"""
         if event.key() == Qt.Key.Key_Delete:
-            # Seçili elementleri sil
-            selected_items = [item for item in self.scene.selectedItems() 
-                            if isinstance(item, ElementGraphicsItem)]
-            
-            from src.core.commands import DeleteElementCommand
-            for item in selected_items:
-                command = DeleteElementCommand(self.scene, item)
-                self.main_window.command_stack.execute(command)
+            # Seçili elementleri tek geri alma adımında sil (item'ı olmayanlar dahil)
+            from core.commands import CompositeCommand, DeleteElementCommand
+            board = self.scene.board
+            commands = [DeleteElementCommand(self.scene, board.elements[element_id])
+                        for element_id in self.scene.selected_element_ids()]
+            if commands:
+                self.main_window.command_stack.execute(CompositeCommand(commands, "Sil"))
         else:
             super().keyPressEvent(event)
 
-        """Tuş olaylarını yakala"""
-        if event.key() == Qt.Key.Key_Delete:
-            # Seçili elementleri sil
-            selected_items = [item for item in self.scene.selectedItems() 
-                            if isinstance(item, ElementGraphicsItem)]
-            
-            for item in selected_items:
-                # Önce bağlantıları sil
-                connections_to_remove = []
-                for scene_item in self.scene.items():
-                    if isinstance(scene_item, ConnectionGraphicsItem):
-                        if scene_item.source_item == item or scene_item.target_item == item:
-                            connections_to_remove.append(scene_item)
-                
-                for conn in connections_to_remove:
-                    self.scene.removeItem(conn)
-                
-                # Elementi sahneden sil
-                self.scene.removeItem(item)
-                
-                # Board verilerinden sil
-                if self.main_window and self.main_window.current_board:
-                    if item.element.id in self.main_window.current_board.elements:
-                        del self.main_window.current_board.elements[item.element.id]
-                        # Sol paneli güncelle
-                        self.main_window.project_explorer.refresh_elements(self.main_window.current_board)
-            
-        super().keyPressEvent(event)
-
     def set_zoom(self, factor):
         """Zoom seviyesini ayarla"""
         print(f"Setting zoom to: {factor}")  # Debug için
@@ -446,10 +1082,16 @@ class BoardView(QGraphicsView):
         scale_factor = factor / current_factor
         self.scale(scale_factor, scale_factor)
         self.zoom = factor
+        self.refresh_visible_items()
     
     def fit_to_view(self):
         """Tüm içeriği görünür pencereye sığdır"""
-        rect = self.scene.itemsBoundingRect()
+        # Sınırlar item'lardan değil modelin geometrisinden gelir
+        board = self.scene.board
+        bounds = board.element_bounds() if board is not None else None
+        if bounds is None:
+            return
+        rect = QRectF(QPointF(bounds[0], bounds[1]), QPointF(bounds[2], bounds[3]))
         if not rect.isEmpty():
             # Kenarlardan biraz boşluk bırak
             rect.adjust(-50, -50, 50, 50)
@@ -459,10 +1101,12 @@ class BoardView(QGraphicsView):
             # Toolbar'daki göstergeyi güncelle
             if self.main_window and hasattr(self.main_window, 'toolbar'):
                 self.main_window.toolbar.set_zoom_level(self.zoom)
+            self.refresh_visible_items()
 
     def set_grid_visible(self, visible):
         """Grid görünürlüğünü ayarla"""
         print(f"Board view setting grid to: {visible}")  # Debug için
+        self.show_grid = visible
         if isinstance(self.scene, BoardGraphicsScene):
             self.scene.set_grid_visible(visible)
 
@@ -483,6 +1127,7 @@ class BoardView(QGraphicsView):
             
             # Zoom uygula
             self.setTransform(QTransform().scale(self.zoom, self.zoom))
+            self.refresh_visible_items()
             
             # Toolbar'daki göstergeyi güncelle
             if self.main_window and hasattr(self.main_window, 'toolbar'):
@@ -515,4 +1160,6 @@ class ElementEditor(QWidget):
     def save_changes(self):
         self.element_item.element.title = self.title_edit.toPlainText()
         self.element_item.element.content = self.content_edit.toPlainText()
+        self.element_item.element.touch()
+        self.element_item.invalidate_text_cache()
         self.element_item.update()
\ No newline at end of file
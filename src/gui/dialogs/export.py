@@ -0,0 +1,76 @@
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel,
+                           QLineEdit, QPushButton, QCheckBox, QFileDialog)
+
+from utils.json_exporter import BUNDLE_SUFFIX
+
+
+class ExportDialog(QDialog):
+    """Oyun motorları için çalışma zamanı paketi dışa aktarım seçenekleri"""
+
+    def __init__(self, parent=None, default_path=""):
+        super().__init__(parent)
+        self.default_path = default_path
+        self.init_ui()
+
+    def init_ui(self):
+        self.setWindowTitle("Çalışma Zamanı Paketi Dışa Aktar")
+        layout = QVBoxLayout(self)
+
+        # Hedef dosya
+        path_layout = QHBoxLayout()
+        path_label = QLabel("Dosya:")
+        self.path_edit = QLineEdit(self.default_path)
+        self.path_edit.textChanged.connect(self.update_buttons)
+        browse_button = QPushButton("Gözat...")
+        browse_button.clicked.connect(self.browse)
+        path_layout.addWidget(path_label)
+        path_layout.addWidget(self.path_edit)
+        path_layout.addWidget(browse_button)
+        layout.addLayout(path_layout)
+
+        # Pakete girecek alanlar (konum, boyut, renk ve zamanlar hiç girmez)
+        self.ids_checkbox = QCheckBox("Element ID'lerini ekle (kayıt/yükleme için)")
+        self.ids_checkbox.setChecked(True)
+        layout.addWidget(self.ids_checkbox)
+        self.content_checkbox = QCheckBox("Element içeriklerini ekle")
+        self.content_checkbox.setChecked(True)
+        layout.addWidget(self.content_checkbox)
+
+        # Butonlar
+        button_layout = QHBoxLayout()
+        self.ok_button = QPushButton("Dışa Aktar")
+        self.cancel_button = QPushButton("İptal")
+
+        self.ok_button.clicked.connect(self.accept)
+        self.cancel_button.clicked.connect(self.reject)
+
+        button_layout.addWidget(self.ok_button)
+        button_layout.addWidget(self.cancel_button)
+        layout.addLayout(button_layout)
+
+        self.update_buttons()
+        self.setMinimumWidth(420)
+
+    def browse(self):
+        filepath, _ = QFileDialog.getSaveFileName(
+            self,
+            "Paketi Kaydet",
+            self.path_edit.text(),
+            f"Çalışma Zamanı Paketi (*{BUNDLE_SUFFIX});;Tüm Dosyalar (*.*)"
+        )
+        if filepath:
+            self.path_edit.setText(filepath)
+
+    def update_buttons(self):
+        self.ok_button.setEnabled(bool(self.path_edit.text().strip()))
+
+    def get_data(self):
+        """Dialog verilerini döndür"""
+        path = self.path_edit.text().strip()
+        if not path.endswith(BUNDLE_SUFFIX):
+            path += BUNDLE_SUFFIX
+        return {
+            'path': path,
+            'include_ids': self.ids_checkbox.isChecked(),
+            'include_content': self.content_checkbox.isChecked()
+        }
@@ -1,20 +1,36 @@
+import os
+import threading
+import time
+
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QMenuBar, 
-                           QStatusBar, QHBoxLayout, QDockWidget, QFileDialog)
-from PyQt6.QtCore import Qt
+                           QStatusBar, QHBoxLayout, QDockWidget, QFileDialog, QMessageBox,
+                           QProgressDialog)
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QAction, QKeySequence
 from .panels.project_explorer import ProjectExplorerPanel
 from .panels.properties import PropertiesPanel
-from .board_view import BoardView, ElementGraphicsItem, ConnectionGraphicsItem
+from .panels.search import SearchPanel
+from .panels.analysis import AnalysisPanel
+from .dialogs.export import ExportDialog
+from .board_view import BoardView
 from .toolbar import EditorToolBar  # Toolbar'ı import et
 from core.project import Project
 from core.board import Board
 from core.element import Element
 from core.commands import CommandStack
+from core.search import SearchIndex
+from core.analysis import GraphAnalysis
+from core.paths import PathStatistics
 from utils.file_ops import ProjectFileHandler
-from uuid import uuid4
+from utils.autosave import AutosaveService, find_recovery_files
+from utils.loader import ProjectLoader
+from utils.json_exporter import BUNDLE_SUFFIX, ExportCancelled, RuntimeExporter
 
 
 class MainWindow(QMainWindow):
+    # Arama indeksi proje açılınca bu sürelik dilimlerle kurulur (saniye)
+    SEARCH_INDEX_SLICE = 0.015
+
     def __init__(self):
         super().__init__()
         # Önce değişkenleri tanımla
@@ -23,14 +39,24 @@ class MainWindow(QMainWindow):
         self.board_view = None
         self.project_explorer = None
         self.properties_panel = None
+        self.search_index = None  # Proje açılınca oluşur, boşta dilim dilim kurulur
+        self._search_steps = None
+        self.graph_analysis = None  # Proje açılınca oluşur, analiz paneli açılınca kurulur
+        self.path_statistics = None
         self.command_stack = CommandStack()
+        self.autosave = AutosaveService(self)
 
         # UI'ı başlat
         self.init_ui()
+        self.autosave.failed.connect(
+            lambda message: self.statusBar.showMessage(f'Otomatik kayıt hatası: {message}'))
 
         # İlk projeyi oluştur
         self.create_new_project()
 
+        # Önceki oturum çöktüyse kurtarma dosyalarını öner
+        QTimer.singleShot(0, self.offer_recovery)
+
     def init_ui(self):
         """Ana pencere arayüzünü başlat"""
         # Pencere başlığı ve boyutu
@@ -53,6 +79,16 @@ class MainWindow(QMainWindow):
         # Sağ panel
         self.properties_panel = PropertiesPanel(self)
         self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.properties_panel)
+
+        # Arama paneli (Ctrl+F ile açılır)
+        self.search_panel = SearchPanel(self)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.search_panel)
+        self.search_panel.hide()
+
+        # Analiz paneli (Görünüm menüsünden açılır)
+        self.analysis_panel = AnalysisPanel(self)
+        self.addDockWidget(Qt.DockWidgetArea.RightDockWidgetArea, self.analysis_panel)
+        self.analysis_panel.hide()
         
         # Toolbar'ı en son ekle
         from .toolbar import EditorToolBar
@@ -98,6 +134,11 @@ class MainWindow(QMainWindow):
         save_as_action.triggered.connect(lambda: self.save_project(True))
         file_menu.addAction(save_as_action)
 
+        export_action = QAction('Dışa Aktar...', self)
+        export_action.setShortcut('Ctrl+Shift+E')
+        export_action.triggered.connect(self.export_runtime_bundle)
+        file_menu.addAction(export_action)
+
         file_menu.addSeparator()
 
         exit_action = QAction('Çıkış', self)
@@ -128,10 +169,23 @@ class MainWindow(QMainWindow):
         add_element_action.triggered.connect(self.add_element)
         edit_menu.addAction(add_element_action)
 
+        # Ara
+        search_action = QAction('Ara', self)
+        search_action.setShortcut(QKeySequence.StandardKey.Find)  # Ctrl+F
+        search_action.triggered.connect(self.search_panel.focus_query)
+        edit_menu.addAction(search_action)
+
+        # Başlangıç Elementi
+        start_action = QAction('Başlangıç Elementi Yap', self)
+        start_action.triggered.connect(self.set_starting_element)
+        edit_menu.addAction(start_action)
+
         # Görünüm menüsü
         view_menu = menubar.addMenu('Görünüm')
         view_menu.addAction('Yakınlaştır')
         view_menu.addAction('Uzaklaştır')
+        view_menu.addSeparator()
+        view_menu.addAction(self.analysis_panel.toggleViewAction())
 
     def create_new_project(self):
         """Yeni proje oluştur"""
@@ -146,6 +200,7 @@ class MainWindow(QMainWindow):
             old_widget = self.layout.itemAt(0).widget()
             self.layout.replaceWidget(old_widget, self.board_view)
             old_widget.deleteLater()
+            self.board_view.show_board(self.current_board)
 
             print("New project created successfully")
             self.statusBar.showMessage('Yeni proje oluşturuldu')
@@ -156,7 +211,10 @@ class MainWindow(QMainWindow):
             self.project_explorer.refresh_components(self.project)
 
             # Komut yığınını temizle
-            self.command_stack = CommandStack()
+            self.reset_command_stack()
+            self.reset_search_index()
+            self.reset_graph_analysis()
+            self.autosave.set_project(self.project)
 
         except Exception as e:
             import traceback
@@ -180,12 +238,14 @@ class MainWindow(QMainWindow):
         if not self.project:
             return
             
+        backend = None  # Mevcut dosyanın biçimi korunur
         if not self.project.save_path or save_as:
-            filepath, _ = QFileDialog.getSaveFileName(
+            filepath, selected_filter = QFileDialog.getSaveFileName(
                 self,
                 "Projeyi Kaydet",
                 "",
-                "Narrative Tool Projesi (*.ntp);;Tüm Dosyalar (*.*)"
+                "Narrative Tool Projesi (*.ntp);;Narrative Tool Projesi - SQLite (*.ntp);;"
+                "Tüm Dosyalar (*.*)"
             )
             if not filepath:
                 return
@@ -194,21 +254,15 @@ class MainWindow(QMainWindow):
                 filepath += '.ntp'
             
             self.project.save_path = filepath
+            backend = 'sqlite' if 'SQLite' in selected_filter else 'json'
         
         try:
-            # Elementlerin pozisyonlarını kaydet
-            for item in self.board_view.scene.items():
-                if isinstance(item, ElementGraphicsItem):
-                    item.element.position = {'x': item.pos().x(), 'y': item.pos().y()}
-                elif isinstance(item, ConnectionGraphicsItem):
-                    # Bağlantıları kaydet
-                    connection = {
-                        'source_id': item.source_item.element.id,
-                        'target_id': item.target_item.element.id
-                    }
-                    self.current_board.connections[str(uuid4())] = connection
-            
-            ProjectFileHandler.save_project(self.project, self.project.save_path)
+            # Otomatik kayıt proje dosyasından okurken dosya değişmemeli
+            self.autosave.wait()
+            # Konumlar ve bağlantılar düzenleme anında modele yazıldığı için
+            # sahneyi dolaşmaya gerek yok
+            ProjectFileHandler.save_project(self.project, self.project.save_path, backend=backend)
+            self.autosave.discard_recovery()
             self.statusBar.showMessage(f'Proje kaydedildi: {self.project.save_path}')
         except Exception as e:
             print(f"Save error: {str(e)}")
@@ -216,6 +270,39 @@ class MainWindow(QMainWindow):
             print(f"Save error: {str(e)}")
             self.statusBar.showMessage(f'Kaydetme hatası: {str(e)}')
 
+    def export_runtime_bundle(self):
+        """Projeyi oyun motorları için çalışma zamanı paketine derle"""
+        if not self.project:
+            return
+        default_path = ""
+        if self.project.save_path:
+            default_path = os.path.splitext(self.project.save_path)[0] + BUNDLE_SUFFIX
+        dialog = ExportDialog(self, default_path)
+        if dialog.exec() != ExportDialog.DialogCode.Accepted:
+            return
+        data = dialog.get_data()
+
+        # Board board yazılır; her board'dan sonra ilerleme ve iptal denetlenir
+        cancel = threading.Event()
+        progress = QProgressDialog("Dışa aktarılıyor...", "İptal", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(cancel.set)
+        exporter = RuntimeExporter(self.project, data['include_ids'], data['include_content'])
+        try:
+            exporter.export(
+                data['path'], cancel=cancel,
+                progress=lambda done, total: progress.setValue(done * 100 // total if total else 0))
+            self.statusBar.showMessage(f'Paket dışa aktarıldı: {data["path"]}')
+        except ExportCancelled:
+            self.statusBar.showMessage('Dışa aktarım iptal edildi')
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.statusBar.showMessage(f'Dışa aktarım hatası: {str(e)}')
+        finally:
+            progress.reset()
+
     def load_project(self):
         filepath, _ = QFileDialog.getOpenFileName(
             self,
@@ -226,53 +313,158 @@ class MainWindow(QMainWindow):
         
         if not filepath:
             return
-            
-        try:
-            # Projeyi yükle
-            self.project = ProjectFileHandler.load_project(filepath)
+
+        # Dosya arka planda okunur; ana board hazır olunca gösterilir
+        loader = ProjectLoader(filepath, self)
+        progress = QProgressDialog("Proje yükleniyor...", "İptal", 0, 100, self)
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(300)
+        progress.canceled.connect(loader.cancel)
+        loader.progressChanged.connect(
+            lambda done, total: progress.setValue(done * 100 // total if total else 0))
+
+        def on_ready(project):
+            progress.reset()
+            self.project = project
             self.project.save_path = filepath
+            self.show_project()
+            self.statusBar.showMessage(f'Proje yüklendi: {filepath}')
+
+        def on_failed(message):
+            progress.reset()
+            self.statusBar.showMessage(f'Yükleme hatası: {message}')
+
+        def on_cancelled():
+            progress.reset()
+            self.statusBar.showMessage('Yükleme iptal edildi')
+
+        loader.projectReady.connect(on_ready)
+        loader.failed.connect(on_failed)
+        loader.cancelled.connect(on_cancelled)
+        loader.finished.connect(loader.deleteLater)
+        self.statusBar.showMessage(f'Yükleniyor: {filepath}')
+        loader.start()
+
+    def show_project(self):
+        """Yüklenen projeyi arayüzde göster"""
+        # Yeni board view oluştur
+        self.board_view = BoardView(self)
+        old_widget = self.layout.itemAt(0).widget()
+        self.layout.replaceWidget(old_widget, self.board_view)
+        old_widget.deleteLater()
+        
+        # Ana board'u görüntüle; diğer board'lar açılana kadar diskte kalır
+        if self.project.boards:
+            boards = list(self.project.boards.values())
+            self.current_board = next((b for b in boards if b.root), boards[0])
             
-            # Yeni board view oluştur
-            self.board_view = BoardView(self)
-            old_widget = self.layout.itemAt(0).widget()
-            self.layout.replaceWidget(old_widget, self.board_view)
-            old_widget.deleteLater()
+            # Sadece görünen alandaki elementler için item oluşturulur
+            self.board_view.show_board(self.current_board)
             
-            # İlk board'u görüntüle
-            if self.project.boards:
-                self.current_board = next(iter(self.project.boards.values()))
-                
-                # Önce elementleri yükle
-                element_items = {}  # element_id -> ElementGraphicsItem eşleşmesi
-                for element in self.current_board.elements.values():
-                    item = ElementGraphicsItem(element)
-                    pos_x = element.position.get('x', 0)
-                    pos_y = element.position.get('y', 0)
-                    item.setPos(pos_x, pos_y)
-                    self.board_view.scene.addItem(item)
-                    element_items[element.id] = item
-                
-                # Sonra bağlantıları yükle
-                for connection in self.current_board.connections.values():
-                    source_item = element_items.get(connection['source_id'])
-                    target_item = element_items.get(connection['target_id'])
-                    if source_item and target_item:
-                        conn_item = ConnectionGraphicsItem(source_item, target_item)
-                        self.board_view.scene.addItem(conn_item)
-                
-                # Sol paneli güncelle
-                self.project_explorer.refresh_boards(self.project)
-                self.project_explorer.refresh_elements(self.current_board)
-                self.project_explorer.refresh_components(self.project)
-                
-                # Komut yığınını temizle
-                self.command_stack = CommandStack()
+            # Sol paneli güncelle
+            self.project_explorer.refresh_boards(self.project)
+            self.project_explorer.refresh_elements(self.current_board)
+            self.project_explorer.refresh_components(self.project)
             
-            self.statusBar.showMessage(f'Proje yüklendi: {filepath}')
+            # Komut yığınını temizle
+            self.reset_command_stack()
+        self.reset_search_index()
+        self.reset_graph_analysis()
+        self.autosave.set_project(self.project)
+
+    def reset_command_stack(self):
+        """Yeni komut yığını oluştur ve otomatik kayda bağla"""
+        self.command_stack = CommandStack()
+        self.command_stack.add_listener(self.autosave.notify_activity)
+        self.command_stack.add_listener(self._update_search_index)
+
+    def reset_search_index(self):
+        """Açılan proje için yeni arama indeksi oluştur ve arka planda kurmaya başla"""
+        self.search_index = SearchIndex(self.project)
+        self.search_panel.clear()
+        self._search_steps = None
+        self.build_search_index()
+
+    def build_search_index(self):
+        """İndekste olmayan board'ları arka planda dilim dilim indekslemeye başla"""
+        index = self.search_index
+        if index is None or self._search_steps is not None or index.is_complete:
+            return
+        self._search_steps = index.iter_refresh()
+        QTimer.singleShot(0, self._index_search_step)
+
+    def _index_search_step(self):
+        """Arama indeksini arayüzü kilitlemeden kısa dilimlerle kur"""
+        steps = self._search_steps
+        if steps is None:
+            return
+        deadline = time.perf_counter() + self.SEARCH_INDEX_SLICE
+        for _ in steps:
+            if time.perf_counter() >= deadline:
+                QTimer.singleShot(0, self._index_search_step)
+                return
+        if steps is self._search_steps:
+            self._search_steps = None
+            # Eksik indeksle gösterilen sonuçlar tamamlanır
+            self.search_panel.index_completed()
+
+    def _update_search_index(self):
+        # Komutların değiştirdiği elementler indekse hemen işlenir
+        if self.search_index is not None:
+            self.search_index.update()
+
+    def reset_graph_analysis(self):
+        """Açılan proje için yeni graf analizi oluştur (panel açıksa hemen kurulur)"""
+        self.graph_analysis = GraphAnalysis(self.project)
+        self.path_statistics = PathStatistics(self.graph_analysis)
+        self.analysis_panel.clear()
+        self.analysis_panel.schedule_refresh()
+
+    def set_starting_element(self):
+        """Seçili elementi hikayenin başlangıcı yap"""
+        scene = self.board_view.scene if self.board_view else None
+        selected = scene.selected_element_ids() if scene is not None else []
+        if not self.project or len(selected) != 1:
+            self.statusBar.showMessage('Başlangıç için tek bir element seçin')
+            return
+        self.project.set_starting_element(selected[0])
+        self.analysis_panel.schedule_refresh()
+        self.statusBar.showMessage('Başlangıç elementi ayarlandı')
+
+    def offer_recovery(self):
+        """Kapanmadan kalan kurtarma dosyası varsa yüklemeyi öner"""
+        files = find_recovery_files()
+        if not files:
+            return
+        answer = QMessageBox.question(
+            self,
+            "Kurtarma",
+            "Önceki oturumdan kaydedilmemiş değişiklikler bulundu. Kurtarılsın mı?",
+            QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
+        )
+        if answer != QMessageBox.StandardButton.Yes:
+            for path in files:
+                os.remove(path)
+            return
+        try:
+            # Kurtarma dosyaları döndürülerek silindiği için tamamen yükle
+            header = ProjectFileHandler.read_index(files[0])['project']
+            self.project = ProjectFileHandler.load_project(files[0], lazy=False)
+            self.project.save_state = None
+            self.project.save_path = header.get('save_path')
+            # Kurtarılan içerik hiçbir dosyada yok; kapanışta kurtarma dosyası silinmesin
+            self.project.mark_dirty()
+            self.show_project()
+            self.statusBar.showMessage('Proje kurtarıldı; kaydetmeyi unutmayın')
         except Exception as e:
             import traceback
             traceback.print_exc()
-            self.statusBar.showMessage(f'Yükleme hatası: {str(e)}')
+            self.statusBar.showMessage(f'Kurtarma hatası: {str(e)}')
+
+    def closeEvent(self, event):
+        """Kapanışta kaydedilmiş projenin kurtarma dosyalarını temizle"""
+        self.autosave.shutdown(discard=not (self.project and self.project.is_dirty))
+        super().closeEvent(event)
     
     def switch_to_board(self, board):
         """Board'u değiştir"""
@@ -281,27 +473,9 @@ class MainWindow(QMainWindow):
 
         print(f"Switching to board: {board.name}")
 
-        # Mevcut board'daki elementlerin pozisyonlarını kaydet
-        if self.current_board:
-            for item in self.board_view.scene.items():
-                if isinstance(item, ElementGraphicsItem):
-                    item.element.position = {'x': item.pos().x(), 'y': item.pos().y()}
-                    print(f"Saving position for element {item.element.title}: {item.element.position}")
-
-        # Board'u değiştir
+        # Konumlar zaten modelde; item'lar görünen alana göre yeniden oluşur
         self.current_board = board
-
-        # Scene'i temizle
-        self.board_view.scene.clear()
-
-        # Elementleri yükle
-        for element_id, element in board.elements.items():
-            item = ElementGraphicsItem(element)
-            pos_x = element.position.get('x', 0)
-            pos_y = element.position.get('y', 0)
-            print(f"Loading element {element.title} at position: {pos_x}, {pos_y}")
-            item.setPos(pos_x, pos_y)
-            self.board_view.scene.addItem(item)
+        self.board_view.show_board(board)
 
         # Elementler listesini güncelle
         self.project_explorer.refresh_elements(board)
@@ -309,6 +483,14 @@ class MainWindow(QMainWindow):
         # Durum çubuğunu güncelle
         self.statusBar.showMessage(f'Board değiştirildi: {board.name}')
 
+    def show_element(self, board_id, element_id):
+        """Board'a geç ve elementi ortalayıp seç (arama sonuçları için)"""
+        board = self.project.boards.get(board_id) if self.project else None
+        if board is None:
+            return
+        self.switch_to_board(board)
+        self.board_view.center_on_element(element_id)
+
     def undo(self):
         """Son işlemi geri al"""
         self.command_stack.undo()
@@ -0,0 +1,142 @@
+from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QComboBox, QListWidget,
+                             QListWidgetItem, QLabel, QPushButton)
+from PyQt6.QtCore import Qt, QTimer
+
+
+class AnalysisPanel(QDockWidget):
+    """Anlatı grafiği analizi: erişilemeyen sahneler, çıkmazlar, döngüler, yetimler"""
+
+    # Art arda gelen komutlardan sonra bir kez yenilenir
+    REFRESH_DELAY_MS = 100
+    MAX_ITEMS = 500
+
+    UNREACHABLE, DEAD_ENDS, LOOPS, ORPHANS = range(4)
+    CATEGORY_TITLES = ("Erişilemeyen", "Çıkmaz", "Döngü", "Yetim")
+
+    def __init__(self, parent=None):
+        super().__init__("Analiz", parent)
+        self.main_window = parent
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.REFRESH_DELAY_MS)
+        self._timer.timeout.connect(self.refresh)
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.summary_label = QLabel()
+        self.summary_label.setWordWrap(True)
+        layout.addWidget(self.summary_label)
+
+        # Yol istatistikleri büyük projelerde pahalı: istenince hesaplanır
+        self.paths_button = QPushButton("Yol İstatistikleri")
+        self.paths_button.clicked.connect(self.show_path_statistics)
+        layout.addWidget(self.paths_button)
+        self.paths_label = QLabel()
+        self.paths_label.setWordWrap(True)
+        layout.addWidget(self.paths_label)
+
+        self.category_combo = QComboBox()
+        self.category_combo.addItems(self.CATEGORY_TITLES)
+        self.category_combo.currentIndexChanged.connect(lambda _: self.refresh())
+        layout.addWidget(self.category_combo)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.results.itemActivated.connect(self._open_result)
+        layout.addWidget(self.results)
+
+        self.setWidget(widget)
+        # Analiz sadece panel açıkken kurulur ve güncellenir
+        self.visibilityChanged.connect(lambda visible: visible and self.schedule_refresh())
+
+    def clear(self):
+        self._timer.stop()
+        self.results.clear()
+        self.summary_label.clear()
+        self.paths_label.clear()
+
+    def schedule_refresh(self):
+        """Panel görünürse kısa bir gecikmeyle yenile"""
+        if self.isVisible():
+            self._timer.start()
+
+    def refresh(self):
+        """Analizi projeyle eşitle ve seçili kategoriyi listele"""
+        self._timer.stop()
+        self.results.clear()
+        analysis = self.main_window.graph_analysis if self.main_window else None
+        if analysis is None:
+            self.summary_label.clear()
+            return
+        analysis.refresh()
+        statistics = self.main_window.path_statistics
+        if statistics is not None and not statistics.is_current:
+            self.paths_label.clear()
+
+        summary = analysis.summary()
+        if analysis.start is None:
+            reach = "Başlangıç elementi seçilmedi"
+        else:
+            reach = f"Erişilen: {summary['reachable']}, erişilemeyen: {summary['unreachable']}"
+        self.summary_label.setText(
+            f"{summary['elements']} element, {summary['connections']} bağlantı\n{reach}\n"
+            f"Çıkmaz: {summary['dead_ends']}, döngü: {summary['loops']}, "
+            f"yetim: {summary['orphans']}")
+
+        category = self.category_combo.currentIndex()
+        if category == self.LOOPS:
+            for members in analysis.loops()[:self.MAX_ITEMS]:
+                first = next(iter(members))
+                self._add_item(analysis, first, f"{len(members)} element: ")
+            return
+        if category == self.UNREACHABLE:
+            element_ids = analysis.unreachable()
+        elif category == self.DEAD_ENDS:
+            element_ids = analysis.dead_ends()
+        else:
+            element_ids = analysis.orphans()
+        for element_id in element_ids[:self.MAX_ITEMS]:
+            self._add_item(analysis, element_id)
+
+    def show_path_statistics(self):
+        """Başlangıçtan sonlara oynanış sayısını ve derinlikleri göster"""
+        statistics = self.main_window.path_statistics if self.main_window else None
+        if statistics is None:
+            return
+        summary = statistics.summary()
+        if statistics.analysis.start is None:
+            self.paths_label.setText("Başlangıç elementi seçilmedi")
+            return
+        if not summary['endings']:
+            self.paths_label.setText("Başlangıçtan erişilen son yok")
+            return
+        self.paths_label.setText(
+            f"Oynanış: {format_count(summary['playthroughs'])}, son: {summary['endings']}\n"
+            f"En kısa: {summary['shortest']} adım, en uzun: {summary['longest']} adım\n"
+            f"Her oynanışta: {len(statistics.common_dominators())} element")
+
+    def _add_item(self, analysis, element_id, prefix=""):
+        board_id = analysis.board_of(element_id)
+        board = self.main_window.project.boards.get(board_id)
+        # Yüklenmemiş board'lar sadece başlık için açılmaz
+        if board is not None and board.is_loaded and element_id in board.elements:
+            title = board.elements[element_id].title
+        else:
+            title = element_id
+        board_name = board.name if board is not None else "?"
+        item = QListWidgetItem(f"{prefix}{title}  —  {board_name}")
+        item.setData(Qt.ItemDataRole.UserRole, (board_id, element_id))
+        self.results.addItem(item)
+
+    def _open_result(self, item):
+        target = item.data(Qt.ItemDataRole.UserRole)
+        if target is not None:
+            self.main_window.show_element(*target)
+
+
+def format_count(count):
+    """Çok büyük sayıları yaklaşık yaz (str() binlerce basamakta hata verir)"""
+    if count < 10 ** 15:
+        return f"{count:,}".replace(",", ".")
+    return f"~10^{int((count.bit_length() - 1) * 0.30103)}"
@@ -1,9 +1,9 @@
-from PyQt6.QtWidgets import (QDockWidget, QTreeWidget, QTreeWidgetItem, 
-                           QVBoxLayout, QHBoxLayout, QWidget, 
-                           QPushButton, QMenu, QDialog)
+from PyQt6.QtWidgets import (QDockWidget, QTreeView, QVBoxLayout, QHBoxLayout,
+                           QWidget, QPushButton, QMenu, QDialog)
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QIcon, QAction
 from ..dialogs.board_dialog import BoardDialog
+from .project_tree import ProjectTreeModel
 from core.board import Board
 
 class ProjectExplorerPanel(QDockWidget):
@@ -24,22 +24,18 @@ class ProjectExplorerPanel(QDockWidget):
         board_buttons.addWidget(self.add_board_btn)
         layout.addLayout(board_buttons)
         
-        # Ağaç widget'ı
-        self.tree = QTreeWidget()
-        self.tree.setHeaderLabel("Proje İçeriği")
-        self.tree.itemDoubleClicked.connect(self.item_double_clicked)
+        # Ağaç görünümü: satırlar modelden okunur, sadece görünenler çizilir
+        self.model = ProjectTreeModel(self)
+        self.tree = QTreeView()
+        self.tree.setModel(self.model)
+        self.tree.setUniformRowHeights(True)
+        self.tree.doubleClicked.connect(self.item_double_clicked)
         self.tree.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.show_context_menu)
         
-        # Ana kategorileri oluştur
-        self.boards_item = QTreeWidgetItem(["Board'lar"])
-        self.elements_item = QTreeWidgetItem(["Elementler"])
-        self.components_item = QTreeWidgetItem(["Bileşenler"])
-        
-        # Ana kategorileri ağaca ekle
-        self.tree.addTopLevelItem(self.boards_item)
-        self.tree.addTopLevelItem(self.elements_item)
-        self.tree.addTopLevelItem(self.components_item)
+        # Ana kategorileri aç; satırlar dal açılınca parça parça oluşur
+        for category in range(len(ProjectTreeModel.CATEGORY_TITLES)):
+            self.tree.expand(self.model.category_index(category))
         
         layout.addWidget(self.tree)
         self.setWidget(widget)
@@ -47,36 +43,33 @@ class ProjectExplorerPanel(QDockWidget):
     def refresh_boards(self, project):
         """Board'ları güncelle"""
         print("Refreshing boards...")
-        self.boards_item.takeChildren()  # Mevcut board'ları temizle
-        if project and project.boards:
-            for board_id, board in project.boards.items():
-                board_item = QTreeWidgetItem([board.name])
-                board_item.setData(0, Qt.ItemDataRole.UserRole, board_id)
-                self.boards_item.addChild(board_item)
-        self.boards_item.setExpanded(True)
+        self.model.set_boards(project)
+        self._reveal(ProjectTreeModel.BOARDS)
         print(f"Added {len(project.boards) if project else 0} boards")
 
     def refresh_elements(self, current_board):
         """Elementleri güncelle"""
-        self.elements_item.takeChildren()  # Mevcut elementleri temizle
-        if current_board and current_board.elements:
-            for element_id, element in current_board.elements.items():
-                element_item = QTreeWidgetItem([element.title])
-                element_item.setData(0, Qt.ItemDataRole.UserRole, element_id)
-                self.elements_item.addChild(element_item)
-        self.elements_item.setExpanded(True)
+        self.model.set_elements(current_board)
+        self._reveal(ProjectTreeModel.ELEMENTS)
+
+    def elements_changed(self, board, element_ids):
+        """Sadece değişen elementlerin satırlarını güncelle (ekleme, silme, ad değişikliği)"""
+        self.model.elements_changed(board, element_ids)
+        self._reveal(ProjectTreeModel.ELEMENTS)
 
     def refresh_components(self, project):
         """Componentleri güncelle"""
         print("Refreshing components...")
-        self.components_item.takeChildren()  # Mevcut componentleri temizle
-        if project and hasattr(project, 'components'):
-            for component_id, component in project.components.items():
-                component_item = QTreeWidgetItem([component.name])
-                component_item.setData(0, Qt.ItemDataRole.UserRole, component_id)
-                self.components_item.addChild(component_item)
-        self.components_item.setExpanded(True)
+        self.model.set_components(project)
+        self._reveal(ProjectTreeModel.COMPONENTS)
         print(f"Added {len(project.components) if hasattr(project, 'components') else 0} components")
+
+    def _reveal(self, category):
+        """Açık bir dal boş kaldıysa ilk satır parçasını yükle"""
+        index = self.model.category_index(category)
+        if (self.tree.isExpanded(index) and not self.model.rowCount(index)
+                and self.model.canFetchMore(index)):
+            self.model.fetchMore(index)
         
     def add_board(self):
         """Yeni board ekle"""
@@ -88,11 +81,11 @@ class ProjectExplorerPanel(QDockWidget):
             data = dialog.get_data()
             board = Board(data['name'], data['root'])
             self.main_window.project.add_board(board)
-            self.refresh_boards(self.main_window.project)
+            self.model.boards_changed([board.id])
             
-    def edit_board(self, board_item):
+    def edit_board(self, index):
         """Board düzenle"""
-        board_id = board_item.data(0, Qt.ItemDataRole.UserRole)
+        board_id = self.model.item_id(index)
         board = self.main_window.project.boards.get(board_id)
         if board:
             dialog = BoardDialog(self, board)
@@ -100,46 +93,49 @@ class ProjectExplorerPanel(QDockWidget):
                 data = dialog.get_data()
                 board.name = data['name']
                 board.root = data['root']
-                self.refresh_boards(self.main_window.project)
+                self.main_window.project.mark_dirty()
+                self.model.boards_changed([board_id])
                 
-    def delete_board(self, board_item):
+    def delete_board(self, index):
         """Board sil"""
-        board_id = board_item.data(0, Qt.ItemDataRole.UserRole)
+        board_id = self.model.item_id(index)
         if board_id in self.main_window.project.boards:
-            del self.main_window.project.boards[board_id]
-            self.refresh_boards(self.main_window.project)
+            self.main_window.project.remove_board(board_id)
+            if self.main_window.current_board is None or self.main_window.current_board.id != board_id:
+                self.main_window.board_view.scene_cache.discard(board_id)
+            self.model.boards_changed([board_id])
             
     def show_context_menu(self, position):
         """Sağ tık menüsü göster"""
-        item = self.tree.itemAt(position)
-        if not item:
+        index = self.tree.indexAt(position)
+        if not index.isValid():
             return
             
         menu = QMenu()
         
         # Board işlemleri
-        if item.parent() == self.boards_item:
+        if self.model.category_of(index) == ProjectTreeModel.BOARDS:
             edit_action = menu.addAction("Düzenle")
-            edit_action.triggered.connect(lambda: self.edit_board(item))
+            edit_action.triggered.connect(lambda: self.edit_board(index))
             
             switch_action = menu.addAction("Bu Board'a Geç")
-            switch_action.triggered.connect(lambda: self.switch_to_board(item))
+            switch_action.triggered.connect(lambda: self.switch_to_board(index))
             
             menu.addSeparator()
             
             delete_action = menu.addAction("Sil")
-            delete_action.triggered.connect(lambda: self.delete_board(item))
+            delete_action.triggered.connect(lambda: self.delete_board(index))
             
             menu.exec(self.tree.viewport().mapToGlobal(position))
             
-    def switch_to_board(self, board_item):
+    def switch_to_board(self, index):
         """Seçili board'a geç"""
-        board_id = board_item.data(0, Qt.ItemDataRole.UserRole)
+        board_id = self.model.item_id(index)
         board = self.main_window.project.boards.get(board_id)
         if board:
             self.main_window.switch_to_board(board)
             
-    def item_double_clicked(self, item, column):
+    def item_double_clicked(self, index):
         """Öğeye çift tıklandığında"""
-        if item.parent() == self.boards_item:
-            self.switch_to_board(item)
\ No newline at end of file
+        if self.model.category_of(index) == ProjectTreeModel.BOARDS:
+            self.switch_to_board(index)
\ No newline at end of file
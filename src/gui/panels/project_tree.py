@@ -0,0 +1,288 @@
+from contextlib import contextmanager
+
+from PyQt6.QtCore import Qt, QAbstractItemModel, QModelIndex
+
+
+class ProjectTreeModel(QAbstractItemModel):
+    """Proje gezgini için ağaç modeli
+
+    Üç sabit kategori (board'lar, elementler, bileşenler) ve altlarında düz
+    satırlar vardır. Satırlar sadece ID listelerinden okunur; her satır için
+    ayrı bir nesne oluşturulmaz. Bir dal açıldıkça satırlar FETCH_BATCH'lik
+    parçalar halinde görünür olur. Ekleme, silme ve yeniden adlandırma
+    sadece ilgili satırları etkiler.
+    """
+
+    BOARDS, ELEMENTS, COMPONENTS = range(3)
+    CATEGORY_TITLES = ("Board'lar", "Elementler", "Bileşenler")
+    FETCH_BATCH = 500  # fetchMore başına görünür hale gelen satır sayısı
+    RESET_ABOVE = 100  # Bu kadar dağınık silme aralığında kategori baştan kurulur
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.project = None
+        self.board = None  # Elementleri listelenen board
+        self._ids = [[], [], []]  # kategori -> satır sırasıyla ID'ler
+        self._rows = [{}, {}, {}]  # kategori -> ID -> satır
+        self._fetched = [0, 0, 0]  # kategori -> görünüme verilmiş satır sayısı
+        self._changing_rows = False  # begin/end arasında fetchMore yapılmaz
+
+    # --- QAbstractItemModel ---
+
+    def index(self, row, column, parent=QModelIndex()):
+        if column != 0:
+            return QModelIndex()
+        if not parent.isValid():
+            if 0 <= row < len(self.CATEGORY_TITLES):
+                return self.createIndex(row, 0, 0)
+            return QModelIndex()
+        if parent.internalId() == 0:
+            category = parent.row()
+            if 0 <= row < self._fetched[category]:
+                return self.createIndex(row, 0, category + 1)
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid() or index.internalId() == 0:
+            return QModelIndex()
+        return self.createIndex(index.internalId() - 1, 0, 0)
+
+    def rowCount(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return len(self.CATEGORY_TITLES)
+        if parent.internalId() == 0:
+            return self._fetched[parent.row()]
+        return 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return 1
+
+    def hasChildren(self, parent=QModelIndex()):
+        if not parent.isValid():
+            return True
+        if parent.internalId() == 0:
+            return bool(self._ids[parent.row()])
+        return False
+
+    def canFetchMore(self, parent):
+        if self._changing_rows or not parent.isValid() or parent.internalId() != 0:
+            return False
+        category = parent.row()
+        return self._fetched[category] < len(self._ids[category])
+
+    def fetchMore(self, parent):
+        if not self.canFetchMore(parent):
+            return
+        category = parent.row()
+        start = self._fetched[category]
+        count = min(self.FETCH_BATCH, len(self._ids[category]) - start)
+        with self._row_change():
+            self.beginInsertRows(parent, start, start + count - 1)
+            self._fetched[category] += count
+            self.endInsertRows()
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        if index.internalId() == 0:
+            if role == Qt.ItemDataRole.DisplayRole:
+                return self.CATEGORY_TITLES[index.row()]
+            return None
+        category = index.internalId() - 1
+        item_id = self._ids[category][index.row()]
+        if role == Qt.ItemDataRole.UserRole:
+            return item_id
+        if role == Qt.ItemDataRole.DisplayRole:
+            item = self._source(category).get(item_id)
+            if item is None:
+                return None
+            return item.title if category == self.ELEMENTS else item.name
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (orientation == Qt.Orientation.Horizontal and section == 0
+                and role == Qt.ItemDataRole.DisplayRole):
+            return "Proje İçeriği"
+        return None
+
+    # --- Yardımcılar ---
+
+    def category_index(self, category):
+        """Kategori satırının indeksi"""
+        return self.index(category, 0)
+
+    def category_of(self, index):
+        """Satırın kategorisi (kategori satırları ve geçersiz indeks için None)"""
+        if not index.isValid() or index.internalId() == 0:
+            return None
+        return index.internalId() - 1
+
+    def item_id(self, index):
+        """Satırın board/element/bileşen ID'si"""
+        return self.data(index, Qt.ItemDataRole.UserRole)
+
+    def row_of(self, category, item_id):
+        """ID'nin satır indeksi (henüz görünür değilse geçersiz indeks)"""
+        row = self._rows[category].get(item_id)
+        if row is None or row >= self._fetched[category]:
+            return QModelIndex()
+        return self.createIndex(row, 0, category + 1)
+
+    @contextmanager
+    def _row_change(self):
+        """Satır ekleme/silme sinyallerine bağlı görünüm bu sırada fetchMore yapamaz
+
+        rowsAboutToBeInserted/Removed'a bağlı biri canFetchMore'u çağırırsa
+        sayaçlar henüz güncellenmediği için aynı satırlar iki kez eklenirdi.
+        """
+        self._changing_rows = True
+        try:
+            yield
+        finally:
+            self._changing_rows = False
+
+    def _source(self, category):
+        if category == self.ELEMENTS:
+            return self.board.elements if self.board is not None else {}
+        if self.project is None:
+            return {}
+        if category == self.BOARDS:
+            return self.project.boards
+        return getattr(self.project, 'components', {})
+
+    # --- Tam yenileme (proje açılınca, board değişince) ---
+
+    def set_boards(self, project):
+        self.project = project
+        self._reset(self.BOARDS, self._source(self.BOARDS))
+
+    def set_elements(self, board):
+        self.board = board
+        self._reset(self.ELEMENTS, self._source(self.ELEMENTS))
+
+    def set_components(self, project):
+        self.project = project
+        self._reset(self.COMPONENTS, self._source(self.COMPONENTS))
+
+    def _reset(self, category, ids):
+        parent = self.category_index(category)
+        fetched = self._fetched[category]
+        if fetched:
+            with self._row_change():
+                self.beginRemoveRows(parent, 0, fetched - 1)
+                self._ids[category] = []
+                self._rows[category] = {}
+                self._fetched[category] = 0
+                self.endRemoveRows()
+        self._ids[category] = list(ids)
+        self._rows[category] = {item_id: row for row, item_id in enumerate(self._ids[category])}
+        # Dal "var/yok" durumu değişmiş olabilir
+        self.dataChanged.emit(parent, parent)
+
+    # --- Artımlı güncelleme ---
+
+    def elements_changed(self, board, element_ids):
+        """Eklenen, silinen ya da yeniden adlandırılan elementlerin satırlarını güncelle"""
+        if board is self.board and board is not None:
+            self._sync(self.ELEMENTS, element_ids, board.elements)
+
+    def boards_changed(self, board_ids):
+        """Eklenen, silinen ya da yeniden adlandırılan board'ların satırlarını güncelle"""
+        if self.project is not None:
+            self._sync(self.BOARDS, board_ids, self.project.boards)
+
+    def _sync(self, category, changed_ids, present):
+        """Her ID için satır varlığını present'e göre eşitle
+
+        present'te olup satırı olmayanlar sona eklenir, satırı olup
+        present'te olmayanlar silinir, ikisinde de olanların sadece
+        satırı yeniden çizilir.
+        """
+        rows = self._rows[category]
+        fetched = self._fetched[category]
+        parent = self.category_index(category)
+        added = []
+        removed = []
+        for item_id in changed_ids:
+            row = rows.get(item_id)
+            if item_id in present:
+                if row is None:
+                    added.append(item_id)
+                elif row < fetched:
+                    index = self.createIndex(row, 0, category + 1)
+                    self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole])
+            elif row is not None:
+                removed.append(row)
+        if removed:
+            self._remove_rows(category, removed)
+        if added:
+            if len(added) > 1:
+                # Sıra modeldeki (eklenme) sırasıyla aynı kalsın
+                wanted = set(added)
+                added = [item_id for item_id in present if item_id in wanted]
+            self._append_rows(category, added)
+        if not fetched and (added or removed):
+            self.dataChanged.emit(parent, parent)
+
+    def _remove_rows(self, category, removed_rows):
+        # Ardışık satırlar tek aralıkta silinir; sondan başa gidilir
+        removed_rows.sort(reverse=True)
+        ranges = []
+        for row in removed_rows:
+            if ranges and ranges[-1][0] == row + 1:
+                ranges[-1][0] = row
+            else:
+                ranges.append([row, row])
+        ids = self._ids[category]
+        rows = self._rows[category]
+        if len(ranges) > self.RESET_ABOVE:
+            gone = {ids[row] for row in removed_rows}
+            fetched = self._fetched[category]
+            self._reset(category, [item_id for item_id in ids if item_id not in gone])
+            if fetched:
+                self._fetch_to(category, fetched - len(removed_rows))
+            return
+        parent = self.category_index(category)
+        for first, last in ranges:
+            for row in range(first, last + 1):
+                del rows[ids[row]]
+            fetched = self._fetched[category]
+            if first < fetched:
+                # Görünür kısım view'a bildirilir; görünmeyen kuyruk sessizce silinir
+                visible_last = min(last, fetched - 1)
+                with self._row_change():
+                    self.beginRemoveRows(parent, first, visible_last)
+                    del ids[first:last + 1]
+                    self._fetched[category] -= visible_last - first + 1
+                    self.endRemoveRows()
+            else:
+                del ids[first:last + 1]
+        for row in range(ranges[-1][0], len(ids)):
+            rows[ids[row]] = row
+
+    def _append_rows(self, category, new_ids):
+        ids = self._ids[category]
+        rows = self._rows[category]
+        start = len(ids)
+        if self._fetched[category] == start:
+            # Bütün satırlar görünürken eklenenler de hemen görünür
+            with self._row_change():
+                self.beginInsertRows(self.category_index(category),
+                                     start, start + len(new_ids) - 1)
+                self._extend(ids, rows, new_ids)
+                self._fetched[category] += len(new_ids)
+                self.endInsertRows()
+        else:
+            self._extend(ids, rows, new_ids)
+
+    @staticmethod
+    def _extend(ids, rows, new_ids):
+        for item_id in new_ids:
+            rows[item_id] = len(ids)
+            ids.append(item_id)
+
+    def _fetch_to(self, category, count):
+        """En az count satır görünür olana kadar fetchMore yap"""
+        parent = self.category_index(category)
+        while self._fetched[category] < count and self.canFetchMore(parent):
+            self.fetchMore(parent)
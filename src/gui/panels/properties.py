@@ -2,7 +2,7 @@ from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QHBoxLayout,
                              QLabel, QLineEdit, QTextEdit, QSpinBox, QColorDialog,
                              QPushButton, QFormLayout, QGroupBox)
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QColor, QBrush
+from PyQt6.QtGui import QColor
 from core.commands import UpdateElementCommand
 
 
@@ -10,7 +10,8 @@ class PropertiesPanel(QDockWidget):
     def __init__(self, parent=None):
         super().__init__("Özellikler", parent)
         self.main_window = parent
-        self.current_element = None
+        self.current_element = None  # Seçili Element (model)
+        self.current_scene = None  # Elementin bulunduğu BoardGraphicsScene
         self._updating = False
 
         # Ana widget ve layout
@@ -29,6 +30,7 @@ class PropertiesPanel(QDockWidget):
         # Başlık alanı
         self.title_edit = QLineEdit()
         self.title_edit.textChanged.connect(self._on_title_changed)
+        self.title_edit.editingFinished.connect(self._end_edit_group)
         self.properties_layout.addRow("Başlık:", self.title_edit)
 
         # İçerik alanı
@@ -85,10 +87,12 @@ class PropertiesPanel(QDockWidget):
         """Seçili elementi güvenli bir şekilde ayarla"""
         try:
             self._updating = True
+            self._end_edit_group()
 
             # Element kontrolü
             if element_item is None:
                 self.current_element = None
+                self.current_scene = None
                 self.properties_widget.hide()
                 self.no_selection_label.show()
                 return
@@ -96,45 +100,58 @@ class PropertiesPanel(QDockWidget):
             # Scene kontrolü
             if not element_item.scene():
                 self.current_element = None
+                self.current_scene = None
                 self.properties_widget.hide()
                 self.no_selection_label.show()
                 return
 
-            print(f"Setting element: {element_item.element.title}")
-            self.current_element = element_item
+            # Item'lar yeniden kullanılabildiği için model elementi tutulur
+            element = element_item.element
+            self.current_element = element
+            self.current_scene = element_item.scene()
             self.no_selection_label.hide()
             self.properties_widget.show()
 
             # Form alanlarını güncelle
-            if hasattr(element_item.element, 'title'):
-                self.title_edit.setText(element_item.element.title)
-            if hasattr(element_item.element, 'content'):
-                self.content_edit.setText(element_item.element.content)
+            self.title_edit.setText(element.title)
+            self.content_edit.setText(element.content)
 
             # Boyut değerlerini güncelle
-            rect = element_item.rect()
-            self.width_spin.setValue(int(rect.width()))
-            self.height_spin.setValue(int(rect.height()))
+            self.width_spin.setValue(int(element.size['width']))
+            self.height_spin.setValue(int(element.size['height']))
 
             # Renk butonunu güncelle
-            color = element_item.brush().color()
-            self.color_button.setStyleSheet(f"background-color: {color.name()};")
+            self.color_button.setStyleSheet(f"background-color: {element.color};")
 
         except Exception as e:
             print(f"Error in set_element: {str(e)}")
             self.current_element = None
+            self.current_scene = None
             self.properties_widget.hide()
             self.no_selection_label.show()
         finally:
             self._updating = False
 
+    def sync_with_board(self, board):
+        """Gösterilen element board'dan silindiyse paneli boşalt"""
+        if (self.current_element is not None and self.current_scene is not None
+                and self.current_scene.board is board
+                and self.current_element.id not in board.elements):
+            self.set_element(None)
+
+    def _end_edit_group(self):
+        """Düzenleme bitince sonraki yazma ayrı bir geri alma adımı olsun"""
+        if self.main_window is not None and hasattr(self.main_window, 'command_stack'):
+            self.main_window.command_stack.close_merge()
+
     def _on_title_changed(self):
         if not self._updating and self.current_element:
             try:
-                old_title = self.current_element.element.title
+                old_title = self.current_element.title
                 new_title = self.title_edit.text()
                 if old_title != new_title:
                     command = UpdateElementCommand(
+                        self.current_scene,
                         self.current_element,
                         "title",
                         old_title,
@@ -147,10 +164,11 @@ class PropertiesPanel(QDockWidget):
     def _on_content_changed(self):
         if not self._updating and self.current_element:
             try:
-                old_content = self.current_element.element.content
+                old_content = self.current_element.content
                 new_content = self.content_edit.toPlainText()
                 if old_content != new_content:
                     command = UpdateElementCommand(
+                        self.current_scene,
                         self.current_element,
                         "content",
                         old_content,
@@ -163,16 +181,14 @@ class PropertiesPanel(QDockWidget):
     def _on_size_changed(self):
         if not self._updating and self.current_element:
             try:
-                old_size = {
-                    'width': self.current_element.rect().width(),
-                    'height': self.current_element.rect().height()
-                }
+                old_size = dict(self.current_element.size)
                 new_size = {
                     'width': self.width_spin.value(),
                     'height': self.height_spin.value()
                 }
                 if old_size != new_size:
                     command = UpdateElementCommand(
+                        self.current_scene,
                         self.current_element,
                         "size",
                         old_size,
@@ -185,16 +201,17 @@ class PropertiesPanel(QDockWidget):
     def _on_color_button_clicked(self):
         if self.current_element:
             try:
-                old_brush = self.current_element.brush()
-                color = QColorDialog.getColor(old_brush.color(), self)
+                old_color = self.current_element.color
+                color = QColorDialog.getColor(QColor(old_color), self)
                 if color.isValid():
-                    new_brush = QBrush(color)
                     command = UpdateElementCommand(
+                        self.current_scene,
                         self.current_element,
                         "color",
-                        old_brush,
-                        new_brush
+                        old_color,
+                        color.name()
                     )
+                    self.color_button.setStyleSheet(f"background-color: {color.name()};")
                     self.main_window.command_stack.execute(command)
             except Exception as e:
                 print(f"Error updating color: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,92 @@
+from PyQt6.QtWidgets import (QDockWidget, QWidget, QVBoxLayout, QLineEdit, QListWidget,
+                             QListWidgetItem, QLabel)
+from PyQt6.QtCore import Qt, QTimer
+
+
+class SearchPanel(QDockWidget):
+    """Tüm board'larda element başlık ve içeriklerinde arama"""
+
+    # Yazarken her tuşta değil, yazma durunca aranır
+    SEARCH_DELAY_MS = 150
+    MAX_RESULTS = 200
+
+    def __init__(self, parent=None):
+        super().__init__("Ara", parent)
+        self.main_window = parent
+        self._partial = False  # Son arama eksik indeksle mi yapıldı?
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.SEARCH_DELAY_MS)
+        self._timer.timeout.connect(self.run_search)
+
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("Başlık veya içerikte ara...")
+        self.query_edit.setClearButtonEnabled(True)
+        self.query_edit.textChanged.connect(lambda _: self._timer.start())
+        self.query_edit.returnPressed.connect(self.run_search)
+        layout.addWidget(self.query_edit)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.results = QListWidget()
+        self.results.setUniformItemSizes(True)
+        self.results.itemActivated.connect(self._open_result)
+        layout.addWidget(self.results)
+
+        self.setWidget(widget)
+
+    def focus_query(self):
+        """Paneli göster ve arama kutusuna odaklan"""
+        self.show()
+        self.raise_()
+        self.query_edit.setFocus()
+        self.query_edit.selectAll()
+
+    def clear(self):
+        self._partial = False
+        self.query_edit.clear()
+        self.results.clear()
+        self.status_label.clear()
+
+    def run_search(self):
+        """Arama kutusundaki sorguyu çalıştır ve sonuçları listele"""
+        self._timer.stop()
+        self.results.clear()
+        index = self.main_window.search_index if self.main_window else None
+        query = self.query_edit.text().strip()
+        if index is None or not query:
+            self.status_label.clear()
+            return
+        hits = index.search(query, limit=self.MAX_RESULTS)
+        self._partial = not index.is_complete
+        if self._partial:
+            # İndeks arka planda tamamlanır; bitince arama yenilenir
+            self.main_window.build_search_index()
+        boards = self.main_window.project.boards
+        for hit in hits:
+            board = boards.get(hit.board_id)
+            board_name = board.name if board is not None else "?"
+            item = QListWidgetItem(f"{hit.title}  —  {board_name}")
+            item.setData(Qt.ItemDataRole.UserRole, hit)
+            self.results.addItem(item)
+        if len(hits) >= self.MAX_RESULTS:
+            status = f"İlk {len(hits)} sonuç"
+        else:
+            status = f"{len(hits)} sonuç"
+        if self._partial:
+            status += " (indeksleme sürüyor, sonuçlar eksik olabilir)"
+        self.status_label.setText(status)
+
+    def index_completed(self):
+        """Arama indeksi tamamlandı; eksik indeksle yapılmış aramayı yenile"""
+        if self._partial and self.query_edit.text().strip():
+            self.run_search()
+
+    def _open_result(self, item):
+        hit = item.data(Qt.ItemDataRole.UserRole)
+        if hit is not None:
+            self.main_window.show_element(hit.board_id, hit.element_id)
@@ -0,0 +1,359 @@
+import glob
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, QStandardPaths, QTimer, pyqtSignal
+
+from core.fields import iso_timestamps
+from utils.file_ops import (FORMAT_NAME, FORMAT_VERSION, LazyBoardSource,
+                            LegacyBoardSource, ProjectFileHandler, _dumps)
+from utils.sqlite_store import SQLiteBoardSource, SQLiteProjectStore
+
+AUTOSAVE_INTERVAL_MS = 60_000  # Değişiklik varsa en geç bu aralıkla kaydet
+IDLE_DELAY_MS = 3_000  # Son düzenlemeden bu kadar sonra kaydet
+SNAPSHOT_BUDGET_MS = 8  # GUI thread'de tek seferde harcanacak en uzun süre
+RECOVERY_KEEP = 3  # Proje başına saklanan kurtarma dosyası sayısı
+WORKER_BATCH = 256  # Worker bu kadar kayıtta bir GIL'i GUI thread'e bırakır
+
+
+def recovery_dir():
+    """Kurtarma dosyalarının klasörü"""
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.AppDataLocation)
+    if not base:
+        base = os.path.join(os.path.expanduser('~'), '.narrative_tool')
+    return os.path.join(base, 'recovery')
+
+
+def find_recovery_files():
+    """Kalan kurtarma dosyaları, en yenisi başta"""
+    files = glob.glob(os.path.join(recovery_dir(), '*.ntp'))
+    return sorted(files, key=os.path.getmtime, reverse=True)
+
+
+def _yield_gil():
+    """GUI thread GIL bekliyorsa hemen alabilsin"""
+    time.sleep(0.0005)
+
+
+def _element_record(element):
+    """Elementin değişmez kopyası
+
+    Sadece atomik değerler içeren tuple'dır; çöp toplayıcı bunları izlemeyi
+    bırakır, böylece büyük görüntüler uzun gen2 taramalarını tetiklemez.
+    """
+    return (element.id, element.title, element.content, element.theme, element.color,
+            tuple(element.components), *element.geometry(), *iso_timestamps(element))
+
+
+def _element_dict(record):
+    """_element_record kopyasını Element.to_dict biçimine çevir"""
+    (element_id, title, content, theme, color, components,
+     x, y, width, height, created_at, modified_at) = record
+    return {
+        'id': element_id,
+        'title': title,
+        'content': content,
+        'theme': theme,
+        'color': color,
+        'components': list(components),
+        'position': {'x': x, 'y': y},
+        'size': {'width': width, 'height': height},
+        'created_at': created_at,
+        'modified_at': modified_at,
+    }
+
+
+class _RecoveryWriter:
+    """Worker thread'de çalışır: anlık görüntüleri biriktirir ve dosyaya yazar
+
+    Her board için element/bağlantı başına serileştirilmiş satırları tutar;
+    böylece her kayıtta sadece değişen kayıtlar yeniden serileştirilir.
+    """
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.boards = {}  # board_id -> ({element_id: satır}, {connection_id: satır})
+
+    def apply(self, deltas):
+        """GUI thread'de alınan değişiklikleri satır önbelleğine işle
+
+        Liste parça parça işlenip boşaltılır; yüz binlerce kaydı tek seferde
+        işlemek ya da serbest bırakmak GIL'i bir kareden uzun süre tutar.
+        """
+        deltas.reverse()  # Sondan kesmek ucuz; sıra parça içinde geri çevrilir
+        while deltas:
+            batch = deltas[-WORKER_BATCH:]
+            del deltas[-WORKER_BATCH:]
+            for board_id, kind, record_id, record in reversed(batch):
+                elements, connections = self.boards.setdefault(board_id, ({}, {}))
+                lines = elements if kind == 'element' else connections
+                if record is None:
+                    lines.pop(record_id, None)
+                elif kind == 'element':
+                    lines[record_id] = _dumps({'element': _element_dict(record)}) + b'\n'
+                else:
+                    lines[record_id] = _dumps({'connection': record}) + b'\n'
+            del batch
+            _yield_gil()
+
+    def write(self, header, boards):
+        """Kurtarma dosyasını geçici dosyaya yazıp yerine taşı"""
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S-%f')
+        path = os.path.join(self.directory, f"{header['id']}-{stamp}.ntp")
+        temp_path = path + '.tmp'
+
+        present = set()
+        toc = []
+        with open(temp_path, 'wb') as f:
+            f.write(_dumps({'format': FORMAT_NAME, 'version': FORMAT_VERSION}) + b'\n')
+            for meta, source in boards:
+                present.add(meta['id'])
+                offset = f.tell()
+                element_count, connection_count = self._write_board(f, meta['id'], source)
+                toc.append(dict(meta, offset=offset, length=f.tell() - offset,
+                                elements=element_count, connections=connection_count))
+            index_offset = f.tell()
+            f.write(_dumps({'project': header, 'boards': toc}) + b'\n')
+            f.write(_dumps({'index': index_offset}) + b'\n')
+        os.replace(temp_path, path)
+
+        # Projeden silinen board'ların önbelleğini bırak
+        for board_id in self.boards.keys() - present:
+            del self.boards[board_id]
+        self.rotate(header['id'])
+        return path
+
+    def _write_board(self, f, board_id, source):
+        if isinstance(source, LazyBoardSource) and not source.journal:
+            # Hiç açılmamış board: proje dosyasındaki blok olduğu gibi
+            f.write(source.read_bytes())
+            return source.element_count, source.connection_count
+        if isinstance(source, LazyBoardSource):
+            # Günlükte değişikliği olan board: blok ve günlük birleştirilir
+            counts = {'element': 0, 'connection': 0}
+            for kind, obj in ProjectFileHandler.iter_board_objects(source.iter_lines(),
+                                                                   source.journal):
+                f.write(_dumps({kind: obj.to_dict()}) + b'\n')
+                counts[kind] += 1
+            return counts['element'], counts['connection']
+        if isinstance(source, LegacyBoardSource):
+            # Eski JSON'daki açılmamış board: GUI thread'de alınmış kopyadan
+            counts = {'element': 0, 'connection': 0}
+            for kind, obj in source.iter_objects():
+                f.write(_dumps({kind: obj.to_dict()}) + b'\n')
+                counts[kind] += 1
+                if counts[kind] % WORKER_BATCH == 0:
+                    _yield_gil()
+            return counts['element'], counts['connection']
+        if isinstance(source, tuple):
+            # SQLite'taki açılmamış board: worker kendi bağlantısıyla okur
+            path, source_board_id = source
+            store = SQLiteProjectStore(path)
+            try:
+                elements = store.load_elements(source_board_id)
+                connections = store.load_connections(source_board_id)
+            finally:
+                store.close()
+            for element in elements:
+                f.write(_dumps({'element': element.to_dict()}) + b'\n')
+            for connection in connections:
+                f.write(_dumps({'connection': connection.to_dict()}) + b'\n')
+            return len(elements), len(connections)
+
+        elements, connections = self.boards.get(board_id, ({}, {}))
+        for lines in (list(elements.values()), list(connections.values())):
+            for start in range(0, len(lines), WORKER_BATCH * 16):
+                f.write(b''.join(lines[start:start + WORKER_BATCH * 16]))
+                _yield_gil()
+        return len(elements), len(connections)
+
+    def rotate(self, project_id):
+        """Projenin en yeni RECOVERY_KEEP dosyası dışındakileri sil"""
+        files = sorted(glob.glob(os.path.join(self.directory, f'{project_id}-*.ntp')))
+        for path in files[:-RECOVERY_KEEP]:
+            os.remove(path)
+
+    def discard(self, project_id):
+        """Projenin tüm kurtarma dosyalarını sil"""
+        for path in glob.glob(os.path.join(self.directory, f'{project_id}-*.ntp')):
+            os.remove(path)
+
+
+class AutosaveService(QObject):
+    """Projeyi zamanlayıcıyla ve boşta kalınca kurtarma dosyalarına kaydet
+
+    GUI thread sadece son görüntüden beri değişen kayıtların kopyasını alır
+    (SNAPSHOT_BUDGET_MS'lik dilimler halinde); serileştirme ve yazma tek
+    worker thread'de yapılır.
+    """
+
+    autosaved = pyqtSignal(str)  # Yazılan kurtarma dosyası
+    failed = pyqtSignal(str)  # Hata mesajı
+
+    def __init__(self, parent=None, interval_ms=AUTOSAVE_INTERVAL_MS, idle_ms=IDLE_DELAY_MS,
+                 directory=None):
+        super().__init__(parent)
+        self.project = None
+        self.directory = directory or recovery_dir()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='autosave')
+        self._writer = _RecoveryWriter(self.directory)  # Sadece worker thread'de kullanılır
+        self._last_future = None
+
+        self._pending = {}  # board_id -> henüz kopyalanmamış element ID'leri
+        # Dilimler boyunca biriken kopyalar; worker GUI thread'le GIL için
+        # yarışmasın diye görüntü tamamlanınca tek seferde gönderilir
+        self._deltas = []
+        self._known_boards = set()  # Görüntüsü alınmaya başlanmış board'lar
+        self._last_meta = None
+        self._changed = False
+        self._snapshot_running = False
+
+        self.interval_timer = QTimer(self)
+        self.interval_timer.setInterval(interval_ms)
+        self.interval_timer.timeout.connect(self.request_autosave)
+        self.interval_timer.start()
+
+        self.idle_timer = QTimer(self)
+        self.idle_timer.setSingleShot(True)
+        self.idle_timer.setInterval(idle_ms)
+        self.idle_timer.timeout.connect(self.request_autosave)
+
+    def set_project(self, project):
+        """İzlenen projeyi değiştir"""
+        self.project = project
+        self._pending.clear()
+        self._deltas = []
+        self._known_boards.clear()
+        self._last_meta = None
+        self._changed = False
+        self._submit(self._writer.boards.clear)
+
+    def notify_activity(self):
+        """Kullanıcı düzenleme yaptı; boşta kalınca kaydet"""
+        self.idle_timer.start()
+
+    def request_autosave(self):
+        """Değişiklik varsa anlık görüntü almaya başla"""
+        if self.project is None or self._snapshot_running:
+            return
+        self._snapshot_running = True
+        self._snapshot_step()
+
+    def _snapshot_step(self):
+        """Zaman bütçesi içinde değişiklikleri kopyala; bitmediyse sonra devam et"""
+        project = self.project
+        if project is None:
+            self._snapshot_running = False
+            return
+        deadline = time.perf_counter() + SNAPSHOT_BUDGET_MS / 1000
+        deltas = self._deltas
+
+        for board_id, board in project.boards.items():
+            if not board.is_loaded:
+                # Açılmamış board'lar worker'da doğrudan kaynaklarından yazılır
+                continue
+            if board_id not in self._known_boards:
+                # İlk kez görülen board: tüm elementleri kopyalanacak
+                self._known_boards.add(board_id)
+                board.clear_dirty('autosave')
+                self._pending[board_id] = list(board.elements)
+                changes = board.change_set('autosave')
+                changes.connections.update(board.connections)
+            if not self._collect(board, deltas, deadline):
+                break
+
+        if time.perf_counter() >= deadline:
+            QTimer.singleShot(0, self._snapshot_step)
+            return
+
+        self._snapshot_running = False
+        if deltas:
+            self._changed = True
+            self._submit(self._writer.apply, deltas)
+            self._deltas = []
+        self._known_boards &= project.boards.keys()
+        header = dict(ProjectFileHandler._project_header(project), save_path=project.save_path)
+        metas = [ProjectFileHandler._board_meta(board) for board in project.boards.values()]
+        if (header, metas) != self._last_meta:
+            self._changed = True
+        if not self._changed:
+            return
+
+        boards = []
+        for meta, board in zip(metas, project.boards.values()):
+            source = board.lazy_source
+            if isinstance(source, SQLiteBoardSource):
+                source = (source.store.path, source.board_id)
+            elif isinstance(source, LegacyBoardSource):
+                # Board bu arada açılırsa asıl veri boşaltılır; worker kopyayı okur
+                source = source.copy()
+            boards.append((dict(meta, modified_at=board.modified_at.isoformat()), source))
+        self._last_meta = (header, metas)
+        self._changed = False
+        self._submit(self._write, dict(header, modified_at=datetime.now().isoformat()), boards)
+
+    def _collect(self, board, deltas, deadline):
+        """Board'un bekleyen kayıtlarını kopyala; süre biterse False döndür"""
+        board_id = board.id
+        elements, connections = board.elements, board.connections
+        pending = self._pending.get(board_id)
+        while pending:
+            element = elements.get(pending.pop())
+            if element is not None:
+                deltas.append((board_id, 'element', element.id, _element_record(element)))
+            if len(deltas) % 64 == 0 and time.perf_counter() >= deadline:
+                return False
+
+        changes = board.change_set('autosave')
+        for removed, kind in ((changes.removed_elements, 'element'),
+                              (changes.removed_connections, 'connection')):
+            while removed:
+                deltas.append((board_id, kind, removed.pop(), None))
+        while changes.elements:
+            element = elements.get(changes.elements.pop())
+            if element is not None:
+                deltas.append((board_id, 'element', element.id, _element_record(element)))
+            if len(deltas) % 64 == 0 and time.perf_counter() >= deadline:
+                return False
+        while changes.connections:
+            connection = connections.get(changes.connections.pop())
+            if connection is not None:
+                deltas.append((board_id, 'connection', connection.id, connection.to_dict()))
+            if len(deltas) % 64 == 0 and time.perf_counter() >= deadline:
+                return False
+        return True
+
+    def _write(self, header, boards):
+        try:
+            path = self._writer.write(header, boards)
+        except Exception as e:
+            self.failed.emit(str(e))
+            return None
+        self.autosaved.emit(path)
+        return path
+
+    def _submit(self, fn, *args):
+        self._last_future = self._executor.submit(fn, *args)
+        return self._last_future
+
+    def wait(self):
+        """Kuyruktaki tüm otomatik kayıt işlerinin bitmesini bekle"""
+        if self._last_future is not None:
+            self._last_future.result()
+
+    def discard_recovery(self):
+        """Proje kaydedildi; kurtarma dosyalarına gerek kalmadı"""
+        if self.project is not None:
+            self._submit(self._writer.discard, self.project.id)
+            self.wait()
+
+    def shutdown(self, discard=True):
+        """Zamanlayıcıları durdur ve worker'ı kapat"""
+        self.interval_timer.stop()
+        self.idle_timer.stop()
+        if discard:
+            self.discard_recovery()
+        self._executor.shutdown(wait=True)
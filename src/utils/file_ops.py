@@ -1,110 +1,631 @@
 import json
 from datetime import datetime
 import os
+from uuid import uuid4
+
+from utils.sqlite_store import SQLiteProjectStore, create_sqlite_project, is_sqlite_file
+
+# .ntp dosya düzeni (sürüm 2):
+#   1. satır      : {"format": "ntp", "version": 2}
+#   board blokları: her board için satır başına bir kayıt
+#                   {"element": {...}} veya {"connection": {...}}
+#   indeks satırı : proje başlığı ve board içindekiler tablosu (offset/length)
+#   son satır     : {"index": <indeks satırının offset'i>}
+# Açılışta sadece ilk satır, son satır ve indeks okunur; board blokları
+# board ilk kez açıldığında okunur.
+#
+# Normal kayıtlar ana dosyayı yeniden yazmaz; son kayıttan beri değişen
+# element/bağlantı kayıtları <dosya>.journal günlüğüne eklenir. Günlüğün ilk
+# satırı ait olduğu ana dosyanın save_id'sini taşır. Günlük büyüyünce ana
+# dosya yeniden yazılarak sıkıştırılır ve günlük silinir.
+FORMAT_NAME = 'ntp'
+FORMAT_VERSION = 2
+FOOTER_READ_SIZE = 256
+JOURNAL_SUFFIX = '.journal'
+JOURNAL_COMPACT_MIN_BYTES = 1 << 20  # Bu boyutun altındaki günlük sıkıştırılmaz
+JOURNAL_COMPACT_RATIO = 0.5  # Günlük ana dosyanın bu oranını geçince sıkıştır
+PROGRESS_EVERY = 1024  # Yüklerken bu kadar kayıtta bir ilerleme/iptal kontrolü
+BOARD_PROGRESS_UNITS = 1000  # Board başına ilerleme birimi
+
+
+class LoadCancelled(Exception):
+    """Yükleme kullanıcı tarafından iptal edildi"""
+
+
+def _dumps(data) -> bytes:
+    """Tek satırlık, kompakt JSON"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+class SaveState:
+    """Projenin diskteki kaydının durumu (günlüklü kayıt için)"""
+
+    def __init__(self, path, save_id, base_size):
+        self.path = path
+        self.save_id = save_id
+        self.base_size = base_size
+        self.journal_size = 0  # Günlüğün geçerli kısmının boyutu
+        self.header = {}  # Son yazılan proje başlığı
+        self.board_meta = {}  # board_id -> son yazılan board bilgisi
+
+    @property
+    def journal_path(self):
+        return self.path + JOURNAL_SUFFIX
+
+    def needs_compaction(self) -> bool:
+        """Günlük ana dosyaya göre fazla büyüdü mü?"""
+        limit = max(JOURNAL_COMPACT_MIN_BYTES, self.base_size * JOURNAL_COMPACT_RATIO)
+        return self.journal_size > limit
+
+
+class LazyBoardSource:
+    """Board verisinin proje dosyasındaki yeri ve ona ait günlük kayıtları"""
+
+    def __init__(self, filepath, offset, length, element_count=0, connection_count=0,
+                 journal=None):
+        self.filepath = filepath
+        self.offset = offset
+        self.length = length
+        self.element_count = element_count
+        self.connection_count = connection_count
+        self.journal = journal or []
+
+    def read_bytes(self) -> bytes:
+        """Board bloğunu ham olarak oku"""
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            return f.read(self.length)
+
+    def iter_lines(self):
+        """Board bloğunun satırlarını dosyadan sırayla oku"""
+        with open(self.filepath, 'rb') as f:
+            f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                line = f.readline(remaining)
+                if not line:
+                    break
+                remaining -= len(line)
+                yield line
+
+    def load(self, board, progress=None, cancel=None):
+        """Board bloğunu satır satır okuyup board'a yükle"""
+        elements, connections = [], []
+        for kind, obj in ProjectFileHandler.iter_board_objects(
+                self.iter_lines(), self.journal, progress, cancel, self.length):
+            (elements if kind == 'element' else connections).append(obj)
+        board.load_records(elements, connections)
+
+    def iter_element_texts(self):
+        """Board'u yüklemeden (element_id, başlık, içerik) üçlüleri (arama indeksi için)"""
+        for kind, data in ProjectFileHandler.iter_board_records(self.iter_lines(), self.journal):
+            if kind == 'element':
+                yield data['id'], data['title'], data['content']
+
+    def iter_records(self):
+        """Board'u yüklemeden ('element'|'connection', nesne) çiftleri (dışa aktarım için)"""
+        return ProjectFileHandler.iter_board_objects(self.iter_lines(), self.journal)
+
+    def iter_graph(self):
+        """Board'u yüklemeden (tür, ID, kaynak, hedef) dörtlüleri (graf analizi için)"""
+        for kind, data in ProjectFileHandler.iter_board_records(self.iter_lines(), self.journal):
+            if kind == 'element':
+                yield kind, data['id'], None, None
+            else:
+                yield kind, data['id'], data['source_id'], data['target_id']
+
+
+class LegacyBoardSource:
+    """Eski tek parça JSON dosyasından ayrıştırılmış board verisi
+
+    Ayrıştırılmış dict'ler board başarıyla dolana kadar tutulur; iptal edilen
+    yükleme aynı kaynaktan yeniden denenebilir. Yüklemeden sonra bırakılır.
+    """
+
+    def __init__(self, board_data):
+        self.board_data = board_data
+
+    def load(self, board, progress=None, cancel=None):
+        elements_data = self.board_data.get('elements', {})
+        connections_data = self.board_data.get('connections', [])
+        total = len(elements_data) + len(connections_data)
+        done = 0
+
+        elements = []
+        for element_data in elements_data.values():
+            elements.append(self._element(element_data))
+            done += 1
+            ProjectFileHandler._check_progress(done, total, progress, cancel)
+
+        connections = []
+        for conn_data in connections_data:
+            connections.append(self._connection(conn_data))
+            done += 1
+            ProjectFileHandler._check_progress(done, total, progress, cancel)
+
+        board.load_records(elements, connections)
+        # Board artık nesneleri tutuyor; ayrıştırılmış kopya bırakılır
+        self.board_data.pop('elements', None)
+        self.board_data.pop('connections', None)
+
+    @staticmethod
+    def _element(element_data):
+        from core.element import Element
+
+        element = Element(element_data['title'], element_data.get('content', ''))
+        element.id = element_data['id']
+        element.position = element_data['position']
+        element.size = element_data['size']
+        element.color = element_data.get('color', element.color)
+        return element
+
+    @staticmethod
+    def _connection(conn_data):
+        from core.connection import Connection
+
+        connection = Connection(conn_data['source_id'], conn_data['target_id'])
+        connection.id = conn_data['id']
+        return connection
+
+    def copy(self) -> 'LegacyBoardSource':
+        """Sığ kopya: load() asıl veriyi bıraktığında başka thread kopyayı okuyabilir"""
+        return LegacyBoardSource(dict(self.board_data,
+                                      elements=dict(self.board_data.get('elements', {})),
+                                      connections=list(self.board_data.get('connections', []))))
+
+    def iter_objects(self):
+        """Board'u yüklemeden, load() ile aynı ('element'|'connection', nesne) çiftleri"""
+        for element_data in self.board_data.get('elements', {}).values():
+            yield 'element', self._element(element_data)
+        for conn_data in self.board_data.get('connections', []):
+            yield 'connection', self._connection(conn_data)
+
+    def iter_element_texts(self):
+        """Board'u yüklemeden (element_id, başlık, içerik) üçlüleri (arama indeksi için)"""
+        for element_data in self.board_data.get('elements', {}).values():
+            yield element_data['id'], element_data['title'], element_data.get('content', '')
+
+    def iter_records(self):
+        """Board'u yüklemeden ('element'|'connection', nesne) çiftleri (dışa aktarım için)"""
+        from core.element import Element
+        from core.connection import Connection
+
+        for element_data in self.board_data.get('elements', {}).values():
+            element = Element(element_data['title'], element_data.get('content', ''))
+            element.id = element_data['id']
+            yield 'element', element
+        for connection_data in self.board_data.get('connections', []):
+            connection = Connection(connection_data['source_id'], connection_data['target_id'])
+            connection.id = connection_data['id']
+            connection.label = connection_data.get('label', '')
+            yield 'connection', connection
+
+    def iter_graph(self):
+        """Board'u yüklemeden (tür, ID, kaynak, hedef) dörtlüleri (graf analizi için)"""
+        for element_id in self.board_data.get('elements', {}):
+            yield 'element', element_id, None, None
+        for connection_data in self.board_data.get('connections', []):
+            yield ('connection', connection_data['id'], connection_data['source_id'],
+                   connection_data['target_id'])
+
 
 class ProjectFileHandler:
     @staticmethod
-    def save_project(project, filepath):
-        """Projeyi JSON olarak kaydet"""
+    def save_project(project, filepath, compact=False, backend=None):
+        """Projeyi kaydet
+
+        Proje bu dosyadan açıldıysa ya da daha önce buraya kaydedildiyse
+        sadece değişiklikler yazılır: JSON dosyada günlüğe eklenir, SQLite
+        dosyada tek işlemde güncellenir. Aksi halde (veya compact=True iken
+        ya da günlük çok büyüdüğünde) dosya baştan yazılır. backend='sqlite'
+        yeni dosyanın SQLite olarak oluşturulmasını sağlar.
+        """
         print(f"Saving project: {project.name}")
-        print(f"Number of boards: {len(project.boards)}")
-        
-        # En üst seviye proje verisi
-        project_data = {
-            'project': {  # Burayı düzelttik
-                'id': project.id,
-                'name': project.name,
-                'created_at': project.created_at.isoformat(),
-                'modified_at': datetime.now().isoformat(),
-                'boards': {}
-            }
-        }
-        
+
+        state = project.save_state
+        same_file = state is not None and state.path == filepath
+        if isinstance(state, SQLiteProjectStore) and same_file and backend != 'json':
+            if compact:
+                create_sqlite_project(project, filepath)
+            else:
+                state.save_changes(project)
+        elif backend == 'sqlite':
+            create_sqlite_project(project, filepath)
+        elif (compact or not isinstance(state, SaveState) or not same_file
+                or not os.path.exists(filepath)):
+            ProjectFileHandler.write_full(project, filepath)
+        else:
+            ProjectFileHandler.append_journal(project, state)
+            if state.needs_compaction():
+                ProjectFileHandler.write_full(project, filepath)
+        print(f"Project saved to: {filepath}")
+
+    @staticmethod
+    def append_journal(project, state):
+        """Son kayıttan beri değişen kayıtları günlüğe ekle"""
+        records = []
+        header = ProjectFileHandler._project_header(project)
+        if header != state.header:
+            records.append({'project': dict(header, modified_at=datetime.now().isoformat())})
+
+        for board_id in state.board_meta.keys() - project.boards.keys():
+            records.append({'remove_board': board_id})
+
+        board_meta = {}
         for board_id, board in project.boards.items():
-            print(f"Saving board: {board.name}")
-            print(f"Number of elements: {len(board.elements)}")
-            print(f"Number of connections: {len(board.connections)}")
-            
-            board_data = {
-                'id': board.id,
-                'name': board.name,
-                'root': board.root,
-                'elements': {},
-                'connections': []
-            }
-            
-            # Elementleri kaydet
-            for element_id, element in board.elements.items():
-                print(f"Saving element: {element.title} at position {element.position}")
-                board_data['elements'][element_id] = {
-                    'id': element.id,
-                    'title': element.title,
-                    'content': element.content,
-                    'position': element.position,
-                    'size': element.size
-                }
-            
-            # Bağlantıları kaydet
-            for connection_id, connection in board.connections.items():
-                print(f"Saving connection from {connection.source_id} to {connection.target_id}")
-                board_data['connections'].append({
-                    'id': connection.id,
-                    'source_id': connection.source_id,
-                    'target_id': connection.target_id
-                })
-            
-            project_data['project']['boards'][board_id] = board_data
-        
-        # JSON'a kaydet
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(project_data, f, indent=4, ensure_ascii=False)
-            print(f"Project saved to: {filepath}")
-
-    @staticmethod
-    def load_project(filepath):
-        """JSON dosyasından proje yükle"""
-        from core.project import Project
-        from core.board import Board
+            meta = board_meta[board_id] = ProjectFileHandler._board_meta(board)
+            dirty = board.is_loaded and board.is_dirty
+            if dirty or meta != state.board_meta.get(board_id):
+                records.append({'board_meta': dict(meta, modified_at=board.modified_at.isoformat())})
+            if not dirty:
+                continue
+            elements, removed_elements, connections, removed_connections = board.dirty_changes()
+            records.extend({'board': board_id, 'remove_connection': cid} for cid in removed_connections)
+            records.extend({'board': board_id, 'remove_element': eid} for eid in removed_elements)
+            records.extend({'board': board_id, 'element': e.to_dict()} for e in elements)
+            records.extend({'board': board_id, 'connection': c.to_dict()} for c in connections)
+
+        if records:
+            data = b''.join(_dumps(record) + b'\n' for record in records)
+            # Yarım kalmış son satır varsa üzerine yazılır
+            with open(state.journal_path, 'r+b' if state.journal_size else 'wb') as f:
+                if state.journal_size:
+                    f.seek(state.journal_size)
+                else:
+                    f.write(_dumps({'journal': state.save_id}) + b'\n')
+                f.write(data)
+                f.truncate()
+                f.flush()
+                os.fsync(f.fileno())
+                state.journal_size = f.tell()
+
+        state.header = header
+        state.board_meta = board_meta
+        for board in project.boards.values():
+            board.clear_dirty()
+        project.clear_dirty()
+
+    @staticmethod
+    def write_full(project, filepath):
+        """Projeyi board bloklarından oluşan dosya olarak baştan yaz
+
+        Henüz yüklenmemiş ve günlükte değişikliği olmayan board'ların blokları
+        eski dosyadan olduğu gibi kopyalanır. Yazma geçici dosyaya yapılır ve
+        sonra yerine taşınır; ardından eski günlük silinir.
+        """
+        save_id = uuid4().hex
+        header = ProjectFileHandler._project_header(project)
+        temp_path = filepath + '.tmp'
+        toc = []
+        with open(temp_path, 'wb') as f:
+            f.write(_dumps({'format': FORMAT_NAME, 'version': FORMAT_VERSION}) + b'\n')
+
+            for board_id, board in project.boards.items():
+                offset = f.tell()
+                source = board.lazy_source
+                if source is not None and (not isinstance(source, LazyBoardSource)
+                                           or source.journal):
+                    # Başka depodan gelen ya da günlük kaydı olan board ham kopyalanamaz
+                    board.ensure_loaded()
+                if board.is_loaded:
+                    chunk = ProjectFileHandler.serialize_board_chunk(board)
+                    element_count, connection_count = len(board.elements), len(board.connections)
+                else:
+                    # Yüklenmemiş board: ayrıştırmadan ham kopya
+                    chunk = source.read_bytes()
+                    element_count, connection_count = source.element_count, source.connection_count
+                f.write(chunk)
+                toc.append((board, dict(
+                    ProjectFileHandler._board_meta(board),
+                    modified_at=board.modified_at.isoformat(),
+                    offset=offset,
+                    length=len(chunk),
+                    elements=element_count,
+                    connections=connection_count,
+                )))
+
+            index_offset = f.tell()
+            f.write(_dumps({
+                'project': dict(header, modified_at=datetime.now().isoformat(), save_id=save_id),
+                'boards': [entry for _, entry in toc],
+            }) + b'\n')
+            f.write(_dumps({'index': index_offset}) + b'\n')
+            base_size = f.tell()
+            # Yer değiştirmeden önce içerik diskte olmalı; aksi halde çökme boş dosya bırakabilir
+            f.flush()
+            os.fsync(f.fileno())
+
+        if isinstance(project.save_state, SQLiteProjectStore):
+            # Tüm board'lar okundu; eski veritabanına artık gerek yok
+            project.save_state.close()
+        os.replace(temp_path, filepath)
+        try:
+            os.remove(filepath + JOURNAL_SUFFIX)
+        except FileNotFoundError:
+            pass
+
+        # Yüklenmemiş board'lar artık yeni dosyadaki konumlarını okumalı
+        for board, entry in toc:
+            if not board.is_loaded:
+                board.set_lazy_source(LazyBoardSource(filepath, entry['offset'], entry['length'],
+                                                      entry['elements'], entry['connections']))
+            board.clear_dirty()
+
+        state = SaveState(filepath, save_id, base_size)
+        state.header = header
+        state.board_meta = {board.id: ProjectFileHandler._board_meta(board) for board, _ in toc}
+        project.save_state = state
+        project.clear_dirty()
+
+    @staticmethod
+    def serialize_board_chunk(board) -> bytes:
+        """Board'un elementlerini ve bağlantılarını satır satır JSON'a çevir"""
+        lines = [_dumps({'element': element.to_dict()}) for element in board.elements.values()]
+        lines.extend(_dumps({'connection': connection.to_dict()})
+                     for connection in board.connections.values())
+        return b''.join(line + b'\n' for line in lines)
+
+    @staticmethod
+    def iter_board_objects(lines, journal=(), progress=None, cancel=None, total=0):
+        """Board bloğu satırlarından ve günlük kayıtlarından ('element'|'connection',
+        nesne) çiftleri üret
+
+        Her satır ayrıştırılır ayrıştırılmaz nesneye çevrilir; bloğun tamamı
+        dict olarak bellekte tutulmaz.
+        """
         from core.element import Element
         from core.connection import Connection
-        
+
+        factories = {'element': Element.from_dict, 'connection': Connection.from_dict}
+        for kind, data in ProjectFileHandler.iter_board_records(
+                lines, journal, progress, cancel, total):
+            yield kind, factories[kind](data)
+
+    @staticmethod
+    def iter_board_records(lines, journal=(), progress=None, cancel=None, total=0):
+        """Board bloğu satırlarından ve günlük kayıtlarından ('element'|'connection',
+        dict) çiftleri üret
+
+        Günlükte değişen ya da silinen kayıtlar bloktan atlanır, güncel
+        halleri sonda üretilir. Sadece birkaç alan gereken okuyucular nesne
+        oluşturma maliyetine girmez.
+        """
+        # Günlükteki son durum: kayıt ID'si -> dict (None = silindi)
+        overrides = {'element': {}, 'connection': {}}
+        for record in journal:
+            for kind in ('element', 'connection'):
+                if kind in record:
+                    overrides[kind][record[kind]['id']] = record[kind]
+                elif f'remove_{kind}' in record:
+                    overrides[kind][record[f'remove_{kind}']] = None
+
+        done = 0
+        for count, line in enumerate(lines, 1):
+            done += len(line)
+            if count % PROGRESS_EVERY == 0:
+                ProjectFileHandler._check_progress(done, total, progress, cancel, force=True)
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            kind = 'element' if 'element' in record else 'connection'
+            data = record[kind]
+            if data['id'] not in overrides[kind]:
+                yield kind, data
+
+        for kind, records in overrides.items():
+            for data in records.values():
+                if data is not None:
+                    yield kind, data
+        if progress is not None:
+            progress(total, total)
+
+    @staticmethod
+    def _check_progress(done, total, progress, cancel, force=False):
+        """Belirli aralıklarla iptali kontrol et ve ilerlemeyi bildir"""
+        if not force and done % PROGRESS_EVERY:
+            return
+        if cancel is not None and cancel.is_set():
+            raise LoadCancelled()
+        if progress is not None:
+            progress(done, total)
+
+    @staticmethod
+    def _project_header(project) -> dict:
+        return {
+            'id': project.id,
+            'name': project.name,
+            'created_at': project.created_at.isoformat(),
+            'starting_element': project.starting_element,
+            'variables': {name: var.to_dict() for name, var in project.variables.items()},
+        }
+
+    @staticmethod
+    def _board_meta(board) -> dict:
+        return {
+            'id': board.id,
+            'name': board.name,
+            'root': board.root,
+            'children': list(board.children),
+            'created_at': board.created_at.isoformat(),
+        }
+
+    @staticmethod
+    def read_journal(state):
+        """Ana dosyaya ait günlük kayıtlarını oku
+
+        Başka bir kayda ait günlük yok sayılır; yarım yazılmış son satır
+        atlanır ve bir sonraki kayıtta üzerine yazılır.
+        """
+        records = []
+        try:
+            f = open(state.journal_path, 'rb')
+        except FileNotFoundError:
+            return records
+        with f:
+            try:
+                owner = json.loads(f.readline())
+            except ValueError:
+                return records
+            if state.save_id is None or owner.get('journal') != state.save_id:
+                return records
+            valid_size = f.tell()
+            for line in f:
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                if not line.endswith(b'\n'):
+                    records.pop()
+                    break
+                valid_size += len(line)
+        state.journal_size = valid_size
+        return records
+
+    @staticmethod
+    def read_index(filepath):
+        """Sürüm 2 dosyanın indeksini oku; eski biçimse None döndür"""
+        with open(filepath, 'rb') as f:
+            first_line = f.readline(FOOTER_READ_SIZE)
+            try:
+                magic = json.loads(first_line)
+            except ValueError:
+                return None
+            if not isinstance(magic, dict) or magic.get('format') != FORMAT_NAME:
+                return None
+
+            # Son satır indeks satırının konumunu verir
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            f.seek(max(0, size - FOOTER_READ_SIZE))
+            footer = f.read().rstrip(b'\n').rsplit(b'\n', 1)[-1]
+            index_offset = json.loads(footer)['index']
+            f.seek(index_offset)
+            return json.loads(f.readline())
+
+    @staticmethod
+    def load_project(filepath, lazy=True, progress=None, cancel=None):
+        """Proje dosyasını yükle
+
+        lazy=True iken sadece proje başlığı, board listesi ve ana board
+        okunur; diğer board'ların içeriği ilk erişimde yüklenir.
+        """
+        loader = ProjectFileHandler.iter_load_project(filepath, lazy, progress, cancel)
+        project = next(loader)
+        for _ in loader:
+            pass
+        return project
+
+    @staticmethod
+    def iter_load_project(filepath, lazy=True, progress=None, cancel=None):
+        """Projeyi akış halinde yükle
+
+        Önce board'ları henüz boş olan Project üretilir, ardından ana board
+        ve (lazy=False ise) diğer board'lar yüklendikçe sırayla üretilir.
+        progress(done, total) board başına BOARD_PROGRESS_UNITS birimle
+        çağrılır; cancel (threading.Event) kurulursa LoadCancelled fırlatılır.
+        """
         print(f"Loading project from: {filepath}")
-        
+
+        if is_sqlite_file(filepath):
+            project = SQLiteProjectStore(filepath).load_project(lazy=True)
+        else:
+            index = ProjectFileHandler.read_index(filepath)
+            if index is None:
+                project = ProjectFileHandler._load_legacy(filepath)
+            else:
+                project = ProjectFileHandler._load_index(filepath, index)
+        yield project
+
+        # Ana board önce: arayüz onu diğerlerini beklemeden gösterebilir
+        boards = sorted(project.boards.values(), key=lambda board: not board.root)
+        if lazy:
+            boards = boards[:1]
+        total = len(boards) * BOARD_PROGRESS_UNITS
+        for position, board in enumerate(boards):
+            base = position * BOARD_PROGRESS_UNITS
+
+            def board_progress(done, board_total, base=base):
+                if progress is not None and board_total:
+                    progress(base + done * BOARD_PROGRESS_UNITS // board_total, total)
+
+            board.ensure_loaded(board_progress, cancel)
+            yield board
+
+    @staticmethod
+    def _load_index(filepath, index):
+        """Sürüm 2 dosyanın indeksinden ve günlüğünden tembel board'lu proje oluştur"""
+        from core.project import Project
+        from core.board import Board
+        from core.variable import Variable
+
+        header = index['project']
+        state = SaveState(filepath, header.get('save_id'), os.path.getsize(filepath))
+
+        # Günlükteki değişiklikleri indekse ve board'lara dağıt
+        entries = {entry['id']: entry for entry in index['boards']}
+        journal_by_board = {}
+        for record in ProjectFileHandler.read_journal(state):
+            if 'project' in record:
+                header.update(record['project'])
+            elif 'board_meta' in record:
+                meta = record['board_meta']
+                entry = entries.setdefault(meta['id'], {
+                    'offset': 0, 'length': 0, 'elements': 0, 'connections': 0})
+                entry.update(meta)
+            elif 'remove_board' in record:
+                entries.pop(record['remove_board'], None)
+                journal_by_board.pop(record['remove_board'], None)
+            else:
+                journal_by_board.setdefault(record['board'], []).append(record)
+
+        project = Project(header['name'])
+        project.id = header['id']
+        project.created_at = datetime.fromisoformat(header['created_at'])
+        project.modified_at = datetime.fromisoformat(header['modified_at'])
+        project.starting_element = header.get('starting_element')
+        project.variables = {name: Variable.from_dict(var)
+                             for name, var in header.get('variables', {}).items()}
+
+        for entry in entries.values():
+            board = Board(entry['name'], entry.get('root', False))
+            board.id = entry['id']
+            board.children = entry.get('children', [])
+            board.created_at = entry['created_at']
+            board.modified_at = entry['modified_at']
+            board.set_lazy_source(LazyBoardSource(filepath, entry['offset'], entry['length'],
+                                                  entry['elements'], entry['connections'],
+                                                  journal_by_board.get(board.id)))
+            project.boards[board.id] = board
+
+        state.header = ProjectFileHandler._project_header(project)
+        state.board_meta = {board_id: ProjectFileHandler._board_meta(board)
+                            for board_id, board in project.boards.items()}
+        project.save_state = state
+        return project
+
+    @staticmethod
+    def _load_legacy(filepath):
+        """Sürüm 1 (tek parça JSON) dosyadan tembel board'lu proje oluştur"""
+        from core.project import Project
+        from core.board import Board
+        from core.variable import Variable
+
         with open(filepath, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-            print("File loaded successfully")
-            print(f"Project data: {data.keys()}")
-        
-        project_data = data['project']  # Burayı düzelttik
-        
+            project_data = json.load(f)['project']
+
         # Yeni proje oluştur
         project = Project(project_data['name'])
         project.id = project_data['id']
         project.created_at = datetime.fromisoformat(project_data['created_at'])
-        
-        # Board'ları yükle
-        for board_id, board_data in project_data['boards'].items():
-            print(f"Loading board: {board_data['name']}")
+        project.starting_element = project_data.get('starting_element')
+        project.variables = {name: Variable.from_dict(var)
+                             for name, var in project_data.get('variables', {}).items()}
+
+        # Board'ları oluştur; içerikleri nesneye çevrilirken dict'ten çıkarılır
+        for board_id, board_data in project_data.pop('boards').items():
             board = Board(board_data['name'], board_data.get('root', False))
             board.id = board_data['id']
-            
-            # Elementleri yükle
-            print(f"Loading {len(board_data.get('elements', {}))} elements")
-            for element_id, element_data in board_data.get('elements', {}).items():
-                print(f"Loading element: {element_data['title']}")
-                element = Element(element_data['title'], element_data.get('content', ''))
-                element.id = element_data['id']
-                element.position = element_data['position']
-                element.size = element_data['size']
-                board.elements[element_id] = element
-            
-            # Bağlantıları yükle
-            print(f"Loading {len(board_data.get('connections', []))} connections")
-            for conn_data in board_data.get('connections', []):
-                connection = Connection(conn_data['source_id'], conn_data['target_id'])
-                connection.id = conn_data['id']
-                board.connections[connection.id] = connection
-            
+            board.set_lazy_source(LegacyBoardSource(board_data))
             project.boards[board_id] = board
-        
-        return project
\ No newline at end of file
+
+        return project
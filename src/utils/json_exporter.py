@@ -0,0 +1,411 @@
+import json
+import os
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+from tempfile import TemporaryFile
+from typing import List, Optional, Tuple
+
+# Oyun motorları için çalışma zamanı paketi (.ntb) düzeni, sürüm 2.
+# Bütün sayılar little-endian; u32 = 4 bayt işaretsiz, u64 = 8 bayt.
+#
+#   başlık (HEADER)  : magic 'NTRB', sürüm u16, bayraklar u16,
+#                      board/element/bağlantı/metin sayıları u32,
+#                      başlangıç elementinin indeksi i32 (-1 = yok),
+#                      değişken sayısı u32,
+#                      board/element/offset/kenar/metin/değişken bölümlerinin
+#                      konumu u64
+#   board'lar        : board başına (ad, ilk element, element sayısı) u32
+#   elementler       : element başına (ID, başlık, içerik, board) u32
+#   CSR offsetleri   : element sayısı + 1 adet u32
+#   kenarlar         : bağlantı başına (hedef element, etiket, koşul, etkiler) u32
+#   değişkenler      : değişken başına (ad, JSON olarak varsayılan değer) u32
+#   metin tablosu    : metin sayısı + 1 adet u64 offset, ardından UTF-8 baytlar
+#
+# Elementler 0'dan başlayan yoğun indekslerdir ve board board sıralanır.
+# i elementinden çıkan kenarlar offsets[i]..offsets[i+1] aralığındadır.
+# Metin alanları metin tablosuna indekstir; aynı metin bir kez yazılır,
+# 0 boş metindir. Pakete alınmayan alanlar NO_STRING taşır. Konum, boyut,
+# renk, tema ve zaman damgası gibi editör alanları pakete girmez. Koşul ve
+# etkiler core.expressions dilindeki kaynak metinlerdir (boşsa 0); istemci
+# bunları kendi yorumlayıcısıyla derler.
+#
+# Sürüm 1 paketlerinde değişken bölümü yoktur, başlık değişken sayısı ve
+# konumu olmadan biter, kenarlar sadece (hedef, etiket) taşır.
+BUNDLE_MAGIC = b'NTRB'
+BUNDLE_VERSION = 2
+BUNDLE_SUFFIX = '.ntb'
+PREAMBLE = struct.Struct('<4sH')
+HEADER = struct.Struct('<4sHHIIIIiI6Q')
+HEADER_V1 = struct.Struct('<4sHHIIIIi5Q')
+NO_STRING = 0xFFFFFFFF
+NO_ELEMENT = -1
+
+FLAG_IDS = 1  # Elementlerin editör ID'leri pakette
+FLAG_CONTENT = 2  # Element içerikleri pakette
+
+BOARD_FIELDS = 3
+ELEMENT_FIELDS = 4
+EDGE_FIELDS = 4
+EDGE_FIELDS_V1 = 2
+VARIABLE_FIELDS = 2
+
+
+class ExportCancelled(Exception):
+    """Dışa aktarım kullanıcı tarafından iptal edildi"""
+
+
+def _little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+class _StringTable:
+    """Tekilleştirilmiş metin tablosu; baytlar geçici dosyaya akıtılır
+
+    Uzun metinler (içerikler) bellekte tutulmaz, özetleriyle eşlenir.
+    """
+
+    DIGEST_ABOVE = 64  # Bundan uzun metinler özetleriyle tekilleştirilir
+
+    def __init__(self, spool):
+        self._spool = spool
+        self._ids = {'': 0}
+        self.offsets = array('Q', [0, 0])
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def add(self, text: str) -> int:
+        if len(text) > self.DIGEST_ABOVE:
+            data = text.encode('utf-8')
+            key = blake2b(data, digest_size=16).digest()
+        else:
+            data = None
+            key = text
+        string_id = self._ids.get(key)
+        if string_id is None:
+            if data is None:
+                data = text.encode('utf-8')
+            string_id = self._ids[key] = len(self)
+            self._spool.write(data)
+            self.offsets.append(self.offsets[-1] + len(data))
+        return string_id
+
+
+class RuntimeExporter:
+    """Projeyi oyun istemcisinin doğrudan dolaşabileceği ikili pakete derle
+
+    Dosya board board akıtılarak yazılır: ilk geçişte sadece element ID'leri
+    okunup yoğun indeksler verilir, ikinci geçişte her board'un elementleri
+    yazılır ve bağlantıları kompakt dizilere eklenir. Yüklenmemiş board'lar
+    yüklenmez; kayıtları kaynaklarından geçici olarak okunur. Bellekte
+    projenin ikinci bir kopyası değil, sadece ID -> indeks eşlemesi, kenar
+    dizileri ve uzun metinlerin özetleri tutulur.
+    """
+
+    def __init__(self, project, include_ids: bool = True, include_content: bool = True):
+        self.project = project
+        self.include_ids = include_ids
+        self.include_content = include_content
+
+    def export(self, filepath, progress=None, cancel=None) -> None:
+        """Paketi geçici dosyaya yazıp yerine taşı
+
+        progress(yapılan, toplam) her board geçişinden sonra çağrılır;
+        cancel verilirse (threading.Event gibi) board aralarında denetlenir.
+        """
+        boards = list(self.project.boards.values())
+        total = len(boards) * 2
+        done = 0
+
+        # 1. geçiş: element ID'leri -> yoğun indeksler
+        index = {}
+        board_ranges = []
+        for board in boards:
+            first = len(index)
+            for element_id in self._iter_element_ids(board):
+                if element_id not in index:
+                    index[element_id] = len(index)
+            board_ranges.append((first, len(index) - first))
+            done += 1
+            self._check(done, total, progress, cancel)
+        element_count = len(index)
+        start = index.get(self.project.starting_element, NO_ELEMENT)
+
+        flags = (FLAG_IDS if self.include_ids else 0) | (FLAG_CONTENT if self.include_content else 0)
+        temp_path = os.fspath(filepath) + '.tmp'
+        try:
+            with open(temp_path, 'wb') as f, TemporaryFile() as spool:
+                strings = _StringTable(spool)
+                f.write(bytes(HEADER.size))
+
+                boards_offset = f.tell()
+                board_table = array('I')
+                for board, (first, count) in zip(boards, board_ranges):
+                    board_table.extend((strings.add(board.name), first, count))
+                f.write(_little_endian_bytes(board_table))
+
+                # 2. geçiş: elementler board board yazılır, bağlantılar dizilere eklenir
+                elements_offset = f.tell()
+                sources, targets, labels = array('I'), array('I'), array('I')
+                conditions, effects = array('I'), array('I')
+                for board_index, (board, (first, count)) in enumerate(zip(boards, board_ranges)):
+                    records = array('I', bytes(4 * ELEMENT_FIELDS * count))
+                    for kind, obj in self._iter_records(board):
+                        if kind == 'connection':
+                            source = index.get(obj.source_id)
+                            target = index.get(obj.target_id)
+                            if source is not None and target is not None:
+                                sources.append(source)
+                                targets.append(target)
+                                labels.append(strings.add(obj.label))
+                                conditions.append(strings.add(obj.condition))
+                                effects.append(strings.add(obj.effects))
+                            continue
+                        position = index.get(obj.id, -1) - first
+                        if not 0 <= position < count:
+                            continue  # Başka board'da da bulunan element bir kez yazılır
+                        at = position * ELEMENT_FIELDS
+                        records[at] = strings.add(obj.id) if self.include_ids else NO_STRING
+                        records[at + 1] = strings.add(obj.title)
+                        records[at + 2] = (strings.add(obj.content) if self.include_content
+                                           else NO_STRING)
+                        records[at + 3] = board_index
+                    f.write(_little_endian_bytes(records))
+                    done += 1
+                    self._check(done, total, progress, cancel)
+                del index
+
+                # CSR: kaynağa göre sayma sıralaması; aynı kaynağın bağlantı sırası korunur
+                offsets = array('I', bytes(4 * (element_count + 1)))
+                for source in sources:
+                    offsets[source + 1] += 1
+                for i in range(element_count):
+                    offsets[i + 1] += offsets[i]
+                cursor = offsets[:-1]
+                edges = array('I', bytes(4 * EDGE_FIELDS * len(sources)))
+                for source, target, label, condition, effect in zip(
+                        sources, targets, labels, conditions, effects):
+                    at = cursor[source] * EDGE_FIELDS
+                    cursor[source] += 1
+                    edges[at] = target
+                    edges[at + 1] = label
+                    edges[at + 2] = condition
+                    edges[at + 3] = effect
+                connection_count = len(sources)
+                del sources, targets, labels, conditions, effects, cursor
+
+                offsets_offset = f.tell()
+                f.write(_little_endian_bytes(offsets))
+                edges_offset = f.tell()
+                f.write(_little_endian_bytes(edges))
+                del offsets, edges
+
+                variables_offset = f.tell()
+                variables = array('I')
+                for variable in self.project.variables.values():
+                    variables.extend((strings.add(variable.name),
+                                      strings.add(json.dumps(variable.default,
+                                                             ensure_ascii=False))))
+                f.write(_little_endian_bytes(variables))
+
+                strings_offset = f.tell()
+                f.write(_little_endian_bytes(strings.offsets))
+                spool.seek(0)
+                while True:
+                    chunk = spool.read(1 << 20)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+
+                f.seek(0)
+                f.write(HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, flags, len(boards),
+                                    element_count, connection_count, len(strings), start,
+                                    len(self.project.variables), boards_offset,
+                                    elements_offset, offsets_offset, edges_offset,
+                                    strings_offset, variables_offset))
+            os.replace(temp_path, filepath)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @staticmethod
+    def _check(done, total, progress, cancel) -> None:
+        if cancel is not None and cancel.is_set():
+            raise ExportCancelled()
+        if progress is not None:
+            progress(done, total)
+
+    @staticmethod
+    def _iter_element_ids(board):
+        """Board'un element ID'leri; board yüklenmez"""
+        source = board.lazy_source
+        if source is not None and hasattr(source, 'iter_graph'):
+            return (record_id for kind, record_id, _, _ in source.iter_graph()
+                    if kind == 'element')
+        return iter(board.elements)
+
+    @staticmethod
+    def _iter_records(board):
+        """Board'un ('element'|'connection', nesne) çiftleri; board yüklenmez"""
+        source = board.lazy_source
+        if source is not None and hasattr(source, 'iter_records'):
+            yield from source.iter_records()
+            return
+        for element in board.elements.values():
+            yield 'element', element
+        for connection in board.connections.values():
+            yield 'connection', connection
+
+
+class RuntimeBundle:
+    """.ntb paketini okur
+
+    Dosya tek seferde okunur; element, offset ve kenar dizileri bu baytlar
+    üzerinde kopyasız görünümlerdir (iç içe nesne ayrıştırılmaz). Metinler
+    istendikçe çözülür. Oyun istemcileri için başvuru okuyucusudur.
+    """
+
+    def __init__(self, data: bytes):
+        if len(data) < HEADER_V1.size:
+            raise ValueError("Geçersiz çalışma zamanı paketi")
+        magic, version = PREAMBLE.unpack_from(data)
+        if magic != BUNDLE_MAGIC or version > BUNDLE_VERSION:
+            raise ValueError("Geçersiz ya da daha yeni sürüm çalışma zamanı paketi")
+        if version == 1:
+            (_, _, self.flags, board_count, self.element_count, self.connection_count,
+             string_count, start, boards_offset, elements_offset, offsets_offset, edges_offset,
+             strings_offset) = HEADER_V1.unpack_from(data)
+            variable_count = variables_offset = 0
+            self._edge_fields = EDGE_FIELDS_V1
+        else:
+            (_, _, self.flags, board_count, self.element_count, self.connection_count,
+             string_count, start, variable_count, boards_offset, elements_offset,
+             offsets_offset, edges_offset, strings_offset,
+             variables_offset) = HEADER.unpack_from(data)
+            self._edge_fields = EDGE_FIELDS
+        self.version = version
+        self.start: Optional[int] = start if start != NO_ELEMENT else None
+        self._data = memoryview(data)
+        self._boards = self._u32(boards_offset, board_count * BOARD_FIELDS)
+        self._elements = self._u32(elements_offset, self.element_count * ELEMENT_FIELDS)
+        self._offsets = self._u32(offsets_offset, self.element_count + 1)
+        self._edges = self._u32(edges_offset, self.connection_count * self._edge_fields)
+        self._variables = self._u32(variables_offset, variable_count * VARIABLE_FIELDS)
+        self._string_offsets = self._array('Q', strings_offset, string_count + 1)
+        self._string_base = strings_offset + 8 * (string_count + 1)
+        self._index = None  # ID -> indeks (ilk index_of çağrısında kurulur)
+
+    @classmethod
+    def load(cls, filepath) -> 'RuntimeBundle':
+        with open(filepath, 'rb') as f:
+            return cls(f.read())
+
+    def _u32(self, offset, count):
+        return self._array('I', offset, count)
+
+    def _array(self, typecode, offset, count):
+        size = array(typecode).itemsize
+        raw = self._data[offset:offset + size * count]
+        if sys.byteorder == 'little':
+            return raw.cast(typecode)
+        values = array(typecode, raw.tobytes())
+        values.byteswap()
+        return values
+
+    def __len__(self) -> int:
+        return self.element_count
+
+    @property
+    def board_count(self) -> int:
+        return len(self._boards) // BOARD_FIELDS
+
+    def string(self, string_id: int) -> Optional[str]:
+        if string_id == NO_STRING:
+            return None
+        offsets, base = self._string_offsets, self._string_base
+        return str(self._data[base + offsets[string_id]:base + offsets[string_id + 1]], 'utf-8')
+
+    # --- Board'lar ---
+
+    def board_name(self, board: int) -> str:
+        return self.string(self._boards[board * BOARD_FIELDS])
+
+    def board_elements(self, board: int) -> range:
+        """Board'un element indeksleri"""
+        at = board * BOARD_FIELDS
+        first = self._boards[at + 1]
+        return range(first, first + self._boards[at + 2])
+
+    # --- Elementler ---
+
+    def element_id(self, element: int) -> Optional[str]:
+        """Editördeki ID (paket ID'siz derlendiyse None)"""
+        return self.string(self._elements[element * ELEMENT_FIELDS])
+
+    def title(self, element: int) -> str:
+        return self.string(self._elements[element * ELEMENT_FIELDS + 1])
+
+    def content(self, element: int) -> Optional[str]:
+        return self.string(self._elements[element * ELEMENT_FIELDS + 2])
+
+    def board_of(self, element: int) -> int:
+        return self._elements[element * ELEMENT_FIELDS + 3]
+
+    def index_of(self, element_id: str) -> Optional[int]:
+        """Editör ID'sinin indeksi (paket ID'siz derlendiyse None)"""
+        if not self.flags & FLAG_IDS:
+            return None
+        if self._index is None:
+            self._index = {self.element_id(i): i for i in range(self.element_count)}
+        return self._index.get(element_id)
+
+    # --- Kenarlar ---
+
+    def successors(self, element: int):
+        """Elementten çıkan bağlantıların hedef indeksleri (kopyasız dilim)"""
+        fields = self._edge_fields
+        return self._edges[self._offsets[element] * fields:
+                           self._offsets[element + 1] * fields:fields]
+
+    def choices(self, element: int) -> List[Tuple[int, str]]:
+        """Elementten çıkan (hedef indeks, etiket) çiftleri"""
+        edges, fields = self._edges, self._edge_fields
+        return [(edges[at], self.string(edges[at + 1]))
+                for at in range(self._offsets[element] * fields,
+                                self._offsets[element + 1] * fields, fields)]
+
+    def edges(self, element: int) -> range:
+        """Elementten çıkan bağlantıların kenar indeksleri"""
+        return range(self._offsets[element], self._offsets[element + 1])
+
+    def edge_target(self, edge: int) -> int:
+        return self._edges[edge * self._edge_fields]
+
+    def edge_label(self, edge: int) -> str:
+        return self.string(self._edges[edge * self._edge_fields + 1])
+
+    def edge_condition(self, edge: int) -> str:
+        """Koşulun kaynak metni (koşulsuzsa ya da sürüm 1 paketse boş)"""
+        if self._edge_fields < EDGE_FIELDS:
+            return ""
+        return self.string(self._edges[edge * EDGE_FIELDS + 2])
+
+    def edge_effects(self, edge: int) -> str:
+        """Etkilerin kaynak metni (etkisizse ya da sürüm 1 paketse boş)"""
+        if self._edge_fields < EDGE_FIELDS:
+            return ""
+        return self.string(self._edges[edge * EDGE_FIELDS + 3])
+
+    # --- Değişkenler ---
+
+    def variables(self) -> List[Tuple[str, object]]:
+        """(ad, varsayılan değer) çiftleri, projedeki sırayla"""
+        values = self._variables
+        return [(self.string(values[at]), json.loads(self.string(values[at + 1])))
+                for at in range(0, len(values), VARIABLE_FIELDS)]
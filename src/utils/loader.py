@@ -0,0 +1,45 @@
+import threading
+
+from PyQt6.QtCore import QThread, pyqtSignal
+
+from utils.file_ops import LoadCancelled, ProjectFileHandler
+
+
+class ProjectLoader(QThread):
+    """Projeyi GUI thread dışında yükler
+
+    Ana board hazır olur olmaz projeyi projectReady ile bildirir; diğer
+    board'lar açıldıklarında yüklenir.
+    """
+
+    progressChanged = pyqtSignal(int, int)  # (yapılan, toplam)
+    projectReady = pyqtSignal(object)  # Ana board'u yüklenmiş Project
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, filepath, parent=None):
+        super().__init__(parent)
+        self.filepath = filepath
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        """Yüklemeyi bir sonraki kontrol noktasında durdur"""
+        self._cancel.set()
+
+    def run(self):
+        try:
+            loader = ProjectFileHandler.iter_load_project(
+                self.filepath, lazy=True, progress=self.progressChanged.emit, cancel=self._cancel)
+            project = next(loader)
+            for _ in loader:
+                break  # İlk üretilen board ana board
+            loader.close()
+            if self._cancel.is_set():
+                raise LoadCancelled()
+            self.projectReady.emit(project)
+        except LoadCancelled:
+            self.cancelled.emit()
+        except Exception as e:
+            import traceback
+            traceback.print_exc()
+            self.failed.emit(str(e))
@@ -0,0 +1,440 @@
+import json
+import os
+import sqlite3
+from datetime import datetime
+
+from core.fields import iso_timestamps
+
+# SQLite proje deposu: aynı .ntp uzantısıyla, JSON biçimine alternatif.
+# Board'lar tembel yüklenir, değişiklikler tek işlemde toplu yazılır ve WAL
+# sayesinde yarıda kalan yazma önceki kaydı bozmaz.
+SQLITE_MAGIC = b'SQLite format 3\x00'
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS boards (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    root INTEGER NOT NULL DEFAULT 0,
+    children TEXT NOT NULL DEFAULT '[]',
+    position INTEGER NOT NULL DEFAULT 0,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS elements (
+    id TEXT PRIMARY KEY,
+    board_id TEXT NOT NULL,
+    title TEXT NOT NULL,
+    content TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    color TEXT NOT NULL,
+    components TEXT NOT NULL,
+    x REAL NOT NULL,
+    y REAL NOT NULL,
+    width REAL NOT NULL,
+    height REAL NOT NULL,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS connections (
+    id TEXT PRIMARY KEY,
+    board_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    target_id TEXT NOT NULL,
+    label TEXT NOT NULL,
+    condition TEXT NOT NULL DEFAULT '',
+    effects TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL,
+    theme TEXT NOT NULL,
+    created_at TEXT NOT NULL,
+    modified_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS components (
+    id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_elements_board ON elements(board_id);
+CREATE INDEX IF NOT EXISTS idx_connections_board ON connections(board_id);
+CREATE INDEX IF NOT EXISTS idx_connections_source ON connections(source_id);
+CREATE INDEX IF NOT EXISTS idx_connections_target ON connections(target_id);
+"""
+
+ELEMENT_COLUMNS = ('id, board_id, title, content, theme, color, components, '
+                   'x, y, width, height, created_at, modified_at')
+CONNECTION_COLUMNS = ('id, board_id, source_id, target_id, label, condition, effects, '
+                      'type, theme, created_at, modified_at')
+
+# Sürüm yükseltmeleri: (sürüm, SQL); eski dosyalar açılırken sırayla uygulanır
+MIGRATIONS = (
+    (2, "ALTER TABLE connections ADD COLUMN condition TEXT NOT NULL DEFAULT '';"
+        "ALTER TABLE connections ADD COLUMN effects TEXT NOT NULL DEFAULT '';"),
+)
+
+
+def is_sqlite_file(filepath) -> bool:
+    """Dosya SQLite veritabanı mı? (ilk 16 bayta bakar)"""
+    try:
+        with open(filepath, 'rb') as f:
+            return f.read(len(SQLITE_MAGIC)) == SQLITE_MAGIC
+    except OSError:
+        return False
+
+
+def _element_row(board_id, element):
+    return (element.id, board_id, element.title, element.content, element.theme,
+            element.color, json.dumps(element.components), *element.geometry(),
+            *iso_timestamps(element))
+
+
+def _connection_row(board_id, connection):
+    return (connection.id, board_id, connection.source_id, connection.target_id,
+            connection.label, connection.condition, connection.effects,
+            connection.type, connection.theme,
+            *iso_timestamps(connection))
+
+
+def _element_from_row(row):
+    from core.element import Element
+
+    element = Element(row['title'], row['content'])
+    element.id = row['id']
+    element.theme = row['theme']
+    element.color = row['color']
+    element.components = json.loads(row['components'])
+    element.position = {'x': row['x'], 'y': row['y']}
+    element.size = {'width': row['width'], 'height': row['height']}
+    element.created_at = row['created_at']
+    element.modified_at = row['modified_at']
+    return element
+
+
+def _connection_from_row(row):
+    from core.connection import Connection
+
+    connection = Connection(row['source_id'], row['target_id'])
+    connection.id = row['id']
+    connection.label = row['label']
+    connection.condition = row['condition']
+    connection.effects = row['effects']
+    connection.type = row['type']
+    connection.theme = row['theme']
+    connection.created_at = row['created_at']
+    connection.modified_at = row['modified_at']
+    return connection
+
+
+class SQLiteBoardSource:
+    """Board içeriğini ilk erişimde veritabanından okuyan kaynak"""
+
+    def __init__(self, store, board_id):
+        self.store = store
+        self.board_id = board_id
+
+    def load(self, board, progress=None, cancel=None):
+        board.load_records(self.store.load_elements(self.board_id, progress, cancel),
+                           self.store.load_connections(self.board_id))
+
+    def iter_element_texts(self):
+        """Board'u yüklemeden (element_id, başlık, içerik) üçlüleri (arama indeksi için)"""
+        return self.store.iter_element_texts(self.board_id)
+
+    def iter_records(self):
+        """Board'u yüklemeden ('element'|'connection', nesne) çiftleri (dışa aktarım için)"""
+        for element in self.store.load_elements(self.board_id):
+            yield 'element', element
+        for connection in self.store.load_connections(self.board_id):
+            yield 'connection', connection
+
+    def iter_graph(self):
+        """Board'u yüklemeden (tür, ID, kaynak, hedef) dörtlüleri (graf analizi için)"""
+        return self.store.iter_graph(self.board_id)
+
+
+class SQLiteProjectStore:
+    """Projeyi SQLite veritabanında tutan depo
+
+    Yüklenen projenin save_state'i olarak saklanır; sonraki kayıtlarda
+    sadece değişen kayıtlar yazılır.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        # Proje yükleyici thread'de açılıp GUI thread'de kullanılabilir
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute('PRAGMA journal_mode=WAL')
+        self.db.execute('PRAGMA synchronous=NORMAL')
+        with self.db:
+            self._migrate()
+            self.db.executescript(SCHEMA)
+        self._saved_board_ids = set()
+
+    def close(self):
+        self.db.close()
+
+    def _migrate(self):
+        """Eski şemayla yazılmış dosyayı güncel sürüme yükselt"""
+        if self.db.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'meta'").fetchone() is None:
+            return  # Yeni dosya
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'schema_version'").fetchone()
+        version = int(row['value']) if row is not None else 1
+        if version > SCHEMA_VERSION:
+            raise ValueError("Proje daha yeni bir sürümle kaydedilmiş")
+        for target, script in MIGRATIONS:
+            if version < target:
+                for statement in script.split(';'):
+                    if statement.strip():
+                        self.db.execute(statement)
+        if version < SCHEMA_VERSION:
+            self.db.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('schema_version', ?)",
+                            (str(SCHEMA_VERSION),))
+
+    # --- Yazma ---
+
+    def save_project(self, project):
+        """Projenin tamamını tek işlemde yaz (mevcut içerik silinir)"""
+        # Tembel board'lar silinmeden önce okunmalı
+        for board in project.boards.values():
+            board.ensure_loaded()
+
+        with self.db:
+            for table in ('boards', 'elements', 'connections', 'components'):
+                self.db.execute(f'DELETE FROM {table}')
+            self._write_header(project)
+            for position, board in enumerate(project.boards.values()):
+                self._write_board(board, position)
+                self.db.executemany(
+                    f'INSERT INTO elements ({ELEMENT_COLUMNS}) VALUES ({", ".join("?" * 13)})',
+                    (_element_row(board.id, e) for e in board.elements.values()))
+                self.db.executemany(
+                    f'INSERT INTO connections ({CONNECTION_COLUMNS}) VALUES ({", ".join("?" * 11)})',
+                    (_connection_row(board.id, c) for c in board.connections.values()))
+            self._write_components(project)
+
+        for board in project.boards.values():
+            board.clear_dirty()
+        self._saved_board_ids = set(project.boards)
+        project.clear_dirty()
+        project.save_state = self
+
+    def save_changes(self, project):
+        """Son kayıttan beri değişen kayıtları tek işlemde yaz"""
+        with self.db:
+            self._write_header(project)
+            removed = self._saved_board_ids - project.boards.keys()
+            for board_id in removed:
+                self.db.execute('DELETE FROM elements WHERE board_id = ?', (board_id,))
+                self.db.execute('DELETE FROM connections WHERE board_id = ?', (board_id,))
+                self.db.execute('DELETE FROM boards WHERE id = ?', (board_id,))
+
+            for position, board in enumerate(project.boards.values()):
+                self._write_board(board, position)
+                if not (board.is_loaded and board.is_dirty):
+                    continue
+                elements, removed_elements, connections, removed_connections = board.dirty_changes()
+                self.db.executemany('DELETE FROM connections WHERE id = ?',
+                                    ((cid,) for cid in removed_connections))
+                self.db.executemany('DELETE FROM elements WHERE id = ?',
+                                    ((eid,) for eid in removed_elements))
+                self.db.executemany(
+                    f'INSERT OR REPLACE INTO elements ({ELEMENT_COLUMNS}) '
+                    f'VALUES ({", ".join("?" * 13)})',
+                    (_element_row(board.id, e) for e in elements))
+                self.db.executemany(
+                    f'INSERT OR REPLACE INTO connections ({CONNECTION_COLUMNS}) '
+                    f'VALUES ({", ".join("?" * 11)})',
+                    (_connection_row(board.id, c) for c in connections))
+            self._write_components(project)
+
+        for board in project.boards.values():
+            board.clear_dirty()
+        self._saved_board_ids = set(project.boards)
+        project.clear_dirty()
+
+    def _write_header(self, project):
+        header = {
+            'id': project.id,
+            'name': project.name,
+            'created_at': project.created_at.isoformat(),
+            'modified_at': datetime.now().isoformat(),
+            'starting_element': project.starting_element,
+            'variables': {name: var.to_dict() for name, var in project.variables.items()},
+        }
+        self.db.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', [
+            ('schema_version', str(SCHEMA_VERSION)),
+            ('project', json.dumps(header, ensure_ascii=False)),
+        ])
+
+    def _write_board(self, board, position):
+        self.db.execute(
+            'INSERT OR REPLACE INTO boards (id, name, root, children, position, created_at, modified_at) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?)',
+            (board.id, board.name, int(board.root), json.dumps(board.children), position,
+             *iso_timestamps(board)))
+
+    def _write_components(self, project):
+        self.db.execute('DELETE FROM components')
+        self.db.executemany('INSERT INTO components (id, data) VALUES (?, ?)', (
+            (cid, json.dumps(comp.to_dict() if hasattr(comp, 'to_dict') else comp,
+                             ensure_ascii=False))
+            for cid, comp in project.components.items()))
+
+    # --- Okuma ---
+
+    def load_project(self, lazy=True):
+        """Projeyi oku; lazy=True iken board içerikleri ilk erişimde okunur"""
+        from core.project import Project
+        from core.board import Board
+        from core.variable import Variable
+
+        header = json.loads(self.db.execute(
+            "SELECT value FROM meta WHERE key = 'project'").fetchone()['value'])
+        project = Project(header['name'])
+        project.id = header['id']
+        project.created_at = datetime.fromisoformat(header['created_at'])
+        project.modified_at = datetime.fromisoformat(header['modified_at'])
+        project.starting_element = header.get('starting_element')
+        project.variables = {name: Variable.from_dict(var)
+                             for name, var in header.get('variables', {}).items()}
+
+        for row in self.db.execute('SELECT * FROM boards ORDER BY position'):
+            board = Board(row['name'], bool(row['root']))
+            board.id = row['id']
+            board.children = json.loads(row['children'])
+            board.created_at = row['created_at']
+            board.set_lazy_source(SQLiteBoardSource(self, board.id))
+            if not lazy:
+                board.ensure_loaded()
+            board.modified_at = row['modified_at']
+            project.boards[board.id] = board
+
+        for row in self.db.execute('SELECT id, data FROM components'):
+            project.components[row['id']] = json.loads(row['data'])
+
+        self._saved_board_ids = set(project.boards)
+        project.save_state = self
+        return project
+
+    def load_elements(self, board_id, progress=None, cancel=None):
+        """Board'un elementleri"""
+        from utils.file_ops import ProjectFileHandler
+
+        total = self.count_elements(board_id) if progress is not None else 0
+        elements = []
+        for row in self.db.execute('SELECT * FROM elements WHERE board_id = ?', (board_id,)):
+            elements.append(_element_from_row(row))
+            ProjectFileHandler._check_progress(len(elements), total, progress, cancel)
+        return elements
+
+    def iter_element_texts(self, board_id):
+        """Board'un elementlerinin (id, başlık, içerik) satırları"""
+        # Okuma sürerken aynı bağlantıdan kayıt yapılabileceği için önce hepsi alınır
+        rows = self.db.execute('SELECT id, title, content FROM elements WHERE board_id = ?',
+                               (board_id,)).fetchall()
+        for row in rows:
+            yield row['id'], row['title'], row['content']
+
+    def iter_graph(self, board_id):
+        """Board'un elementleri ve bağlantı uçları; içerik okunmaz"""
+        elements = self.db.execute('SELECT id FROM elements WHERE board_id = ?',
+                                   (board_id,)).fetchall()
+        connections = self.db.execute(
+            'SELECT id, source_id, target_id FROM connections WHERE board_id = ?',
+            (board_id,)).fetchall()
+        for row in elements:
+            yield 'element', row['id'], None, None
+        for row in connections:
+            yield 'connection', row['id'], row['source_id'], row['target_id']
+
+    def load_connections(self, board_id):
+        """Board'un bağlantıları"""
+        rows = self.db.execute('SELECT * FROM connections WHERE board_id = ?', (board_id,))
+        return [_connection_from_row(row) for row in rows]
+
+    # --- Proje yüklemeden sorgular ---
+
+    def get_element(self, element_id):
+        """ID'ye göre element (yoksa None)"""
+        row = self.db.execute('SELECT * FROM elements WHERE id = ?', (element_id,)).fetchone()
+        return _element_from_row(row) if row is not None else None
+
+    def get_element_board_id(self, element_id):
+        """Elementin bulunduğu board'un ID'si"""
+        row = self.db.execute('SELECT board_id FROM elements WHERE id = ?', (element_id,)).fetchone()
+        return row['board_id'] if row is not None else None
+
+    def get_incoming_connections(self, element_id):
+        """Elemente gelen bağlantılar"""
+        rows = self.db.execute('SELECT * FROM connections WHERE target_id = ?', (element_id,))
+        return [_connection_from_row(row) for row in rows]
+
+    def get_outgoing_connections(self, element_id):
+        """Elementten çıkan bağlantılar"""
+        rows = self.db.execute('SELECT * FROM connections WHERE source_id = ?', (element_id,))
+        return [_connection_from_row(row) for row in rows]
+
+    def count_elements(self, board_id):
+        """Board'daki element sayısı"""
+        return self.db.execute('SELECT COUNT(*) FROM elements WHERE board_id = ?',
+                               (board_id,)).fetchone()[0]
+
+
+def create_sqlite_project(project, sqlite_path):
+    """Projeyi yeni bir SQLite dosyasına yaz ve deposunu döndür
+
+    Veritabanı önce geçici dosyada kurulur, sonra hedefin yerine taşınır.
+    """
+    for board in project.boards.values():
+        board.ensure_loaded()
+
+    # save_project save_state'i geçici depoya çevirir; eski depo önceden alınır
+    previous = project.save_state
+    temp_path = sqlite_path + '.tmp'
+    for path in (temp_path, temp_path + '-wal', temp_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    temp_store = SQLiteProjectStore(temp_path)
+    temp_store.save_project(project)
+    # WAL içeriğini ana dosyaya aktar ki tek dosya taşınabilsin
+    temp_store.db.execute('PRAGMA journal_mode=DELETE')
+    temp_store.close()
+
+    # Açık WAL bağlantısının altındaki dosya değiştirilmez
+    if (isinstance(previous, SQLiteProjectStore)
+            and os.path.abspath(previous.path) == os.path.abspath(sqlite_path)):
+        previous.close()
+    for path in (sqlite_path + '-wal', sqlite_path + '-shm'):
+        if os.path.exists(path):
+            os.remove(path)
+    os.replace(temp_path, sqlite_path)
+
+    store = SQLiteProjectStore(sqlite_path)
+    store._saved_board_ids = set(project.boards)
+    project.save_state = store
+    return store
+
+
+def convert_json_to_sqlite(json_path, sqlite_path):
+    """JSON .ntp dosyasını SQLite deposuna çevir"""
+    from utils.file_ops import ProjectFileHandler
+
+    project = ProjectFileHandler.load_project(json_path, lazy=False)
+    create_sqlite_project(project, sqlite_path).close()
+
+
+def convert_sqlite_to_json(sqlite_path, json_path):
+    """SQLite deposunu JSON .ntp dosyasına çevir"""
+    from utils.file_ops import ProjectFileHandler
+
+    store = SQLiteProjectStore(sqlite_path)
+    try:
+        project = store.load_project(lazy=False)
+    finally:
+        store.close()
+    project.save_state = None
+    ProjectFileHandler.save_project(project, json_path, compact=True)
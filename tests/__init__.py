@@ -0,0 +1,22 @@
+"""Birim testleri
+
+Testler src/ altındaki paketleri uygulamanın kendisi gibi ('core.*',
+'utils.*') içe aktarır; bunun için yol ve Qt platformu burada ayarlanır.
+"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC = os.path.join(ROOT, 'src')
+for path in (ROOT, SRC):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+# Testler pencere açmadan çalışır
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+def application():
+    """Qt nesnesi kullanan testler için paylaşılan QApplication"""
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication([])
@@ -0,0 +1,192 @@
+import random
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.analysis import GraphAnalysis, strongly_connected_components
+from core.board import Board
+from core.connection import Connection
+from core.element import Element
+from core.project import Project
+
+
+class _NoProject:
+    boards = {}
+    starting_element = None
+
+
+def brute_force(graph):
+    """Bileşenler, erişilenler, çıkmazlar ve yetimler baştan hesaplanmış hali"""
+    succ = {node: set(graph._succ[node]) for node in graph._succ}
+    components = {frozenset(c) for c in strongly_connected_components(succ, succ.__getitem__)}
+    reached = set()
+    if graph.start in succ:
+        stack = [graph.start]
+        reached.add(graph.start)
+        while stack:
+            for node in succ[stack.pop()]:
+                if node not in reached:
+                    reached.add(node)
+                    stack.append(node)
+    targets = {node for targets in succ.values() for node in targets}
+    dead_ends = {node for node in succ if not succ[node]}
+    orphans = {node for node in dead_ends if node not in targets}
+    return components, reached, dead_ends, orphans
+
+
+class IncrementalAnalysisTest(unittest.TestCase):
+    """Rastgele düzenlemelerden sonra artımlı durum baştan hesaplanana eşit olmalı"""
+
+    def check(self, graph):
+        components, reached, dead_ends, orphans = brute_force(graph)
+        self.assertEqual({frozenset(c) for c in graph.components()}, components)
+        self.assertEqual(graph.reachable(), reached)
+        self.assertEqual(set(graph.dead_ends()), dead_ends)
+        self.assertEqual(set(graph.orphans()), orphans)
+        # Kapsayan ağaç gerçek kenarlardan oluşur
+        for node, parent in graph._parent.items():
+            if parent is None:
+                self.assertEqual(node, graph.start)
+            else:
+                self.assertIn(node, graph._succ[parent])
+                self.assertIn(node, graph._children[parent])
+        # Yoğunlaştırılmış graf: kenar sayıları doğru, topolojik sıra geçerli
+        counts = {}
+        for u, targets in graph._succ.items():
+            for v in targets:
+                cu, cv = graph.component_of(u), graph.component_of(v)
+                if cu != cv:
+                    counts[cu, cv] = counts.get((cu, cv), 0) + 1
+        self.assertEqual(counts, {(c, d): n for c, targets in graph._csucc.items()
+                                  for d, n in targets.items()})
+        for (c, d), n in counts.items():
+            self.assertLess(graph._ord[c], graph._ord[d])
+            self.assertEqual(graph._cpred[d][c], n)
+        self.assertEqual(len(set(graph._ord.values())), len(graph._ord))
+
+    def test_random_edits(self):
+        for seed in range(150):
+            rng = random.Random(seed)
+            graph = GraphAnalysis(_NoProject())
+            nodes = [f'n{i}' for i in range(rng.randint(3, 20))]
+            for node in nodes:
+                graph.add_node(node)
+            graph.set_start(rng.choice(nodes))
+            live, serial = {}, 0
+            for _ in range(120):
+                roll = rng.random()
+                present = list(graph._succ)
+                if roll < 0.5 and present:
+                    serial += 1
+                    live[f'c{serial}'] = rng.choice(present), rng.choice(present)
+                    graph.add_edge(f'c{serial}', *live[f'c{serial}'])
+                elif roll < 0.85 and live:
+                    # Bileşen içinden silinen kenar bileşeni bölebilir
+                    connection_id = rng.choice(list(live))
+                    del live[connection_id]
+                    graph.remove_edge(connection_id)
+                elif roll < 0.92 and present:
+                    node = rng.choice(present)
+                    live = {cid: ends for cid, ends in live.items() if node not in ends}
+                    graph.remove_node(node)
+                elif roll < 0.97:
+                    graph.add_node(rng.choice(nodes))
+                else:
+                    graph.set_start(rng.choice(nodes))
+                self.check(graph)
+            graph._rebuild()
+            self.check(graph)
+
+    def test_merge_and_split(self):
+        graph = GraphAnalysis(_NoProject())
+        for i in range(5):
+            graph.add_edge(f'c{i}', f'n{i}', f'n{i + 1}')
+        graph.set_start('n0')
+        self.assertEqual(graph.loops(), [])
+        graph.add_edge('back', 'n4', 'n1')  # n1..n4 tek bileşende birleşir
+        self.assertEqual([set(loop) for loop in graph.loops()], [{'n1', 'n2', 'n3', 'n4'}])
+        self.check(graph)
+        graph.remove_edge('c2')  # n2 -> n3 kopunca bileşen dağılır
+        self.assertEqual(graph.loops(), [])
+        self.assertEqual(graph.reachable(), {'n0', 'n1', 'n2'})
+        self.check(graph)
+
+
+def analysis_state(analysis):
+    implicit = analysis._implicit
+    return (set(analysis._succ), dict(analysis._edges), analysis.reachable(),
+            set(analysis.dead_ends()), set(analysis.orphans()),
+            {frozenset(c) for c in analysis.components()}, set(implicit),
+            # Örtük düğümün board'u okuma sırasına bağlıdır
+            {node: analysis.board_of(node) for node in analysis._succ if node not in implicit})
+
+
+class ProjectAnalysisTest(unittest.TestCase):
+    def test_random_project_edits_match_rebuild(self):
+        for seed in range(120):
+            rng = random.Random(seed)
+            project = Project('p')
+            for i in range(3):
+                board = Board(f'b{i}', i == 0)
+                project.add_board(board)
+                for j in range(4):
+                    board.add_element(Element(f'{i}.{j}'))
+            analysis = GraphAnalysis(project)
+            analysis.refresh()
+            for step in range(30):
+                boards = list(project.boards.values())
+                elements = [eid for board in boards for eid in board.elements]
+                board = rng.choice(boards)
+                roll = rng.random()
+                if roll < 0.5 and elements:
+                    # Kaynak ve hedef başka board'larda olabilir
+                    board.add_connection(Connection(rng.choice(elements), rng.choice(elements)))
+                elif roll < 0.7 and board.connections:
+                    board.remove_connection(rng.choice(list(board.connections)))
+                elif roll < 0.8 and len(boards) > 1:
+                    project.remove_board(rng.choice(boards[1:]).id)
+                elif roll < 0.9:
+                    added = Board('yeni')
+                    added.add_element(Element('x'))
+                    project.add_board(added)
+                elif board.elements:
+                    board.remove_element(rng.choice(list(board.elements)))
+                if elements and rng.random() < 0.2:
+                    project.set_starting_element(rng.choice(elements))
+                analysis.refresh()
+                rebuilt = GraphAnalysis(project)
+                rebuilt.refresh()
+                self.assertEqual(analysis_state(analysis), analysis_state(rebuilt),
+                                 f'seed {seed}, adım {step}')
+
+    def test_board_removal_keeps_incoming_connections(self):
+        project = Project('p')
+        first, second = Board('bir', True), Board('iki')
+        project.add_board(first)
+        project.add_board(second)
+        a, b = Element('a'), Element('b')
+        first.add_element(a)
+        second.add_element(b)
+        first.add_connection(Connection(a.id, b.id))
+        back = Connection(b.id, a.id)
+        second.add_connection(back)
+        project.set_starting_element(a.id)
+        analysis = GraphAnalysis(project)
+        analysis.refresh()
+        self.assertEqual(len(analysis.loops()), 1)
+
+        project.remove_board(second.id)
+        analysis.refresh()
+        # Birinci board'un bağlantısı hâlâ b'yi gösterir; b'nin kendi bağlantısı gitti
+        self.assertIn(b.id, analysis)
+        self.assertEqual(analysis.board_of(b.id), first.id)
+        self.assertEqual(analysis.loops(), [])
+        self.assertEqual(analysis.dead_ends(), [b.id])
+
+        first.remove_connection(next(iter(first.connections)))
+        analysis.update()
+        self.assertNotIn(b.id, analysis)
+        self.assertEqual(len(analysis), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
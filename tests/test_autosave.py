@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+
+import tests
+from utils.autosave import AutosaveService
+from utils.file_ops import ProjectFileHandler
+from tests.test_file_ops import build_project, snapshot
+
+
+class AutosaveTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = tests.application()
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.service = AutosaveService(directory=os.path.join(self.directory, 'recovery'))
+        self.addCleanup(self.service.shutdown, discard=False)
+
+    def autosave(self, project):
+        written = []
+        self.service.autosaved.connect(written.append)
+        self.service.set_project(project)
+        self.service.request_autosave()
+        while self.service._snapshot_running:
+            self.app.processEvents()
+        self.service.wait()
+        self.app.processEvents()  # Worker'dan gelen sinyal
+        self.assertEqual(len(written), 1)
+        return written[0]
+
+    def test_legacy_boards_are_not_loaded(self):
+        project = build_project()
+        data = project.to_dict()
+        for board_data in data['boards'].values():
+            board_data['connections'] = list(board_data['connections'].values())
+        path = os.path.join(self.directory, 'eski.ntp')
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'project': data}, f)
+
+        legacy = ProjectFileHandler.load_project(path)
+        lazy = [board for board in legacy.boards.values() if not board.is_loaded]
+        self.assertTrue(lazy)
+        recovery = self.autosave(legacy)
+        # Kurtarma dosyası yazıldı ama açılmamış board'lar GUI thread'de yüklenmedi
+        self.assertTrue(all(not board.is_loaded for board in lazy))
+        self.assertEqual(snapshot(ProjectFileHandler.load_project(recovery), timestamps=False),
+                         snapshot(legacy, timestamps=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,134 @@
+import unittest
+
+import tests
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QImage, QPainter
+from PyQt6.QtWidgets import QStyleOptionGraphicsItem
+
+from core.board import Board
+from core.connection import Connection
+from core.element import Element
+from gui.board_view import BoardGraphicsScene, ElementGraphicsItem
+
+NEAR = QRectF(-500, -500, 1000, 1000)
+LEAVES = QRectF(5000, 0, 1000, 1000)
+EMPTY = QRectF(-9000, -9000, 100, 100)
+
+
+class SceneVirtualizationTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = tests.application()
+
+    def setUp(self):
+        # Ortada bir merkez, uzakta ona bağlı 600 element
+        self.board = Board('b', True)
+        self.hub = Element('merkez')
+        self.board.add_element(self.hub)
+        self.leaves = []
+        for i in range(600):
+            leaf = Element(f'yaprak {i}')
+            leaf.set_position(5000 + (i % 30) * 300, (i // 30) * 300)
+            self.board.add_element(leaf)
+            self.board.add_connection(Connection(self.hub.id, leaf.id))
+            self.leaves.append(leaf)
+        self.scene = BoardGraphicsScene()
+        self.scene.set_board(self.board)
+
+    def test_hub_does_not_materialize_neighbours(self):
+        self.scene.update_viewport(NEAR)
+        self.assertEqual(list(self.scene.element_items), [self.hub.id])
+        self.assertEqual(len(self.scene.connection_items), 600)
+        for item in self.scene.connection_items.values():
+            # Uzaktaki uç modelin geometrisinden çizilir
+            self.assertIsNone(item.target_item)
+            self.assertFalse(item.boundingRect().isEmpty())
+
+    def test_ends_follow_materialization(self):
+        self.scene.update_viewport(LEAVES)
+        self.assertNotIn(self.hub.id, self.scene.element_items)
+        for connection_id, item in self.scene.connection_items.items():
+            self.assertIsNone(item.source_item)
+            self.assertEqual(item.target_item.element.id,
+                             self.board.connections[connection_id].target_id)
+
+        self.scene.update_viewport(QRectF(-500, -500, 7000, 1500))
+        hub_item = self.scene.element_items[self.hub.id]
+        self.assertTrue(all(item.source_item is hub_item
+                            for item in self.scene.connection_items.values()))
+        self.assertEqual(len(hub_item.connections), len(self.scene.connection_items))
+
+    def test_far_end_moves_and_deletes(self):
+        self.scene.update_viewport(NEAR)
+        moved, deleted = self.leaves[-1], self.leaves[-2]
+        item = next(i for i in self.scene.connection_items.values()
+                    if i.connection.target_id == moved.id)
+        moved.set_position(9000, 9000)
+        self.board.update_element_geometry(moved.id)
+        self.scene.refresh_element(moved.id)
+        self.assertTrue(item.boundingRect().contains(9000, 9000))
+
+        self.board.remove_element(deleted.id)
+        self.scene.refresh_element(deleted.id)
+        self.assertFalse(any(i.connection.target_id == deleted.id
+                             for i in self.scene.connection_items.values()))
+        self.assertEqual(len(self.scene.connection_items), 599)
+
+    def test_connection_items_are_pooled(self):
+        self.scene.update_viewport(NEAR)
+        items = set(map(id, self.scene.connection_items.values()))
+        self.scene.update_viewport(EMPTY)
+        self.assertFalse(self.scene.connection_items)
+        self.assertFalse(self.scene._ghost_ends)
+        self.assertEqual(len(self.scene._connection_pool), 600)
+        self.scene.update_viewport(NEAR)
+        self.assertEqual(set(map(id, self.scene.connection_items.values())), items)
+
+    def test_zoom_in_reuses_materialized_items(self):
+        self.scene.update_viewport(NEAR)
+        materialized = self.scene._materialized_rect
+        self.scene.update_viewport(QRectF(-300, -300, 600, 600))
+        self.assertIs(self.scene._materialized_rect, materialized)
+        # Çok yakınlaşınca fazlası bırakılsın diye bölge yeniden kurulur
+        self.scene.update_viewport(QRectF(-10, -10, 20, 20))
+        self.assertIsNot(self.scene._materialized_rect, materialized)
+
+
+class ElementPaintTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = tests.application()
+
+    def setUp(self):
+        element = Element('başlık', 'uzun içerik metni ' * 20)
+        self.item = ElementGraphicsItem(element)
+
+    def paint(self, scale):
+        image = QImage(400, 400, QImage.Format.Format_ARGB32)
+        painter = QPainter(image)
+        painter.scale(scale, scale)
+        self.item.paint(painter, QStyleOptionGraphicsItem())
+        painter.end()
+
+    def test_title_only_tier_skips_content_layout(self):
+        self.paint(0.45)
+        self.assertIsNotNone(self.item._title_text)
+        self.assertIsNone(self.item._content_layout)
+        self.paint(1.0)
+        self.assertIsNotNone(self.item._content_layout)
+
+    def test_box_only_tier_skips_text_layout(self):
+        self.paint(0.2)
+        self.assertIsNone(self.item._title_text)
+        self.assertIsNone(self.item._content_layout)
+
+    def test_layouts_are_cached(self):
+        self.paint(1.0)
+        updates = ElementGraphicsItem.layout_updates
+        self.paint(0.45)
+        self.paint(1.0)
+        self.assertEqual(ElementGraphicsItem.layout_updates, updates)
+
+
+if __name__ == '__main__':
+    unittest.main()
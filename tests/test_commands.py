@@ -0,0 +1,334 @@
+import random
+import unittest
+from unittest import mock
+
+import tests
+from PyQt6.QtCore import QPointF
+
+from core.board import Board
+from core.commands import (CommandStack, CompositeCommand, DeleteElementCommand,
+                           MoveElementCommand, TextChange, UpdateElementCommand)
+from core.connection import Connection
+from core.element import Element
+from gui.board_view import BoardGraphicsScene
+
+
+class CountingScene(BoardGraphicsScene):
+    """Toplu güncelleme dışında yapılan panel yenilemelerini sayan sahne"""
+
+    def __init__(self):
+        super().__init__()
+        self.refreshes = []
+
+    def notify_model_changed(self, element_ids=()):
+        if not self._batch_depth:
+            self.refreshes.append(set(element_ids))
+        super().notify_model_changed(element_ids)
+
+
+class CommandTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = tests.application()
+
+    def setUp(self):
+        # Zincir halinde bağlı beş element
+        self.board = Board('b', True)
+        self.elements = []
+        for i in range(5):
+            element = Element(f'e{i}', f'içerik {i}')
+            element.set_position(i * 250, 0)
+            self.board.add_element(element)
+            self.elements.append(element)
+        for first, second in zip(self.elements, self.elements[1:]):
+            self.board.add_connection(Connection(first.id, second.id))
+        self.scene = CountingScene()
+        self.scene.set_board(self.board)
+        self.stack = CommandStack()
+
+    def state(self):
+        return (sorted(self.board.elements),
+                sorted((c.source_id, c.target_id) for c in self.board.connections.values()))
+
+    def delete(self, element):
+        self.stack.execute(DeleteElementCommand(self.scene, element))
+
+
+class TransactionTest(CommandTestCase):
+    def test_transaction_is_one_step(self):
+        before = self.state()
+        with self.stack.transaction('Sil'):
+            for element in self.elements[1:4]:
+                self.delete(element)
+        self.assertEqual(len(self.stack.undo_stack), 1)
+        self.assertIsInstance(self.stack.undo_stack[0], CompositeCommand)
+        after = self.state()
+        self.assertEqual(after[0], sorted([self.elements[0].id, self.elements[4].id]))
+        self.assertEqual(after[1], [])
+
+        self.stack.undo()
+        self.assertEqual(self.state(), before)
+        self.stack.redo()
+        self.assertEqual(self.state(), after)
+
+    def test_single_command_is_not_wrapped(self):
+        with self.stack.transaction():
+            self.delete(self.elements[0])
+        self.assertIsInstance(self.stack.undo_stack[0], DeleteElementCommand)
+        with self.stack.transaction():
+            pass
+        self.assertEqual(len(self.stack.undo_stack), 1)
+
+    def test_nested_transaction_joins_outer(self):
+        with self.stack.transaction('dış') as outer:
+            self.delete(self.elements[0])
+            with self.stack.transaction('iç') as inner:
+                self.assertIs(inner, outer)
+                self.delete(self.elements[1])
+            self.delete(self.elements[2])
+        self.assertEqual(len(self.stack.undo_stack), 1)
+        self.assertEqual(len(self.stack.undo_stack[0]), 3)
+
+    def test_rollback_on_exception(self):
+        before = self.state()
+        self.delete(self.elements[4])
+        history = list(self.stack.undo_stack)
+        with self.assertRaises(RuntimeError):
+            with self.stack.transaction():
+                self.delete(self.elements[0])
+                self.stack.execute(MoveElementCommand(
+                    self.scene, self.elements[1], QPointF(250, 0), QPointF(0, 900)))
+                raise RuntimeError('iptal')
+        self.assertEqual(self.stack.undo_stack, history)
+        self.assertEqual(self.elements[1].geometry()[:2], (250, 0))
+        self.assertIn(self.elements[0].id, self.board.elements)
+        # Transaction kapandı: sonraki komut ayrı adım olur
+        self.delete(self.elements[0])
+        self.assertEqual(len(self.stack.undo_stack), 2)
+        self.stack.undo()
+        self.stack.undo()
+        self.assertEqual(self.state(), before)
+
+    def test_one_refresh_per_batch(self):
+        with self.stack.transaction():
+            for element in self.elements[:3]:
+                self.delete(element)
+        self.assertEqual(self.scene.refreshes, [{e.id for e in self.elements[:3]}])
+
+        self.scene.refreshes.clear()
+        self.stack.undo()
+        self.assertEqual(len(self.scene.refreshes), 1)
+        self.scene.refreshes.clear()
+        self.stack.redo()
+        self.assertEqual(len(self.scene.refreshes), 1)
+
+        # Transaction dışında her komut kendi yenilemesini yapar
+        self.scene.refreshes.clear()
+        self.stack.undo()
+        self.delete(self.elements[3])
+        self.delete(self.elements[4])
+        self.assertEqual(len(self.scene.refreshes), 3)
+
+
+def random_text(rng, length):
+    return ''.join(rng.choice('abcçğıİö \n') for _ in range(length))
+
+
+class HistoryBudgetTest(CommandTestCase):
+    def edit(self, element, text, merge=False):
+        if not merge:
+            self.stack.close_merge()
+        self.stack.execute(UpdateElementCommand(self.scene, element, 'content',
+                                                element.content, text))
+
+    def assert_accounting(self):
+        stack = self.stack
+        footprint = stack.footprint()
+        self.assertEqual(footprint['undo_entries'], len(stack.undo_stack))
+        self.assertEqual(footprint['redo_entries'], len(stack.redo_stack))
+        self.assertEqual(footprint['undo_bytes'], sum(c.footprint() for c in stack.undo_stack))
+        self.assertEqual(footprint['redo_bytes'], sum(c.footprint() for c in stack.redo_stack))
+        self.assertEqual(footprint['total_bytes'],
+                         footprint['undo_bytes'] + footprint['redo_bytes'])
+
+    def test_text_change_round_trip(self):
+        rng = random.Random(5)
+        for _ in range(300):
+            old = random_text(rng, rng.choice((0, 5, 60, 3000)))
+            start = rng.randint(0, len(old))
+            end = rng.randint(start, len(old))
+            new = old[:start] + random_text(rng, rng.choice((0, 1, 40, 2000))) + old[end:]
+            change = TextChange(old, new)
+            self.assertEqual(change.apply(old), new)
+            self.assertEqual(change.revert(new), old)
+            middle = len(new) - change.start - change.end
+            self.assertEqual(isinstance(change._new, bytes), middle > TextChange.COMPRESS_ABOVE)
+
+    def test_long_text_is_compressed(self):
+        old = 'kapı ' * 2000
+        change = TextChange(old, 'pencere ' * 2000)
+        self.assertIsInstance(change._old, bytes)
+        self.assertLess(change.footprint(), len(old) // 10)
+        self.assertEqual(change.revert('pencere ' * 2000), old)
+        # Uzun metinde tek harflik düzenleme sadece farkı tutar
+        self.assertLess(TextChange(old, old[:5000] + 'x' + old[5000:]).footprint(), 200)
+
+    def test_entry_budget(self):
+        self.stack.set_budget(max_entries=3)
+        element = self.elements[0]
+        for i in range(5):
+            self.edit(element, f'metin {i}')
+        self.assertEqual(len(self.stack.undo_stack), 3)
+        self.assertEqual(self.stack.evicted, 2)
+        while self.stack.can_undo():
+            self.stack.undo()
+        self.assertEqual(element.content, 'metin 1')
+        self.assert_accounting()
+        # Sınır küçülünce en uzak ileri alma adımları da atılır
+        self.stack.set_budget(max_entries=1)
+        self.assertEqual(len(self.stack.redo_stack), 1)
+        self.stack.redo()
+        self.assertEqual(element.content, 'metin 2')
+
+    def test_byte_budget_keeps_latest_step(self):
+        element = self.elements[0]
+        self.edit(element, 'kısa')
+        size = self.stack.footprint()['total_bytes']
+        self.stack.set_budget(max_bytes=size * 3)
+        for i in range(10):
+            self.edit(element, f'kısa {i}')
+            self.assertLessEqual(self.stack.footprint()['total_bytes'], size * 3)
+        self.assert_accounting()
+        # Tek başına sınırı aşan son adım yine de geri alınabilir
+        self.edit(element, random_text(random.Random(1), size * 4))
+        self.assertEqual(len(self.stack.undo_stack), 1)
+        self.stack.undo()
+        self.assertEqual(element.content, 'kısa 9')
+        self.assert_accounting()
+
+    def test_random_history_matches_reference(self):
+        rng = random.Random(11)
+        element = self.elements[0]
+        self.stack.set_budget(max_entries=8, max_bytes=6000)
+        undo_states, redo_states = [], []
+        for _ in range(2000):
+            action = rng.random()
+            if action < 0.5:
+                current = element.content
+                if rng.random() < 0.2:
+                    text = random_text(rng, rng.choice((500, 1500, 4000)))
+                else:
+                    position = rng.randint(0, len(current))
+                    text = current[:position] + random_text(rng, rng.randint(0, 3)) \
+                        + current[position + rng.randint(0, 3):]
+                undo_states.append(current)
+                redo_states.clear()
+                self.edit(element, text)
+                stack = self.stack
+                footprint = stack.footprint()
+                self.assertTrue(len(stack.undo_stack) == 1 or (
+                    footprint['undo_entries'] <= stack.max_entries
+                    and footprint['total_bytes'] <= stack.max_bytes))
+                # Atılanlar en eski adımlardır
+                del undo_states[:len(undo_states) - len(stack.undo_stack)]
+            elif action < 0.8 and self.stack.can_undo():
+                redo_states.append(element.content)
+                self.stack.undo()
+                self.assertEqual(element.content, undo_states.pop())
+            elif self.stack.can_redo():
+                undo_states.append(element.content)
+                self.stack.redo()
+                self.assertEqual(element.content, redo_states.pop())
+            self.assertEqual(len(self.stack.undo_stack), len(undo_states))
+            self.assertEqual(len(self.stack.redo_stack), len(redo_states))
+            self.assert_accounting()
+
+
+class MergeTest(CommandTestCase):
+    def setUp(self):
+        super().setUp()
+        self.now = 100.0
+        clock = mock.patch('core.commands.time.monotonic', side_effect=lambda: self.now)
+        clock.start()
+        self.addCleanup(clock.stop)
+
+    def update(self, element, name, value, after=0.1):
+        self.now += after
+        self.stack.execute(UpdateElementCommand(self.scene, element, name,
+                                                getattr(element, name), value))
+
+    def type_text(self, element, text, name='content', after=0.1):
+        for size in range(1, len(text) + 1):
+            self.update(element, name, text[:size], after)
+
+    def test_typing_within_window_is_one_step(self):
+        element = self.elements[0]
+        original = element.content
+        self.type_text(element, 'merhaba')
+        self.assertEqual(len(self.stack.undo_stack), 1)
+        self.stack.undo()
+        self.assertEqual(element.content, original)
+        self.stack.redo()
+        self.assertEqual(element.content, 'merhaba')
+
+    def test_pause_longer_than_window_starts_new_step(self):
+        element = self.elements[0]
+        self.type_text(element, 'ab')
+        self.update(element, 'content', 'abc', after=CommandStack.MERGE_WINDOW + 0.5)
+        self.update(element, 'content', 'abcd')
+        self.assertEqual(len(self.stack.undo_stack), 2)
+        self.stack.undo()
+        self.assertEqual(element.content, 'ab')
+
+    def test_only_same_element_and_field_merge(self):
+        first, second = self.elements[:2]
+        self.update(first, 'content', 'bir')
+        self.update(second, 'content', 'iki')
+        self.update(second, 'title', 'başlık')
+        self.update(second, 'title', 'başlık 2')
+        self.assertEqual(len(self.stack.undo_stack), 3)
+        # Metin olmayan özellikler birleşmez
+        self.update(first, 'color', '#ff0000')
+        self.update(first, 'color', '#00ff00')
+        self.assertEqual(len(self.stack.undo_stack), 5)
+        self.stack.undo()
+        self.assertEqual(first.color, '#ff0000')
+
+    def test_undo_breaks_merging(self):
+        element = self.elements[0]
+        self.type_text(element, 'abc')
+        self.stack.undo()
+        self.assertEqual(element.content, 'içerik 0')
+        # Geri almadan hemen sonraki düzenleme geri alınmış adıma katılmaz
+        self.update(element, 'content', 'x')
+        self.update(element, 'content', 'xy')
+        self.assertEqual(len(self.stack.undo_stack), 1)
+        self.assertFalse(self.stack.can_redo())
+
+        self.stack.undo()
+        self.stack.redo()
+        self.update(element, 'content', 'xyz')
+        self.assertEqual(len(self.stack.undo_stack), 2)
+        self.stack.undo()
+        self.assertEqual(element.content, 'xy')
+
+    def test_other_command_breaks_merging(self):
+        element = self.elements[0]
+        self.update(element, 'content', 'a')
+        self.now += 0.1
+        self.stack.execute(MoveElementCommand(self.scene, element, QPointF(0, 0), QPointF(10, 10)))
+        self.update(element, 'content', 'ab')
+        self.assertEqual(len(self.stack.undo_stack), 3)
+        self.stack.undo()
+        self.assertEqual(element.content, 'a')
+
+    def test_close_merge(self):
+        element = self.elements[0]
+        self.update(element, 'content', 'a')
+        self.stack.close_merge()
+        self.update(element, 'content', 'ab')
+        self.assertEqual(len(self.stack.undo_stack), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
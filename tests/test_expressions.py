@@ -0,0 +1,159 @@
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from src.core.board import Board
+from src.core.connection import Connection
+from src.core.element import Element
+from src.core.expressions import (ExpressionCompiler, ExpressionError, _tokenize,
+                              parse_condition, parse_effects, validate)
+from src.core.project import Project
+from src.core.runtime import RuntimeGraph
+from src.core.variable import Variable
+
+SLOTS = {'gold': 0, 'met': 1, 'name': 2, 'hp': 3}
+
+
+def values():
+    return [12, False, 'ayşe', 2.5]
+
+
+class TokenizerTest(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual(_tokenize('gold >= 10.5 && !met'),
+                         [('var', 'gold'), '>=', ('const', 10.5), 'and', 'not',
+                          ('var', 'met'), None])
+        self.assertEqual(_tokenize("true or 'a' == \"b\""),
+                         [('const', True), 'or', ('const', 'a'), '==', ('const', 'b'), None])
+        self.assertEqual(_tokenize('  '), [None])
+
+    def test_string_escapes(self):
+        self.assertEqual(_tokenize(r'"a\"b\tc"'), [('const', 'a"b\tc'), None])
+        self.assertEqual(_tokenize("'ı ş ğ'"), [('const', 'ı ş ğ'), None])
+
+    def test_bad_escape_is_expression_error(self):
+        for text in (r'"\x"', r"'\N{foo}'", r'name == "\x4"'):
+            with self.assertRaises(ExpressionError):
+                parse_condition(text)
+        with self.assertRaises(ExpressionError):
+            validate(effects=r'name = "\x"')
+        with self.assertRaises(ExpressionError):
+            Connection('a', 'b').set_condition(r'"\x"')
+
+    def test_unknown_characters(self):
+        for text in ('gold @ 1', '"open', 'gold $'):
+            with self.assertRaises(ExpressionError):
+                parse_condition(text)
+
+
+class ParserTest(unittest.TestCase):
+    def evaluate(self, text):
+        return ExpressionCompiler(SLOTS).condition(text)(values())
+
+    def test_precedence(self):
+        self.assertEqual(parse_condition('1 + 2 * 3').tree,
+                         ('bin', '+', ('const', 1), ('bin', '*', ('const', 2), ('const', 3))))
+        self.assertEqual(parse_condition('not a == b').tree,
+                         ('not', ('cmp', '==', ('var', 'a'), ('var', 'b'))))
+        self.assertEqual(parse_condition('a or b and c').tree,
+                         ('or', ('var', 'a'), ('and', ('var', 'b'), ('var', 'c'))))
+        self.assertEqual(parse_condition('-a * b').tree,
+                         ('bin', '*', ('neg', ('var', 'a')), ('var', 'b')))
+        self.assertEqual(parse_condition('a - b - c').tree,
+                         ('bin', '-', ('bin', '-', ('var', 'a'), ('var', 'b')), ('var', 'c')))
+
+    def test_evaluation(self):
+        cases = {
+            'gold >= 10 and not met': True,
+            'gold > 20 || met': False,
+            '!(gold == 12)': False,
+            'name == "ayşe"': True,
+            '-gold + 2 * 3 < 0': True,
+            'gold % 5 == 2': True,
+            '(gold - 2) / 4 == 2.5': True,
+            'hp * 2 >= 5.0': True,
+            'false or gold': 12,
+            'gold == hp': False,
+        }
+        for text, expected in cases.items():
+            with self.subTest(text=text):
+                result = self.evaluate(text)
+                self.assertEqual(result, expected)
+                self.assertIs(type(result), type(expected))
+
+    def test_rejected(self):
+        for text in ('1 < 2 < 3', 'a == b != c', 'foo(1)', 'a.b', 'x[1]', 'gold = 1',
+                     'gold >', '(gold', 'gold)', 'a == not b', ''):
+            with self.subTest(text=text), self.assertRaises(ExpressionError):
+                parse_condition(text)
+
+    def test_deep_nesting(self):
+        with self.assertRaises(ExpressionError):
+            parse_condition('(' * 5000 + '1' + ')' * 5000)
+
+    def test_variables(self):
+        self.assertEqual(parse_condition('gold >= 10 and not met').variables, {'gold', 'met'})
+        effects = parse_effects('gold -= 10; met = true;; hp *= gold')
+        self.assertEqual(effects.writes, {'gold', 'met', 'hp'})
+        self.assertEqual(effects.reads, {'gold', 'hp'})
+
+    def test_effects_rejected(self):
+        for text in ('gold', '1 = 2', 'gold == 1', 'gold = ', 'gold = 1 met = 2'):
+            with self.subTest(text=text), self.assertRaises(ExpressionError):
+                parse_effects(text)
+
+    def test_parse_cache(self):
+        self.assertIs(parse_condition('a < b'), parse_condition('a < b'))
+
+
+class CompilerTest(unittest.TestCase):
+    def test_undefined_variable(self):
+        compiler = ExpressionCompiler(SLOTS)
+        with self.assertRaises(ExpressionError) as raised:
+            compiler.condition('unknown > 1')
+        self.assertIn('unknown', str(raised.exception))
+        with self.assertRaises(ExpressionError):
+            compiler.effects('gold = missing')
+        with self.assertRaises(ExpressionError):
+            compiler.effects('missing += 1')
+
+    def test_effects(self):
+        compiler = ExpressionCompiler(SLOTS)
+        state = values()
+        compiler.effects('gold -= 10; met = true; hp *= gold')(state)
+        self.assertEqual(state, [2, True, 'ayşe', 5.0])
+        state = values()
+        compiler.effects('name = name + "!"')(state)
+        self.assertEqual(state[2], 'ayşe!')
+
+    def test_runtime_graph_reports_connection(self):
+        project = Project('t')
+        board = Board('b', True)
+        project.add_board(board)
+        for element_id in ('s', 'e'):
+            element = Element(element_id)
+            element.id = element_id
+            board.add_element(element)
+        connection = Connection('s', 'e')
+        connection.label = 'go'
+        # Dosyadan doğrulanmadan okunmuş gibi
+        connection.condition = r'name == "\x"'
+        board.add_connection(connection)
+        project.set_starting_element('s')
+        project.add_variable(Variable('name', ''))
+        with self.assertRaises(ExpressionError) as raised:
+            RuntimeGraph.from_project(project)
+        self.assertIn('(go)', str(raised.exception))
+        connection.condition = 'missing > 1'
+        with self.assertRaises(ExpressionError) as raised:
+            RuntimeGraph.from_project(project)
+        self.assertIn('missing', str(raised.exception))
+
+    def test_compiled_cache(self):
+        compiler = ExpressionCompiler(SLOTS)
+        self.assertIs(compiler.condition('gold > 1'), compiler.condition('gold > 1'))
+        self.assertIsNone(compiler.condition(''))
+        self.assertIsNone(compiler.effects('  '))
+
+
+if __name__ == '__main__':
+    unittest.main()
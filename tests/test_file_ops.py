@@ -0,0 +1,214 @@
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.board import Board
+from core.connection import Connection
+from core.element import Element
+from core.project import Project
+from core.variable import Variable
+from utils.file_ops import (JOURNAL_SUFFIX, PROGRESS_EVERY, LegacyBoardSource, LoadCancelled,
+                            ProjectFileHandler)
+from utils.sqlite_store import (SQLiteProjectStore, convert_json_to_sqlite,
+                                convert_sqlite_to_json)
+
+
+def build_project():
+    project = Project('kayıt')
+    root = Board('kök', True)
+    side = Board('yan')
+    project.add_board(root)
+    project.add_board(side)
+    previous = None
+    for i in range(20):
+        element = Element(f'e{i}', f'içerik {i}')
+        element.set_position(i * 250, 0)
+        root.add_element(element)
+        if previous is not None:
+            root.add_connection(Connection(previous.id, element.id))
+        previous = element
+    side.add_element(Element('yalnız', 'x'))
+    project.set_starting_element(next(iter(root.elements)))
+    project.add_variable(Variable('gold', 3))
+    return project
+
+
+def snapshot(project, timestamps=True):
+    """Karşılaştırma için projenin kalıcı içeriği (board'lar yüklenerek)"""
+    def record(item):
+        data = item.to_dict()
+        if not timestamps:
+            data.pop('created_at', None)
+            data.pop('modified_at', None)
+        return data
+
+    boards = {}
+    for board_id, board in project.boards.items():
+        board.ensure_loaded()
+        boards[board_id] = (board.name, board.root,
+                            {eid: record(e) for eid, e in board.elements.items()},
+                            {cid: record(c) for cid, c in board.connections.items()})
+    return (project.name, project.starting_element,
+            {name: v.to_dict() for name, v in project.variables.items()}, boards)
+
+
+class FileOpsTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'proje.ntp')
+
+    def load(self, path=None, lazy=True):
+        return ProjectFileHandler.load_project(path or self.path, lazy=lazy)
+
+    def test_journal_round_trip(self):
+        project = build_project()
+        ProjectFileHandler.save_project(project, self.path)
+        self.assertFalse(project.is_dirty)
+        self.assertFalse(os.path.exists(self.path + JOURNAL_SUFFIX))
+
+        project = self.load()
+        root = next(b for b in project.boards.values() if b.root)
+        side = next(b for b in project.boards.values() if not b.root)
+        first, second = list(root.elements)[:2]
+        root.ensure_loaded()
+        root.elements[first].title = 'değişti'
+        root.elements[first].touch()
+        root.remove_element(second)
+        added = Element('yeni', 'n')
+        root.add_element(added)
+        root.add_connection(Connection(first, added.id))
+        project.remove_board(side.id)
+        project.add_variable(Variable('met', False))
+        size = os.path.getsize(self.path)
+        ProjectFileHandler.save_project(project, self.path)
+        self.assertFalse(project.is_dirty)
+        # Ana dosyaya dokunulmadan günlüğe yazıldı
+        self.assertEqual(os.path.getsize(self.path), size)
+        self.assertTrue(os.path.getsize(self.path + JOURNAL_SUFFIX))
+        expected = snapshot(project)
+
+        reloaded = self.load()
+        self.assertEqual(snapshot(reloaded), expected)
+
+        # Yarım yazılmış son satır yok sayılır ve sonraki kayıtta üzerine yazılır
+        with open(self.path + JOURNAL_SUFFIX, 'ab') as f:
+            f.write(b'{"board": "yar')
+        reloaded = self.load()
+        self.assertEqual(snapshot(reloaded), expected)
+        reloaded.set_starting_element(added.id)
+        ProjectFileHandler.save_project(reloaded, self.path)
+        expected = snapshot(reloaded)
+        self.assertEqual(snapshot(self.load()), expected)
+
+        # Sıkıştırma günlüğü ana dosyaya katar
+        ProjectFileHandler.save_project(reloaded, self.path, compact=True)
+        self.assertFalse(os.path.exists(self.path + JOURNAL_SUFFIX))
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        self.assertEqual(snapshot(self.load()), expected)
+        self.assertEqual(snapshot(self.load(lazy=False)), expected)
+
+    def test_foreign_journal_ignored(self):
+        project = build_project()
+        ProjectFileHandler.save_project(project, self.path)
+        with open(self.path + JOURNAL_SUFFIX, 'wb') as f:
+            f.write(b'{"journal": "baska"}\n{"remove_board": "x"}\n')
+        self.assertEqual(snapshot(self.load()), snapshot(project))
+
+    def test_legacy_file(self):
+        project = build_project()
+        data = project.to_dict()
+        # Sürüm 1 bağlantıları liste olarak yazardı
+        for board_data in data['boards'].values():
+            board_data['connections'] = list(board_data['connections'].values())
+        with open(self.path, 'w', encoding='utf-8') as f:
+            json.dump({'project': data}, f)
+        # Sürüm 1 okuyucusu kayıt zamanlarını taşımaz
+        expected = snapshot(project, timestamps=False)
+
+        legacy = self.load()
+        self.assertEqual(snapshot(legacy, timestamps=False), expected)
+        # Eski dosyaya kayıt yeni biçimde baştan yazar
+        ProjectFileHandler.save_project(legacy, self.path)
+        self.assertIsNotNone(ProjectFileHandler.read_index(self.path))
+        self.assertEqual(snapshot(self.load(), timestamps=False), expected)
+
+    def test_cancelled_legacy_load_can_be_retried(self):
+        source_board = Board('eski', True)
+        for i in range(PROGRESS_EVERY * 2):
+            source_board.add_element(Element(f'e{i}'))
+        ids = list(source_board.elements)
+        for first, second in zip(ids, ids[1:]):
+            source_board.add_connection(Connection(first, second))
+        data = source_board.to_dict()
+        data['connections'] = list(data['connections'].values())
+
+        board = Board('eski', True)
+        board.set_lazy_source(LegacyBoardSource(data))
+        cancel = threading.Event()
+        cancel.set()
+        with self.assertRaises(LoadCancelled):
+            board.ensure_loaded(cancel=cancel)
+        self.assertFalse(board.is_loaded)
+        board.ensure_loaded()
+        self.assertEqual(set(board.elements), set(source_board.elements))
+        self.assertEqual(set(board.connections), set(source_board.connections))
+
+    def test_sqlite_conversion(self):
+        project = build_project()
+        ProjectFileHandler.save_project(project, self.path)
+        expected = snapshot(project)
+        sqlite_path = os.path.join(self.directory.name, 'proje.db')
+        json_path = os.path.join(self.directory.name, 'geri.ntp')
+
+        convert_json_to_sqlite(self.path, sqlite_path)
+        store = SQLiteProjectStore(sqlite_path)
+        try:
+            self.assertEqual(snapshot(store.load_project(lazy=False)), expected)
+        finally:
+            store.close()
+
+        convert_sqlite_to_json(sqlite_path, json_path)
+        self.assertEqual(snapshot(self.load(json_path)), expected)
+
+    def test_sqlite_incremental_save(self):
+        project = build_project()
+        ProjectFileHandler.save_project(project, self.path, backend='sqlite')
+        self.addCleanup(lambda: project.save_state.close())
+        self.assertFalse(project.is_dirty)
+        board = next(b for b in project.boards.values() if b.root)
+        element_id = next(iter(board.elements))
+        board.elements[element_id].content = 'güncel'
+        board.elements[element_id].touch()
+        project.remove_variable('gold')
+        ProjectFileHandler.save_project(project, self.path)
+        self.assertFalse(project.is_dirty)
+        expected = snapshot(project)
+
+        reloaded = self.load()
+        self.addCleanup(lambda: reloaded.save_state.close())
+        self.assertEqual(snapshot(reloaded), expected)
+
+    def test_sqlite_compact_closes_previous_store(self):
+        project = build_project()
+        ProjectFileHandler.save_project(project, self.path, backend='sqlite')
+        previous = project.save_state
+        ProjectFileHandler.save_project(project, self.path, compact=True)
+        self.addCleanup(lambda: project.save_state.close())
+        self.assertIsNot(project.save_state, previous)
+        with self.assertRaises(sqlite3.ProgrammingError):
+            previous.db.execute('SELECT 1')
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        expected = snapshot(project)
+
+        reloaded = self.load()
+        self.addCleanup(lambda: reloaded.save_state.close())
+        self.assertEqual(snapshot(reloaded), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
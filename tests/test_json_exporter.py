@@ -0,0 +1,233 @@
+import os
+import pathlib
+import struct
+import tempfile
+import threading
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.board import Board
+from core.connection import Connection
+from core.element import Element
+from core.project import Project
+from core.variable import Variable
+from utils.file_ops import ProjectFileHandler
+from utils.json_exporter import (BUNDLE_MAGIC, FLAG_CONTENT, FLAG_IDS, HEADER_V1,
+                                 ExportCancelled, RuntimeBundle, RuntimeExporter)
+
+LONG_CONTENT = 'Uzun ortak içerik, özetiyle tekilleştirilir. ' * 5
+
+
+def build_project():
+    project = Project('paket')
+    boards = [Board('kök', True), Board('yan'), Board('boş')]
+    for board in boards:
+        project.add_board(board)
+    root, side, _ = boards
+    elements = []
+    for i in range(12):
+        board = root if i < 8 else side
+        element = Element(f'e{i}', LONG_CONTENT if i % 3 == 0 else f'kısa {i % 2}')
+        board.add_element(element)
+        elements.append(element)
+    # Bağlantılar kaynağa göre sırasız eklenir; CSR aynı kaynağın sırasını korumalı
+    pairs = [(3, 1), (0, 2), (3, 0), (0, 1), (7, 3), (0, 7), (2, 2), (5, 6), (3, 5)]
+    for number, (source, target) in enumerate(pairs):
+        connection = Connection(elements[source].id, elements[target].id)
+        connection.set_label(f'seçim {number % 3}')
+        if number % 2:
+            connection.set_condition('gold >= 2')
+            connection.set_effects('gold -= 1; met = true')
+        root.add_connection(connection)
+    for source, target in ((8, 9), (9, 8), (11, 0)):
+        connection = Connection(elements[source].id, elements[target].id)
+        connection.set_label('geçiş')
+        side.add_connection(connection)
+    project.set_starting_element(elements[0].id)
+    project.add_variable(Variable('gold', 3))
+    project.add_variable(Variable('met', False))
+    project.add_variable(Variable('ad', 'Ayşe'))
+    return project
+
+
+def expected_view(project, include_ids=True, include_content=True):
+    """Projeden beklenen paket içeriği (bkz. bundle_view)"""
+    boards, elements, edges = [], [], {}
+    board_of = {}
+    for board in project.boards.values():
+        board.ensure_loaded()
+        boards.append((board.name, len(board.elements)))
+        for element in board.elements.values():
+            board_of[element.id] = board.name
+            elements.append((element.id if include_ids else None, element.title,
+                             element.content if include_content else None, board.name))
+    for board in project.boards.values():
+        for connection in board.connections.values():
+            edges.setdefault(connection.source_id, []).append(
+                (connection.target_id, connection.label, connection.condition,
+                 connection.effects))
+    edges = [edges.get(element.id, []) for board in project.boards.values()
+             for element in board.elements.values()]
+    variables = [(v.name, v.default) for v in project.variables.values()]
+    return boards, elements, edges, variables
+
+
+def bundle_view(bundle, ids):
+    """Paketi karşılaştırılabilir biçimde çöz; ids indeks -> element ID eşlemesi"""
+    boards = [(bundle.board_name(b), len(bundle.board_elements(b)))
+              for b in range(bundle.board_count)]
+    elements = [(bundle.element_id(i), bundle.title(i), bundle.content(i),
+                 bundle.board_name(bundle.board_of(i))) for i in range(len(bundle))]
+    edges = []
+    for i in range(len(bundle)):
+        edges.append([(ids[bundle.edge_target(edge)], bundle.edge_label(edge),
+                       bundle.edge_condition(edge), bundle.edge_effects(edge))
+                      for edge in bundle.edges(i)])
+        # successors ve choices aynı kenarları verir
+        targets = [bundle.edge_target(edge) for edge in bundle.edges(i)]
+        assert list(bundle.successors(i)) == targets
+        assert [target for target, _ in bundle.choices(i)] == targets
+    return boards, elements, edges, bundle.variables()
+
+
+def element_ids(project):
+    return [element_id for board in project.boards.values() for element_id in board.elements]
+
+
+def v1_bundle() -> bytes:
+    """Sürüm 1 düzeninde iki elementli, tek kenarlı paket"""
+    strings = ['', 'kök', 'a', 'b', 'A', 'B', 'git']
+    data = [s.encode('utf-8') for s in strings]
+    boards = struct.pack('<3I', 1, 0, 2)
+    elements = struct.pack('<8I', 2, 4, 0, 0, 3, 5, 0, 0)
+    offsets = struct.pack('<3I', 0, 1, 1)
+    edges = struct.pack('<2I', 1, 6)
+    string_offsets = [0]
+    for item in data:
+        string_offsets.append(string_offsets[-1] + len(item))
+    boards_offset = HEADER_V1.size
+    elements_offset = boards_offset + len(boards)
+    offsets_offset = elements_offset + len(elements)
+    edges_offset = offsets_offset + len(offsets)
+    strings_offset = edges_offset + len(edges)
+    header = HEADER_V1.pack(BUNDLE_MAGIC, 1, FLAG_IDS | FLAG_CONTENT, 1, 2, 1, len(strings), 0,
+                            boards_offset, elements_offset, offsets_offset, edges_offset,
+                            strings_offset)
+    return (header + boards + elements + offsets + edges
+            + struct.pack(f'<{len(string_offsets)}Q', *string_offsets) + b''.join(data))
+
+
+class RuntimeBundleTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.path = os.path.join(self.directory.name, 'oyun.ntb')
+        self.project = build_project()
+
+    def export(self, project=None, path=None, **flags):
+        RuntimeExporter(project or self.project, **flags).export(path or self.path)
+        return RuntimeBundle.load(path or self.path)
+
+    def test_round_trip(self):
+        bundle = self.export()
+        self.assertEqual(bundle.version, 2)
+        self.assertEqual(bundle.flags, FLAG_IDS | FLAG_CONTENT)
+        ids = element_ids(self.project)
+        self.assertEqual(bundle_view(bundle, ids), expected_view(self.project))
+        self.assertEqual(bundle.element_id(bundle.start), self.project.starting_element)
+        for index, element_id in enumerate(ids):
+            self.assertEqual(bundle.index_of(element_id), index)
+        self.assertIsNone(bundle.index_of('yok'))
+        self.assertEqual(list(bundle.board_elements(2)), [])
+
+    def test_strings_are_deduplicated(self):
+        bundle = self.export()
+        strings = {''}
+        for board in self.project.boards.values():
+            strings.add(board.name)
+            for element in board.elements.values():
+                strings.update((element.id, element.title, element.content))
+            for connection in board.connections.values():
+                strings.update((connection.label, connection.condition, connection.effects))
+        strings.update(('gold', '3', 'met', 'false', 'ad', '"Ayşe"'))
+        table = [bundle.string(i) for i in range(len(bundle._string_offsets) - 1)]
+        self.assertEqual(len(table), len(set(table)))
+        self.assertEqual(set(table), strings)
+
+    def test_flags(self):
+        ids = element_ids(self.project)
+        for include_ids in (True, False):
+            for include_content in (True, False):
+                with self.subTest(include_ids=include_ids, include_content=include_content):
+                    bundle = self.export(include_ids=include_ids,
+                                         include_content=include_content)
+                    self.assertEqual(bool(bundle.flags & FLAG_IDS), include_ids)
+                    self.assertEqual(bool(bundle.flags & FLAG_CONTENT), include_content)
+                    self.assertEqual(bundle_view(bundle, ids),
+                                     expected_view(self.project, include_ids, include_content))
+                    if not include_ids:
+                        self.assertIsNone(bundle.index_of(ids[0]))
+
+    def test_version_1_bundle(self):
+        bundle = RuntimeBundle(v1_bundle())
+        self.assertEqual(bundle.version, 1)
+        self.assertEqual(bundle.start, 0)
+        self.assertEqual([bundle.title(i) for i in range(len(bundle))], ['A', 'B'])
+        self.assertEqual(bundle.choices(0), [(1, 'git')])
+        self.assertEqual(list(bundle.successors(0)), [1])
+        self.assertEqual(bundle.choices(1), [])
+        self.assertEqual((bundle.edge_condition(0), bundle.edge_effects(0)), ('', ''))
+        self.assertEqual(bundle.variables(), [])
+        self.assertEqual(bundle.index_of('b'), 1)
+
+    def test_invalid_bundle(self):
+        with self.assertRaises(ValueError):
+            RuntimeBundle(b'NTRB')
+        with self.assertRaises(ValueError):
+            RuntimeBundle(b'XXXX' + v1_bundle()[4:])
+
+    def test_cancel_removes_temporary_file(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'eski')
+        cancel = threading.Event()
+        calls = []
+
+        def progress(done, total):
+            calls.append(done)
+            if done == total // 2 + 1:
+                cancel.set()  # İkinci geçişin ortasında iptal
+
+        with self.assertRaises(ExportCancelled):
+            RuntimeExporter(self.project).export(self.path, progress, cancel)
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read(), b'eski')
+        self.assertEqual(calls, list(range(1, len(self.project.boards) + 2)))
+
+    def test_path_object(self):
+        path = pathlib.Path(self.directory.name) / 'yol.ntb'
+        bundle = self.export(path=path)
+        self.assertEqual(len(bundle), 12)
+        self.assertFalse(os.path.exists(os.fspath(path) + '.tmp'))
+
+    def test_lazy_boards_are_not_loaded(self):
+        expected = expected_view(self.project)
+        json_path = os.path.join(self.directory.name, 'proje.ntp')
+        sqlite_path = os.path.join(self.directory.name, 'proje.db')
+        ProjectFileHandler.save_project(self.project, json_path)
+        ProjectFileHandler.save_project(self.project, sqlite_path, backend='sqlite')
+        self.addCleanup(lambda: self.project.save_state.close())
+        for path in (json_path, sqlite_path):
+            with self.subTest(path=os.path.basename(path)):
+                lazy = ProjectFileHandler.load_project(path)
+                if lazy.save_state is not None and hasattr(lazy.save_state, 'close'):
+                    self.addCleanup(lazy.save_state.close)
+                unloaded = [board for board in lazy.boards.values() if not board.is_loaded]
+                self.assertTrue(unloaded)
+                bundle = self.export(lazy)
+                self.assertTrue(all(not board.is_loaded for board in unloaded))
+                self.assertEqual(bundle_view(bundle, element_ids(lazy)), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
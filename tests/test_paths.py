@@ -0,0 +1,157 @@
+import random
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.analysis import GraphAnalysis
+from core.paths import PathStatistics
+
+
+class _Project:
+    def __init__(self):
+        self.boards = {}
+        self.starting_element = None
+
+
+class PathStatisticsTest(unittest.TestCase):
+    """Yoğunlaştırılmış grafın bütün yolları tek tek dolaşılarak karşılaştırılır"""
+
+    def setUp(self):
+        self.project = _Project()
+        self.graph = GraphAnalysis(self.project)
+        self.paths = PathStatistics(self.graph)
+
+    def check(self):
+        graph, paths = self.graph, self.paths
+        paths.summary()
+        start = graph.start
+        if start is None or start not in graph:
+            self.assertEqual(paths.path_count(), 0)
+            self.assertEqual(paths.endings(), [])
+            return
+        succ = {comp: set(graph.component_successors(comp))
+                for comp in {graph.component_of(node) for node in graph._succ}}
+        first = graph.component_of(start)
+        counts, shortest, longest = {}, {}, {}
+
+        def walk(comp, depth):
+            counts[comp] = counts.get(comp, 0) + 1
+            shortest[comp] = min(shortest.get(comp, depth), depth)
+            longest[comp] = max(longest.get(comp, depth), depth)
+            for following in succ[comp]:
+                walk(following, depth + 1)
+        walk(first, 0)
+
+        def reached_avoiding(avoid):
+            seen = {first} if first != avoid else set()
+            stack = list(seen)
+            while stack:
+                for comp in succ[stack.pop()]:
+                    if comp != avoid and comp not in seen:
+                        seen.add(comp)
+                        stack.append(comp)
+            return seen
+
+        def as_elements(comps):
+            # Döngü bileşenleri baskın listesinde yer almaz
+            return {start if comp == first else next(iter(graph.component_members(comp)))
+                    for comp in comps
+                    if comp == first or len(graph.component_members(comp)) == 1}
+
+        for node in graph._succ:
+            comp = graph.component_of(node)
+            self.assertEqual(paths.path_count(node), counts.get(comp, 0))
+            self.assertEqual(paths.shortest_depth(node), shortest.get(comp))
+            self.assertEqual(paths.longest_depth(node), longest.get(comp))
+            if comp not in counts:
+                self.assertEqual(paths.dominators(node), [])
+                continue
+            expected = as_elements(d for d in counts if d != comp
+                                   and (d == first or comp not in reached_avoiding(d)))
+            found = paths.dominators(node)
+            self.assertEqual(set(found), expected)
+            if found:
+                self.assertEqual(found[0], start)
+
+        endings = [node for node in graph._succ
+                   if graph.component_of(node) in counts and not graph._succ[node]]
+        self.assertEqual(set(paths.endings()), set(endings))
+        self.assertEqual(paths.path_count(),
+                         sum(counts[graph.component_of(node)] for node in endings))
+        if endings:
+            ends = {graph.component_of(node) for node in endings}
+            expected = as_elements(d for d in counts if all(
+                end == d or end not in reached_avoiding(d) for end in ends))
+            self.assertEqual(set(paths.common_dominators()), expected)
+
+        # Somut yollar: element tekrarsız bütün yollar
+        def simple_paths(target):
+            found = []
+
+            def extend(path):
+                node = path[-1]
+                if node == target or (target is None and not graph._succ[node]):
+                    found.append(list(path))
+                    return
+                for following in graph._succ[node]:
+                    if following not in path:
+                        path.append(following)
+                        extend(path)
+                        path.pop()
+            extend([start])
+            return sorted(found)
+
+        expected = simple_paths(None)
+        self.assertEqual(sorted(paths.iter_paths()), expected)
+        self.assertEqual(len(list(paths.iter_paths(limit=2))), min(2, len(expected)))
+        self.assertEqual(sorted(paths.iter_paths(max_length=2)),
+                         [path for path in expected if len(path) <= 3])
+        target = sorted(graph._succ)[len(graph._succ) // 2]
+        self.assertEqual(sorted(paths.iter_paths(target=target)), simple_paths(target))
+
+    def test_random_graphs(self):
+        for seed in range(200):
+            rng = random.Random(seed)
+            self.setUp()
+            nodes = [f'n{i}' for i in range(rng.randint(2, 9))]
+            for node in nodes:
+                self.graph.add_node(node)
+            self.project.starting_element = nodes[0]
+            for serial in range(25):
+                if rng.random() < 0.7:
+                    self.graph.add_edge(f'c{serial}', rng.choice(nodes), rng.choice(nodes))
+                elif self.graph._edges:
+                    self.graph.remove_edge(rng.choice(list(self.graph._edges)))
+                self.check()
+
+    def test_no_start(self):
+        self.graph.add_edge('c', 'a', 'b')
+        self.check()
+        self.project.starting_element = 'yok'
+        self.check()
+
+    def test_exponential_path_count(self):
+        previous = 's'
+        self.graph.add_node('s')
+        depth = 70
+        for i in range(depth):
+            for serial, (u, v) in enumerate(((previous, f'a{i}'), (previous, f'b{i}'),
+                                             (f'a{i}', f'm{i}'), (f'b{i}', f'm{i}'))):
+                self.graph.add_edge(f'e{i}.{serial}', u, v)
+            previous = f'm{i}'
+        self.project.starting_element = 's'
+        self.assertEqual(self.paths.path_count(), 2 ** depth)
+        self.assertEqual(self.paths.shortest_depth(previous), 2 * depth)
+        self.assertEqual(self.paths.longest_depth(previous), 2 * depth)
+        self.assertEqual(self.paths.common_dominators(),
+                         ['s'] + [f'm{i}' for i in range(depth)])
+        self.assertEqual(len(list(self.paths.iter_paths(limit=1000))), 1000)
+        # Düzenleme önbelleği geçersiz kılar
+        self.graph.add_edge('kısa', 's', previous)
+        self.assertFalse(self.paths.is_current)
+        self.assertEqual(self.paths.path_count(), 2 ** depth + 1)
+        self.graph.remove_edge('kısa')
+        self.assertEqual(self.paths.path_count(), 2 ** depth)
+
+
+if __name__ == '__main__':
+    unittest.main()
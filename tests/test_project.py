@@ -0,0 +1,44 @@
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.board import Board
+from core.element import Element
+from core.project import Project
+from core.variable import Variable
+
+
+class ProjectDirtyTest(unittest.TestCase):
+    def setUp(self):
+        self.project = Project('p')
+        self.board = Board('b', True)
+        self.project.add_board(self.board)
+        self.project.clear_dirty()
+
+    def assertMarks(self, change):
+        self.assertFalse(self.project.is_dirty)
+        change()
+        self.assertTrue(self.project.is_dirty)
+        self.project.clear_dirty()
+
+    def test_project_level_changes(self):
+        self.assertMarks(lambda: self.project.set_starting_element('x'))
+        self.assertMarks(lambda: self.project.add_variable(Variable('gold')))
+        self.assertMarks(lambda: self.project.remove_variable('gold'))
+        self.assertMarks(lambda: self.project.add_board(Board('yan')))
+        self.assertMarks(lambda: self.project.remove_board(self.board.id))
+        self.assertMarks(self.project.mark_dirty)
+
+    def test_missing_names_do_not_mark(self):
+        self.project.remove_variable('yok')
+        self.project.remove_board('yok')
+        self.assertFalse(self.project.is_dirty)
+
+    def test_board_changes(self):
+        self.board.add_element(Element('t'))
+        self.assertTrue(self.project.is_dirty)
+        self.board.clear_dirty()
+        self.assertFalse(self.project.is_dirty)
+
+
+if __name__ == '__main__':
+    unittest.main()
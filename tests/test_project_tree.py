@@ -0,0 +1,165 @@
+import unittest
+
+import tests
+from PyQt6.QtTest import QAbstractItemModelTester
+
+from core.board import Board
+from core.element import Element
+from core.project import Project
+from gui.panels.project_tree import ProjectTreeModel
+
+BATCH = ProjectTreeModel.FETCH_BATCH
+ELEMENTS = ProjectTreeModel.ELEMENTS
+BOARDS = ProjectTreeModel.BOARDS
+
+
+class ProjectTreeModelTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = tests.application()
+
+    def setUp(self):
+        self.project = Project('p')
+        self.board = Board('kök', True)
+        self.project.add_board(self.board)
+        self.project.add_board(Board('yan'))
+        for i in range(BATCH * 2 + 50):
+            self.board.add_element(Element(f'e{i}'))
+        self.model = ProjectTreeModel()
+        self.model.set_boards(self.project)
+        self.model.set_elements(self.board)
+        self.parent = self.model.category_index(ELEMENTS)
+        self.model.fetchMore(self.parent)
+        self.assertEqual(self.model.rowCount(self.parent), BATCH)
+
+        self.signals = []
+        self.model.dataChanged.connect(
+            lambda first, last, roles=(): self.signals.append(
+                ('changed', self.model.category_of(first), first.row(), last.row())))
+        self.model.rowsRemoved.connect(
+            lambda parent, first, last: self.signals.append(('removed', first, last)))
+        self.model.rowsInserted.connect(
+            lambda parent, first, last: self.signals.append(('inserted', first, last)))
+
+    def element_at(self, row):
+        return self.board.elements[self.model.item_id(self.model.index(row, 0, self.parent))]
+
+    def remove(self, *rows):
+        ids = [self.model._ids[ELEMENTS][row] for row in rows]
+        for element_id in ids:
+            self.board.remove_element(element_id)
+        self.model.elements_changed(self.board, ids)
+
+    def assert_consistent(self):
+        """Bütün satırlar açılınca model board'daki sırayı gösterir"""
+        while self.model.canFetchMore(self.parent):
+            self.model.fetchMore(self.parent)
+        shown = [self.model.item_id(self.model.index(row, 0, self.parent))
+                 for row in range(self.model.rowCount(self.parent))]
+        self.assertEqual(shown, list(self.board.elements))
+        for row, element_id in enumerate(shown):
+            self.assertEqual(self.model.row_of(ELEMENTS, element_id).row(), row)
+
+    def test_rename_touches_one_row(self):
+        element = self.element_at(10)
+        element.title = 'yeni ad'
+        self.model.elements_changed(self.board, [element.id])
+        self.assertEqual(self.signals, [('changed', ELEMENTS, 10, 10)])
+        self.assertEqual(self.model.data(self.model.index(10, 0, self.parent)), 'yeni ad')
+
+        # Henüz görünmeyen satır için sinyal yok
+        self.signals.clear()
+        hidden = self.board.elements[self.model._ids[ELEMENTS][BATCH + 10]]
+        hidden.title = 'gizli'
+        self.model.elements_changed(self.board, [hidden.id])
+        self.assertEqual(self.signals, [])
+        self.assert_consistent()
+
+    def test_board_rename(self):
+        boards = self.model.category_index(BOARDS)
+        self.model.fetchMore(boards)
+        self.assertEqual(self.model.rowCount(boards), 2)
+        self.signals.clear()
+        board = self.project.boards[self.model._ids[BOARDS][1]]
+        board.name = 'yeni'
+        self.model.boards_changed([board.id])
+        self.assertEqual(self.signals, [('changed', BOARDS, 1, 1)])
+
+    def test_delete_rows(self):
+        self.remove(20)
+        self.assertEqual(self.signals, [('removed', 20, 20)])
+        # Ardışık satırlar tek aralıkta
+        self.signals.clear()
+        self.remove(30, 31, 32, 33, 34)
+        self.assertEqual(self.signals, [('removed', 30, 34)])
+        # Görünmeyen satırın silinmesi görünüme bildirilmez
+        self.signals.clear()
+        self.remove(BATCH + 100)
+        self.assertEqual(self.signals, [])
+        self.assertEqual(self.model.rowCount(self.parent), BATCH - 6)
+        self.assert_consistent()
+
+    def test_delete_across_fetched_boundary(self):
+        fetched = self.model.rowCount(self.parent)
+        self.remove(*range(fetched - 2, fetched + 3))
+        self.assertEqual(self.signals, [('removed', fetched - 2, fetched - 1)])
+        self.assertEqual(self.model.rowCount(self.parent), fetched - 2)
+        self.assert_consistent()
+
+    def test_many_scattered_deletes_reset_category(self):
+        rows = list(range(0, 2 * (ProjectTreeModel.RESET_ABOVE + 10), 2))
+        self.remove(*rows)
+        self.assertGreaterEqual(self.model.rowCount(self.parent), BATCH - len(rows))
+        self.assert_consistent()
+
+    def test_add_rows(self):
+        # Bütün satırlar görünmüyorken eklenen satır sona sessizce eklenir
+        element = Element('yeni')
+        self.board.add_element(element)
+        self.model.elements_changed(self.board, [element.id])
+        self.assertEqual(self.signals, [])
+        self.assert_consistent()
+
+        # Hepsi görünürken eklenenler model sırasıyla tek aralıkta görünür
+        self.signals.clear()
+        count = self.model.rowCount(self.parent)
+        added = [Element('a'), Element('b'), Element('c')]
+        for element in added:
+            self.board.add_element(element)
+        self.model.elements_changed(self.board, [added[2].id, added[0].id, added[1].id])
+        self.assertEqual(self.signals, [('inserted', count, count + 2)])
+        self.assert_consistent()
+
+    def test_fetch_beyond_batch(self):
+        self.model.fetchMore(self.parent)
+        self.model.fetchMore(self.parent)
+        self.assertEqual(self.signals, [('inserted', BATCH, 2 * BATCH - 1),
+                                        ('inserted', 2 * BATCH, 2 * BATCH + 49)])
+        self.assertFalse(self.model.canFetchMore(self.parent))
+        self.signals.clear()
+        self.remove(2 * BATCH + 10)
+        self.assertEqual(self.signals, [('removed', 2 * BATCH + 10, 2 * BATCH + 10)])
+        self.assert_consistent()
+
+    def test_model_tester(self):
+        """Qt'nin model denetleyicisi her sinyalde tutarlılığı denetler
+
+        Denetleyici sinyallerin içinden fetchMore çağırır; satır sayısı
+        sinyaller sürerken değişmemeli.
+        """
+        self.tester = QAbstractItemModelTester(
+            self.model, QAbstractItemModelTester.FailureReportingMode.Fatal)
+        self.model.fetchMore(self.parent)
+        self.assertLessEqual(self.model.rowCount(self.parent), len(self.board.elements))
+        self.element_at(5).title = 'yeni ad'
+        self.model.elements_changed(self.board, [self.element_at(5).id])
+        self.remove(3, 4, BATCH + 1)
+        element = Element('yeni')
+        self.board.add_element(element)
+        self.model.elements_changed(self.board, [element.id])
+        self.remove(*range(0, 2 * (ProjectTreeModel.RESET_ABOVE + 10), 2))
+        self.assert_consistent()
+
+
+if __name__ == '__main__':
+    unittest.main()
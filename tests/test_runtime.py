@@ -0,0 +1,190 @@
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from src.core.board import Board
+from src.core.connection import Connection
+from src.core.element import Element
+from src.core.expressions import ExpressionError
+from src.core.project import Project
+from src.core.runtime import Playthrough, RuntimeGraph, Simulator
+from src.core.variable import Variable
+
+
+def build_project():
+    """Başlangıçtan iki sona, bir döngüye ve koşul yüzünden takılan bir elemente giden hikaye
+
+        başla -sol-> orman -bitir-> son 1
+        başla -sağ [gold >= 5]-> kale -son-> son 2
+        başla -kapı {gold += 1}-> avlu -geri-> başla
+        başla -x-> kuyu -çık [gold > 100]-> son 1
+    """
+    project = Project('hikaye')
+    board = Board('kök', True)
+    project.add_board(board)
+    elements = {}
+    for title in ('başla', 'orman', 'kale', 'avlu', 'kuyu', 'son 1', 'son 2'):
+        elements[title] = Element(title)
+        board.add_element(elements[title])
+
+    def connect(source, target, label, condition='', effects=''):
+        connection = Connection(elements[source].id, elements[target].id)
+        connection.set_label(label)
+        connection.set_condition(condition)
+        connection.set_effects(effects)
+        board.add_connection(connection)
+        return connection
+
+    connect('başla', 'orman', 'sol')
+    connect('başla', 'kale', 'sağ', condition='gold >= 5')
+    connect('başla', 'avlu', 'kapı', effects='gold += 1')
+    connect('başla', 'kuyu', 'x')
+    connect('orman', 'son 1', 'bitir')
+    connect('kale', 'son 2', 'son')
+    connect('avlu', 'başla', 'geri')
+    connect('kuyu', 'son 1', 'çık', condition='gold > 100')
+    project.set_starting_element(elements['başla'].id)
+    project.add_variable(Variable('gold', 3))
+    project.add_variable(Variable('zero', 0))
+    return project, board, elements
+
+
+class RuntimeTestCase(unittest.TestCase):
+    def setUp(self):
+        self.project, self.board, self.elements = build_project()
+
+    def graph(self):
+        return RuntimeGraph.from_project(self.project)
+
+    def ids(self, *titles):
+        return [self.elements[title].id for title in titles]
+
+
+class PlaythroughTest(RuntimeTestCase):
+    def test_conditions_and_effects(self):
+        play = Playthrough(self.graph())
+        self.assertEqual(play.choice_labels(), ['sol', 'kapı', 'x'])
+        for _ in range(2):
+            play.choose_label('kapı')
+            play.choose_label('geri')
+        self.assertEqual(play.state['gold'], 5)
+        self.assertEqual(play.choice_labels(), ['sol', 'sağ', 'kapı', 'x'])
+        play.choose_label('sağ')
+        play.choose_label('son')
+        self.assertTrue(play.finished)
+        self.assertFalse(play.blocked)
+        self.assertEqual(play.element_id, self.elements['son 2'].id)
+        self.assertEqual(play.steps, 6)
+
+    def test_blocked(self):
+        play = Playthrough(self.graph())
+        play.choose_label('x')
+        self.assertTrue(play.finished)
+        self.assertTrue(play.blocked)
+
+    def test_invalid_choices(self):
+        graph = self.graph()
+        play = Playthrough(graph)
+        hidden = next(c for c in graph.choices(graph.start) if graph.labels[c] == 'sağ')
+        with self.assertRaises(ValueError):
+            play.choose(hidden)
+        with self.assertRaises(ValueError):
+            play.choose_label('sağ')
+        self.assertEqual(play.steps, 0)
+
+    def test_no_start(self):
+        self.project.starting_element = None
+        with self.assertRaises(ValueError):
+            Simulator(self.graph())
+
+
+class ErrorReportTest(RuntimeTestCase):
+    def test_condition_error_names_choice(self):
+        connection = next(c for c in self.board.connections.values() if c.label == 'sol')
+        connection.set_condition('gold / zero > 1')
+        play = Playthrough(self.graph())
+        with self.assertRaises(ExpressionError) as raised:
+            play.choices()
+        self.assertIn('başla -> orman (sol)', str(raised.exception))
+        with self.assertRaises(ExpressionError) as raised:
+            Simulator(self.graph()).run(5, seed=1, workers=1)
+        self.assertIn('başla -> orman (sol)', str(raised.exception))
+
+    def test_effect_error_names_choice(self):
+        connection = next(c for c in self.board.connections.values() if c.label == 'bitir')
+        connection.set_effects('gold = gold / zero')
+        play = Playthrough(self.graph())
+        play.choose_label('sol')
+        with self.assertRaises(ExpressionError) as raised:
+            play.choose_label('bitir')
+        self.assertIn('orman -> son 1 (bitir)', str(raised.exception))
+        with self.assertRaises(ExpressionError) as raised:
+            Simulator(self.graph()).run_scripts([['sol', 'bitir']], workers=1)
+        self.assertIn('orman -> son 1 (bitir)', str(raised.exception))
+
+
+class SimulatorTest(RuntimeTestCase):
+    def test_scripts_with_indices_and_labels(self):
+        simulator = Simulator(self.graph())
+        report = simulator.run_scripts([
+            ['sol', 'bitir'],  # son 1
+            [1, 0, 'kapı', 0, 'sağ', 0],  # döngüden sonra son 2 (sıralar koşullara göre)
+            ['sol'],  # senaryo erken biter
+            [2],  # kuyu: koşul sağlanmıyor
+        ], workers=1)
+        self.assertEqual((report.runs, report.completed, report.stopped, report.blocked,
+                          report.truncated), (4, 2, 1, 1, 0))
+        self.assertEqual(report.endings_reached(), dict(zip(self.ids('son 1', 'son 2'), (1, 1))))
+        self.assertEqual(report.blocked_at(), {self.elements['kuyu'].id: 1})
+        self.assertEqual(report.total_steps, 2 + 6 + 1 + 1)
+        self.assertEqual(report.longest, 6)
+        self.assertEqual(report.visit_counts()[self.elements['başla'].id], 6)
+        self.assertEqual(report.unvisited(), [])
+
+        with self.assertRaises(ValueError):
+            simulator.run_scripts([['sağ']], workers=1)
+        with self.assertRaises(ValueError):
+            simulator.run_scripts([[3]], workers=1)
+
+    def test_truncated(self):
+        simulator = Simulator(self.graph(), max_steps=3)
+        report = simulator.run_scripts([['kapı', 'geri', 'kapı', 'geri']], workers=1)
+        self.assertEqual((report.runs, report.truncated, report.stopped), (1, 1, 0))
+        self.assertEqual(report.total_steps, 3)
+
+        # Rastgele oynanışlar döngüde kalırsa max_steps'te kesilir
+        report = simulator.run(300, seed=3, workers=1)
+        self.assertGreater(report.truncated, 0)
+        self.assertLessEqual(report.longest, 3)
+        self.assertEqual(report.runs, report.completed + report.truncated
+                         + report.stopped + report.blocked)
+        self.assertEqual(report.stopped, 0)
+
+    def test_seeded_runs_are_deterministic(self):
+        simulator = Simulator(self.graph())
+        reports = [simulator.run(600, seed=42, workers=workers) for workers in (1, 1, 3)]
+        for report in reports[1:]:
+            self.assertEqual(report.seed, 42)
+            self.assertEqual(report.summary(), reports[0].summary())
+            self.assertEqual(report.visit_counts(), reports[0].visit_counts())
+            self.assertEqual(report.endings_reached(), reports[0].endings_reached())
+            self.assertEqual(report.blocked_at(), reports[0].blocked_at())
+        summary = reports[0].summary()
+        self.assertEqual(summary['runs'], 600)
+        self.assertEqual(summary['runs'], summary['completed'] + summary['blocked']
+                         + summary['truncated'] + summary['stopped'])
+        self.assertEqual(summary['endings_reached'], 2)
+        self.assertGreater(summary['blocked'], 0)
+        self.assertNotEqual(simulator.run(600, seed=43, workers=1).visit_counts(),
+                            reports[0].visit_counts())
+
+    def test_parallel_scripts_match_serial(self):
+        simulator = Simulator(self.graph())
+        scripts = [['sol', 'bitir'], ['kapı', 'geri', 'x'], [0], ['kapı']] * 150
+        serial = simulator.run_scripts(scripts, workers=1)
+        parallel = simulator.run_scripts(scripts, workers=2)
+        self.assertEqual(parallel.summary(), serial.summary())
+        self.assertEqual(parallel.visit_counts(), serial.visit_counts())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import random
+import unittest
+
+import tests  # noqa: F401  (yol ayarı)
+from core.board import Board
+from core.element import Element
+from core.project import Project
+from core.search import MERGE_MAX_LISTS, SearchIndex, tokenize
+
+
+class SearchIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.project = Project('p')
+        self.first = Board('bir', True)
+        self.second = Board('iki')
+        for board, titles in ((self.first, ('Kapı', 'Anahtar')), (self.second, ('kapıcı',))):
+            self.project.add_board(board)
+            for title in titles:
+                board.add_element(Element(title, 'İçerik'))
+        self.index = SearchIndex(self.project)
+
+    def titles(self, query, **kwargs):
+        return sorted(hit.title for hit in self.index.search(query, **kwargs))
+
+    def test_search(self):
+        self.index.refresh()
+        self.assertTrue(self.index.is_complete)
+        self.assertEqual(self.titles('apı'), ['Kapı', 'kapıcı'])
+        self.assertEqual(self.titles('KAPI içerik'), ['Kapı', 'kapıcı'])
+        self.assertEqual(self.titles('kapı', board_id=self.second.id), ['kapıcı'])
+        self.assertEqual(self.titles('yok'), [])
+
+    def test_search_does_not_build_index(self):
+        steps = self.index.iter_refresh()
+        next(steps)
+        self.assertFalse(self.index.is_complete)
+        # Sorgu kalan board'ları indekslemez, sadece hazır olanı arar
+        self.assertEqual(self.titles('kapı'), ['Kapı'])
+        self.assertFalse(self.index.is_complete)
+        for _ in steps:
+            pass
+        self.assertTrue(self.index.is_complete)
+        self.assertEqual(self.titles('kapı'), ['Kapı', 'kapıcı'])
+
+    def test_changes_applied_on_search(self):
+        self.index.refresh()
+        element = next(iter(self.first.elements.values()))
+        element.title = 'Pencere'
+        self.first.mark_element_dirty(element.id)
+        self.assertEqual(self.titles('pencere'), ['Pencere'])
+        self.project.remove_board(self.second.id)
+        self.assertEqual(self.titles('kapı'), [])
+        self.assertTrue(self.index.is_complete)
+        self.project.add_board(Board('üç'))
+        self.assertFalse(self.index.is_complete)
+
+
+class SearchQueryTest(unittest.TestCase):
+    """Sayısal ve kısa terimli sorgular kaba kuvvet aramayla aynı sonucu verir"""
+
+    WORDS = ('kapı', 'kral', 'gemi', 'orman', 'ışık')
+    QUERIES = ('1', '1 2', '12 3', 'kapı 1', 'ka 1', 'k', 'ka kapı', 'kral 7',
+               '2 ka 9', '123', '99999 1', 'ı 0', 'bulunmayan 1')
+
+    def setUp(self):
+        rng = random.Random(7)
+        self.project = Project('p')
+        self.boards = [Board('bir', True), Board('iki')]
+        for board in self.boards:
+            self.project.add_board(board)
+            for index in range(600):
+                words = ' '.join(rng.choice(self.WORDS) for _ in range(3))
+                board.add_element(Element(f'{rng.choice(self.WORDS)} {index}', words))
+        self.index = SearchIndex(self.project)
+        self.index.refresh()
+
+    def expected(self, query, board_id=None):
+        terms = tokenize(query)
+        found = []
+        for board in self.boards:
+            if board_id is not None and board.id != board_id:
+                continue
+            for element in board.elements.values():
+                tokens = tokenize(f'{element.title}\n{element.content}')
+                if all(any(term in token for token in tokens) for term in terms):
+                    found.append(element.id)
+        return sorted(found)
+
+    def found(self, query, **kwargs):
+        return sorted(hit.element_id for hit in self.index.search(query, limit=10 ** 6, **kwargs))
+
+    def check(self):
+        for query in self.QUERIES:
+            with self.subTest(query=query):
+                self.assertEqual(self.found(query), self.expected(query))
+        self.assertEqual(self.found('1 2', board_id=self.boards[1].id),
+                         self.expected('1 2', board_id=self.boards[1].id))
+
+    def test_queries_match_brute_force(self):
+        # '1' yüzlerce sayıya uyar: belge haritası yolu da denenir
+        self.assertGreater(sum('1' in token for token in self.index._postings), MERGE_MAX_LISTS)
+        self.check()
+        # Saklanan kısa terim eşleşmeleri tekrar sorguda da doğru
+        self.check()
+
+    def test_short_term_cache_follows_changes(self):
+        self.check()
+        board = self.boards[0]
+        elements = list(board.elements.values())
+        for element in elements[:50]:
+            board.remove_element(element.id)
+        for element in elements[50:100]:
+            element.title = f'gemi {int(element.title.split()[1]) + 5000}'
+            board.mark_element_dirty(element.id)
+        board.add_element(Element('yeni 1212', 'kapı'))
+        self.check()
+
+    def test_limit_and_order(self):
+        hits = self.index.search('1 2', limit=5)
+        self.assertEqual(len(hits), 5)
+        everything = self.index.search('1 2', limit=10 ** 6)
+        self.assertEqual([hit.element_id for hit in hits],
+                         [hit.element_id for hit in everything[:5]])
+
+
+if __name__ == '__main__':
+    unittest.main()